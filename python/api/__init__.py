@@ -0,0 +1,58 @@
+"""
+Exchange integration package
+File: python/api/__init__.py
+Purpose: Re-exports the shared price-feed service and the pluggable exchange adapters
+Related components: price_feed.py, adapters.py, main.py
+Tags: api, exchanges, price-feed, package
+"""
+
+# Import exchange adapters
+from .adapters import (
+    BitstampAdapter,
+    CoinbaseAdapter,
+    ExchangeAdapter,
+    ExchangeFactory,
+    ExchangePoolConfig,
+    HTTPExchangeAdapter,
+    KrakenAdapter,
+    SimulatedExchange,
+    aclose_exchange_clients,
+    get_exchange_client
+)
+
+# Import the price-feed service
+from .price_feed import (
+    AggregatedPrice,
+    PriceFeedService,
+    PriceQuote,
+    PriceSubscription,
+    StalePriceError,
+    aclose_price_feed,
+    configure_price_feed,
+    get_price_feed
+)
+
+# Export all public components
+__all__ = [
+    # Exchange adapters
+    "BitstampAdapter",
+    "CoinbaseAdapter",
+    "ExchangeAdapter",
+    "ExchangeFactory",
+    "ExchangePoolConfig",
+    "HTTPExchangeAdapter",
+    "KrakenAdapter",
+    "SimulatedExchange",
+    "aclose_exchange_clients",
+    "get_exchange_client",
+
+    # Price feed
+    "AggregatedPrice",
+    "PriceFeedService",
+    "PriceQuote",
+    "PriceSubscription",
+    "StalePriceError",
+    "aclose_price_feed",
+    "configure_price_feed",
+    "get_price_feed"
+]
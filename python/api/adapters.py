@@ -0,0 +1,224 @@
+"""
+Exchange price adapters
+File: python/api/adapters.py
+Purpose: Pluggable exchange adapters (Coinbase, Kraken, Bitstamp and a simulated exchange) over one pooled async HTTP client per exchange
+Related components: price_feed.py (PriceFeedService), llm/http_pool.py, main.py
+Tags: api, exchanges, adapters, http, connection-pool
+"""
+
+import asyncio
+import os
+import random
+import threading
+from typing import Any, Dict, List, Optional, Type
+import httpx
+from pydantic import BaseModel
+
+
+class ExchangePoolConfig(BaseModel):
+    """Connection pool settings for each exchange's shared HTTP client"""
+    max_connections: int = 10
+    max_keepalive_connections: int = 5
+    keepalive_expiry: float = 30.0
+    timeout: float = 5.0
+
+    @classmethod
+    def from_env(cls) -> "ExchangePoolConfig":
+        """Build pool settings from PRICE_FEED_* environment variables"""
+        return cls(
+            max_connections=int(os.getenv("PRICE_FEED_MAX_CONNECTIONS", "10")),
+            max_keepalive_connections=int(os.getenv("PRICE_FEED_MAX_KEEPALIVE", "5")),
+            timeout=float(os.getenv("PRICE_FEED_TIMEOUT", "5"))
+        )
+
+
+_clients: Dict[str, httpx.AsyncClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_exchange_client(exchange: str, base_url: str) -> httpx.AsyncClient:
+    """Return the shared keep-alive client for an exchange, creating it once"""
+    client = _clients.get(exchange)
+    if client is not None:
+        return client
+    with _clients_lock:
+        client = _clients.get(exchange)
+        if client is None:
+            config = ExchangePoolConfig.from_env()
+            client = httpx.AsyncClient(
+                base_url=base_url,
+                timeout=config.timeout,
+                limits=httpx.Limits(
+                    max_connections=config.max_connections,
+                    max_keepalive_connections=config.max_keepalive_connections,
+                    keepalive_expiry=config.keepalive_expiry
+                )
+            )
+            _clients[exchange] = client
+        return client
+
+
+async def aclose_exchange_clients() -> None:
+    """Close every shared exchange client (call on application shutdown)"""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        await client.aclose()
+
+
+class ExchangeAdapter:
+    """Base class for exchange price sources
+
+    Symbols are ``BASE-QUOTE`` (``BTC-USD``); adapters translate them to
+    the exchange's own pair names.
+    """
+
+    name = "base"
+
+    async def fetch_price(self, symbol: str) -> float:
+        """Last traded (or spot) price of ``symbol`` - to be implemented by subclasses"""
+        raise NotImplementedError
+
+    async def aclose(self) -> None:
+        """Release adapter-owned resources (shared clients are closed separately)"""
+
+
+class HTTPExchangeAdapter(ExchangeAdapter):
+    """Adapter for a public REST ticker endpoint on the exchange's pooled client"""
+
+    base_url = ""
+
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        self._client = client
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._client or get_exchange_client(self.name, self.base_url)
+
+    def request(self, symbol: str) -> Dict[str, Any]:
+        """``path`` and ``params`` of the ticker request"""
+        raise NotImplementedError
+
+    def parse(self, payload: Any, symbol: str) -> float:
+        raise NotImplementedError
+
+    async def fetch_price(self, symbol: str) -> float:
+        request = self.request(symbol)
+        response = await self.client.get(request["path"], params=request.get("params"))
+        response.raise_for_status()
+        return float(self.parse(response.json(), symbol))
+
+
+class CoinbaseAdapter(HTTPExchangeAdapter):
+    """Coinbase spot price"""
+
+    name = "coinbase"
+    base_url = "https://api.coinbase.com"
+
+    def request(self, symbol: str) -> Dict[str, Any]:
+        return {"path": f"/v2/prices/{symbol}/spot"}
+
+    def parse(self, payload: Any, symbol: str) -> float:
+        return payload["data"]["amount"]
+
+
+class KrakenAdapter(HTTPExchangeAdapter):
+    """Kraken last trade price"""
+
+    name = "kraken"
+    base_url = "https://api.kraken.com"
+
+    def request(self, symbol: str) -> Dict[str, Any]:
+        base, _, quote = symbol.partition("-")
+        return {"path": "/0/public/Ticker",
+                "params": {"pair": f"{'XBT' if base == 'BTC' else base}{quote}"}}
+
+    def parse(self, payload: Any, symbol: str) -> float:
+        if payload.get("error"):
+            raise ValueError(f"Kraken error: {payload['error']}")
+        # The result is keyed by Kraken's canonical pair name (e.g. XXBTZUSD)
+        ticker = next(iter(payload["result"].values()))
+        return ticker["c"][0]
+
+
+class BitstampAdapter(HTTPExchangeAdapter):
+    """Bitstamp last trade price"""
+
+    name = "bitstamp"
+    base_url = "https://www.bitstamp.net"
+
+    def request(self, symbol: str) -> Dict[str, Any]:
+        return {"path": f"/api/v2/ticker/{symbol.replace('-', '').lower()}/"}
+
+    def parse(self, payload: Any, symbol: str) -> float:
+        return payload["last"]
+
+
+class SimulatedExchange(ExchangeAdapter):
+    """Local stand-in exchange for tests and offline development
+
+    Prices are set explicitly or follow a seeded random walk; latency and
+    failures can be injected. ``calls`` counts fetches per symbol.
+    """
+
+    name = "simulated"
+
+    def __init__(self, name: Optional[str] = None, prices: Optional[Dict[str, float]] = None,
+                 volatility: float = 0.0, latency: float = 0.0, seed: int = 0):
+        if name:
+            self.name = name
+        self.prices = dict(prices or {"BTC-USD": 100_000.0})
+        self.volatility = volatility
+        self.latency = latency
+        self.error: Optional[Exception] = None
+        self.calls: Dict[str, int] = {}
+        self._rng = random.Random(seed)
+
+    def set_price(self, symbol: str, price: float) -> None:
+        self.prices[symbol] = price
+
+    def fail(self, error: Optional[Exception] = None) -> None:
+        """Make fetches raise ``error`` (None restores normal operation)"""
+        self.error = error
+
+    async def fetch_price(self, symbol: str) -> float:
+        self.calls[symbol] = self.calls.get(symbol, 0) + 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.error is not None:
+            raise self.error
+        if symbol not in self.prices:
+            raise KeyError(f"{self.name} does not list {symbol}")
+        if self.volatility:
+            self.prices[symbol] *= 1.0 + self._rng.gauss(0.0, self.volatility)
+        return self.prices[symbol]
+
+
+class ExchangeFactory:
+    """Factory and registry for exchange adapters"""
+
+    _adapters: Dict[str, Type[ExchangeAdapter]] = {
+        "coinbase": CoinbaseAdapter,
+        "kraken": KrakenAdapter,
+        "bitstamp": BitstampAdapter,
+        "simulated": SimulatedExchange,
+    }
+
+    @classmethod
+    def create(cls, exchange: str, **kwargs) -> ExchangeAdapter:
+        """Create an adapter for the specified exchange"""
+        if exchange not in cls._adapters:
+            available = ", ".join(cls._adapters.keys())
+            raise ValueError(f"Unknown exchange '{exchange}'. Available: {available}")
+        return cls._adapters[exchange](**kwargs)
+
+    @classmethod
+    def register(cls, exchange: str, adapter_class: Type[ExchangeAdapter]):
+        """Register a new adapter (replacing any existing one with that name)"""
+        cls._adapters[exchange] = adapter_class
+
+    @classmethod
+    def list_exchanges(cls) -> List[str]:
+        """List all available exchange names"""
+        return list(cls._adapters.keys())
@@ -0,0 +1,320 @@
+"""
+Shared price-feed service
+File: python/api/price_feed.py
+Purpose: One process-wide poller per symbol that queries every exchange adapter, aggregates the fresh quotes by median and fans ticks out to subscribers
+Related components: adapters.py, main.py (/price endpoint), workflows/triggers.py, strategies/indicators.py
+Tags: api, price-feed, polling, pub-sub, median, staleness
+"""
+
+import asyncio
+import inspect
+import logging
+import os
+import statistics
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set
+from pydantic import BaseModel
+from ..llm.metrics import get_registry
+from .adapters import ExchangeAdapter, ExchangeFactory, aclose_exchange_clients
+
+logger = logging.getLogger(__name__)
+
+PriceCallback = Callable[["AggregatedPrice"], Any]
+
+
+class StalePriceError(RuntimeError):
+    """No exchange has a fresh enough quote for the symbol"""
+
+
+class PriceQuote(BaseModel):
+    """One exchange's price for a symbol"""
+    exchange: str
+    symbol: str
+    price: float
+    # Epoch seconds when the quote was received
+    timestamp: float
+
+
+class AggregatedPrice(BaseModel):
+    """Median of the fresh exchange quotes for a symbol"""
+    symbol: str
+    price: float
+    timestamp: float
+    # Fresh quotes used for the median, by exchange
+    quotes: Dict[str, float]
+    # Exchanges whose last quote is too old (or that never answered)
+    stale: List[str]
+
+
+class PriceSubscription:
+    """A subscriber to one symbol's ticks
+
+    With a callback, ticks are passed to it on the subscription's own task
+    (coroutine functions are awaited); ticks arriving while it is busy
+    collapse into the newest one. Otherwise ticks queue for ``get`` /
+    ``async for``; the queue keeps only the newest ``maxsize`` ticks. Either
+    way a slow consumer never holds up the poller or other subscribers.
+    """
+
+    def __init__(self, feed: "PriceFeedService", symbol: str,
+                 callback: Optional[PriceCallback] = None, maxsize: int = 1):
+        self.feed = feed
+        self.symbol = symbol
+        self.callback = callback
+        self.queue: "asyncio.Queue[AggregatedPrice]" = asyncio.Queue(maxsize)
+        self._pending: Optional[AggregatedPrice] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _deliver(self, price: AggregatedPrice) -> None:
+        if self.callback is not None:
+            self._pending = price
+            if self._task is None or self._task.done():
+                self._task = asyncio.create_task(self._run_callback())
+            return
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(price)
+
+    async def _run_callback(self) -> None:
+        while self._pending is not None:
+            price, self._pending = self._pending, None
+            try:
+                result = self.callback(price)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.warning("Price subscriber for %s failed: %s", self.symbol, e)
+
+    async def _stop(self) -> None:
+        """Cancel a callback still running"""
+        self._pending = None
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def get(self) -> AggregatedPrice:
+        return await self.queue.get()
+
+    def __aiter__(self) -> "PriceSubscription":
+        return self
+
+    async def __anext__(self) -> AggregatedPrice:
+        return await self.get()
+
+    async def close(self) -> None:
+        await self.feed.unsubscribe(self)
+
+    async def __aenter__(self) -> "PriceSubscription":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+
+class PriceFeedService:
+    """Polls exchanges once per symbol on behalf of every subscriber
+
+    The first subscriber to a symbol starts its poller and the last one
+    to leave stops it, so N workflows watching BTC-USD cost one request
+    per exchange per ``interval``. Each poll queries all adapters
+    concurrently (``timeout`` each); quotes older than ``stale_after``
+    drop out of the median, and a tick needs ``min_sources`` fresh quotes.
+    ``get_price`` serves callers that do not subscribe, sharing any poll
+    already in flight.
+    """
+
+    def __init__(self, adapters: Sequence[ExchangeAdapter], interval: float = 5.0,
+                 stale_after: float = 30.0, timeout: float = 5.0, min_sources: int = 1,
+                 clock: Callable[[], float] = time.time):
+        if not adapters:
+            raise ValueError("A price feed needs at least one exchange adapter")
+        self.adapters = list(adapters)
+        self.interval = interval
+        self.stale_after = stale_after
+        self.timeout = timeout
+        self.min_sources = min_sources
+        self._clock = clock
+        self._quotes: Dict[str, Dict[str, PriceQuote]] = {}
+        self._latest: Dict[str, AggregatedPrice] = {}
+        self._subscribers: Dict[str, Set[PriceSubscription]] = {}
+        self._pollers: Dict[str, asyncio.Task] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    @classmethod
+    def from_env(cls) -> "PriceFeedService":
+        """Build a feed from PRICE_FEED_* environment variables"""
+        names = os.getenv("PRICE_FEED_EXCHANGES", "coinbase,kraken,bitstamp")
+        return cls(
+            [ExchangeFactory.create(name.strip()) for name in names.split(",") if name.strip()],
+            interval=float(os.getenv("PRICE_FEED_INTERVAL", "5")),
+            stale_after=float(os.getenv("PRICE_FEED_STALE_AFTER", "30")),
+            timeout=float(os.getenv("PRICE_FEED_TIMEOUT", "5")),
+            min_sources=int(os.getenv("PRICE_FEED_MIN_SOURCES", "1"))
+        )
+
+    def subscribe(self, symbol: str, callback: Optional[PriceCallback] = None,
+                  maxsize: int = 1) -> PriceSubscription:
+        """Subscribe to a symbol's ticks, starting its poller if needed"""
+        subscription = PriceSubscription(self, symbol, callback, maxsize)
+        self._subscribers.setdefault(symbol, set()).add(subscription)
+        if symbol not in self._pollers:
+            self._pollers[symbol] = asyncio.create_task(self._poll(symbol))
+        return subscription
+
+    async def unsubscribe(self, subscription: PriceSubscription) -> None:
+        """Remove a subscriber; the symbol's poller stops with its last one"""
+        subscribers = self._subscribers.get(subscription.symbol)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        await subscription._stop()
+        if not subscribers:
+            del self._subscribers[subscription.symbol]
+            task = self._pollers.pop(subscription.symbol, None)
+            if task is not None:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+
+    @property
+    def symbols(self) -> List[str]:
+        """Symbols with a running poller"""
+        return list(self._pollers)
+
+    def latest(self, symbol: str) -> Optional[AggregatedPrice]:
+        """Most recent aggregated price, however old"""
+        return self._latest.get(symbol)
+
+    def quotes(self, symbol: str) -> Dict[str, PriceQuote]:
+        """Last quote from each exchange"""
+        return dict(self._quotes.get(symbol, {}))
+
+    async def get_price(self, symbol: str, max_age: Optional[float] = None) -> AggregatedPrice:
+        """Aggregated price no older than ``max_age`` (default: the poll interval)
+
+        Polls only when the cached price is too old; raises StalePriceError
+        when too few exchanges answer.
+        """
+        max_age = self.interval if max_age is None else max_age
+        latest = self._latest.get(symbol)
+        if latest is not None and self._clock() - latest.timestamp <= max_age:
+            return latest
+        price = await self.refresh(symbol)
+        if price is None:
+            raise StalePriceError(f"No fresh {symbol} price from at least "
+                                  f"{self.min_sources} exchange(s)")
+        return price
+
+    async def refresh(self, symbol: str) -> Optional[AggregatedPrice]:
+        """Poll every exchange now (joining a poll already in flight)"""
+        task = self._inflight.get(symbol)
+        if task is None:
+            task = asyncio.ensure_future(self._refresh(symbol))
+            self._inflight[symbol] = task
+            task.add_done_callback(lambda _: self._inflight.pop(symbol, None))
+        return await asyncio.shield(task)
+
+    async def _refresh(self, symbol: str) -> Optional[AggregatedPrice]:
+        results = await asyncio.gather(*(self._fetch(adapter, symbol)
+                                         for adapter in self.adapters))
+        quotes = self._quotes.setdefault(symbol, {})
+        for quote in results:
+            if quote is not None:
+                quotes[quote.exchange] = quote
+
+        price = self._aggregate(symbol)
+        if price is None:
+            return None
+        self._latest[symbol] = price
+        for subscription in list(self._subscribers.get(symbol, ())):
+            subscription._deliver(price)
+        return price
+
+    async def _fetch(self, adapter: ExchangeAdapter, symbol: str) -> Optional[PriceQuote]:
+        started = time.perf_counter()
+        try:
+            price = await asyncio.wait_for(adapter.fetch_price(symbol), self.timeout)
+            status = "ok" if price > 0 else "invalid"
+        except asyncio.TimeoutError:
+            price, status = None, "timeout"
+        except Exception as e:
+            logger.debug("%s price fetch for %s failed: %s", adapter.name, symbol, e)
+            price, status = None, "error"
+        registry = get_registry()
+        registry.counter("price_feed_requests_total", "Exchange price requests",
+                         ("exchange", "status")).inc(exchange=adapter.name, status=status)
+        registry.histogram("price_feed_request_seconds", "Exchange price request latency",
+                           ("exchange",)).observe(time.perf_counter() - started,
+                                                  exchange=adapter.name)
+        if status != "ok":
+            return None
+        return PriceQuote(exchange=adapter.name, symbol=symbol, price=price,
+                          timestamp=self._clock())
+
+    def _aggregate(self, symbol: str) -> Optional[AggregatedPrice]:
+        now = self._clock()
+        quotes = self._quotes.get(symbol, {})
+        fresh = {name: q.price for name, q in quotes.items()
+                 if now - q.timestamp <= self.stale_after}
+        if len(fresh) < self.min_sources or not fresh:
+            return None
+        return AggregatedPrice(
+            symbol=symbol, price=statistics.median(fresh.values()), timestamp=now,
+            quotes=fresh, stale=[a.name for a in self.adapters if a.name not in fresh])
+
+    async def _poll(self, symbol: str) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            try:
+                await self.refresh(symbol)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Price poll for %s failed: %s", symbol, e)
+            await asyncio.sleep(max(0.0, self.interval - (loop.time() - started)))
+
+    async def aclose(self) -> None:
+        """Stop every poller and release the adapters"""
+        tasks = list(self._pollers.values())
+        subscriptions = [s for subscribers in self._subscribers.values() for s in subscribers]
+        self._pollers.clear()
+        self._subscribers.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for subscription in subscriptions:
+            await subscription._stop()
+        for adapter in self.adapters:
+            await adapter.aclose()
+
+
+_feed: Optional[PriceFeedService] = None
+_feed_lock = threading.Lock()
+
+
+def get_price_feed() -> PriceFeedService:
+    """Process-wide price feed shared by workflows, triggers and the API"""
+    global _feed
+    if _feed is None:
+        with _feed_lock:
+            if _feed is None:
+                _feed = PriceFeedService.from_env()
+    return _feed
+
+
+def configure_price_feed(feed: Optional[PriceFeedService]) -> None:
+    """Replace the process-wide feed (None rebuilds it from the environment)"""
+    global _feed
+    with _feed_lock:
+        _feed = feed
+
+
+async def aclose_price_feed() -> None:
+    """Stop the shared feed, if started, and close the exchange clients"""
+    global _feed
+    with _feed_lock:
+        feed, _feed = _feed, None
+    if feed is not None:
+        await feed.aclose()
+    await aclose_exchange_clients()
@@ -0,0 +1,46 @@
+"""
+Backtest Module - Strategy replay and parameter sweeps
+File: python/backtest/__init__.py
+Purpose: Replays historical or synthetic BTC prices through the accumulation strategies and reports ROI, sats and drawdown
+Related components: runner.py, data.py, __main__.py, strategies/
+Tags: backtest, strategies, sweep
+"""
+
+from .data import (
+    PERIODS,
+    PeriodAggregator,
+    PriceBars,
+    aggregate,
+    load_bars,
+    read_price_chunks,
+    synthetic_bars
+)
+from .runner import (
+    BacktestConfig,
+    BacktestResult,
+    format_results,
+    parameter_grid,
+    run_backtest,
+    run_sweep,
+    save_results
+)
+
+__all__ = [
+    # Price data
+    "PERIODS",
+    "PeriodAggregator",
+    "PriceBars",
+    "aggregate",
+    "load_bars",
+    "read_price_chunks",
+    "synthetic_bars",
+
+    # Runner
+    "BacktestConfig",
+    "BacktestResult",
+    "format_results",
+    "parameter_grid",
+    "run_backtest",
+    "run_sweep",
+    "save_results"
+]
@@ -0,0 +1,159 @@
+"""
+Backtest price data
+File: python/backtest/data.py
+Purpose: Streams daily or minute-level price CSVs in chunks and rolls them up into per-period closes
+Related components: runner.py, __main__.py, strategies/base.py (days_since_genesis)
+Tags: backtest, data, csv, chunked, numpy
+"""
+
+import csv
+import itertools
+from typing import Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+from ..strategies import GENESIS, PowerLawStrategy
+
+
+GENESIS_TIMESTAMP = GENESIS.timestamp()
+
+PERIODS = {"1m": 60, "5m": 300, "15m": 900, "1h": 3600, "4h": 14400,
+           "1d": 86400, "1w": 604800}
+
+TIMESTAMP_COLUMNS = ("timestamp", "time", "date", "datetime")
+PRICE_COLUMNS = ("close", "price")
+
+
+class PriceBars:
+    """Closing price of each period, timestamped at its last observation"""
+
+    def __init__(self, timestamps: np.ndarray, closes: np.ndarray):
+        self.timestamps = np.asarray(timestamps, dtype=np.float64)
+        self.closes = np.asarray(closes, dtype=np.float64)
+
+    @property
+    def days(self) -> np.ndarray:
+        """Days since genesis of each bar"""
+        return (self.timestamps - GENESIS_TIMESTAMP) / 86400.0
+
+    def __len__(self) -> int:
+        return int(self.closes.size)
+
+
+def period_seconds(period: str) -> int:
+    if period not in PERIODS:
+        raise ValueError(f"Unknown period '{period}'. Available: {', '.join(PERIODS)}")
+    return PERIODS[period]
+
+
+class PeriodAggregator:
+    """Rolls a time-ordered price stream up into period closes, chunk by chunk
+
+    Only completed closes and the still-open period are kept, so inputs of
+    any length stream through without being held in memory.
+    """
+
+    def __init__(self, period: str = "1d"):
+        self.seconds = period_seconds(period)
+        self._timestamps: List[np.ndarray] = []
+        self._closes: List[np.ndarray] = []
+        # (period id, timestamp, price) of the latest, possibly unfinished, period
+        self._open: Optional[Tuple[int, float, float]] = None
+
+    def feed(self, timestamps: np.ndarray, prices: np.ndarray) -> None:
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        prices = np.asarray(prices, dtype=np.float64)
+        if timestamps.size == 0:
+            return
+        if (np.any(np.diff(timestamps) < 0)
+                or (self._open is not None and timestamps[0] < self._open[1])):
+            raise ValueError("Price data must be in ascending time order")
+
+        ids = np.floor_divide(timestamps, self.seconds).astype(np.int64)
+        if self._open is not None and self._open[0] != ids[0]:
+            self._timestamps.append(np.array([self._open[1]]))
+            self._closes.append(np.array([self._open[2]]))
+        # Every period but the chunk's last is complete
+        ends = np.flatnonzero(np.diff(ids))
+        self._timestamps.append(timestamps[ends])
+        self._closes.append(prices[ends])
+        self._open = (int(ids[-1]), float(timestamps[-1]), float(prices[-1]))
+
+    def bars(self) -> PriceBars:
+        """Bars so far, including the open period"""
+        timestamps, closes = list(self._timestamps), list(self._closes)
+        if self._open is not None:
+            timestamps.append(np.array([self._open[1]]))
+            closes.append(np.array([self._open[2]]))
+        if not timestamps:
+            return PriceBars(np.empty(0), np.empty(0))
+        return PriceBars(np.concatenate(timestamps), np.concatenate(closes))
+
+
+def parse_timestamps(values: np.ndarray) -> np.ndarray:
+    """Epoch seconds from epoch seconds/milliseconds or ISO 8601 strings"""
+    try:
+        numbers = values.astype(np.float64)
+    except ValueError:
+        iso = np.char.rstrip(np.char.strip(values), "Z")
+        return iso.astype("datetime64[s]").astype(np.int64).astype(np.float64)
+    # Millisecond epochs (exchange exports) are > 1e11 for any date after 1973
+    return np.where(numbers > 1e11, numbers / 1000.0, numbers)
+
+
+def _column(header: List[str], wanted: Optional[str], candidates: Tuple[str, ...]) -> int:
+    names = [h.strip().lower() for h in header]
+    for name in ([wanted.lower()] if wanted else candidates):
+        if name in names:
+            return names.index(name)
+    raise ValueError(f"CSV has no {wanted or '/'.join(candidates)} column: {header}")
+
+
+def read_price_chunks(path: str, chunk_rows: int = 500_000,
+                      timestamp_column: Optional[str] = None,
+                      price_column: Optional[str] = None
+                      ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Yield (epoch seconds, price) arrays from a CSV, ``chunk_rows`` rows at a time
+
+    The header names the columns; by default the timestamp comes from
+    timestamp/time/date and the price from close, then price.
+    """
+    with open(path, newline="") as f:
+        header = next(csv.reader([f.readline()]))
+        columns = (_column(header, timestamp_column, TIMESTAMP_COLUMNS),
+                   _column(header, price_column, PRICE_COLUMNS))
+        while True:
+            lines = [line for line in itertools.islice(f, chunk_rows) if line.strip()]
+            if not lines:
+                return
+            table = np.loadtxt(lines, delimiter=",", usecols=columns, dtype=str, ndmin=2)
+            yield parse_timestamps(table[:, 0]), table[:, 1].astype(np.float64)
+
+
+def aggregate(chunks: Iterable[Tuple[np.ndarray, np.ndarray]], period: str = "1d") -> PriceBars:
+    """Per-period closes of a stream of (timestamps, prices) chunks"""
+    aggregator = PeriodAggregator(period)
+    for timestamps, prices in chunks:
+        aggregator.feed(timestamps, prices)
+    return aggregator.bars()
+
+
+def load_bars(path: str, period: str = "1d", chunk_rows: int = 500_000,
+              timestamp_column: Optional[str] = None,
+              price_column: Optional[str] = None) -> PriceBars:
+    """Per-period closes of a price CSV, read in chunks of ``chunk_rows`` rows"""
+    return aggregate(read_price_chunks(path, chunk_rows, timestamp_column, price_column),
+                     period)
+
+
+def synthetic_bars(periods: int = 2000, start_day: float = 3000.0, period: str = "1d",
+                   volatility: float = 0.035, seed: int = 0) -> PriceBars:
+    """Deterministic random-walk prices around the power-law trend, for demos and tests"""
+    rng = np.random.default_rng(seed)
+    step = period_seconds(period)
+    timestamps = GENESIS_TIMESTAMP + start_day * 86400.0 + step * np.arange(periods)
+    days = (timestamps - GENESIS_TIMESTAMP) / 86400.0
+    # Mean-reverting log deviation from the trend keeps prices in a plausible range
+    deviation = np.zeros(periods)
+    shocks = rng.normal(0.0, volatility, periods)
+    for i in range(1, periods):
+        deviation[i] = 0.995 * deviation[i - 1] + shocks[i]
+    return PriceBars(timestamps, PowerLawStrategy().model_price(days) * np.exp(deviation))
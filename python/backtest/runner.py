@@ -0,0 +1,140 @@
+"""
+Backtest runner and parameter sweeps
+File: python/backtest/runner.py
+Purpose: Replays price bars through a strategy (vectorized walk-forward) and spreads parameter grids across a process pool
+Related components: data.py, __main__.py, strategies/engine.py (StrategyFactory, calculate_dca_amount)
+Tags: backtest, sweep, multiprocessing, roi, drawdown
+"""
+
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+from pydantic import BaseModel, Field
+from ..strategies import BUY, StrategyFactory, calculate_dca_amount
+from .data import PriceBars
+
+
+SATS_PER_BTC = 100_000_000
+
+
+class BacktestConfig(BaseModel):
+    """One run: a strategy, its constructor parameters and the per-period budget"""
+    strategy_id: str
+    params: Dict[str, Any] = Field(default_factory=dict)
+    # Fiat spent per period at multiplier 1.0
+    base_amount: float = 10.0
+
+
+class BacktestResult(BaseModel):
+    """Outcome of one run"""
+    strategy_id: str
+    params: Dict[str, Any]
+    periods: int
+    buys: int
+    invested: float
+    final_value: float
+    sats: int
+    roi: float
+    # Largest peak-to-trough fall of value per unit invested
+    max_drawdown: float
+    # Wall time of the run in seconds (the only non-deterministic field)
+    runtime: float
+
+
+def parameter_grid(strategy_id: str, grid: Optional[Dict[str, Sequence[Any]]] = None,
+                   base_amount: float = 10.0) -> List[BacktestConfig]:
+    """Every combination of ``grid`` values, in a stable order"""
+    grid = grid or {}
+    names = list(grid)
+    return [BacktestConfig(strategy_id=strategy_id, params=dict(zip(names, values)),
+                           base_amount=base_amount)
+            for values in itertools.product(*(grid[name] for name in names))]
+
+
+def run_backtest(config: BacktestConfig, bars: PriceBars) -> BacktestResult:
+    """Replay ``bars`` through one strategy configuration
+
+    Each period buys ``base_amount`` times the strategy's (clamped)
+    multiplier on a buy signal. Hold and sell signals skip the buy: this
+    is an accumulation backtest, so the stack is never sold.
+    """
+    started = time.perf_counter()
+    strategy = StrategyFactory.create(config.strategy_id, **config.params)
+    actions, multipliers, _ = strategy.evaluate_series(bars.closes, bars.days)
+
+    spend = np.where(actions == BUY, calculate_dca_amount(config.base_amount, multipliers), 0.0)
+    btc = np.cumsum(spend / bars.closes)
+    invested = np.cumsum(spend)
+    value = btc * bars.closes
+    equity = np.divide(value, invested, out=np.ones_like(value), where=invested > 0)
+    drawdown = 1.0 - equity / np.maximum.accumulate(equity) if len(bars) else np.zeros(1)
+
+    total = float(invested[-1]) if len(bars) else 0.0
+    final_value = float(value[-1]) if len(bars) else 0.0
+    return BacktestResult(
+        strategy_id=config.strategy_id,
+        params=config.params,
+        periods=len(bars),
+        buys=int(np.count_nonzero(spend)),
+        invested=total,
+        final_value=final_value,
+        sats=int(round(float(btc[-1]) * SATS_PER_BTC)) if len(bars) else 0,
+        roi=final_value / total - 1.0 if total else 0.0,
+        max_drawdown=float(drawdown.max()),
+        runtime=time.perf_counter() - started
+    )
+
+
+# Bars of the current pool worker, shipped once per process by the initializer
+_worker_bars: Optional[PriceBars] = None
+
+
+def _init_worker(timestamps: np.ndarray, closes: np.ndarray) -> None:
+    global _worker_bars
+    _worker_bars = PriceBars(timestamps, closes)
+
+
+def _run_in_worker(config: BacktestConfig) -> BacktestResult:
+    return run_backtest(config, _worker_bars)
+
+
+def run_sweep(configs: Sequence[BacktestConfig], bars: PriceBars,
+              workers: Optional[int] = None,
+              chunksize: Optional[int] = None) -> List[BacktestResult]:
+    """Run every configuration, across ``workers`` processes when above one
+
+    Results come back in ``configs`` order and, runtime aside, are
+    identical whatever the worker count. Defaults to one worker per CPU.
+    """
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+    workers = min(workers, len(configs))
+    if workers <= 1:
+        return [run_backtest(config, bars) for config in configs]
+    chunksize = chunksize or max(1, len(configs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(bars.timestamps, bars.closes)) as pool:
+        return list(pool.map(_run_in_worker, configs, chunksize=chunksize))
+
+
+def save_results(results: Sequence[BacktestResult], path: str,
+                 metadata: Optional[Dict[str, Any]] = None) -> None:
+    """Write results (and run metadata) as JSON"""
+    with open(path, "w") as f:
+        json.dump({"metadata": metadata or {},
+                   "results": [r.model_dump() for r in results]}, f, indent=2)
+
+
+def format_results(results: Sequence[BacktestResult]) -> str:
+    """Plain-text table of results, best ROI first"""
+    lines = [f"{'strategy':<18} {'roi':>8} {'sats':>13} {'drawdown':>9} "
+             f"{'buys':>6} {'ms':>8}  params"]
+    for r in sorted(results, key=lambda r: r.roi, reverse=True):
+        params = ",".join(f"{k}={v}" for k, v in r.params.items())
+        lines.append(f"{r.strategy_id:<18} {r.roi:>8.1%} {r.sats:>13,} "
+                     f"{r.max_drawdown:>9.1%} {r.buys:>6} "
+                     f"{r.runtime * 1000:>8.1f}  {params}")
+    return "\n".join(lines)
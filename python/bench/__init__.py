@@ -0,0 +1,34 @@
+"""
+Benchmark Module - Load harness and mock LLM provider
+File: python/bench/__init__.py
+Purpose: Measures strategy and workflow latency/throughput without calling real providers
+Related components: harness.py, mock_server.py, __main__.py
+Tags: benchmark, performance, mock
+"""
+
+from .mock_server import MockProviderServer, MockServerConfig, create_app
+from .harness import (
+    SCENARIOS,
+    BenchmarkResult,
+    compare_reports,
+    percentile,
+    run_benchmarks,
+    run_level,
+    save_report
+)
+
+__all__ = [
+    # Mock provider
+    "MockProviderServer",
+    "MockServerConfig",
+    "create_app",
+
+    # Harness
+    "SCENARIOS",
+    "BenchmarkResult",
+    "compare_reports",
+    "percentile",
+    "run_benchmarks",
+    "run_level",
+    "save_report"
+]
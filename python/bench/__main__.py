@@ -0,0 +1,97 @@
+"""
+Benchmark command line
+File: python/bench/__main__.py
+Purpose: ``python -m python.bench`` runs the harness against a spawned mock provider and saves JSON
+Related components: harness.py, mock_server.py
+Tags: benchmark, cli
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from .harness import (
+    SCENARIOS,
+    compare_reports,
+    format_results,
+    run_benchmarks,
+    save_report
+)
+from .mock_server import MockProviderServer, MockServerConfig
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m python.bench",
+        description="Benchmark LLM strategies and the news workflow against a "
+                    "local mock provider")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help="Comma-separated scenarios (%(default)s)")
+    parser.add_argument("--concurrency", default="1,4,16,64",
+                        help="Comma-separated concurrency levels (%(default)s)")
+    parser.add_argument("--requests", type=int, default=100,
+                        help="Calls per scenario and level (%(default)s)")
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--latency-distribution", default="fixed",
+                        choices=["fixed", "uniform", "lognormal"])
+    parser.add_argument("--latency-spread", type=float, default=0.0)
+    parser.add_argument("--tokens-per-second", type=float, default=200.0)
+    parser.add_argument("--completion-tokens", type=int, default=64)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--base-url",
+                        help="Use an already running mock/provider instead of spawning one")
+    parser.add_argument("--output", default="bench-results.json",
+                        help="JSON report path (%(default)s)")
+    parser.add_argument("--compare", help="Baseline JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Regression threshold as a fraction (%(default)s)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    config = MockServerConfig(
+        latency_ms=args.latency_ms,
+        latency_distribution=args.latency_distribution,
+        latency_spread=args.latency_spread,
+        tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        seed=args.seed
+    )
+    scenarios = [s for s in args.scenarios.split(",") if s]
+    levels = [int(c) for c in args.concurrency.split(",") if c]
+
+    def run(base_url: str):
+        return asyncio.run(run_benchmarks(base_url, scenarios, levels,
+                                          args.requests, config.model_dump()))
+
+    if args.base_url:
+        report = run(args.base_url)
+    else:
+        with MockProviderServer(config) as server:
+            report = run(server.base_url)
+
+    save_report(report, args.output)
+    print(format_results(report["results"]))
+    print(f"\nSaved {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare_reports(baseline, report, args.threshold)
+        for row in rows:
+            flag = "REGRESSION" if row["regression"] else "ok"
+            print(f"{row['scenario']:<15} {row['concurrency']:>5} "
+                  f"p95 {row['p95_change']:+.1%} runs/s "
+                  f"{row['runs_per_sec_change']:+.1%} {flag}")
+        if any(row["regression"] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
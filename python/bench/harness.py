@@ -0,0 +1,240 @@
+"""
+Workflow and strategy benchmark harness
+File: python/bench/harness.py
+Purpose: Drives strategies and the news workflow against the mock provider at increasing concurrency
+Related components: bench/mock_server.py, llm/, workflows/bitcoin_news.py
+Tags: benchmark, latency, throughput, percentiles
+"""
+
+import asyncio
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Sequence
+from pydantic import BaseModel
+from ..llm import GrokStrategy, OpenAIStrategy, aclose_http_clients
+from ..workflows.bitcoin_news import BitcoinNewsWorkflow
+from ..workflows.checkpoint import BoundedMemorySaver
+
+
+Call = Callable[[], Awaitable[Any]]
+
+
+class BenchmarkResult(BaseModel):
+    """Latency and throughput of one scenario at one concurrency level"""
+    scenario: str
+    concurrency: int
+    requests: int
+    errors: int
+    duration: float
+    runs_per_sec: float
+    p50: float
+    p95: float
+    p99: float
+    mean: float
+    peak_rss_mb: float
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Linear-interpolated percentile of already sorted values, q in [0, 1]"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return (sorted_values[lower]
+            + (sorted_values[upper] - sorted_values[lower]) * (position - lower))
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+async def run_level(scenario: str, call: Call, concurrency: int,
+                    requests: int) -> BenchmarkResult:
+    """Run ``requests`` calls from ``concurrency`` closed-loop workers"""
+    latencies: List[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            try:
+                await call()
+            except Exception:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    duration = time.perf_counter() - started
+
+    latencies.sort()
+    return BenchmarkResult(
+        scenario=scenario,
+        concurrency=concurrency,
+        requests=requests,
+        errors=errors,
+        duration=duration,
+        runs_per_sec=len(latencies) / duration if duration else 0.0,
+        p50=percentile(latencies, 0.50),
+        p95=percentile(latencies, 0.95),
+        p99=percentile(latencies, 0.99),
+        mean=sum(latencies) / len(latencies) if latencies else 0.0,
+        peak_rss_mb=peak_rss_mb()
+    )
+
+
+PROMPT = "Summarize this Bitcoin news headline: \"Bitcoin holds steady\""
+
+
+async def _consume_stream(strategy) -> str:
+    return "".join([token async for token in strategy.query_stream(PROMPT)])
+
+
+def _scenario_call(scenario: str) -> Call:
+    """Build the call for a scenario (fresh clients pointed at the mock)"""
+    if scenario == "openai_query":
+        strategy = OpenAIStrategy()
+        return lambda: strategy.query(PROMPT)
+    if scenario == "grok_query":
+        strategy = GrokStrategy()
+        return lambda: strategy.query(PROMPT)
+    if scenario == "openai_stream":
+        strategy = OpenAIStrategy()
+        return lambda: _consume_stream(strategy)
+    if scenario == "workflow":
+        workflow = BitcoinNewsWorkflow(openai=OpenAIStrategy(), grok=GrokStrategy(),
+                                       checkpointer=BoundedMemorySaver(), fused=False)
+        return workflow.run
+    if scenario == "workflow_fused":
+        workflow = BitcoinNewsWorkflow(openai=OpenAIStrategy(), grok=GrokStrategy(),
+                                       checkpointer=BoundedMemorySaver(), fused=True)
+        return workflow.run
+    raise ValueError(f"Unknown scenario '{scenario}'. Available: {SCENARIOS}")
+
+
+SCENARIOS = ["openai_query", "grok_query", "openai_stream", "workflow",
+             "workflow_fused"]
+
+
+@contextmanager
+def provider_env(base_url: str) -> Iterator[None]:
+    """Point the OpenAI and Groq SDKs at ``base_url`` for the duration"""
+    overrides = {
+        "OPENAI_BASE_URL": f"{base_url}/v1",
+        "GROQ_BASE_URL": base_url,
+        "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY") or "bench",
+        "GROK_API_KEY": os.getenv("GROK_API_KEY") or "bench",
+    }
+    saved = {key: os.environ.get(key) for key in overrides}
+    os.environ.update(overrides)
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                              capture_output=True, text=True, check=True,
+                              timeout=5).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+async def run_benchmarks(base_url: str,
+                         scenarios: Sequence[str] = tuple(SCENARIOS),
+                         concurrency_levels: Sequence[int] = (1, 4, 16, 64),
+                         requests: int = 100,
+                         server_config: Optional[Dict[str, Any]] = None
+                         ) -> Dict[str, Any]:
+    """Run every scenario at every concurrency level against ``base_url``
+
+    Returns a JSON-serializable report: ``meta`` (commit, python, config)
+    and ``results`` (one BenchmarkResult per scenario and level).
+    """
+    results: List[BenchmarkResult] = []
+    with provider_env(base_url):
+        try:
+            for scenario in scenarios:
+                call = _scenario_call(scenario)
+                for concurrency in concurrency_levels:
+                    results.append(await run_level(scenario, call, concurrency,
+                                                   requests))
+        finally:
+            await aclose_http_clients()
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "requests_per_level": requests,
+            "server": server_config or {}
+        },
+        "results": [result.model_dump() for result in results]
+    }
+
+
+def save_report(report: Dict[str, Any], path: str) -> None:
+    """Write a report as indented JSON"""
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def compare_reports(baseline: Dict[str, Any], current: Dict[str, Any],
+                    threshold: float = 0.10) -> List[Dict[str, Any]]:
+    """Per scenario/level p95 and throughput deltas against a baseline
+
+    An entry is a regression when p95 grew or runs/sec fell by more than
+    ``threshold`` (a fraction).
+    """
+    before = {(r["scenario"], r["concurrency"]): r for r in baseline["results"]}
+    rows = []
+    for result in current["results"]:
+        old = before.get((result["scenario"], result["concurrency"]))
+        if old is None:
+            continue
+        p95_change = (result["p95"] / old["p95"] - 1) if old["p95"] else 0.0
+        rps_change = ((result["runs_per_sec"] / old["runs_per_sec"] - 1)
+                      if old["runs_per_sec"] else 0.0)
+        rows.append({
+            "scenario": result["scenario"],
+            "concurrency": result["concurrency"],
+            "p95_change": p95_change,
+            "runs_per_sec_change": rps_change,
+            "regression": p95_change > threshold or rps_change < -threshold
+        })
+    return rows
+
+
+def format_results(results: Sequence[Dict[str, Any]]) -> str:
+    """Plain-text table of report results"""
+    lines = [f"{'scenario':<15} {'conc':>5} {'runs/s':>9} {'p50 ms':>9} "
+             f"{'p95 ms':>9} {'p99 ms':>9} {'errors':>7} {'rss MiB':>8}"]
+    for r in results:
+        lines.append(f"{r['scenario']:<15} {r['concurrency']:>5} "
+                     f"{r['runs_per_sec']:>9.1f} {r['p50'] * 1000:>9.1f} "
+                     f"{r['p95'] * 1000:>9.1f} {r['p99'] * 1000:>9.1f} "
+                     f"{r['errors']:>7} {r['peak_rss_mb']:>8.1f}")
+    return "\n".join(lines)
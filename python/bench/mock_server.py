@@ -0,0 +1,326 @@
+"""
+Mock OpenAI/Groq-compatible provider server
+File: python/bench/mock_server.py
+Purpose: Local chat-completions/responses server with configurable latency, token rate, errors, 429s and streaming
+Related components: bench/harness.py, llm/openai_strategy.py, llm/grok_strategy.py
+Tags: benchmark, mock, openai, groq, fastapi
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import random
+import socket
+import time
+import urllib.request
+from typing import Any, AsyncIterator, Dict, Optional
+from uuid import uuid4
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+
+class MockServerConfig(BaseModel):
+    """Latency, throughput and failure model of the mock provider"""
+    latency_ms: float = 50.0
+    # fixed, uniform (latency_ms +/- spread) or lognormal (median latency_ms, sigma=spread)
+    latency_distribution: str = "fixed"
+    latency_spread: float = 0.0
+    tokens_per_second: float = 200.0
+    completion_tokens: int = 64
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after: float = 0.05
+    seed: Optional[int] = None
+
+    def sample_latency(self, rng: random.Random) -> float:
+        """Time to first token in seconds"""
+        if self.latency_distribution == "uniform":
+            ms = rng.uniform(self.latency_ms - self.latency_spread,
+                             self.latency_ms + self.latency_spread)
+        elif self.latency_distribution == "lognormal":
+            ms = self.latency_ms * rng.lognormvariate(0.0, self.latency_spread)
+        elif self.latency_distribution == "fixed":
+            ms = self.latency_ms
+        else:
+            raise ValueError(f"Unknown latency distribution "
+                             f"'{self.latency_distribution}'")
+        return max(0.0, ms) / 1000
+
+
+class ServerStats(BaseModel):
+    """Request counters exposed at GET /stats"""
+    requests: int = 0
+    streamed: int = 0
+    errors: int = 0
+    rate_limited: int = 0
+
+
+def _schema_instance(schema: Dict[str, Any]) -> Any:
+    """Smallest value satisfying a response_format JSON schema"""
+    if "enum" in schema:
+        return schema["enum"][0]
+    kind = schema.get("type")
+    if kind == "object":
+        return {key: _schema_instance(sub)
+                for key, sub in schema.get("properties", {}).items()}
+    if kind == "array":
+        return []
+    if kind in ("number", "integer"):
+        return 0
+    if kind == "boolean":
+        return False
+    return "Synthetic benchmark response."
+
+
+def _completion_text(prompt: str, tokens: int,
+                     response_format: Optional[Dict[str, Any]] = None) -> str:
+    """Canned completion shaped to what the news workflow parses"""
+    if (response_format or {}).get("type") == "json_schema":
+        return json.dumps(_schema_instance(response_format["json_schema"]["schema"]))
+    if "Respond in JSON" in prompt:
+        return json.dumps({"analysis": "neutral",
+                           "reasoning": "Synthetic benchmark response."})
+    if "one per line" in prompt:
+        return "\n".join(f"Bitcoin headline {i}" for i in range(1, 11))
+    return " ".join(f"token{i}" for i in range(tokens))
+
+
+def _usage(prompt: str, completion: str, responses_api: bool = False) -> Dict[str, int]:
+    prompt_tokens = max(1, len(prompt) // 4)
+    completion_tokens = max(1, len(completion) // 4)
+    if responses_api:
+        return {"input_tokens": prompt_tokens, "output_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+                "input_tokens_details": {"cached_tokens": 0},
+                "output_tokens_details": {"reasoning_tokens": 0}}
+    return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens}
+
+
+def create_app(config: Optional[MockServerConfig] = None) -> FastAPI:
+    """Build the mock provider app
+
+    Serves OpenAI (``/v1/...``) and Groq (``/openai/v1/...``) paths.
+    ``PUT /config`` swaps the model at runtime and ``GET /stats`` returns
+    request counters.
+    """
+    app = FastAPI(title="Mock LLM provider")
+    state = {"config": config or MockServerConfig(), "stats": ServerStats()}
+    rng = random.Random(state["config"].seed)
+
+    def inject_failure() -> Optional[JSONResponse]:
+        cfg: MockServerConfig = state["config"]
+        roll = rng.random()
+        if roll < cfg.rate_limit_rate:
+            state["stats"].rate_limited += 1
+            return JSONResponse(
+                {"error": {"message": "Rate limit reached", "type": "rate_limit"}},
+                status_code=429, headers={"retry-after": str(cfg.retry_after)})
+        if roll < cfg.rate_limit_rate + cfg.error_rate:
+            state["stats"].errors += 1
+            return JSONResponse(
+                {"error": {"message": "Injected failure", "type": "server_error"}},
+                status_code=500)
+        return None
+
+    async def stream_chat(model: str, prompt: str, completion: str,
+                          groq: bool) -> AsyncIterator[str]:
+        cfg: MockServerConfig = state["config"]
+        chunk_id = f"chatcmpl-{uuid4().hex}"
+        created = int(time.time())
+        await asyncio.sleep(cfg.sample_latency(rng))
+        words = completion.split(" ")
+        for i, word in enumerate(words):
+            if i:
+                await asyncio.sleep(1 / cfg.tokens_per_second)
+            token = word if i == 0 else f" {word}"
+            yield "data: " + json.dumps({
+                "id": chunk_id, "object": "chat.completion.chunk",
+                "created": created, "model": model,
+                "choices": [{"index": 0, "delta": {"content": token},
+                             "finish_reason": None}]
+            }) + "\n\n"
+        final: Dict[str, Any] = {
+            "id": chunk_id, "object": "chat.completion.chunk",
+            "created": created, "model": model,
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+            "usage": _usage(prompt, completion)
+        }
+        if groq:
+            final["x_groq"] = {"id": chunk_id, "usage": _usage(prompt, completion)}
+        yield "data: " + json.dumps(final) + "\n\n"
+        yield "data: [DONE]\n\n"
+
+    async def chat(request: Request, groq: bool):
+        body = await request.json()
+        state["stats"].requests += 1
+        failure = inject_failure()
+        if failure is not None:
+            return failure
+
+        cfg: MockServerConfig = state["config"]
+        model = body.get("model", "mock")
+        messages = body.get("messages") or [{}]
+        prompt = str(messages[-1].get("content", ""))
+        completion = _completion_text(prompt, cfg.completion_tokens,
+                                      body.get("response_format"))
+
+        if body.get("stream"):
+            state["stats"].streamed += 1
+            return StreamingResponse(stream_chat(model, prompt, completion, groq),
+                                     media_type="text/event-stream")
+
+        tokens = len(completion.split(" "))
+        await asyncio.sleep(cfg.sample_latency(rng) + tokens / cfg.tokens_per_second)
+        return {
+            "id": f"chatcmpl-{uuid4().hex}", "object": "chat.completion",
+            "created": int(time.time()), "model": model,
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": completion}}],
+            "usage": _usage(prompt, completion)
+        }
+
+    @app.post("/v1/chat/completions")
+    async def openai_chat(request: Request):
+        return await chat(request, groq=False)
+
+    @app.post("/openai/v1/chat/completions")
+    async def groq_chat(request: Request):
+        return await chat(request, groq=True)
+
+    @app.post("/v1/responses")
+    async def responses(request: Request):
+        body = await request.json()
+        state["stats"].requests += 1
+        failure = inject_failure()
+        if failure is not None:
+            return failure
+
+        cfg: MockServerConfig = state["config"]
+        prompt = str(body.get("input", ""))
+        completion = _completion_text(prompt, cfg.completion_tokens)
+        tokens = len(completion.split(" "))
+        await asyncio.sleep(cfg.sample_latency(rng) + tokens / cfg.tokens_per_second)
+        return {
+            "id": f"resp_{uuid4().hex}", "object": "response",
+            "created_at": int(time.time()), "model": body.get("model", "mock"),
+            "status": "completed", "parallel_tool_calls": False,
+            "tool_choice": "auto", "tools": body.get("tools", []),
+            "output": [{
+                "type": "message", "id": f"msg_{uuid4().hex}", "role": "assistant",
+                "status": "completed",
+                "content": [{"type": "output_text", "text": completion,
+                             "annotations": []}]
+            }],
+            "usage": _usage(prompt, completion, responses_api=True)
+        }
+
+    @app.put("/config")
+    async def update_config(new_config: MockServerConfig) -> MockServerConfig:
+        state["config"] = new_config
+        if new_config.seed is not None:
+            rng.seed(new_config.seed)
+        return new_config
+
+    @app.get("/stats")
+    async def stats() -> ServerStats:
+        return state["stats"]
+
+    return app
+
+
+def _serve(config: Dict[str, Any], host: str, port: int) -> None:
+    """Subprocess entry point"""
+    import uvicorn
+    uvicorn.run(create_app(MockServerConfig(**config)), host=host, port=port,
+                log_level="warning", access_log=False)
+
+
+def _free_port(host: str) -> int:
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+class MockProviderServer:
+    """Runs the mock provider in a separate process
+
+    A separate process keeps the server's CPU and memory out of the
+    benchmark's measurements. Usable as a context manager.
+    """
+
+    def __init__(self, config: Optional[MockServerConfig] = None,
+                 host: str = "127.0.0.1", port: Optional[int] = None):
+        self.config = config or MockServerConfig()
+        self.host = host
+        self.port = port or _free_port(host)
+        self._process: Optional[multiprocessing.Process] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self, timeout: float = 15.0) -> "MockProviderServer":
+        """Start the server and wait until it answers"""
+        context = multiprocessing.get_context("spawn")
+        self._process = context.Process(
+            target=_serve, args=(self.config.model_dump(), self.host, self.port),
+            daemon=True)
+        self._process.start()
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                self.stats()
+                return self
+            except OSError:
+                if not self._process.is_alive():
+                    break
+                time.sleep(0.05)
+        self.stop()
+        raise RuntimeError(f"Mock provider failed to start on {self.base_url}")
+
+    def stop(self) -> None:
+        """Terminate the server process"""
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join(timeout=5)
+            self._process = None
+
+    def stats(self) -> ServerStats:
+        """Request counters from the running server"""
+        with urllib.request.urlopen(f"{self.base_url}/stats", timeout=1) as response:
+            return ServerStats(**json.loads(response.read()))
+
+    def reconfigure(self, config: MockServerConfig) -> None:
+        """Swap the latency/failure model without restarting"""
+        request = urllib.request.Request(
+            f"{self.base_url}/config", data=config.model_dump_json().encode(),
+            method="PUT", headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=1):
+            self.config = config
+
+    def __enter__(self) -> "MockProviderServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def main() -> None:
+    """Run the mock provider in the foreground"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    for name, field in MockServerConfig.model_fields.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", dest=name,
+                            type=field.annotation if field.annotation in (int, float, str)
+                            else int, default=field.default)
+    args = vars(parser.parse_args())
+    host, port = args.pop("host"), args.pop("port")
+    _serve(args, host, port)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,22 +2,115 @@
 LLM Module - Strategy implementations for different providers
 File: python/llm/__init__.py
 Purpose: Provides convenient imports for all LLM strategy components
-Related components: base.py, strategies.py, openai_strategy.py, grok_strategy.py
+Related components: base.py, strategies.py, openai_strategy.py, grok_strategy.py,
+    http_pool.py, cache.py, coalesce.py, rate_limit.py,
+    router.py, metrics.py, structured.py, resilience.py, fallback.py,
+    secret_provider.py
 Tags: llm, strategy, imports
 """
 
 # Import base classes and interfaces
-from .base import LLMStrategy, LLMConfig
+from .base import LLMStrategy, LLMConfig, CachedLLMStrategy
+
+# Import response caching
+from .cache import LLMResponseCache, CacheStats, make_cache_key
+
+# Import single-flight request coalescing
+from .coalesce import (
+    CoalescingLLMStrategy,
+    CoalesceStats,
+    SingleFlight,
+    get_default_group
+)
+
+# Import provider rate limiting
+from .rate_limit import (
+    ProviderRateLimiter,
+    TokenBucket,
+    configure_rate_limit,
+    get_rate_limiter,
+    estimate_tokens
+)
+
+# Import latency, token and cost instrumentation
+from .metrics import (
+    MetricsRegistry,
+    UsageStats,
+    collect_usage,
+    estimate_cost,
+    get_registry
+)
+
+# Import structured-output helpers
+from .structured import (
+    IncrementalJSONExtractor,
+    extract_json,
+    json_schema_format,
+    validate_schema
+)
+
+# Import deadlines, retries and circuit breaking
+from .resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    Deadline,
+    DeadlineExceededError,
+    LLMError,
+    LLMTimeoutError,
+    RetryPolicy,
+    configure_circuit_breaker,
+    current_deadline,
+    deadline_scope,
+    get_circuit_breaker,
+    is_retryable
+)
+from .fallback import FallbackStrategy
+
+# Import 1Password-backed secret resolution
+from .secret_provider import (
+    SecretProvider,
+    SecretResolutionError,
+    configure_secret_provider,
+    get_secret,
+    get_secret_provider,
+    preload_secrets
+)
+
+# Import task-aware model selection
+from .model_selection import (
+    MODEL_CATALOG,
+    ModelProfile,
+    ModelSelector,
+    ModelTier,
+    TaskPolicy,
+    TaskType,
+    configure_model_selector,
+    get_model_selector
+)
 
 # Import specific strategy implementations
 from .openai_strategy import OpenAIStrategy
 from .grok_strategy import GrokStrategy
 
+# Import latency-aware router and per-backend health stats
+from .router import RouterStrategy, RouterStats
+from .backend_stats import BackendStats
+
+# Import shared connection pool helpers
+from .http_pool import (
+    HTTPPoolConfig,
+    configure_http_pool,
+    get_http_client,
+    aclose_http_clients
+)
+
 # Import factory and convenience functions
 from .strategies import (
     LLMStrategyFactory,
     create_openai_strategy,
-    create_grok_strategy
+    create_grok_strategy,
+    create_router_strategy,
+    create_fallback_strategy
 )
 
 # Export all public components
@@ -25,13 +118,89 @@ __all__ = [
     # Base classes
     "LLMStrategy",
     "LLMConfig",
+    "CachedLLMStrategy",
+    
+    # Response caching
+    "LLMResponseCache",
+    "CacheStats",
+    "make_cache_key",
+    
+    # Request coalescing
+    "CoalescingLLMStrategy",
+    "CoalesceStats",
+    "SingleFlight",
+    "get_default_group",
+    
+    # Rate limiting
+    "ProviderRateLimiter",
+    "TokenBucket",
+    "configure_rate_limit",
+    "get_rate_limiter",
+    "estimate_tokens",
+    
+    # Instrumentation
+    "MetricsRegistry",
+    "UsageStats",
+    "collect_usage",
+    "estimate_cost",
+    "get_registry",
+    
+    # Structured output
+    "IncrementalJSONExtractor",
+    "extract_json",
+    "json_schema_format",
+    "validate_schema",
+    
+    # Resilience
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "Deadline",
+    "DeadlineExceededError",
+    "LLMError",
+    "LLMTimeoutError",
+    "RetryPolicy",
+    "configure_circuit_breaker",
+    "current_deadline",
+    "deadline_scope",
+    "get_circuit_breaker",
+    "is_retryable",
+    "FallbackStrategy",
+    
+    # Secrets
+    "SecretProvider",
+    "SecretResolutionError",
+    "configure_secret_provider",
+    "get_secret",
+    "get_secret_provider",
+    "preload_secrets",
+    
+    # Model selection
+    "MODEL_CATALOG",
+    "ModelProfile",
+    "ModelSelector",
+    "ModelTier",
+    "TaskPolicy",
+    "TaskType",
+    "configure_model_selector",
+    "get_model_selector",
     
     # Strategy implementations
     "OpenAIStrategy", 
     "GrokStrategy",
+    "RouterStrategy",
+    "RouterStats",
+    "BackendStats",
+    
+    # Connection pooling
+    "HTTPPoolConfig",
+    "configure_http_pool",
+    "get_http_client",
+    "aclose_http_clients",
     
     # Factory and utilities
     "LLMStrategyFactory",
     "create_openai_strategy",
-    "create_grok_strategy"
+    "create_grok_strategy",
+    "create_router_strategy",
+    "create_fallback_strategy"
 ]
@@ -0,0 +1,55 @@
+"""
+Per-backend health statistics
+File: python/llm/backend_stats.py
+Purpose: EWMA latency and error rate plus a window of recent latency samples for one LLM backend or model
+Related components: router.py (RouterStrategy), model_selection.py (ModelSelector)
+Tags: llm, ewma, latency, error-rate, health
+"""
+
+import time
+from collections import deque
+from typing import Callable, Optional
+
+
+class BackendStats:
+    """EWMA latency/error rate and recent latency samples for one backend"""
+
+    def __init__(self, alpha: float = 0.2, window: int = 100,
+                 clock: Callable[[], float] = time.monotonic):
+        self.alpha = alpha
+        self.ewma_latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.successes = 0
+        self.failures = 0
+        self.last_failure: Optional[float] = None
+        self._samples: "deque[float]" = deque(maxlen=window)
+        self._clock = clock
+
+    def record_success(self, latency: float) -> None:
+        """Record a successful call and its latency in seconds"""
+        self.successes += 1
+        self._samples.append(latency)
+        if self.ewma_latency is None:
+            self.ewma_latency = latency
+        else:
+            self.ewma_latency += self.alpha * (latency - self.ewma_latency)
+        self.error_rate += self.alpha * (0.0 - self.error_rate)
+
+    def record_failure(self) -> None:
+        """Record a failed call"""
+        self.failures += 1
+        self.last_failure = self._clock()
+        self.error_rate += self.alpha * (1.0 - self.error_rate)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Latency percentile over recent samples (None if no samples)"""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(q * len(ordered)))
+        return ordered[index]
+
+    @property
+    def sample_count(self) -> int:
+        """Number of latency samples in the window"""
+        return len(self._samples)
@@ -6,9 +6,33 @@ Related components: All LLM strategy implementations
 Tags: llm, strategy, base, interface
 """
 
+import asyncio
+import json
 import os
-from typing import Dict, Any, Optional
+import time
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+)
 from pydantic import BaseModel
+from .cache import LLMResponseCache, make_cache_key
+from .metrics import record_llm_call, record_queue_wait, record_retry, usage_tokens
+from .structured import extract_json, json_schema_format
+from .model_selection import SELECTION_OPTIONS, TaskType, get_model_selector
+from .rate_limit import (
+    ProviderRateLimiter,
+    estimate_tokens,
+    get_rate_limiter,
+    rate_limit_retry_after
+)
+from .resilience import (
+    DeadlineExceededError,
+    LLMTimeoutError,
+    RetryPolicy,
+    call_with_resilience,
+    caller_retries_rate_limits,
+    current_deadline,
+    default_timeout
+)
 
 
 class LLMConfig(BaseModel):
@@ -16,11 +40,20 @@ class LLMConfig(BaseModel):
     provider: str
     api_key: str
     model: str = None
+    # Per-request timeout in seconds; None uses LLM_TIMEOUT_SECONDS
+    timeout: Optional[float] = None
 
 
 class LLMStrategy:
     """Base class for LLM strategies"""
 
+    # Whether the provider enforces JSON-schema ``response_format``
+    supports_json_schema = False
+    # Whether ``query_with_web_search`` really searches (not a plain completion)
+    supports_web_search = False
+    # None reads LLM_RETRY_* on each call
+    retry_policy: Optional[RetryPolicy] = None
+
     def __init__(self, config: LLMConfig):
         self.config = config
 
@@ -32,4 +65,260 @@ class LLMStrategy:
     async def query_with_web_search(self, prompt: str, 
                                   options: Optional[Dict[str, Any]] = None) -> str:
         """Query the LLM with web search capability - to be implemented by subclasses"""
-        raise NotImplementedError 
\ No newline at end of file
+        raise NotImplementedError
+
+    async def query_stream(self, prompt: str,
+                          options: Optional[Dict[str, Any]] = None
+                          ) -> AsyncIterator[str]:
+        """Stream response tokens as they arrive
+
+        Providers without streaming support yield the full response as a
+        single chunk.
+        """
+        yield await self.query(prompt, options)
+
+    def structured_options(self, schema: Dict[str, Any], name: str = "response",
+                           options: Optional[Dict[str, Any]] = None
+                           ) -> Dict[str, Any]:
+        """Options requesting schema-enforced output where the provider supports it"""
+        merged = dict(options or {})
+        if self.supports_json_schema:
+            merged.setdefault("response_format", json_schema_format(schema, name))
+        return merged
+
+    async def query_json(self, prompt: str, schema: Dict[str, Any],
+                         name: str = "response",
+                         options: Optional[Dict[str, Any]] = None,
+                         attempts: int = 2) -> Any:
+        """Query for a JSON value matching ``schema``
+
+        Providers with schema support get a ``response_format``; every reply
+        goes through the tolerant extractor and is validated. A malformed
+        reply is re-requested, up to ``attempts`` calls in total.
+        """
+        options = self.structured_options(schema, name, options)
+        for attempt in range(attempts):
+            response = await self.query(prompt, options)
+            try:
+                return extract_json(response, schema)
+            except ValueError:
+                if attempt == attempts - 1:
+                    raise
+
+    def _record_call(self, kind: str, started: float, prompt: str,
+                     usage: Any = None, completion: str = "",
+                     model: Optional[str] = None, error: bool = False) -> None:
+        """Export latency, tokens and cost of a finished provider call"""
+        prompt_tokens, completion_tokens = (
+            (0, 0) if error else usage_tokens(usage, prompt, completion))
+        wall_time = time.perf_counter() - started
+        record_llm_call(self.config.provider, model or self.config.model, kind,
+                        wall_time, prompt_tokens, completion_tokens, error=error)
+        get_model_selector().observe(model or self.config.model, wall_time, error)
+
+    def _model_for(self, prompt: str, options: Optional[Dict[str, Any]],
+                   task: Optional[TaskType] = None) -> Tuple[str, Dict[str, Any]]:
+        """Model for this call and the options to send to the provider
+
+        An explicit ``options["model"]`` wins. Otherwise ``options["task"]``
+        (or ``task``) selects a model through the process-wide ModelSelector,
+        honouring optional ``tier``, ``max_latency`` and ``max_cost`` options;
+        calls without a task use the configured model. Selection keys are
+        never forwarded to the provider.
+        """
+        options = dict(options or {})
+        selection = {key: options.pop(key) for key in SELECTION_OPTIONS if key in options}
+        task = selection.pop("task", task)
+        model = options.pop("model", None)
+        if model is None and task is not None:
+            profile = get_model_selector().select(self.config.provider, task,
+                                                  prompt, **selection)
+            model = profile.model if profile is not None else None
+        return model or self.config.model, options
+
+    @property
+    def request_timeout(self) -> Optional[float]:
+        """Upper bound for a single provider request"""
+        return self.config.timeout if self.config.timeout is not None else default_timeout()
+
+    async def _send(self, send: Callable[[], Awaitable[Any]], label: str) -> Any:
+        """Send a provider request under the deadline, timeout, retries and circuit breaker"""
+        return await call_with_resilience(send, self.config.provider, label,
+                                          timeout=self.request_timeout,
+                                          retry=self.retry_policy)
+
+    async def _bounded_stream(self, stream: Any, label: str) -> AsyncIterator[Any]:
+        """Iterate a provider stream, giving up on a stalled chunk or the deadline"""
+        iterator = stream.__aiter__()
+        while True:
+            deadline = current_deadline()
+            limit = deadline.timeout(self.request_timeout) if deadline else self.request_timeout
+            try:
+                if limit is None:
+                    chunk = await iterator.__anext__()
+                else:
+                    chunk = await asyncio.wait_for(iterator.__anext__(), limit)
+            except StopAsyncIteration:
+                return
+            except asyncio.TimeoutError as e:
+                if deadline is not None and deadline.expired:
+                    raise DeadlineExceededError(f"{label}: deadline exceeded",
+                                                provider=self.config.provider) from e
+                raise LLMTimeoutError(f"{label}: stream stalled for {limit:.1f}s",
+                                      provider=self.config.provider,
+                                      retryable=True) from e
+            yield chunk
+
+    @property
+    def rate_limiter(self) -> ProviderRateLimiter:
+        """Process-wide limiter shared by every strategy of this provider"""
+        return get_rate_limiter(self.config.provider)
+
+    async def query_many(self, prompts: Sequence[str],
+                         options: Optional[Dict[str, Any]] = None,
+                         concurrency: int = 8,
+                         return_exceptions: bool = False,
+                         max_retries: int = 3) -> List[Any]:
+        """Run many prompts with bounded concurrency, results in input order
+
+        With ``return_exceptions`` a failed prompt yields its exception in
+        place of a result; otherwise the first failure cancels the batch.
+        """
+        results: List[Any] = [None] * len(prompts)
+        async for index, result in self.query_many_as_completed(
+            prompts, options, concurrency, return_exceptions, max_retries
+        ):
+            results[index] = result
+        return results
+
+    async def query_many_as_completed(self, prompts: Sequence[str],
+                                      options: Optional[Dict[str, Any]] = None,
+                                      concurrency: int = 8,
+                                      return_exceptions: bool = False,
+                                      max_retries: int = 3
+                                      ) -> AsyncIterator[Tuple[int, Any]]:
+        """Run many prompts, yielding ``(index, result)`` as each finishes"""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(index: int, prompt: str) -> Tuple[int, Any]:
+            async with semaphore:
+                try:
+                    return index, await self._query_rate_limited(
+                        prompt, options, max_retries)
+                except Exception as e:
+                    if return_exceptions:
+                        return index, e
+                    raise
+
+        tasks = [asyncio.ensure_future(run(i, p)) for i, p in enumerate(prompts)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _query_rate_limited(self, prompt: str,
+                                  options: Optional[Dict[str, Any]],
+                                  max_retries: int) -> str:
+        """Query through the provider limiter, backing off on HTTP 429"""
+        limiter = self.rate_limiter
+        tokens = estimate_tokens(prompt, options)
+        attempt = 0
+        while True:
+            waited = time.perf_counter()
+            await limiter.acquire(tokens)
+            record_queue_wait(self.config.provider, time.perf_counter() - waited)
+            try:
+                # The limiter is the only 429 retry layer for these calls
+                with caller_retries_rate_limits():
+                    return await self.query(prompt, options)
+            except Exception as e:
+                retry_after = rate_limit_retry_after(e, default=2.0 ** attempt)
+                if retry_after is None or attempt >= max_retries:
+                    raise
+                limiter.penalize(retry_after)
+                record_retry(self.config.provider)
+                attempt += 1
+
+
+class CachedLLMStrategy(LLMStrategy):
+    """Wraps any LLM strategy with a response cache
+
+    Web-search queries are cached under their own key space with the cache's
+    short ``web_search_ttl`` so time-sensitive answers expire quickly.
+    """
+
+    def __init__(self, strategy: LLMStrategy,
+                 cache: Optional[LLMResponseCache] = None):
+        super().__init__(strategy.config)
+        self.strategy = strategy
+        self.supports_json_schema = strategy.supports_json_schema
+        self.supports_web_search = strategy.supports_web_search
+        self.cache = cache if cache is not None else LLMResponseCache.from_env()
+
+    async def query(self, prompt: str,
+                   options: Optional[Dict[str, Any]] = None) -> str:
+        """Query through the cache"""
+        return await self._cached("query", self.strategy.query, prompt, options)
+
+    async def query_with_web_search(self, prompt: str,
+                                  options: Optional[Dict[str, Any]] = None) -> str:
+        """Web search query through the cache (short TTL)"""
+        return await self._cached("web_search", self.strategy.query_with_web_search,
+                                  prompt, options)
+
+    async def query_stream(self, prompt: str,
+                          options: Optional[Dict[str, Any]] = None
+                          ) -> AsyncIterator[str]:
+        """Stream from the cache on a hit, otherwise stream and store"""
+        key = make_cache_key(self.config.provider, self.config.model,
+                             prompt, options, kind="query")
+        cached = await self.cache.aget(key)
+        if cached is not None:
+            self._record_hit("stream")
+            yield cached
+            return
+
+        chunks = []
+        async for chunk in self.strategy.query_stream(prompt, options):
+            chunks.append(chunk)
+            yield chunk
+        await self.cache.aset(key, "".join(chunks), ttl=self.cache.ttl_for("query"))
+
+    async def query_json(self, prompt: str, schema: Dict[str, Any],
+                         name: str = "response",
+                         options: Optional[Dict[str, Any]] = None,
+                         attempts: int = 2) -> Any:
+        """Structured query through the cache; only valid replies are stored"""
+        options = self.structured_options(schema, name, options)
+        key = make_cache_key(self.config.provider, self.config.model, prompt,
+                             {**options, "schema": schema}, kind="json")
+        cached = await self.cache.aget(key)
+        if cached is not None:
+            self._record_hit("json")
+            return json.loads(cached)
+
+        value = await self.strategy.query_json(prompt, schema, name, options, attempts)
+        await self.cache.aset(key, json.dumps(value), ttl=self.cache.ttl_for("query"))
+        return value
+
+    def _record_hit(self, kind: str) -> None:
+        """Export a call answered from the cache"""
+        record_llm_call(self.config.provider, self.config.model, kind,
+                        wall_time=0.0, cache_hit=True)
+
+    async def _cached(self, kind: str, call, prompt: str,
+                      options: Optional[Dict[str, Any]]) -> str:
+        """Return a cached response or call through and store the result"""
+        key = make_cache_key(self.config.provider, self.config.model,
+                             prompt, options, kind=kind)
+        cached = await self.cache.aget(key)
+        if cached is not None:
+            self._record_hit(kind)
+            return cached
+
+        result = await call(prompt, options)
+        if result is not None:
+            await self.cache.aset(key, result, ttl=self.cache.ttl_for(kind))
+        return result
@@ -0,0 +1,242 @@
+"""
+LLM Response Cache
+File: python/llm/cache.py
+Purpose: Bounded in-memory LRU/TTL cache with an optional SQLite tier for LLM responses
+Related components: base.py (CachedLLMStrategy)
+Tags: llm, cache, lru, ttl, sqlite
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+from pydantic import BaseModel
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapse whitespace so trivially different prompts share a cache entry"""
+    return " ".join(prompt.split())
+
+
+def make_cache_key(provider: str, model: Optional[str], prompt: str,
+                   options: Optional[Dict[str, Any]] = None,
+                   kind: str = "query") -> str:
+    """Build a stable cache key from provider, model, prompt and options"""
+    payload = json.dumps(
+        {
+            "provider": provider,
+            "model": model,
+            "kind": kind,
+            "prompt": normalize_prompt(prompt),
+            "options": options or {},
+        },
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CacheStats(BaseModel):
+    """Counters describing cache effectiveness"""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    disk_hits: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class LLMResponseCache:
+    """LRU response cache with per-entry TTL and an optional SQLite tier
+
+    Lookups check memory first, then the SQLite file (if ``db_path`` is set).
+    Disk hits are promoted back into memory. Every entry carries its own
+    expiry, so web-search results can use a much shorter TTL than plain
+    completions. Async callers use ``aget`` / ``aset``, which run SQLite
+    reads and commits on a worker thread instead of the event loop.
+    """
+
+    def __init__(self, max_entries: int = 1024, default_ttl: float = 3600.0,
+                 web_search_ttl: float = 300.0, db_path: Optional[str] = None,
+                 clock: Callable[[], float] = time.time):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.web_search_ttl = web_search_ttl
+        self.db_path = db_path
+        self.stats = CacheStats()
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Guards the connection, so disk I/O never holds up memory lookups
+        self._db_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            self._open_db(db_path)
+
+    @classmethod
+    def from_env(cls) -> "LLMResponseCache":
+        """Build a cache from LLM_CACHE_* environment variables"""
+        return cls(
+            max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024")),
+            default_ttl=float(os.getenv("LLM_CACHE_TTL", "3600")),
+            web_search_ttl=float(os.getenv("LLM_CACHE_WEB_SEARCH_TTL", "300")),
+            db_path=os.getenv("LLM_CACHE_DB_PATH") or None
+        )
+
+    def _open_db(self, db_path: str) -> None:
+        """Open (and create if needed) the persistent tier"""
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    def ttl_for(self, kind: str) -> float:
+        """Return the TTL to use for a request kind"""
+        return self.web_search_ttl if kind == "web_search" else self.default_ttl
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a cached value, or None on miss/expiry"""
+        now = self._clock()
+        value = self._get_memory(key, now)
+        return value if value is not None else self._get_disk(key, now)
+
+    async def aget(self, key: str) -> Optional[str]:
+        """Like ``get``, reading the SQLite tier on a worker thread"""
+        now = self._clock()
+        value = self._get_memory(key, now)
+        if value is not None:
+            return value
+        if self._db is None:
+            return self._get_disk(key, now)
+        return await asyncio.to_thread(self._get_disk, key, now)
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        """Store a value with the given TTL (seconds)"""
+        expires_at = self._set_memory(key, value, ttl)
+        self._set_disk(key, value, expires_at)
+
+    async def aset(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        """Like ``set``, committing to the SQLite tier on a worker thread"""
+        expires_at = self._set_memory(key, value, ttl)
+        if self._db is not None:
+            await asyncio.to_thread(self._set_disk, key, value, expires_at)
+
+    def _get_memory(self, key: str, now: float) -> Optional[str]:
+        """Memory-tier lookup (counts hits, not misses)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return value
+            del self._entries[key]
+            self.stats.expirations += 1
+            return None
+
+    def _get_disk(self, key: str, now: float) -> Optional[str]:
+        """SQLite-tier lookup after a memory miss, promoting hits into memory"""
+        row = None
+        expired = False
+        with self._db_lock:
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[1] <= now:
+                    self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self._db.commit()
+                    expired = True
+        with self._lock:
+            if row is not None and not expired:
+                value, expires_at = row
+                self._store_in_memory(key, value, expires_at)
+                self.stats.hits += 1
+                self.stats.disk_hits += 1
+                return value
+            if expired:
+                self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+
+    def _set_memory(self, key: str, value: str, ttl: Optional[float]) -> float:
+        """Store in the memory tier and return the entry's expiry"""
+        expires_at = self._clock() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            self._store_in_memory(key, value, expires_at)
+        return expires_at
+
+    def _set_disk(self, key: str, value: str, expires_at: float) -> None:
+        with self._db_lock:
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) "
+                    "VALUES (?, ?, ?)",
+                    (key, value, expires_at)
+                )
+                self._db.commit()
+
+    def _store_in_memory(self, key: str, value: str, expires_at: float) -> None:
+        """Insert into the LRU, evicting the least recently used entries"""
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def purge_expired(self) -> int:
+        """Drop expired entries from both tiers, returning how many were removed"""
+        now = self._clock()
+        removed = 0
+        with self._lock:
+            for key in [k for k, (exp, _) in self._entries.items() if exp <= now]:
+                del self._entries[key]
+                removed += 1
+        with self._db_lock:
+            if self._db is not None:
+                cursor = self._db.execute(
+                    "DELETE FROM llm_cache WHERE expires_at <= ?", (now,)
+                )
+                self._db.commit()
+                removed += cursor.rowcount
+        self.stats.expirations += removed
+        return removed
+
+    def clear(self) -> None:
+        """Remove every entry from both tiers"""
+        with self._lock:
+            self._entries.clear()
+        with self._db_lock:
+            if self._db is not None:
+                self._db.execute("DELETE FROM llm_cache")
+                self._db.commit()
+
+    def close(self) -> None:
+        """Close the persistent tier"""
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
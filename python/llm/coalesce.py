@@ -0,0 +1,120 @@
+"""
+Single-flight request coalescing for LLM strategies
+File: python/llm/coalesce.py
+Purpose: Shares one upstream call between concurrent identical LLM requests
+Related components: base.py, cache.py (key construction)
+Tags: llm, coalescing, single-flight, deduplication
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+from pydantic import BaseModel
+from .base import LLMStrategy
+from .cache import make_cache_key
+
+
+class CoalesceStats(BaseModel):
+    """Counters describing how many calls were deduplicated"""
+    requests: int = 0
+    upstream_calls: int = 0
+    deduplicated: int = 0
+
+
+class SingleFlight:
+    """Runs at most one in-flight call per key
+
+    The upstream call runs as its own task so a cancelled caller does not
+    cancel it for the others; every caller receives the same result or the
+    same exception.
+    """
+
+    def __init__(self):
+        self.stats = CoalesceStats()
+        self._inflight: Dict[str, "asyncio.Task[Any]"] = {}
+
+    async def do(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Await the in-flight call for ``key``, starting it if needed"""
+        self.stats.requests += 1
+        task = self._inflight.get(key)
+        if task is None:
+            self.stats.upstream_calls += 1
+            task = asyncio.ensure_future(call())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+        else:
+            self.stats.deduplicated += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: "asyncio.Task[Any]") -> None:
+        """Forget a completed call and mark its exception as retrieved"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()
+
+    @property
+    def inflight(self) -> int:
+        """Number of distinct calls currently in flight"""
+        return len(self._inflight)
+
+
+# Process-wide group so separate workflow/strategy instances coalesce too
+_default_group = SingleFlight()
+
+
+def get_default_group() -> SingleFlight:
+    """Return the process-wide single-flight group"""
+    return _default_group
+
+
+class CoalescingLLMStrategy(LLMStrategy):
+    """Wraps an LLM strategy so concurrent identical requests share one call
+
+    Web-search queries are coalesced by default. Plain queries are opt-in
+    because sampled completions (temperature > 0) are not interchangeable
+    for every caller.
+    """
+
+    def __init__(self, strategy: LLMStrategy,
+                 group: Optional[SingleFlight] = None,
+                 coalesce_query: bool = False,
+                 coalesce_web_search: bool = True):
+        super().__init__(strategy.config)
+        self.strategy = strategy
+        self.supports_json_schema = strategy.supports_json_schema
+        self.supports_web_search = strategy.supports_web_search
+        self.group = group if group is not None else get_default_group()
+        self.coalesce_query = coalesce_query
+        self.coalesce_web_search = coalesce_web_search
+
+    @property
+    def stats(self) -> CoalesceStats:
+        """Deduplication counters of the underlying group"""
+        return self.group.stats
+
+    async def query(self, prompt: str,
+                   options: Optional[Dict[str, Any]] = None) -> str:
+        """Query, sharing identical in-flight calls when enabled"""
+        if not self.coalesce_query:
+            return await self.strategy.query(prompt, options)
+        key = make_cache_key(self.config.provider, self.config.model,
+                             prompt, options, kind="query")
+        return await self.group.do(key, lambda: self.strategy.query(prompt, options))
+
+    async def query_with_web_search(self, prompt: str,
+                                  options: Optional[Dict[str, Any]] = None) -> str:
+        """Web search query, sharing identical in-flight calls when enabled"""
+        if not self.coalesce_web_search:
+            return await self.strategy.query_with_web_search(prompt, options)
+        key = make_cache_key(self.config.provider, self.config.model,
+                             prompt, options, kind="web_search")
+        return await self.group.do(
+            key, lambda: self.strategy.query_with_web_search(prompt, options)
+        )
+
+    async def query_stream(self, prompt: str,
+                          options: Optional[Dict[str, Any]] = None
+                          ) -> AsyncIterator[str]:
+        """Streams are per-caller and pass straight through"""
+        async for chunk in self.strategy.query_stream(prompt, options):
+            yield chunk
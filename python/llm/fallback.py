@@ -0,0 +1,99 @@
+"""
+Provider fallback on open circuits
+File: python/llm/fallback.py
+Purpose: Serves a call from the next provider when the primary fails fast (circuit open) or exhausts its retries
+Related components: resilience.py, strategies.py (registered as "fallback"), base.py
+Tags: llm, fallback, circuit-breaker, failover
+"""
+
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Union
+from .base import LLMStrategy
+from .resilience import DeadlineExceededError, LLMError
+
+
+StrategySpec = Union[str, LLMStrategy]
+
+
+def should_fall_back(error: BaseException) -> bool:
+    """Whether another provider might serve a call that failed with ``error``
+
+    Open circuits, timeouts, 5xx and exhausted 429s qualify; bad requests
+    would fail anywhere and a passed deadline leaves no time to try.
+    """
+    return (isinstance(error, LLMError) and error.retryable
+            and not isinstance(error, DeadlineExceededError))
+
+
+class FallbackStrategy(LLMStrategy):
+    """Tries ``primary``, then each fallback in order, on degraded-provider errors
+
+    Fallbacks may be given as provider names; they are created through
+    LLMStrategyFactory the first time they are needed, so a healthy primary
+    never pays for a second client. Web searches only fail over to
+    providers whose ``supports_web_search`` is set: a plain completion
+    would pass off invented results as a search.
+    """
+
+    def __init__(self, primary: StrategySpec = "openai",
+                 fallbacks: Sequence[StrategySpec] = ("grok",)):
+        self._specs: List[StrategySpec] = [primary, *fallbacks]
+        self._created: Dict[int, LLMStrategy] = {}
+        first = self._strategy(0)
+        super().__init__(first.config)
+        self.supports_json_schema = first.supports_json_schema
+        self.supports_web_search = first.supports_web_search
+
+    def _strategy(self, index: int) -> LLMStrategy:
+        """Strategy at ``index``, creating it from its provider name if needed"""
+        spec = self._specs[index]
+        if isinstance(spec, LLMStrategy):
+            return spec
+        if index not in self._created:
+            from .strategies import LLMStrategyFactory
+            self._created[index] = LLMStrategyFactory.create(spec)
+        return self._created[index]
+
+    async def _first_available(self, method: str, *args: Any,
+                               web_search: bool = False) -> Any:
+        error: Optional[Exception] = None
+        for index in range(len(self._specs)):
+            strategy = self._strategy(index)
+            if web_search and not strategy.supports_web_search:
+                continue
+            try:
+                return await getattr(strategy, method)(*args)
+            except Exception as e:
+                if not should_fall_back(e):
+                    raise
+                error = e
+        if error is None:
+            raise LLMError("No configured provider supports web search",
+                           provider=self.config.provider)
+        raise error
+
+    async def query(self, prompt: str,
+                   options: Optional[Dict[str, Any]] = None) -> str:
+        """Query the first provider that can serve the call"""
+        return await self._first_available("query", prompt, options)
+
+    async def query_with_web_search(self, prompt: str,
+                                  options: Optional[Dict[str, Any]] = None) -> str:
+        """Web search on the first search-capable provider that can serve the call"""
+        return await self._first_available("query_with_web_search", prompt, options,
+                                           web_search=True)
+
+    async def query_stream(self, prompt: str,
+                          options: Optional[Dict[str, Any]] = None
+                          ) -> AsyncIterator[str]:
+        """Stream from the first provider; no fallback once tokens were yielded"""
+        for index in range(len(self._specs)):
+            started = False
+            try:
+                async for chunk in self._strategy(index).query_stream(prompt, options):
+                    started = True
+                    yield chunk
+                return
+            except Exception as e:
+                if (started or index == len(self._specs) - 1
+                        or not should_fall_back(e)):
+                    raise
@@ -6,31 +6,43 @@ Related components: base.py, strategies.py
 Tags: llm, strategy, grok
 """
 
-import os
-from typing import Dict, Any, Optional
-from groq import Groq
+import time
+from typing import Dict, Any, Optional, AsyncIterator
+import groq
+from groq import AsyncGroq
 from .base import LLMStrategy, LLMConfig
+from .resilience import as_llm_error
+from .http_pool import get_http_client
+from .secret_provider import get_secret
 
 
 class GrokStrategy(LLMStrategy):
     """Grok LLM strategy implementation"""
 
-    def __init__(self):
-        config = LLMConfig(
-            provider="grok",
-            api_key=os.getenv("GROK_API_KEY", ""),
-            model="grok-3-mini"
-        )
+    def __init__(self, config: LLMConfig = None):
+        if config is None:
+            config = LLMConfig(
+                provider="grok",
+                api_key=get_secret("GROK_API_KEY"),
+                model="grok-3-mini"
+            )
         super().__init__(config)
-        self.client = Groq(api_key=self.config.api_key)
+        self.client = AsyncGroq(
+            api_key=self.config.api_key,
+            http_client=get_http_client("grok", groq),
+            # Retries are governed by the strategy's RetryPolicy
+            max_retries=0
+        )
 
     async def query(self, prompt: str, 
                    options: Optional[Dict[str, Any]] = None) -> str:
         """Query Grok LLM with configurable options"""
+        started = time.perf_counter()
+        model, options = self._model_for(prompt, options)
         try:
             # Default parameters
             default_params = {
-                "model": self.config.model,
+                "model": model,
                 "messages": [{"role": "user", "content": prompt}],
                 "max_tokens": 1000,
                 "temperature": 0.7,
@@ -41,10 +53,50 @@ class GrokStrategy(LLMStrategy):
             if options:
                 default_params.update(options)
             
-            response = self.client.chat.completions.create(**default_params)
-            return response.choices[0].message.content
+            response = await self._send(
+                lambda: self.client.chat.completions.create(**default_params),
+                "Grok API error")
+            content = response.choices[0].message.content
+        except Exception as e:
+            self._record_call("query", started, prompt, error=True, model=model)
+            raise as_llm_error(e, self.config.provider, "Grok API error")
+        self._record_call("query", started, prompt, response.usage, content,
+                          model=model)
+        return content
+
+    async def query_stream(self, prompt: str,
+                          options: Optional[Dict[str, Any]] = None
+                          ) -> AsyncIterator[str]:
+        """Stream Grok completion tokens as they arrive"""
+        started = time.perf_counter()
+        model, options = self._model_for(prompt, options)
+        chunks, usage = [], None
+        try:
+            default_params = {
+                "model": model,
+                "messages": [{"role": "user", "content": prompt}],
+                "max_tokens": 1000,
+                "temperature": 0.7
+            }
+            if options:
+                default_params.update(options)
+            default_params["stream"] = True
+
+            stream = await self._send(
+                lambda: self.client.chat.completions.create(**default_params),
+                "Grok API error")
+            async for chunk in self._bounded_stream(stream, "Grok API error"):
+                # Groq reports stream usage on the final chunk's x_groq
+                usage = (getattr(getattr(chunk, "x_groq", None), "usage", None)
+                         or usage)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    chunks.append(chunk.choices[0].delta.content)
+                    yield chunk.choices[0].delta.content
         except Exception as e:
-            raise Exception(f"Grok API error: {str(e)}")
+            self._record_call("stream", started, prompt, error=True, model=model)
+            raise as_llm_error(e, self.config.provider, "Grok API error")
+        self._record_call("stream", started, prompt, usage, "".join(chunks),
+                          model=model)
 
     async def query_with_web_search(self, prompt: str, 
                                   options: Optional[Dict[str, Any]] = None) -> str:
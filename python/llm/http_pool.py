@@ -0,0 +1,89 @@
+"""
+Shared HTTP connection pools for LLM providers
+File: python/llm/http_pool.py
+Purpose: Provides one process-wide keep-alive async HTTP client per provider
+Related components: openai_strategy.py, grok_strategy.py, main.py
+Tags: llm, http, connection-pool, async
+"""
+
+import importlib.util
+import os
+import threading
+from types import ModuleType
+from typing import Any, Dict
+from pydantic import BaseModel
+
+
+# HTTP/2 is only negotiated when the optional ``h2`` package is installed
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class HTTPPoolConfig(BaseModel):
+    """Connection pool settings for a provider's shared HTTP client"""
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = True
+
+    @classmethod
+    def from_env(cls) -> "HTTPPoolConfig":
+        """Build pool settings from LLM_HTTP_* environment variables"""
+        return cls(
+            max_connections=int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(
+                os.getenv("LLM_HTTP_MAX_KEEPALIVE", "20")
+            ),
+            keepalive_expiry=float(
+                os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "30")
+            ),
+            http2=os.getenv("LLM_HTTP2", "true").lower() in ("1", "true", "yes")
+        )
+
+
+_clients: Dict[str, Any] = {}
+_configs: Dict[str, HTTPPoolConfig] = {}
+_lock = threading.Lock()
+
+
+def configure_http_pool(provider: str, config: HTTPPoolConfig) -> None:
+    """Set pool settings for a provider (applies to clients created later)"""
+    with _lock:
+        _configs[provider] = config
+
+
+def get_http_client(provider: str, sdk: ModuleType) -> Any:
+    """Return the shared async HTTP client for a provider, creating it once
+
+    ``sdk`` is the provider SDK module (``openai``, ``groq``). The client is
+    built from the SDK's own ``DefaultAsyncHttpxClient`` so it carries the
+    SDK's default timeouts and matches the httpx version the SDK expects.
+    """
+    client = _clients.get(provider)
+    if client is not None:
+        return client
+
+    with _lock:
+        client = _clients.get(provider)
+        if client is None:
+            config = _configs.get(provider) or HTTPPoolConfig.from_env()
+            limits_class = type(sdk.DEFAULT_CONNECTION_LIMITS)
+            limits = limits_class(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry
+            )
+            client = sdk.DefaultAsyncHttpxClient(
+                limits=limits,
+                http2=config.http2 and HTTP2_AVAILABLE
+            )
+            _clients[provider] = client
+        return client
+
+
+async def aclose_http_clients() -> None:
+    """Close every shared client (call on application shutdown)"""
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        await client.aclose()
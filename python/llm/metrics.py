@@ -0,0 +1,324 @@
+"""
+LLM and workflow instrumentation
+File: python/llm/metrics.py
+Purpose: Prometheus-format counters/histograms plus per-run usage collection for LLM calls and workflow nodes
+Related components: base.py, openai_strategy.py, grok_strategy.py, workflows/bitcoin_news.py, main.py (/metrics)
+Tags: llm, metrics, prometheus, latency, tokens, cost
+"""
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from pydantic import BaseModel
+
+
+# USD per million (prompt, completion) tokens; unknown models cost 0
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "grok-3": (3.00, 15.00),
+    "grok-3-mini": (0.30, 0.50),
+}
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def estimate_cost(model: Optional[str], prompt_tokens: int,
+                  completion_tokens: int) -> float:
+    """Estimated USD cost of a call from the MODEL_PRICES table"""
+    prompt_price, completion_price = MODEL_PRICES.get(model or "", (0.0, 0.0))
+    return (prompt_tokens * prompt_price
+            + completion_tokens * completion_price) / 1_000_000
+
+
+def usage_tokens(usage: Any, prompt: str = "",
+                 completion: str = "") -> Tuple[int, int]:
+    """(prompt, completion) tokens from a provider usage object
+
+    Understands chat-completions (prompt/completion_tokens) and responses
+    API (input/output_tokens) usage; falls back to ~4 characters per token
+    when the provider reported nothing (e.g. streamed responses).
+    """
+    prompt_tokens = (getattr(usage, "prompt_tokens", None)
+                     or getattr(usage, "input_tokens", None))
+    completion_tokens = (getattr(usage, "completion_tokens", None)
+                         or getattr(usage, "output_tokens", None))
+    if not isinstance(prompt_tokens, int):
+        prompt_tokens = len(prompt) // 4
+    if not isinstance(completion_tokens, int):
+        completion_tokens = len(completion or "") // 4
+    return prompt_tokens, completion_tokens
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str],
+                   extra: str = "") -> str:
+    """Render a Prometheus label set"""
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Counter:
+    """Monotonic counter with labels"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str,
+                 labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Add ``amount`` to the series identified by ``labels``"""
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        """Current value of one series"""
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        return self._values.get(key, 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_format_labels(self.labelnames, key)} {value}"
+                    for key, value in sorted(self._values.items())]
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str,
+                 labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per series: [bucket counts..., sum, count]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record one observation"""
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with self._lock:
+            series = self._series.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, **labels: str) -> int:
+        """Number of observations in one series"""
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        series = self._series.get(key)
+        return int(series[-1]) if series else 0
+
+    def samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                for bound, count in zip(self.buckets, series):
+                    labels = _format_labels(self.labelnames, key, f'le="{bound}"')
+                    lines.append(f"{self.name}_bucket{labels} {count}")
+                labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{labels} {series[-1]}")
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {series[-2]}")
+                lines.append(f"{self.name}_count{labels} {series[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics rendered together in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str,
+                labelnames: Sequence[str] = ()) -> Counter:
+        """Return the counter ``name``, creating it on first use"""
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str,
+                  labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Return the histogram ``name``, creating it on first use"""
+        return self._get_or_create(Histogram, name, documentation, labelnames,
+                                   buckets=buckets)
+
+    def _get_or_create(self, cls, name, documentation, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, documentation, labelnames, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric '{name}' already registered as {metric.kind}")
+            return metric
+
+    def render(self) -> str:
+        """Prometheus text exposition (format 0.0.4)"""
+        lines = []
+        for name, metric in sorted(self._metrics.items()):
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+_registry = MetricsRegistry()
+
+
+def get_registry() -> MetricsRegistry:
+    """Process-wide registry exported by the /metrics endpoint"""
+    return _registry
+
+
+def _llm_calls() -> Histogram:
+    return _registry.histogram("llm_request_duration_seconds",
+                               "LLM call wall time",
+                               ("provider", "model", "kind"))
+
+
+def _llm_requests() -> Counter:
+    return _registry.counter("llm_requests_total",
+                             "LLM calls by outcome (ok, error, cache_hit)",
+                             ("provider", "model", "kind", "status"))
+
+
+def _llm_tokens() -> Counter:
+    return _registry.counter("llm_tokens_total", "LLM tokens by type",
+                             ("provider", "model", "type"))
+
+
+def _llm_cost() -> Counter:
+    return _registry.counter("llm_cost_usd_total", "Estimated LLM spend in USD",
+                             ("provider", "model"))
+
+
+class UsageStats(BaseModel):
+    """Latency, token and spend totals for a node or a whole run"""
+    wall_time: float = 0.0
+    llm_time: float = 0.0
+    queue_wait: float = 0.0
+    llm_calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost: float = 0.0
+    retries: int = 0
+    cache_hits: int = 0
+
+    def merge(self, other: "UsageStats") -> "UsageStats":
+        """Field-wise sum of two stats"""
+        return UsageStats(**{name: getattr(self, name) + getattr(other, name)
+                             for name in UsageStats.model_fields})
+
+
+_current_usage: ContextVar[Optional[UsageStats]] = ContextVar(
+    "llm_current_usage", default=None
+)
+
+
+@contextmanager
+def collect_usage() -> Iterator[UsageStats]:
+    """Attribute LLM calls made inside the block to a fresh UsageStats
+
+    Collectors nest: on exit the inner totals are added to the outer one.
+    """
+    usage = UsageStats()
+    outer = _current_usage.get()
+    token = _current_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _current_usage.reset(token)
+        if outer is not None:
+            for name in UsageStats.model_fields:
+                setattr(outer, name, getattr(outer, name) + getattr(usage, name))
+
+
+def record_llm_call(provider: str, model: Optional[str], kind: str,
+                    wall_time: float, prompt_tokens: int = 0,
+                    completion_tokens: int = 0, error: bool = False,
+                    cache_hit: bool = False) -> None:
+    """Export one LLM call and add it to the active collector"""
+    model = model or ""
+    status = "cache_hit" if cache_hit else ("error" if error else "ok")
+    cost = estimate_cost(model, prompt_tokens, completion_tokens)
+
+    _llm_requests().inc(provider=provider, model=model, kind=kind, status=status)
+    if not cache_hit:
+        _llm_calls().observe(wall_time, provider=provider, model=model, kind=kind)
+    if prompt_tokens or completion_tokens:
+        _llm_tokens().inc(prompt_tokens, provider=provider, model=model, type="prompt")
+        _llm_tokens().inc(completion_tokens, provider=provider, model=model,
+                          type="completion")
+        _llm_cost().inc(cost, provider=provider, model=model)
+
+    usage = _current_usage.get()
+    if usage is not None:
+        usage.llm_calls += 1
+        usage.llm_time += wall_time
+        usage.prompt_tokens += prompt_tokens
+        usage.completion_tokens += completion_tokens
+        usage.cost += cost
+        usage.cache_hits += int(cache_hit)
+
+
+def record_queue_wait(provider: str, seconds: float) -> None:
+    """Export time spent waiting for a provider rate limiter"""
+    _registry.histogram("llm_queue_wait_seconds",
+                        "Time LLM calls waited for the provider rate limiter",
+                        ("provider",)).observe(seconds, provider=provider)
+    usage = _current_usage.get()
+    if usage is not None:
+        usage.queue_wait += seconds
+
+
+def record_retry(provider: str) -> None:
+    """Export one retried LLM call"""
+    _registry.counter("llm_retries_total", "Retried LLM calls",
+                      ("provider",)).inc(provider=provider)
+    usage = _current_usage.get()
+    if usage is not None:
+        usage.retries += 1
+
+
+def record_node(workflow: str, node: str, usage: UsageStats,
+                error: bool = False) -> None:
+    """Export one workflow node execution"""
+    _registry.counter("workflow_node_runs_total", "Workflow node executions",
+                      ("workflow", "node", "status")).inc(
+        workflow=workflow, node=node, status="error" if error else "ok")
+    _registry.histogram("workflow_node_duration_seconds", "Workflow node wall time",
+                        ("workflow", "node")).observe(
+        usage.wall_time, workflow=workflow, node=node)
+    _registry.histogram("workflow_node_queue_wait_seconds",
+                        "Time a workflow node spent queued or rate limited",
+                        ("workflow", "node")).observe(
+        usage.queue_wait, workflow=workflow, node=node)
+    _registry.counter("workflow_node_cost_usd_total",
+                      "Estimated LLM spend per workflow node in USD",
+                      ("workflow", "node")).inc(usage.cost, workflow=workflow, node=node)
+    tokens = _registry.counter("workflow_node_tokens_total",
+                               "LLM tokens per workflow node",
+                               ("workflow", "node", "type"))
+    tokens.inc(usage.prompt_tokens, workflow=workflow, node=node, type="prompt")
+    tokens.inc(usage.completion_tokens, workflow=workflow, node=node, type="completion")
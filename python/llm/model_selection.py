@@ -0,0 +1,213 @@
+"""
+Task-aware model selection
+File: python/llm/model_selection.py
+Purpose: Picks a model per call from the task type (search, summarize, classify), latency/cost budgets and observed performance
+Related components: base.py (_model_for), openai_strategy.py, grok_strategy.py, metrics.py (MODEL_PRICES), backend_stats.py (BackendStats), src/llm/model-selection.ts
+Tags: llm, model-selection, cost, latency, tiers
+"""
+
+import os
+import threading
+import time
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
+from pydantic import BaseModel
+from .backend_stats import BackendStats
+from .metrics import MODEL_PRICES, estimate_cost, get_registry
+
+
+class TaskType(str, Enum):
+    """Kinds of LLM work the workflows issue"""
+    SEARCH = "search"
+    SUMMARIZE = "summarize"
+    CLASSIFY = "classify"
+
+
+class ModelTier(str, Enum):
+    """Relative capability (and price) of a model"""
+    BUDGET = "budget"
+    STANDARD = "standard"
+    PREMIUM = "premium"
+
+
+TIER_ORDER = [ModelTier.BUDGET, ModelTier.STANDARD, ModelTier.PREMIUM]
+
+
+class ModelProfile(BaseModel):
+    """A selectable model and what is known about it up front"""
+    provider: str
+    model: str
+    tier: ModelTier
+    # Prior latency estimate (seconds) until enough calls have been observed
+    typical_latency: float
+    web_search: bool = False
+
+
+MODEL_CATALOG: List[ModelProfile] = [
+    ModelProfile(provider="openai", model="gpt-4o", tier=ModelTier.PREMIUM,
+                 typical_latency=2.0, web_search=True),
+    ModelProfile(provider="openai", model="gpt-4o-mini", tier=ModelTier.BUDGET,
+                 typical_latency=1.0, web_search=True),
+    ModelProfile(provider="grok", model="grok-3", tier=ModelTier.PREMIUM,
+                 typical_latency=1.5),
+    ModelProfile(provider="grok", model="grok-3-mini", tier=ModelTier.BUDGET,
+                 typical_latency=0.8),
+]
+
+
+class TaskPolicy(BaseModel):
+    """Preferred tier and budgets for one task type"""
+    tier: ModelTier
+    # Expected completion size, used to estimate cost against the budget
+    completion_tokens: int
+    max_latency: Optional[float] = None
+    max_cost: Optional[float] = None
+    needs_web_search: bool = False
+
+
+# Sentiment labels are trivial; summaries are short; search answers are the
+# input to everything else, so they get the strongest model
+DEFAULT_POLICIES: Dict[TaskType, TaskPolicy] = {
+    TaskType.SEARCH: TaskPolicy(tier=ModelTier.PREMIUM, completion_tokens=800,
+                                needs_web_search=True),
+    TaskType.SUMMARIZE: TaskPolicy(tier=ModelTier.BUDGET, completion_tokens=300),
+    TaskType.CLASSIFY: TaskPolicy(tier=ModelTier.BUDGET, completion_tokens=100,
+                                  max_latency=3.0),
+}
+
+# Option keys consumed by selection and never sent to the provider
+SELECTION_OPTIONS = ("task", "tier", "max_latency", "max_cost")
+
+
+class ModelSelector:
+    """Chooses a model per call and learns from observed latency and errors
+
+    Candidates are the provider's catalog models able to do the task. Those
+    within the latency and cost budgets (and not failing) are preferred,
+    nearest the policy's tier first, cheaper before pricier. When none fit,
+    the fastest healthy candidate is used. Latency is the observed EWMA once
+    ``min_samples`` calls have completed, the catalog prior before that.
+    """
+
+    def __init__(self, catalog: Optional[List[ModelProfile]] = None,
+                 policies: Optional[Dict[TaskType, TaskPolicy]] = None,
+                 min_samples: int = 5, error_threshold: float = 0.5,
+                 recovery_after: float = 30.0, enabled: bool = True):
+        self.catalog = catalog if catalog is not None else list(MODEL_CATALOG)
+        self.policies = dict(DEFAULT_POLICIES)
+        self.policies.update(policies or {})
+        self.min_samples = min_samples
+        self.error_threshold = error_threshold
+        self.recovery_after = recovery_after
+        self.enabled = enabled
+        self._stats: Dict[str, BackendStats] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "ModelSelector":
+        """Build a selector from LLM_MODEL_SELECTION and LLM_TASK_TIERS
+
+        ``LLM_TASK_TIERS`` overrides tiers, e.g. ``classify=budget,search=standard``.
+        """
+        policies = {}
+        for entry in filter(None, os.getenv("LLM_TASK_TIERS", "").split(",")):
+            task, _, tier = entry.partition("=")
+            task_type = TaskType(task.strip())
+            policies[task_type] = DEFAULT_POLICIES[task_type].model_copy(
+                update={"tier": ModelTier(tier.strip())})
+        return cls(
+            policies=policies,
+            enabled=os.getenv("LLM_MODEL_SELECTION", "true").lower() in ("1", "true", "yes")
+        )
+
+    def stats(self, model: str) -> BackendStats:
+        with self._lock:
+            return self._stats.setdefault(model, BackendStats())
+
+    def observe(self, model: Optional[str], latency: float, error: bool = False) -> None:
+        """Feed one finished call into the model's latency/error statistics"""
+        if not model:
+            return
+        stats = self.stats(model)
+        if error:
+            stats.record_failure()
+        else:
+            stats.record_success(latency)
+
+    def is_healthy(self, profile: ModelProfile) -> bool:
+        """Healthy unless failing often and recently (then retried after recovery_after)"""
+        stats = self.stats(profile.model)
+        return (stats.error_rate < self.error_threshold or stats.last_failure is None
+                or time.monotonic() - stats.last_failure >= self.recovery_after)
+
+    def expected_latency(self, profile: ModelProfile) -> float:
+        stats = self.stats(profile.model)
+        if stats.sample_count >= self.min_samples and stats.ewma_latency is not None:
+            return stats.ewma_latency
+        return profile.typical_latency
+
+    def select(self, provider: str, task: TaskType, prompt: str = "",
+               tier: Optional[ModelTier] = None, max_latency: Optional[float] = None,
+               max_cost: Optional[float] = None) -> Optional[ModelProfile]:
+        """Model for ``task`` on ``provider`` (None if the catalog has no candidate)"""
+        if not self.enabled:
+            return None
+        task = TaskType(task)
+        policy = self.policies[task]
+        tier = ModelTier(tier) if tier is not None else policy.tier
+        max_latency = max_latency if max_latency is not None else policy.max_latency
+        max_cost = max_cost if max_cost is not None else policy.max_cost
+
+        candidates = [p for p in self.catalog if p.provider == provider
+                      and (p.web_search or not policy.needs_web_search)]
+        if not candidates:
+            return None
+
+        prompt_tokens = max(1, len(prompt) // 4)
+        wanted = TIER_ORDER.index(tier)
+
+        def fits(profile: ModelProfile) -> bool:
+            if not self.is_healthy(profile):
+                return False
+            if max_latency is not None and self.expected_latency(profile) > max_latency:
+                return False
+            cost = estimate_cost(profile.model, prompt_tokens, policy.completion_tokens)
+            return max_cost is None or cost <= max_cost
+
+        def preference(profile: ModelProfile) -> Tuple[Any, ...]:
+            distance = TIER_ORDER.index(profile.tier) - wanted
+            # Same tier, then cheaper tiers, then pricier ones
+            return (abs(distance), distance > 0,
+                    sum(MODEL_PRICES.get(profile.model, (0.0, 0.0))))
+
+        feasible = sorted(filter(fits, candidates), key=preference)
+        if feasible:
+            chosen = feasible[0]
+        else:
+            chosen = min(candidates, key=lambda p: (not self.is_healthy(p),
+                                                    self.expected_latency(p)))
+        get_registry().counter(
+            "llm_model_selections_total", "Models chosen by task-aware selection",
+            ("task", "model")).inc(task=task.value, model=chosen.model)
+        return chosen
+
+
+_selector: Optional[ModelSelector] = None
+_selector_lock = threading.Lock()
+
+
+def get_model_selector() -> ModelSelector:
+    """Process-wide selector shared by every strategy"""
+    global _selector
+    if _selector is None:
+        with _selector_lock:
+            if _selector is None:
+                _selector = ModelSelector.from_env()
+    return _selector
+
+
+def configure_model_selector(selector: Optional[ModelSelector]) -> None:
+    """Replace the process-wide selector (None rebuilds it from the environment)"""
+    global _selector
+    with _selector_lock:
+        _selector = selector
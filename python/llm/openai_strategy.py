@@ -6,32 +6,46 @@ Related components: base.py, strategies.py
 Tags: llm, strategy, openai, web-search
 """
 
-import os
-from typing import Dict, Any, Optional
-from openai import OpenAI
+import time
+from typing import Dict, Any, Optional, AsyncIterator
+import openai
+from openai import AsyncOpenAI
 from .base import LLMStrategy, LLMConfig
+from .resilience import as_llm_error
+from .http_pool import get_http_client
+from .secret_provider import get_secret
 
 
 class OpenAIStrategy(LLMStrategy):
     """OpenAI LLM strategy with web search capability"""
 
+    supports_json_schema = True
+    supports_web_search = True
+
     def __init__(self, config: LLMConfig = None):
         if config is None:
             config = LLMConfig(
                 provider="openai",
-                api_key=os.getenv("OPENAI_API_KEY", ""),
+                api_key=get_secret("OPENAI_API_KEY"),
                 model="gpt-4o"
             )
         super().__init__(config)
-        self.client = OpenAI(api_key=self.config.api_key)
+        self.client = AsyncOpenAI(
+            api_key=self.config.api_key,
+            http_client=get_http_client("openai", openai),
+            # Retries are governed by the strategy's RetryPolicy
+            max_retries=0
+        )
 
     async def query(self, prompt: str, 
                    options: Optional[Dict[str, Any]] = None) -> str:
         """Query OpenAI without web search"""
+        started = time.perf_counter()
+        model, options = self._model_for(prompt, options)
         try:
             # Default parameters
             default_params = {
-                "model": self.config.model,
+                "model": model,
                 "messages": [{"role": "user", "content": prompt}]
             }
             
@@ -39,18 +53,56 @@ class OpenAIStrategy(LLMStrategy):
             if options:
                 default_params.update(options)
             
-            response = self.client.chat.completions.create(**default_params)
-            return response.choices[0].message.content
+            response = await self._send(
+                lambda: self.client.chat.completions.create(**default_params),
+                "OpenAI API error")
+            content = response.choices[0].message.content
+        except Exception as e:
+            self._record_call("query", started, prompt, error=True, model=model)
+            raise as_llm_error(e, self.config.provider, "OpenAI API error")
+        self._record_call("query", started, prompt, response.usage, content,
+                          model=model)
+        return content
+
+    async def query_stream(self, prompt: str,
+                          options: Optional[Dict[str, Any]] = None
+                          ) -> AsyncIterator[str]:
+        """Stream OpenAI completion tokens as they arrive"""
+        started = time.perf_counter()
+        model, options = self._model_for(prompt, options)
+        chunks, usage = [], None
+        try:
+            default_params = {
+                "model": model,
+                "messages": [{"role": "user", "content": prompt}]
+            }
+            if options:
+                default_params.update(options)
+            default_params["stream"] = True
+
+            stream = await self._send(
+                lambda: self.client.chat.completions.create(**default_params),
+                "OpenAI API error")
+            async for chunk in self._bounded_stream(stream, "OpenAI API error"):
+                usage = getattr(chunk, "usage", None) or usage
+                if chunk.choices and chunk.choices[0].delta.content:
+                    chunks.append(chunk.choices[0].delta.content)
+                    yield chunk.choices[0].delta.content
         except Exception as e:
-            raise Exception(f"OpenAI API error: {e}")
+            self._record_call("stream", started, prompt, error=True, model=model)
+            raise as_llm_error(e, self.config.provider, "OpenAI API error")
+        self._record_call("stream", started, prompt, usage, "".join(chunks),
+                          model=model)
 
     async def query_with_web_search(self, prompt: str, 
                                   options: Optional[Dict[str, Any]] = None) -> str:
         """Query OpenAI with web search capability"""
+        started = time.perf_counter()
+        model, options = self._model_for(prompt, options, task="search")
         try:
             # Default parameters for web search
             default_params = {
-                "model": "gpt-4o",
+                "model": model,
                 "tools": [{"type": "web_search_preview"}],
                 "input": prompt
             }
@@ -59,7 +111,13 @@ class OpenAIStrategy(LLMStrategy):
             if options:
                 default_params.update(options)
             
-            response = self.client.responses.create(**default_params)
-            return response.output_text
+            response = await self._send(
+                lambda: self.client.responses.create(**default_params),
+                "OpenAI API error")
+            content = response.output_text
         except Exception as e:
-            raise Exception(f"OpenAI API error: {e}") 
\ No newline at end of file
+            self._record_call("web_search", started, prompt, error=True, model=model)
+            raise as_llm_error(e, self.config.provider, "OpenAI API error")
+        self._record_call("web_search", started, prompt, response.usage, content,
+                          model=model)
+        return content 
\ No newline at end of file
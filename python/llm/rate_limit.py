@@ -0,0 +1,161 @@
+"""
+Provider-aware rate limiting for LLM strategies
+File: python/llm/rate_limit.py
+Purpose: Token-bucket limiter tracking requests and estimated tokens per provider
+Related components: base.py (query_many), strategies.py
+Tags: llm, rate-limit, token-bucket, backoff
+"""
+
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+def estimate_tokens(prompt: str, options: Optional[Dict[str, Any]] = None) -> int:
+    """Rough token estimate for a request (prompt plus completion budget)
+
+    Uses the common ~4 characters per token heuristic for the prompt and the
+    requested ``max_tokens`` (or a conservative default) for the completion.
+    """
+    completion = (options or {}).get("max_tokens") or 500
+    return max(1, len(prompt) // 4) + int(completion)
+
+
+def rate_limit_retry_after(error: BaseException,
+                           default: float = 1.0) -> Optional[float]:
+    """Return the back-off delay if ``error`` (or its cause) is an HTTP 429
+
+    Strategies re-wrap SDK errors, so the original exception is found by
+    walking ``__cause__``/``__context__``. Returns None for other errors.
+    """
+    seen = set()
+    current: Optional[BaseException] = error
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        if getattr(current, "status_code", None) == 429:
+            response = getattr(current, "response", None)
+            headers = getattr(response, "headers", None) or {}
+            retry_after = headers.get("retry-after")
+            try:
+                return float(retry_after) if retry_after is not None else default
+            except ValueError:
+                return default
+        current = current.__cause__ or current.__context__
+    return None
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at ``rate`` per second"""
+
+    def __init__(self, rate: float, capacity: float,
+                 clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity,
+                           self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` tokens are available (0 if available now)"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self._tokens >= amount:
+            return 0.0
+        return (amount - self._tokens) / self.rate
+
+    def consume(self, amount: float) -> None:
+        """Take tokens from the bucket (call after wait_time returned 0)"""
+        self._tokens -= min(amount, self.capacity)
+
+
+class ProviderRateLimiter:
+    """Requests-per-minute and tokens-per-minute limiter for one provider
+
+    Waiters are served in FIFO order. A 429 from the provider pauses every
+    caller sharing the limiter until the Retry-After delay has passed.
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._clock = clock
+        self._requests = (TokenBucket(requests_per_minute / 60.0,
+                                      requests_per_minute, clock)
+                          if requests_per_minute else None)
+        self._tokens = (TokenBucket(tokens_per_minute / 60.0,
+                                    tokens_per_minute, clock)
+                        if tokens_per_minute else None)
+        self._blocked_until = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def acquire(self, tokens: int = 1) -> None:
+        """Wait until one request of ``tokens`` estimated tokens may proceed"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                wait = self._blocked_until - self._clock()
+                if self._requests is not None:
+                    wait = max(wait, self._requests.wait_time(1))
+                if self._tokens is not None:
+                    wait = max(wait, self._tokens.wait_time(tokens))
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+
+            if self._requests is not None:
+                self._requests.consume(1)
+            if self._tokens is not None:
+                self._tokens.consume(tokens)
+
+    def penalize(self, retry_after: float) -> None:
+        """Block all callers for ``retry_after`` seconds (after a 429)"""
+        self._blocked_until = max(self._blocked_until,
+                                  self._clock() + retry_after)
+
+
+_limiters: Dict[str, ProviderRateLimiter] = {}
+_registry_lock = threading.Lock()
+
+
+def _limiter_from_env(provider: str) -> ProviderRateLimiter:
+    """Build a limiter from LLM_RATE_LIMIT_<PROVIDER>_RPM/TPM variables"""
+    prefix = f"LLM_RATE_LIMIT_{provider.upper()}"
+    rpm = os.getenv(f"{prefix}_RPM")
+    tpm = os.getenv(f"{prefix}_TPM")
+    return ProviderRateLimiter(
+        requests_per_minute=float(rpm) if rpm else None,
+        tokens_per_minute=float(tpm) if tpm else None
+    )
+
+
+def get_rate_limiter(provider: str) -> ProviderRateLimiter:
+    """Return the process-wide limiter for a provider"""
+    limiter = _limiters.get(provider)
+    if limiter is None:
+        with _registry_lock:
+            limiter = _limiters.get(provider)
+            if limiter is None:
+                limiter = _limiter_from_env(provider)
+                _limiters[provider] = limiter
+    return limiter
+
+
+def configure_rate_limit(provider: str,
+                         requests_per_minute: Optional[float] = None,
+                         tokens_per_minute: Optional[float] = None) -> ProviderRateLimiter:
+    """Replace a provider's limiter with explicit RPM/TPM limits"""
+    limiter = ProviderRateLimiter(requests_per_minute, tokens_per_minute)
+    with _registry_lock:
+        _limiters[provider] = limiter
+    return limiter
@@ -0,0 +1,364 @@
+"""
+Deadlines, retries and circuit breakers for LLM provider calls
+File: python/llm/resilience.py
+Purpose: Bounds every provider request by a per-call timeout and the caller's deadline, retries only retryable errors with jittered backoff, and fails fast while a provider is degraded
+Related components: base.py (_send), openai_strategy.py, grok_strategy.py, fallback.py, workflows/bitcoin_news.py
+Tags: llm, timeout, deadline, retry, backoff, circuit-breaker
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional
+from pydantic import BaseModel
+from .metrics import get_registry, record_retry
+from .rate_limit import rate_limit_retry_after
+
+
+class LLMError(Exception):
+    """Provider call failure with retry classification"""
+
+    def __init__(self, message: str, provider: str = "",
+                 retryable: bool = False, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.provider = provider
+        self.retryable = retryable
+        self.status_code = status_code
+
+
+class LLMTimeoutError(LLMError):
+    """A single request exceeded its per-call timeout"""
+
+
+class DeadlineExceededError(LLMError):
+    """The caller's end-to-end deadline has passed"""
+
+
+class CircuitOpenError(LLMError):
+    """The provider's circuit breaker is open; the call was not attempted"""
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    """HTTP status of ``error`` or anything in its cause chain"""
+    seen = set()
+    current: Optional[BaseException] = error
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        status = getattr(current, "status_code", None)
+        if isinstance(status, int):
+            return status
+        current = current.__cause__ or current.__context__
+    return None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether retrying ``error`` could succeed
+
+    Timeouts, connection failures, 408/409/429 and 5xx are retryable;
+    other 4xx (bad request, auth, not found) and unknown errors are not.
+    """
+    if isinstance(error, LLMError):
+        return error.retryable
+    status = _status_code(error)
+    if status is not None:
+        return status in (408, 409, 429) or status >= 500
+    # SDK timeout/connection errors carry no status (APITimeoutError,
+    # APIConnectionError, httpx.ConnectError, ...)
+    return isinstance(error, (TimeoutError, ConnectionError)) or any(
+        word in cls.__name__ for cls in type(error).__mro__
+        for word in ("Timeout", "Connection"))
+
+
+def as_llm_error(error: BaseException, provider: str, label: str) -> LLMError:
+    """``error`` itself if already classified, else wrapped as ``label: error``"""
+    if isinstance(error, LLMError):
+        return error
+    wrapped = LLMError(f"{label}: {error}", provider=provider,
+                       retryable=is_retryable(error), status_code=_status_code(error))
+    wrapped.__cause__ = error
+    return wrapped
+
+
+class Deadline:
+    """Absolute point in time by which work must finish"""
+
+    def __init__(self, seconds: float, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self.at = clock() + seconds
+
+    def remaining(self) -> float:
+        """Seconds left (never negative)"""
+        return max(0.0, self.at - self._clock())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+    def timeout(self, cap: Optional[float] = None) -> float:
+        """Time allowed for the next step: the remaining budget, capped"""
+        remaining = self.remaining()
+        return remaining if cap is None else min(remaining, cap)
+
+
+_deadline: ContextVar[Optional[Deadline]] = ContextVar("llm_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Deadline of the enclosing ``deadline_scope`` (None if unbounded)"""
+    return _deadline.get()
+
+
+def resolve_deadline(seconds: Optional[float]) -> Optional[Deadline]:
+    """Deadline ``seconds`` from now, never later than the current one
+
+    ``None`` returns the current deadline unchanged.
+    """
+    outer = _deadline.get()
+    if seconds is None:
+        return outer
+    deadline = Deadline(seconds)
+    return outer if outer is not None and outer.at < deadline.at else deadline
+
+
+@contextmanager
+def bind_deadline(deadline: Optional[Deadline]) -> Iterator[Optional[Deadline]]:
+    """Make ``deadline`` current for the block (and tasks it starts)"""
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[Optional[Deadline]]:
+    """Bound all LLM calls made inside the block (and tasks it starts)
+
+    Scopes nest; an inner scope can only shorten the outer deadline.
+    ``None`` keeps the outer deadline unchanged.
+    """
+    with bind_deadline(resolve_deadline(seconds)) as deadline:
+        yield deadline
+
+
+_caller_retries_429: ContextVar[bool] = ContextVar("llm_caller_retries_429", default=False)
+
+
+@contextmanager
+def caller_retries_rate_limits() -> Iterator[None]:
+    """Leave HTTP 429 to the caller for calls made inside the block
+
+    ``LLMStrategy.query_many`` backs off 429s through the shared provider
+    limiter (pausing sibling tasks too); retrying them here as well would
+    multiply upstream calls.
+    """
+    token = _caller_retries_429.set(True)
+    try:
+        yield
+    finally:
+        _caller_retries_429.reset(token)
+
+
+def check_deadline(what: str = "Workflow") -> None:
+    """Raise DeadlineExceededError if the current deadline has passed"""
+    deadline = _deadline.get()
+    if deadline is not None and deadline.expired:
+        raise DeadlineExceededError(f"{what} deadline exceeded")
+
+
+class RetryPolicy(BaseModel):
+    """Capped exponential backoff with full jitter"""
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        """Build a policy from LLM_RETRY_* environment variables"""
+        return cls(
+            max_attempts=int(os.getenv("LLM_RETRY_MAX_ATTEMPTS", "3")),
+            base_delay=float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5")),
+            max_delay=float(os.getenv("LLM_RETRY_MAX_DELAY", "8.0"))
+        )
+
+    def backoff(self, attempt: int, rng: random.Random = random) -> float:
+        """Delay before retry number ``attempt`` (0-based)"""
+        return rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """Closed -> open after consecutive failures -> half-open probe -> closed
+
+    While open, calls fail immediately with CircuitOpenError instead of
+    tying up a worker waiting on a dead upstream. After
+    ``recovery_time`` one probe call is let through; its outcome closes or
+    re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str = "", failure_threshold: int = 5,
+                 recovery_time: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.failures = 0
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if (self._state == self.OPEN
+                    and self._clock() - self._opened_at >= self.recovery_time):
+                self._state = self.HALF_OPEN
+                self._probing = False
+            return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may be attempted now"""
+        state = self.state
+        with self._lock:
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def release(self) -> None:
+        """Free the half-open probe slot of a call that ended without an outcome"""
+        with self._lock:
+            self._probing = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._state = self.CLOSED
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if (self._state == self.HALF_OPEN
+                    or self.failures >= self.failure_threshold):
+                if self._state != self.OPEN:
+                    get_registry().counter(
+                        "llm_circuit_opened_total", "Circuit breaker trips",
+                        ("provider",)).inc(provider=self.name)
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+                self._probing = False
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(provider: str) -> CircuitBreaker:
+    """Process-wide breaker for ``provider`` (LLM_CIRCUIT_* env settings)"""
+    breaker = _breakers.get(provider)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(provider)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    provider,
+                    failure_threshold=int(os.getenv("LLM_CIRCUIT_FAILURE_THRESHOLD", "5")),
+                    recovery_time=float(os.getenv("LLM_CIRCUIT_RECOVERY_SECONDS", "30"))
+                )
+                _breakers[provider] = breaker
+    return breaker
+
+
+def configure_circuit_breaker(provider: str, failure_threshold: int = 5,
+                              recovery_time: float = 30.0) -> CircuitBreaker:
+    """Replace the breaker for ``provider`` (e.g. in tests or at startup)"""
+    with _breakers_lock:
+        breaker = CircuitBreaker(provider, failure_threshold, recovery_time)
+        _breakers[provider] = breaker
+    return breaker
+
+
+def default_timeout() -> Optional[float]:
+    """Per-request timeout from LLM_TIMEOUT_SECONDS (0 disables)"""
+    seconds = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+    return seconds if seconds > 0 else None
+
+
+async def call_with_resilience(call: Callable[[], Awaitable[Any]], provider: str,
+                               label: str, timeout: Optional[float] = None,
+                               retry: Optional[RetryPolicy] = None,
+                               breaker: Optional[CircuitBreaker] = None,
+                               rng: random.Random = random) -> Any:
+    """Run ``call`` under the deadline, per-call timeout, retries and breaker
+
+    Failures are raised as LLMError subclasses whose message starts with
+    ``label`` and whose ``__cause__`` is the original error.
+    """
+    retry = retry or RetryPolicy.from_env()
+    breaker = breaker or get_circuit_breaker(provider)
+    attempt = 0
+    while True:
+        deadline = _deadline.get()
+        if deadline is not None and deadline.expired:
+            raise DeadlineExceededError(f"{label}: deadline exceeded", provider=provider)
+        if not breaker.allow():
+            raise CircuitOpenError(f"{label}: circuit open for {provider}",
+                                   provider=provider, retryable=True)
+
+        limit = deadline.timeout(timeout) if deadline is not None else timeout
+        try:
+            if limit is None:
+                return_value = await call()
+            else:
+                return_value = await asyncio.wait_for(call(), limit)
+        except asyncio.TimeoutError as e:
+            if deadline is not None and deadline.expired:
+                error: LLMError = DeadlineExceededError(
+                    f"{label}: deadline exceeded", provider=provider)
+            else:
+                after = f" after {limit:.1f}s" if limit is not None else ""
+                error = LLMTimeoutError(f"{label}: request timed out{after}",
+                                        provider=provider, retryable=True)
+            error.__cause__ = e
+        except Exception as e:
+            error = as_llm_error(e, provider, label)
+        except BaseException:
+            # Cancelled (e.g. a hedged loser): not a verdict on the provider
+            breaker.release()
+            raise
+        else:
+            breaker.record_success()
+            return return_value
+
+        # Only signs of a degraded upstream count towards opening the circuit
+        if error.retryable and error.status_code != 429:
+            breaker.record_failure()
+        elif isinstance(error, DeadlineExceededError):
+            breaker.release()
+        else:
+            breaker.record_success()
+
+        retry_after = rate_limit_retry_after(error, default=0.0)
+        if (not error.retryable or attempt + 1 >= retry.max_attempts
+                or (retry_after is not None and _caller_retries_429.get())):
+            raise error
+        delay = retry.backoff(attempt, rng)
+        if retry_after:
+            delay = max(delay, retry_after)
+        if deadline is not None and deadline.remaining() <= delay:
+            raise error
+        record_retry(provider)
+        await asyncio.sleep(delay)
+        attempt += 1
@@ -0,0 +1,213 @@
+"""
+Latency-aware LLM router with hedged requests
+File: python/llm/router.py
+Purpose: Routes each call to the fastest healthy backend and hedges slow calls
+Related components: base.py, backend_stats.py, strategies.py (registered as "router")
+Tags: llm, router, hedging, ewma, latency
+"""
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+from pydantic import BaseModel
+from .base import LLMStrategy, LLMConfig
+from .backend_stats import BackendStats
+from .openai_strategy import OpenAIStrategy
+from .grok_strategy import GrokStrategy
+
+
+class RouterStats(BaseModel):
+    """Counters describing routing decisions"""
+    requests: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    failovers: int = 0
+
+
+def backend_name(strategy: LLMStrategy) -> str:
+    """Stable ``provider/model`` name for a backend"""
+    return f"{strategy.config.provider}/{strategy.config.model}"
+
+
+class RouterStrategy(LLMStrategy):
+    """Routes queries across several backends by observed latency and health
+
+    Each plain ``query`` goes to the healthy backend with the lowest EWMA
+    latency. If it has not answered after the backend's p95 latency, the
+    request is hedged to the next backend; the first answer wins and the
+    loser is cancelled. Failures fail over to the next backend. Web search
+    is routed only among ``web_search_backends`` (not hedged) since a plain
+    completion is not a substitute for a search.
+    """
+
+    def __init__(self, backends: Optional[List[LLMStrategy]] = None,
+                 web_search_backends: Optional[List[LLMStrategy]] = None,
+                 hedge: bool = True,
+                 hedge_quantile: float = 0.95,
+                 default_hedge_delay: float = 2.0,
+                 min_hedge_delay: float = 0.05,
+                 min_samples: int = 5,
+                 error_threshold: float = 0.5,
+                 recovery_after: float = 30.0,
+                 alpha: float = 0.2,
+                 clock: Callable[[], float] = time.monotonic):
+        if backends is None:
+            backends = [OpenAIStrategy(), GrokStrategy()]
+        if not backends:
+            raise ValueError("RouterStrategy needs at least one backend")
+        super().__init__(LLMConfig(provider="router", api_key=""))
+        self.backends = backends
+        self.web_search_backends = web_search_backends or backends[:1]
+        # A schema can only be requested if whichever backend answers honours it
+        self.supports_json_schema = all(b.supports_json_schema for b in backends)
+        self.supports_web_search = all(b.supports_web_search
+                                       for b in self.web_search_backends)
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.default_hedge_delay = default_hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.min_samples = min_samples
+        self.error_threshold = error_threshold
+        self.recovery_after = recovery_after
+        self.stats = RouterStats()
+        self._clock = clock
+        self._backend_stats: Dict[int, BackendStats] = {}
+        for backend in backends + self.web_search_backends:
+            self._backend_stats.setdefault(id(backend),
+                                           BackendStats(alpha=alpha, clock=clock))
+
+    def stats_for(self, backend: LLMStrategy) -> BackendStats:
+        """Return the statistics tracked for a backend"""
+        return self._backend_stats[id(backend)]
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Per-backend statistics keyed by ``provider/model``"""
+        return {
+            backend_name(b): {
+                "ewma_latency": self.stats_for(b).ewma_latency,
+                "error_rate": self.stats_for(b).error_rate,
+                "p95_latency": self.stats_for(b).percentile(0.95),
+                "healthy": self.is_healthy(b),
+            }
+            for b in self.backends
+        }
+
+    def is_healthy(self, backend: LLMStrategy) -> bool:
+        """Healthy unless the error rate is high and the last failure recent
+
+        An unhealthy backend becomes eligible again (as a probe) once
+        ``recovery_after`` seconds have passed since its last failure.
+        """
+        stats = self.stats_for(backend)
+        if stats.error_rate < self.error_threshold:
+            return True
+        return (stats.last_failure is None or
+                self._clock() - stats.last_failure >= self.recovery_after)
+
+    def rank(self, backends: List[LLMStrategy]) -> List[LLMStrategy]:
+        """Order backends: healthy first, then by EWMA latency
+
+        Backends with no latency samples sort first so they get explored.
+        """
+        def key(backend: LLMStrategy):
+            stats = self.stats_for(backend)
+            latency = stats.ewma_latency if stats.ewma_latency is not None else 0.0
+            return (not self.is_healthy(backend), latency, stats.error_rate)
+        return sorted(backends, key=key)
+
+    def hedge_delay(self, backend: LLMStrategy) -> float:
+        """How long to wait on ``backend`` before hedging"""
+        stats = self.stats_for(backend)
+        if stats.sample_count < self.min_samples:
+            return self.default_hedge_delay
+        return max(self.min_hedge_delay, stats.percentile(self.hedge_quantile))
+
+    async def query(self, prompt: str,
+                   options: Optional[Dict[str, Any]] = None) -> str:
+        """Query the fastest healthy backend, hedging slow calls"""
+        return await self._route(self.rank(self.backends), "query",
+                                 prompt, options, hedge=self.hedge)
+
+    async def query_with_web_search(self, prompt: str,
+                                  options: Optional[Dict[str, Any]] = None) -> str:
+        """Web search on the fastest healthy search backend (fail over only)"""
+        return await self._route(self.rank(self.web_search_backends),
+                                 "query_with_web_search", prompt, options,
+                                 hedge=False)
+
+    async def query_stream(self, prompt: str,
+                          options: Optional[Dict[str, Any]] = None
+                          ) -> AsyncIterator[str]:
+        """Stream from the fastest healthy backend (streams are not hedged)"""
+        backend = self.rank(self.backends)[0]
+        stats = self.stats_for(backend)
+        started = self._clock()
+        try:
+            async for chunk in backend.query_stream(prompt, options):
+                yield chunk
+        except Exception:
+            stats.record_failure()
+            raise
+        stats.record_success(self._clock() - started)
+
+    async def _call(self, backend: LLMStrategy, method: str, prompt: str,
+                    options: Optional[Dict[str, Any]]) -> str:
+        """Call one backend and record its latency or failure"""
+        stats = self.stats_for(backend)
+        started = self._clock()
+        try:
+            result = await getattr(backend, method)(prompt, options)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            stats.record_failure()
+            raise
+        stats.record_success(self._clock() - started)
+        return result
+
+    async def _route(self, ranked: List[LLMStrategy], method: str, prompt: str,
+                     options: Optional[Dict[str, Any]], hedge: bool) -> str:
+        """Run a call across ranked backends with hedging and failover"""
+        self.stats.requests += 1
+        primary = ranked[0]
+        pending: Dict["asyncio.Task[str]", LLMStrategy] = {}
+        next_index = 0
+        hedged = False
+        last_error: Optional[BaseException] = None
+
+        def launch() -> None:
+            nonlocal next_index
+            backend = ranked[next_index]
+            next_index += 1
+            task = asyncio.ensure_future(self._call(backend, method, prompt, options))
+            pending[task] = backend
+
+        launch()
+        try:
+            while pending:
+                timeout = None
+                if hedge and not hedged and next_index < len(ranked):
+                    timeout = self.hedge_delay(primary)
+                done, _ = await asyncio.wait(pending, timeout=timeout,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedged = True
+                    self.stats.hedges += 1
+                    launch()
+                    continue
+
+                for task in done:
+                    backend = pending.pop(task)
+                    if task.exception() is None:
+                        if hedged and backend is not primary:
+                            self.stats.hedge_wins += 1
+                        return task.result()
+                    last_error = task.exception()
+
+                if not pending and next_index < len(ranked):
+                    self.stats.failovers += 1
+                    launch()
+            raise last_error
+        finally:
+            for task in pending:
+                task.cancel()
@@ -0,0 +1,203 @@
+"""
+Cached, concurrent secret resolution
+File: python/llm/secret_provider.py
+Purpose: Resolves 1Password ``op://`` references with concurrent ``op read`` calls into a memory-only TTL cache
+Related components: openai_strategy.py, grok_strategy.py, main.py (lifespan preload), run_with_1password.py
+Tags: llm, secrets, 1password, cache, startup
+"""
+
+import asyncio
+import os
+import subprocess
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+
+# Environment variables holding provider API keys (or op:// references to them)
+API_KEY_VARIABLES = ("OPENAI_API_KEY", "GROK_API_KEY")
+
+
+class SecretResolutionError(Exception):
+    """Raised when a secret reference cannot be resolved"""
+
+
+def is_secret_reference(value: Optional[str]) -> bool:
+    """Whether ``value`` is a 1Password secret reference"""
+    return bool(value) and value.startswith("op://")
+
+
+class SecretProvider:
+    """Resolves ``op://`` references through the 1Password CLI
+
+    Every ``op read`` is a separate process costing hundreds of
+    milliseconds, so ``resolve_many`` runs them concurrently (bounded by
+    ``concurrency``) and identical in-flight references share one call.
+    Values are kept in process memory for ``ttl`` seconds and are never
+    written to disk or to ``os.environ``.
+    """
+
+    def __init__(self, op_path: str = "op", ttl: float = 300.0,
+                 concurrency: int = 8, timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.op_path = op_path
+        self.ttl = ttl
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.lookups = 0
+        self._clock = clock
+        self._cache: Dict[str, Tuple[str, float]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "SecretProvider":
+        """Build a provider from SECRETS_* environment variables"""
+        return cls(
+            op_path=os.getenv("SECRETS_OP_PATH", "op"),
+            ttl=float(os.getenv("SECRETS_CACHE_TTL", "300")),
+            concurrency=int(os.getenv("SECRETS_CONCURRENCY", "8")),
+            timeout=float(os.getenv("SECRETS_OP_TIMEOUT", "30"))
+        )
+
+    def cached(self, reference: str) -> Optional[str]:
+        """Cached value of ``reference`` if present and fresh"""
+        with self._lock:
+            entry = self._cache.get(reference)
+            if entry is None:
+                return None
+            value, expires = entry
+            if self._clock() >= expires:
+                del self._cache[reference]
+                return None
+            return value
+
+    def _store(self, reference: str, value: str) -> None:
+        with self._lock:
+            self._cache[reference] = (value, self._clock() + self.ttl)
+
+    def clear(self) -> None:
+        """Forget every cached value"""
+        with self._lock:
+            self._cache.clear()
+
+    def _command(self, reference: str) -> Tuple[str, ...]:
+        return (self.op_path, "read", "--no-newline", reference)
+
+    def _failure(self, reference: str, detail: str) -> SecretResolutionError:
+        # Never include the secret itself, only the reference
+        return SecretResolutionError(f"Could not resolve {reference}: {detail.strip()}")
+
+    async def _read(self, reference: str) -> str:
+        self.lookups += 1
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *self._command(reference),
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+        except OSError as e:
+            raise self._failure(reference, str(e))
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), self.timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise self._failure(reference, f"op timed out after {self.timeout}s")
+        if process.returncode != 0:
+            raise self._failure(reference, stderr.decode(errors="replace"))
+        value = stdout.decode().rstrip("\n")
+        self._store(reference, value)
+        return value
+
+    async def resolve(self, reference: str) -> str:
+        """Value of one reference (cached, single-flight)"""
+        value = self.cached(reference)
+        if value is not None:
+            return value
+        future = self._inflight.get(reference)
+        if future is None:
+            future = asyncio.ensure_future(self._read(reference))
+            self._inflight[reference] = future
+            future.add_done_callback(lambda _: self._inflight.pop(reference, None))
+        return await asyncio.shield(future)
+
+    async def resolve_many(self, references: Iterable[str]) -> Dict[str, str]:
+        """Resolve several references concurrently
+
+        Raises SecretResolutionError naming every reference that failed.
+        """
+        unique = list(dict.fromkeys(references))
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(reference: str) -> str:
+            async with semaphore:
+                return await self.resolve(reference)
+
+        results = await asyncio.gather(*(bounded(r) for r in unique),
+                                       return_exceptions=True)
+        failures = [r for r in results if isinstance(r, BaseException)]
+        if failures:
+            raise SecretResolutionError("; ".join(str(f) for f in failures))
+        return dict(zip(unique, results))
+
+    def resolve_sync(self, reference: str) -> str:
+        """Blocking resolution for callers outside the event loop"""
+        value = self.cached(reference)
+        if value is not None:
+            return value
+        self.lookups += 1
+        try:
+            result = subprocess.run(self._command(reference), capture_output=True,
+                                    text=True, timeout=self.timeout)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            raise self._failure(reference, str(e))
+        if result.returncode != 0:
+            raise self._failure(reference, result.stderr)
+        value = result.stdout.rstrip("\n")
+        self._store(reference, value)
+        return value
+
+
+_provider: Optional[SecretProvider] = None
+_provider_lock = threading.Lock()
+
+
+def get_secret_provider() -> SecretProvider:
+    """Process-wide secret provider"""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = SecretProvider.from_env()
+    return _provider
+
+
+def configure_secret_provider(provider: Optional[SecretProvider]) -> None:
+    """Replace the process-wide provider (None rebuilds it from the environment)"""
+    global _provider
+    with _provider_lock:
+        _provider = provider
+
+
+def get_secret(name: str, default: str = "") -> str:
+    """Value of environment variable ``name``, resolving an ``op://`` reference
+
+    Plain values are returned unchanged, so a literal key in the
+    environment keeps working.
+    """
+    value = os.getenv(name, default)
+    if is_secret_reference(value):
+        return get_secret_provider().resolve_sync(value)
+    return value
+
+
+async def preload_secrets(names: Iterable[str] = API_KEY_VARIABLES) -> Dict[str, str]:
+    """Resolve the ``op://`` references in ``names`` concurrently into the cache
+
+    Call once at startup so later ``get_secret`` lookups are cache hits.
+    Returns the resolved values keyed by variable name.
+    """
+    references = {name: os.getenv(name) for name in names}
+    references = {name: ref for name, ref in references.items()
+                  if is_secret_reference(ref)}
+    values = await get_secret_provider().resolve_many(references.values())
+    return {name: values[ref] for name, ref in references.items()}
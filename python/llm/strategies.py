@@ -2,14 +2,17 @@
 LLM Strategy Factory and Registry
 File: python/llm/strategies.py
 Purpose: Provides a factory pattern for creating and managing LLM strategies
-Related components: base.py, openai_strategy.py, grok_strategy.py
+Related components: base.py, openai_strategy.py, grok_strategy.py, router.py,
+    fallback.py
 Tags: llm, strategy, factory, registry
 """
 
-from typing import Dict, Type
+from typing import Dict, Sequence, Type
 from .base import LLMStrategy, LLMConfig
 from .openai_strategy import OpenAIStrategy
 from .grok_strategy import GrokStrategy
+from .router import RouterStrategy
+from .fallback import FallbackStrategy
 
 
 class LLMStrategyFactory:
@@ -18,6 +21,8 @@ class LLMStrategyFactory:
     _strategies: Dict[str, Type[LLMStrategy]] = {
         "openai": OpenAIStrategy,
         "grok": GrokStrategy,
+        "router": RouterStrategy,
+        "fallback": FallbackStrategy,
     }
     
     @classmethod
@@ -47,9 +52,20 @@ def create_openai_strategy(config: LLMConfig = None) -> OpenAIStrategy:
     return OpenAIStrategy(config)
 
 
-def create_grok_strategy() -> GrokStrategy:
+def create_grok_strategy(config: LLMConfig = None) -> GrokStrategy:
     """Create a Grok strategy instance"""
-    return GrokStrategy()
+    return GrokStrategy(config)
+
+
+def create_router_strategy(**kwargs) -> RouterStrategy:
+    """Create a latency-aware router over OpenAI and Grok"""
+    return RouterStrategy(**kwargs)
+
+
+def create_fallback_strategy(primary: str = "openai",
+                             fallbacks: Sequence[str] = ("grok",)) -> FallbackStrategy:
+    """Create a strategy that fails over when a provider's circuit is open"""
+    return FallbackStrategy(primary, fallbacks)
 
 
 # Export all strategy classes for direct import
@@ -59,6 +75,10 @@ __all__ = [
     "LLMConfig",
     "OpenAIStrategy",
     "GrokStrategy",
+    "RouterStrategy",
+    "FallbackStrategy",
     "create_openai_strategy",
-    "create_grok_strategy"
+    "create_grok_strategy",
+    "create_router_strategy",
+    "create_fallback_strategy"
 ]
@@ -0,0 +1,124 @@
+"""
+Structured (JSON) output helpers
+File: python/llm/structured.py
+Purpose: Schema-enforced response_format options plus a tolerant incremental JSON extractor
+Related components: base.py (query_json), workflows/bitcoin_news.py (fused analysis)
+Tags: llm, json, structured-output, parsing, streaming
+"""
+
+import json
+from typing import Any, Dict, Optional
+
+
+_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "number": (int, float),
+    "integer": int,
+    "boolean": bool,
+}
+
+
+def json_schema_format(schema: Dict[str, Any], name: str = "response") -> Dict[str, Any]:
+    """OpenAI-style ``response_format`` enforcing ``schema``"""
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": name, "schema": schema, "strict": True}
+    }
+
+
+def validate_schema(value: Any, schema: Dict[str, Any], path: str = "$") -> Any:
+    """Check ``value`` against the subset of JSON Schema used for LLM output
+
+    Supports ``type``, ``enum``, ``required``, ``properties`` and ``items``.
+    Raises ValueError naming the first offending path.
+    """
+    expected = schema.get("type")
+    if expected in _TYPES:
+        if (not isinstance(value, _TYPES[expected])
+                or (expected in ("number", "integer") and isinstance(value, bool))):
+            raise ValueError(f"{path}: expected {expected}")
+    if "enum" in schema and value not in schema["enum"]:
+        raise ValueError(f"{path}: {value!r} is not one of {schema['enum']}")
+    if isinstance(value, dict):
+        for key in schema.get("required", []):
+            if key not in value:
+                raise ValueError(f"{path}: missing required property '{key}'")
+        for key, subschema in schema.get("properties", {}).items():
+            if key in value:
+                validate_schema(value[key], subschema, f"{path}.{key}")
+    if isinstance(value, list) and "items" in schema:
+        for i, item in enumerate(value):
+            validate_schema(item, schema["items"], f"{path}[{i}]")
+    return value
+
+
+class IncrementalJSONExtractor:
+    """Finds the first complete JSON object or array in streamed text
+
+    Text around the value (prose, markdown fences) is ignored and each
+    chunk is scanned only once, so ``feed`` can be called per streamed
+    token. Balanced fragments that are not valid JSON (``{like this}``)
+    are skipped and scanning resumes after their opening brace.
+    """
+
+    def __init__(self):
+        self.value: Any = None
+        self.done = False
+        self._text = ""
+        self._pos = 0
+        self._start: Optional[int] = None
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk: str) -> bool:
+        """Add text; returns True once a complete value has been parsed"""
+        if self.done:
+            return True
+        self._text += chunk
+        text = self._text
+        i = self._pos
+        while i < len(text):
+            char = text[i]
+            if self._start is None:
+                if char in "{[":
+                    self._start, self._depth = i, 1
+            elif self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        self.value = json.loads(text[self._start:i + 1])
+                        self.done = True
+                        self._pos = i + 1
+                        return True
+                    except json.JSONDecodeError:
+                        # Not JSON after all; rescan from the next character
+                        i = self._start
+                        self._start = None
+                        self._in_string = self._escaped = False
+            i += 1
+        self._pos = i
+        return False
+
+
+def extract_json(text: str, schema: Optional[Dict[str, Any]] = None) -> Any:
+    """Parse the first JSON value in ``text``, optionally validating it"""
+    extractor = IncrementalJSONExtractor()
+    if not extractor.feed(text or ""):
+        raise ValueError("No JSON value found in response")
+    if schema is not None:
+        validate_schema(extractor.value, schema)
+    return extractor.value
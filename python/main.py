@@ -6,17 +6,72 @@ RELATED: Docker container, CI/CD pipeline, LangGraph workflows
 TAGS: fastapi, health-check, docker
 """
 
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
+import asyncio
+import json
+import logging
 import os
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator, Optional
 from pydantic import BaseModel, EmailStr
 
+from .api.price_feed import AggregatedPrice, StalePriceError, aclose_price_feed, get_price_feed
+from .llm.http_pool import aclose_http_clients
+from .llm.metrics import get_registry
+from .llm.secret_provider import preload_secrets
+from .node.rpc import aclose_bitcoin_rpc
+from .storage.ledger import Ledger, LedgerPage
+from .strategies.store import PriceArchive
+from .workflows.bitcoin_news import (
+    BitcoinNewsWorkflow,
+    get_shared_workflow,
+    shut_down,
+    warm_up
+)
+from .workflows.jobs import WorkflowJob, WorkflowJobQueue, QueueFullError
+from .workflows.scheduler import JobState, OverlapPolicy, WorkflowScheduler
+
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Application startup/shutdown hooks."""
+    try:
+        # Resolve op:// API key references concurrently before clients read them
+        await preload_secrets()
+    except Exception as e:
+        logger.warning("Secret preload failed: %s", e)
+    try:
+        # Build clients and compile graphs before the first request arrives
+        warm_up()
+    except Exception as e:
+        logger.warning("Workflow warm-up skipped: %s", e)
+    job_queue.start()
+    scheduler.start()
+    yield
+    await scheduler.stop()
+    await job_queue.stop()
+    shut_down()
+    # Release the pooled LLM provider connections
+    await aclose_http_clients()
+    # Stop the price pollers and release the pooled exchange connections
+    await aclose_price_feed()
+    # Release the shared Bitcoin node connection
+    await aclose_bitcoin_rpc()
+    # Commit buffered ledger entries
+    if ledger is not None:
+        ledger.close()
+
 
 app = FastAPI(
     title="Stackr Bitcoin DCA",
     description="Privacy-first Bitcoin DCA and automated withdrawal system",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -28,6 +83,76 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Override for the shared workflow instance (e.g. one with injected strategies)
+_news_workflow: Optional[BitcoinNewsWorkflow] = None
+
+
+def get_news_workflow() -> BitcoinNewsWorkflow:
+    """Return the Bitcoin news workflow (the shared, pre-built instance by default)."""
+    return _news_workflow or get_shared_workflow()
+
+
+async def run_news_workflow() -> Any:
+    """Run the shared Bitcoin news workflow once (job queue runner)."""
+    return await get_news_workflow().run()
+
+
+# Bounded worker pool for workflow runs submitted over the API
+job_queue = WorkflowJobQueue.from_env()
+job_queue.register("bitcoin-news", run_news_workflow)
+
+# Recurring runs inside this process instead of a cron-spawned interpreter
+scheduler = WorkflowScheduler.from_env()
+if os.getenv("WORKFLOW_NEWS_SCHEDULE"):
+    scheduler.add_job(
+        "bitcoin-news",
+        run_news_workflow,
+        os.environ["WORKFLOW_NEWS_SCHEDULE"],
+        jitter=float(os.getenv("WORKFLOW_NEWS_SCHEDULE_JITTER", "30")),
+        overlap=OverlapPolicy(os.getenv("WORKFLOW_NEWS_SCHEDULE_OVERLAP", "skip"))
+    )
+
+# Memory-mapped price history; hourly/daily rollups are rebuilt on a schedule
+price_archive = PriceArchive.from_env()
+
+
+async def run_price_rollups() -> Dict[str, int]:
+    """Roll raw prices up into hourly/daily bars and trim raw retention (job runner)."""
+    retention_days = float(os.getenv("PRICE_RAW_RETENTION_DAYS", "0"))
+    keep_seconds = retention_days * 86400 if retention_days > 0 else None
+    return await asyncio.to_thread(price_archive.compact, keep_seconds)
+
+
+if price_archive is not None:
+    scheduler.add_job("price-rollups", run_price_rollups,
+                      os.getenv("PRICE_ROLLUP_SCHEDULE", "@every 5m"))
+
+
+# Append-only transaction ledger (purchases, withdrawals, settings changes)
+ledger = Ledger.from_env()
+
+
+def get_ledger() -> Ledger:
+    """Return the configured ledger or answer 503 when LEDGER_DB_PATH is unset."""
+    if ledger is None:
+        raise HTTPException(status_code=503, detail="Ledger not configured (set LEDGER_DB_PATH)")
+    return ledger
+
+
+def ledger_filters(user_id: Optional[str], strategy_id: Optional[str], kind: Optional[str],
+                   start: Optional[float], end: Optional[float]) -> Dict[str, Any]:
+    """Query-string filters shared by the ledger endpoints."""
+    return {"user_id": user_id, "strategy_id": strategy_id, "kind": kind,
+            "start": start, "end": end}
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """Encode a workflow event as a Server-Sent Events frame."""
+    data = json.dumps({"node": event.get("node"), "data": event.get("data")},
+                      default=str)
+    return f"event: {event['event']}\ndata: {data}\n\n"
+
+
 @app.get("/")
 async def root() -> Dict[str, str]:
     """Root endpoint returning basic application info."""
@@ -68,13 +193,115 @@ async def api_info() -> Dict[str, Any]:
             "root": "/",
             "health": "/health",
             "docs": "/docs",
-            "redoc": "/redoc"
+            "redoc": "/redoc",
+            "metrics": "/metrics",
+            "price": "/price/{symbol}",
+            "ledger": "/ledger",
+            "ledger_export_csv": "/ledger/export.csv",
+            "ledger_export_json": "/ledger/export.json"
         },
         "workflows": {
-            "bitcoin_news": "Available via LangGraph workflows"
+            "bitcoin_news": "Available via LangGraph workflows",
+            "bitcoin_news_stream": "/workflows/bitcoin-news/stream",
+            "bitcoin_news_jobs": "/workflows/bitcoin-news",
+            "scheduled_jobs": "/scheduler/jobs"
         }
     }
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Prometheus metrics: per-node and per-provider latency, tokens and cost."""
+    return PlainTextResponse(get_registry().render(),
+                             media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/workflows/bitcoin-news/stream")
+async def stream_bitcoin_news() -> StreamingResponse:
+    """Run the Bitcoin news workflow, streaming node and token events as SSE."""
+    try:
+        workflow = get_news_workflow()
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Workflow unavailable: {str(e)}")
+
+    async def event_stream() -> AsyncIterator[str]:
+        try:
+            async for event in workflow.stream_events():
+                yield format_sse(event)
+        except Exception as e:
+            yield format_sse({"event": "error", "data": {"message": str(e)}})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/workflows/bitcoin-news", status_code=202)
+async def submit_bitcoin_news(response: Response) -> Dict[str, Any]:
+    """Enqueue a Bitcoin news workflow run and return its job id."""
+    try:
+        job = job_queue.submit("bitcoin-news")
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e),
+                            headers={"Retry-After": "5"})
+
+    response.headers["Location"] = f"/workflows/bitcoin-news/{job.id}"
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/workflows/bitcoin-news/{job.id}"
+    }
+
+@app.get("/workflows/bitcoin-news/{job_id}")
+async def get_bitcoin_news_job(job_id: str) -> WorkflowJob:
+    """Return the status (and result once finished) of a workflow job."""
+    job = job_queue.get(job_id)
+    if job is None or job.workflow != "bitcoin-news":
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@app.get("/scheduler/jobs")
+async def get_scheduled_jobs() -> Dict[str, JobState]:
+    """Schedule and last-run state of every recurring workflow."""
+    return scheduler.jobs()
+
+@app.get("/price/{symbol}")
+async def get_price(symbol: str) -> AggregatedPrice:
+    """Median price across exchanges from the shared price feed (e.g. BTC-USD)."""
+    try:
+        return await get_price_feed().get_price(symbol.upper())
+    except StalePriceError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+@app.get("/ledger")
+def get_ledger_entries(user_id: Optional[str] = None, strategy_id: Optional[str] = None,
+                       kind: Optional[str] = None, start: Optional[float] = None,
+                       end: Optional[float] = None, cursor: Optional[str] = None,
+                       limit: int = Query(100, ge=1, le=1000)) -> LedgerPage:
+    """One page of ledger entries in time order; pass next_cursor back for the next page."""
+    # A plain def: FastAPI runs the flush and SQLite query in its threadpool
+    try:
+        return get_ledger().query(cursor=cursor, limit=limit, **ledger_filters(
+            user_id, strategy_id, kind, start, end))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/ledger/export.{fmt}")
+async def export_ledger(fmt: str, user_id: Optional[str] = None,
+                        strategy_id: Optional[str] = None, kind: Optional[str] = None,
+                        start: Optional[float] = None,
+                        end: Optional[float] = None) -> StreamingResponse:
+    """Stream matching ledger entries as CSV or JSON without loading them into memory."""
+    if fmt not in ("csv", "json"):
+        raise HTTPException(status_code=404, detail="Export format must be csv or json")
+    filters = ledger_filters(user_id, strategy_id, kind, start, end)
+    source = get_ledger()
+    rows = source.iter_csv(**filters) if fmt == "csv" else source.iter_json(**filters)
+    return StreamingResponse(
+        rows,
+        media_type="text/csv" if fmt == "csv" else "application/json",
+        headers={"Content-Disposition": f'attachment; filename="stackr-ledger.{fmt}"'}
+    )
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
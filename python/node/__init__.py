@@ -0,0 +1,54 @@
+"""
+Bitcoin node integration package
+File: python/node/__init__.py
+Purpose: Re-exports the batched Bitcoin Knots RPC client, the BIP84 address cache with xpub withdrawals and the mock node used in tests
+Related components: rpc.py, addresses.py, mock.py, main.py
+Tags: node, bitcoin, json-rpc, xpub, package
+"""
+
+# Import the RPC client
+from .rpc import (
+    BitcoinRPC,
+    BitcoinRPCConfig,
+    NodeWarmingUpError,
+    RPCError,
+    aclose_bitcoin_rpc,
+    configure_bitcoin_rpc,
+    get_bitcoin_rpc
+)
+
+# Import address selection and withdrawals
+from .addresses import (
+    AddressCache,
+    NoUnusedAddressError,
+    get_address_cache,
+    normalize_xpub,
+    select_unused_address,
+    withdraw_to_xpub
+)
+
+# Import the mock node
+from .mock import MockBitcoind
+
+# Export all public components
+__all__ = [
+    # RPC client
+    "BitcoinRPC",
+    "BitcoinRPCConfig",
+    "NodeWarmingUpError",
+    "RPCError",
+    "aclose_bitcoin_rpc",
+    "configure_bitcoin_rpc",
+    "get_bitcoin_rpc",
+
+    # Addresses and withdrawals
+    "AddressCache",
+    "NoUnusedAddressError",
+    "get_address_cache",
+    "normalize_xpub",
+    "select_unused_address",
+    "withdraw_to_xpub",
+
+    # Mock node
+    "MockBitcoind"
+]
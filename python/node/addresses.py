@@ -0,0 +1,328 @@
+"""
+BIP84 address cache and xpub withdrawals
+File: python/node/addresses.py
+Purpose: Pre-derives an xpub's BIP84 receive addresses ahead of the gap limit through the node, tracks used/unused state incrementally from the watch-only wallet and withdraws to the next unused address
+Related components: rpc.py (BitcoinRPC), mock.py (MockBitcoind), PROJECT_ARCHITECTURE.md (select_unused_address, withdraw_to_xpub)
+Tags: node, bitcoin, xpub, bip84, gap-limit, withdrawal
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional, Set, Union
+from .rpc import UNSENT_ERRORS, BitcoinRPC, RPCCall, RPCError, get_bitcoin_rpc
+
+logger = logging.getLogger(__name__)
+
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+# Extended public key version bytes -> (network, version bitcoind accepts)
+XPUB_VERSIONS: Dict[bytes, tuple] = {
+    bytes.fromhex("0488b21e"): ("mainnet", bytes.fromhex("0488b21e")),  # xpub
+    bytes.fromhex("04b24746"): ("mainnet", bytes.fromhex("0488b21e")),  # zpub
+    bytes.fromhex("043587cf"): ("testnet", bytes.fromhex("043587cf")),  # tpub
+    bytes.fromhex("045f1cf6"): ("testnet", bytes.fromhex("043587cf")),  # vpub
+}
+
+# P2SH-wrapped segwit keys (ypub/upub) are not BIP84
+WRAPPED_VERSIONS = {bytes.fromhex("049d7cb2"), bytes.fromhex("044a5262")}
+
+RECEIVE_CHAIN = 0
+CHANGE_CHAIN = 1
+
+
+class NoUnusedAddressError(LookupError):
+    """Every address within the gap limit is used or reserved"""
+
+
+def b58decode_check(value: str) -> bytes:
+    """Decode base58check, verifying the 4-byte checksum"""
+    number = 0
+    for char in value:
+        if char not in BASE58_ALPHABET:
+            raise ValueError(f"Invalid base58 character {char!r}")
+        number = number * 58 + BASE58_ALPHABET.index(char)
+    body = number.to_bytes((number.bit_length() + 7) // 8, "big")
+    raw = b"\x00" * (len(value) - len(value.lstrip("1"))) + body
+    payload, checksum = raw[:-4], raw[-4:]
+    if hashlib.sha256(hashlib.sha256(payload).digest()).digest()[:4] != checksum:
+        raise ValueError("Invalid base58 checksum")
+    return payload
+
+
+def b58encode_check(payload: bytes) -> str:
+    """Encode bytes as base58check"""
+    raw = payload + hashlib.sha256(hashlib.sha256(payload).digest()).digest()[:4]
+    number = int.from_bytes(raw, "big")
+    chars = []
+    while number:
+        number, rem = divmod(number, 58)
+        chars.append(BASE58_ALPHABET[rem])
+    return "1" * (len(raw) - len(raw.lstrip(b"\x00"))) + "".join(reversed(chars))
+
+
+def normalize_xpub(xpub: str, network: Optional[str] = None) -> str:
+    """Return ``xpub`` re-encoded with the version bytes bitcoind descriptors accept
+
+    SLIP-132 zpub/vpub keys become xpub/tpub (the wpkh() descriptor already
+    says BIP84). Raises ValueError for malformed keys, wrapped-segwit keys
+    and keys for a different network (testnet, signet and regtest share
+    tpub).
+    """
+    payload = b58decode_check(xpub.strip())
+    if len(payload) != 78:
+        raise ValueError("Extended public key must be 78 bytes")
+    version = payload[:4]
+    if version in WRAPPED_VERSIONS:
+        raise ValueError("ypub/upub keys are P2SH-wrapped segwit; BIP84 needs a zpub or vpub")
+    if version not in XPUB_VERSIONS:
+        raise ValueError("Not an extended public key (expected xpub/zpub/tpub/vpub)")
+    key_network, normalized = XPUB_VERSIONS[version]
+    if network is not None and (network == "mainnet") != (key_network == "mainnet"):
+        raise ValueError(f"Extended public key is for {key_network}, node is on {network}")
+    return b58encode_check(normalized + payload[4:])
+
+
+class AddressCache:
+    """BIP84 addresses of one xpub chain, derived ahead and tracked incrementally
+
+    Addresses come from the node (``deriveaddresses`` on a ``wpkh()``
+    descriptor) in ranges, so the cache always holds ``gap_limit +
+    lookahead`` addresses past the highest used index; the same range is
+    imported into the watch-only ``wallet``. ``sync`` reads only the
+    wallet transactions since the last synced block (``listsinceblock``)
+    and flips the addresses they pay to used, so nothing is rescanned.
+    A sync with nothing new is a single RPC call. Syncs (and
+    ``reserve_unused_address``) are serialized, so concurrent withdrawals
+    on a shared cache never derive the same range twice.
+
+    ``birthday`` is the rescan start (epoch seconds or ``"now"``) of the
+    first import; later range extensions import with ``"now"``, since the
+    addresses they add lie beyond the gap limit of any earlier payment.
+    """
+
+    def __init__(self, rpc: BitcoinRPC, xpub: str, chain: int = RECEIVE_CHAIN,
+                 gap_limit: int = 20, lookahead: int = 100,
+                 wallet: Optional[str] = None, birthday: Union[int, str] = 0):
+        self.rpc = rpc
+        self.xpub = normalize_xpub(xpub, rpc.config.network)
+        self.chain = chain
+        self.gap_limit = gap_limit
+        self.lookahead = lookahead
+        self.wallet = wallet
+        self.birthday = birthday
+        self.addresses: List[str] = []
+        self.used: Set[int] = set()
+        self.reserved: Set[int] = set()
+        self.last_block: Optional[str] = None
+        self.descriptor: Optional[str] = None
+        # Highest index imported into the watch-only wallet
+        self.watched_end = -1
+        self._index: Dict[str, int] = {}
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def from_env(cls, rpc: BitcoinRPC, xpub: str) -> "AddressCache":
+        """Build a cache from BITCOIN_ADDRESS_* / BITCOIN_WATCH_WALLET variables"""
+        return cls(rpc, xpub,
+                   gap_limit=int(os.getenv("BITCOIN_ADDRESS_GAP_LIMIT", "20")),
+                   lookahead=int(os.getenv("BITCOIN_ADDRESS_LOOKAHEAD", "100")),
+                   wallet=os.getenv("BITCOIN_WATCH_WALLET") or None)
+
+    @property
+    def base_descriptor(self) -> str:
+        return f"wpkh({self.xpub}/{self.chain}/*)"
+
+    @property
+    def highest_used(self) -> int:
+        """Highest used index (-1 before the first payment)"""
+        return max(self.used, default=-1)
+
+    @property
+    def target(self) -> int:
+        """Number of addresses the cache should hold"""
+        return self.highest_used + 1 + self.gap_limit + self.lookahead
+
+    def index_of(self, address: str) -> Optional[int]:
+        return self._index.get(address)
+
+    def is_used(self, address: str) -> bool:
+        index = self._index.get(address)
+        return index is not None and index in self.used
+
+    async def sync(self) -> List[str]:
+        """Fold in payments since the last sync and derive ahead; return newly used addresses"""
+        async with self._lock:
+            return await self._sync()
+
+    async def reserve_unused_address(self) -> str:
+        """Sync, then reserve the next unused address, as one step"""
+        async with self._lock:
+            await self._sync()
+            return self.select_unused_address()
+
+    async def _sync(self) -> List[str]:
+        if self.descriptor is None:
+            info = await self.rpc.call("getdescriptorinfo", self.base_descriptor, wallet="")
+            self.descriptor = f"{self.base_descriptor}#{info['checksum']}"
+
+        calls = self._extension_calls()
+        calls.append(("listsinceblock", (self.last_block or "", 1, True)))
+        results = await self.rpc.batch(calls, wallet=self.wallet)
+        self._apply_extension(calls[:-1], results[:-1])
+        since = results[-1]
+
+        newly_used = []
+        for tx in since.get("transactions", []):
+            index = self._index.get(tx.get("address", ""))
+            if tx.get("category") == "receive" and index is not None and index not in self.used:
+                self.used.add(index)
+                self.reserved.discard(index)
+                newly_used.append(self.addresses[index])
+        self.last_block = since.get("lastblock", self.last_block)
+
+        # A payment near the frontier moves the gap limit: extend again
+        while len(self.addresses) < self.target:
+            calls = self._extension_calls()
+            self._apply_extension(calls, await self.rpc.batch(calls, wallet=self.wallet))
+        return newly_used
+
+    def _extension_calls(self) -> List[RPCCall]:
+        start, end = len(self.addresses), self.target - 1
+        if end < start:
+            return []
+        calls: List[RPCCall] = [("deriveaddresses", (self.descriptor, [start, end]))]
+        if end > self.watched_end:
+            calls.append(("importdescriptors", ([{
+                "desc": self.descriptor, "range": [0, end], "active": False,
+                "internal": self.chain == CHANGE_CHAIN,
+                "timestamp": self.birthday if self.watched_end < 0 else "now"
+            }],)))
+        return calls
+
+    def _apply_extension(self, calls: List[RPCCall], results: List[Any]) -> None:
+        for (method, params), result in zip(calls, results):
+            if method == "deriveaddresses":
+                start = params[1][0]
+                if start != len(self.addresses):
+                    raise RuntimeError("Address derivation out of order")
+                for offset, address in enumerate(result):
+                    self._index[address] = start + offset
+                self.addresses.extend(result)
+            elif method == "importdescriptors":
+                failed = [r.get("error", {}).get("message", "unknown error")
+                          for r in result if not r.get("success")]
+                if failed:
+                    raise RPCError(-4, "; ".join(failed), method)
+                self.watched_end = params[0][0]["range"][1]
+
+    def select_unused_address(self, reserve: bool = True) -> str:
+        """Lowest address that is neither used nor reserved, within the gap limit
+
+        Reserving keeps concurrent withdrawals from sharing an address until
+        ``sync`` sees it used (or ``release`` hands it back). Raises
+        NoUnusedAddressError when the next free index would open a gap the
+        wallet recovering this xpub could not see past.
+        """
+        limit = min(len(self.addresses), self.highest_used + 1 + self.gap_limit)
+        for index in range(self.highest_used + 1, limit):
+            if index not in self.reserved:
+                if reserve:
+                    self.reserved.add(index)
+                return self.addresses[index]
+        raise NoUnusedAddressError(
+            f"No unused address within the gap limit of {self.gap_limit} "
+            f"({len(self.reserved)} reserved); sync the cache or release reservations")
+
+    def mark_used(self, address: str) -> None:
+        """Record a payment to ``address`` ahead of the next sync"""
+        index = self._index.get(address)
+        if index is None:
+            raise KeyError(f"{address} is not a cached address of this xpub")
+        self.used.add(index)
+        self.reserved.discard(index)
+
+    def release(self, address: str) -> None:
+        """Return a reserved address that was never paid"""
+        index = self._index.get(address)
+        if index is not None:
+            self.reserved.discard(index)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serializable state, restorable without re-deriving"""
+        return {"xpub": self.xpub, "chain": self.chain, "descriptor": self.descriptor,
+                "addresses": list(self.addresses), "used": sorted(self.used),
+                "reserved": sorted(self.reserved), "last_block": self.last_block,
+                "watched_end": self.watched_end}
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        """Load a ``snapshot`` taken from a cache of the same xpub and chain"""
+        if (state["xpub"], state["chain"]) != (self.xpub, self.chain):
+            raise ValueError("Snapshot belongs to a different xpub or chain")
+        self.descriptor = state["descriptor"]
+        self.addresses = list(state["addresses"])
+        self._index = {address: i for i, address in enumerate(self.addresses)}
+        self.used = set(state["used"])
+        self.reserved = set(state["reserved"])
+        self.last_block = state["last_block"]
+        self.watched_end = state["watched_end"]
+
+
+_caches: Dict[str, AddressCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_address_cache(xpub: str, rpc: Optional[BitcoinRPC] = None) -> AddressCache:
+    """Process-wide cache for an xpub's receive chain, created once
+
+    Uses the shared node client unless ``rpc`` is given; a cache whose
+    client was closed (e.g. by ``aclose_bitcoin_rpc``) is moved to the
+    current one, keeping its state.
+    """
+    cache = _caches.get(xpub)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.get(xpub)
+            if cache is None:
+                cache = AddressCache.from_env(rpc or get_bitcoin_rpc(), xpub)
+                _caches[xpub] = cache
+    if cache.rpc.is_closed:
+        cache.rpc = rpc or get_bitcoin_rpc()
+    return cache
+
+
+async def select_unused_address(xpub: str, rpc: Optional[BitcoinRPC] = None,
+                                cache: Optional[AddressCache] = None) -> str:
+    """Sync the xpub's cache and reserve its next unused address"""
+    cache = cache or get_address_cache(xpub, rpc)
+    return await cache.reserve_unused_address()
+
+
+async def withdraw_to_xpub(xpub: str, amount: float, rpc: Optional[BitcoinRPC] = None,
+                           cache: Optional[AddressCache] = None) -> str:
+    """Send ``amount`` BTC from the node wallet to the xpub's next unused address
+
+    Returns the txid. The address is marked used once the send succeeds and
+    released if the node certainly did not run it. After an ambiguous
+    failure (e.g. a read timeout) it stays reserved, since the payment may
+    have gone through, so it is never handed out twice.
+    """
+    if amount <= 0:
+        raise ValueError("Withdrawal amount must be positive")
+    cache = cache or get_address_cache(xpub, rpc)
+    rpc = rpc or cache.rpc
+    address = await cache.reserve_unused_address()
+    try:
+        txid = await rpc.call("sendtoaddress", address, round(amount, 8), idempotent=False)
+    except (RPCError, *UNSENT_ERRORS):
+        cache.release(address)
+        raise
+    except Exception as e:
+        logger.warning("Withdrawal to %s may have been sent (%s); keeping it reserved",
+                       address, e)
+        raise
+    cache.mark_used(address)
+    logger.info("Withdrew %.8f BTC to %s (%s)", amount, address, txid)
+    return txid
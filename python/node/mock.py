@@ -0,0 +1,191 @@
+"""
+Mock bitcoind JSON-RPC server
+File: python/node/mock.py
+Purpose: In-process stand-in for bitcoind's JSON-RPC interface (batches, auth, wallets, descriptors, payments and blocks) served through an httpx transport
+Related components: rpc.py (BitcoinRPC), addresses.py (AddressCache), tests/test_bitcoin_node.py
+Tags: node, bitcoin, json-rpc, mock, testing
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import httpx
+
+
+class MockBitcoind:
+    """Enough of bitcoind's RPC for the node client, without a node
+
+    Addresses derived from a descriptor are deterministic placeholders
+    (not real BIP84 keys); ``address`` computes the same value so tests
+    can pay a given index. ``pay`` puts a transaction in the mempool and
+    ``mine`` confirms it. Watch-only wallets only see payments to
+    addresses in the ranges imported into them, like the real node.
+    ``requests`` counts HTTP requests and ``calls`` lists every method;
+    ``latency`` (seconds) makes each request yield to the event loop like
+    a real network round trip.
+    """
+
+    def __init__(self, user: str = "stackr", password: str = "stackr_password",
+                 chain: str = "test", latency: float = 0.0):
+        self.latency = latency
+        self.auth = "Basic " + base64.b64encode(f"{user}:{password}".encode()).decode()
+        self.chain = chain
+        self.requests = 0
+        self.calls: List[str] = []
+        self.blocks: List[str] = [self._hash("genesis")]
+        # (block height or None while in the mempool, address, amount, txid)
+        self.transactions: List[Tuple[Optional[int], str, float, str]] = []
+        # wallet -> imported (descriptor without checksum, range end)
+        self.imports: Dict[str, Dict[str, int]] = {}
+        self.failures = 0
+        self.lost_replies = 0
+        self.lost_method: Optional[str] = None
+        self._methods: Dict[str, Callable[..., Any]] = {
+            "getblockchaininfo": self._getblockchaininfo,
+            "getnetworkinfo": self._getnetworkinfo,
+            "getdescriptorinfo": self._getdescriptorinfo,
+            "deriveaddresses": self._deriveaddresses,
+            "importdescriptors": self._importdescriptors,
+            "listsinceblock": self._listsinceblock,
+            "sendtoaddress": self._sendtoaddress,
+        }
+
+    @staticmethod
+    def _hash(value: str) -> str:
+        return hashlib.sha256(value.encode()).hexdigest()
+
+    @classmethod
+    def checksum(cls, descriptor: str) -> str:
+        return cls._hash(descriptor)[:8]
+
+    @classmethod
+    def address(cls, descriptor: str, index: int) -> str:
+        """Placeholder address of ``descriptor`` (without checksum) at ``index``"""
+        return "tb1q" + cls._hash(f"{descriptor}/{index}")[:38]
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle_async if self.latency else self.handle)
+
+    async def handle_async(self, request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(self.latency)
+        return self.handle(request)
+
+    def fail_next(self, count: int = 1) -> None:
+        """Drop the next ``count`` requests with a connection error"""
+        self.failures = count
+
+    def lose_replies(self, count: int = 1, method: Optional[str] = None) -> None:
+        """Run the next ``count`` requests (calling ``method``, if given), then time out"""
+        self.lost_replies = count
+        self.lost_method = method
+
+    def pay(self, address: str, amount: float = 0.001) -> str:
+        """Broadcast a payment to ``address`` (unconfirmed until ``mine``)"""
+        txid = self._hash(f"tx{len(self.transactions)}")
+        self.transactions.append((None, address, amount, txid))
+        return txid
+
+    def mine(self) -> str:
+        """Confirm the mempool in a new block"""
+        height = len(self.blocks)
+        self.blocks.append(self._hash(f"block{height}"))
+        self.transactions = [(height if block is None else block, address, amount, txid)
+                             for block, address, amount, txid in self.transactions]
+        return self.blocks[-1]
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        if self.failures:
+            self.failures -= 1
+            raise httpx.ConnectError("connection refused", request=request)
+        self.requests += 1
+        if request.headers.get("Authorization") != self.auth:
+            return httpx.Response(401)
+        path = request.url.path
+        wallet = path[len("/wallet/"):] if path.startswith("/wallet/") else None
+        body = json.loads(request.content)
+        methods = {call.get("method") for call in (body if isinstance(body, list) else [body])}
+        if isinstance(body, list):
+            response = httpx.Response(200, json=[self._dispatch(call, wallet) for call in body])
+        else:
+            reply = self._dispatch(body, wallet)
+            response = httpx.Response(500 if reply["error"] else 200, json=reply)
+        if self.lost_replies and (self.lost_method is None or self.lost_method in methods):
+            self.lost_replies -= 1
+            raise httpx.ReadTimeout("timed out waiting for the reply", request=request)
+        return response
+
+    def _dispatch(self, call: Dict[str, Any], wallet: Optional[str]) -> Dict[str, Any]:
+        method = call.get("method", "")
+        self.calls.append(method)
+        reply: Dict[str, Any] = {"result": None, "error": None, "id": call.get("id")}
+        if method not in self._methods:
+            reply["error"] = {"code": -32601, "message": "Method not found"}
+            return reply
+        try:
+            reply["result"] = self._methods[method](wallet, *call.get("params", []))
+        except ValueError as e:
+            reply["error"] = {"code": -8, "message": str(e)}
+        return reply
+
+    def _getblockchaininfo(self, wallet):
+        return {"chain": self.chain, "blocks": len(self.blocks) - 1,
+                "bestblockhash": self.blocks[-1], "initialblockdownload": False}
+
+    def _getnetworkinfo(self, wallet):
+        return {"version": 280100, "subversion": "/Satoshi:28.1.0/Knots:20250305/"}
+
+    def _split(self, descriptor: str) -> str:
+        base, _, checksum = descriptor.partition("#")
+        if checksum and checksum != self.checksum(base):
+            raise ValueError(f"Provided checksum '{checksum}' does not match computed checksum")
+        return base
+
+    def _getdescriptorinfo(self, wallet, descriptor):
+        base = self._split(descriptor)
+        return {"descriptor": f"{base}#{self.checksum(base)}",
+                "checksum": self.checksum(base), "isrange": "*" in base, "issolvable": True}
+
+    def _deriveaddresses(self, wallet, descriptor, range_=None):
+        if "#" not in descriptor:
+            raise ValueError("Missing checksum")
+        base = self._split(descriptor)
+        start, end = range_ if isinstance(range_, list) else (0, range_ or 0)
+        return [self.address(base, i) for i in range(start, end + 1)]
+
+    def _importdescriptors(self, wallet, requests):
+        if wallet is None:
+            raise ValueError("Wallet file not specified")
+        imported = self.imports.setdefault(wallet, {})
+        results = []
+        for request in requests:
+            base = self._split(request["desc"])
+            imported[base] = max(imported.get(base, -1), request["range"][1])
+            results.append({"success": True})
+        return results
+
+    def _watched(self, wallet: Optional[str]) -> set:
+        return {self.address(base, i)
+                for base, end in self.imports.get(wallet, {}).items()
+                for i in range(end + 1)}
+
+    def _listsinceblock(self, wallet, blockhash="", target_confirmations=1,
+                        include_watchonly=True):
+        if wallet is None:
+            raise ValueError("Wallet file not specified")
+        since = self.blocks.index(blockhash) if blockhash else -1
+        watched = self._watched(wallet)
+        transactions = [
+            {"address": address, "category": "receive", "amount": amount, "txid": txid,
+             "confirmations": 0 if block is None else len(self.blocks) - block,
+             "blockhash": None if block is None else self.blocks[block]}
+            for block, address, amount, txid in self.transactions
+            if address in watched and (block is None or block > since)
+        ]
+        return {"transactions": transactions, "removed": [], "lastblock": self.blocks[-1]}
+
+    def _sendtoaddress(self, wallet, address, amount, *args):
+        if amount <= 0:
+            raise ValueError("Invalid amount for send")
+        return self.pay(address, amount)
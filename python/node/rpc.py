@@ -0,0 +1,231 @@
+"""
+Bitcoin Knots JSON-RPC client
+File: python/node/rpc.py
+Purpose: Async JSON-RPC client that batches calls into one HTTP request over a kept-alive connection, with retries and per-call wallet routing
+Related components: addresses.py (AddressCache), mock.py (MockBitcoind), main.py (/health)
+Tags: node, bitcoin, json-rpc, batching, connection-pool
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import httpx
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+RPCCall = Tuple[str, Sequence[Any]]
+
+# bitcoind answers this while loading the block index or wallet
+RPC_IN_WARMUP = -28
+
+
+class NodeWarmingUpError(httpx.TransportError):
+    """The node rejected the request while starting up (it did not run)"""
+
+
+# Failures where the node never ran the request, so even a state-changing
+# call can be resent
+UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, NodeWarmingUpError)
+
+
+class RPCError(Exception):
+    """Error returned by the node for one JSON-RPC call"""
+
+    def __init__(self, code: int, message: str, method: str = ""):
+        super().__init__(f"{method or 'rpc'} failed ({code}): {message}")
+        self.code = code
+        self.message = message
+        self.method = method
+
+
+class BitcoinRPCConfig(BaseModel):
+    """Connection settings for the Bitcoin Knots RPC interface"""
+    host: str = "localhost"
+    port: int = 18332
+    user: str = "stackr"
+    password: str = "stackr_password"
+    network: str = "testnet"
+    # Wallet used when a call does not name one (None: node-level calls only)
+    wallet: Optional[str] = None
+    # Request timeout in seconds
+    timeout: float = 30.0
+    retry_attempts: int = 3
+    # Base delay of the exponential backoff between attempts, in seconds
+    retry_backoff: float = 0.5
+    # Largest number of calls sent in one batch request
+    max_batch: int = 500
+    max_keepalive_connections: int = 2
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @classmethod
+    def from_env(cls) -> "BitcoinRPCConfig":
+        """Build settings from BITCOIN_RPC_* environment variables"""
+        return cls(
+            host=os.getenv("BITCOIN_RPC_HOST", "localhost"),
+            port=int(os.getenv("BITCOIN_RPC_PORT", "18332")),
+            user=os.getenv("BITCOIN_RPC_USER", "stackr"),
+            password=os.getenv("BITCOIN_RPC_PASSWORD", "stackr_password"),
+            network=os.getenv("BITCOIN_NETWORK", "testnet"),
+            wallet=os.getenv("BITCOIN_RPC_WALLET") or None,
+            timeout=int(os.getenv("BITCOIN_RPC_TIMEOUT", "30000")) / 1000.0,
+            retry_attempts=int(os.getenv("BITCOIN_RPC_RETRY_ATTEMPTS", "3")),
+            max_batch=int(os.getenv("BITCOIN_RPC_MAX_BATCH", "500"))
+        )
+
+
+class BitcoinRPC:
+    """JSON-RPC client for one node over a single keep-alive HTTP client
+
+    ``batch`` sends many calls as one JSON-RPC array, so a gap-limit scan
+    costs one round trip instead of one per address. Transport errors,
+    non-JSON 5xx responses and warm-up errors are retried with exponential
+    backoff; any other node error is raised as RPCError. Calls made with
+    ``idempotent=False`` (payments) are only resent after UNSENT_ERRORS: a
+    read timeout may arrive after the node already ran them.
+    """
+
+    def __init__(self, config: Optional[BitcoinRPCConfig] = None,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.config = config or BitcoinRPCConfig.from_env()
+        self._ids = itertools.count(1)
+        self._client = httpx.AsyncClient(
+            base_url=self.config.url,
+            auth=(self.config.user, self.config.password),
+            timeout=self.config.timeout,
+            limits=httpx.Limits(max_keepalive_connections=self.config.max_keepalive_connections),
+            transport=transport
+        )
+
+    @classmethod
+    def from_env(cls) -> "BitcoinRPC":
+        return cls(BitcoinRPCConfig.from_env())
+
+    def _path(self, wallet: Optional[str]) -> str:
+        wallet = wallet if wallet is not None else self.config.wallet
+        return f"/wallet/{wallet}" if wallet else "/"
+
+    async def call(self, method: str, *params: Any, wallet: Optional[str] = None,
+                   idempotent: bool = True) -> Any:
+        """Run one RPC call and return its result"""
+        return (await self.batch([(method, params)], wallet=wallet,
+                                 idempotent=idempotent))[0]
+
+    async def batch(self, calls: Sequence[RPCCall], wallet: Optional[str] = None,
+                    return_errors: bool = False, idempotent: bool = True) -> List[Any]:
+        """Run calls as JSON-RPC batches and return their results in order
+
+        Calls are split into requests of at most ``max_batch``. A failed
+        call raises its RPCError, or takes its result's place when
+        ``return_errors`` is set.
+        """
+        results: List[Any] = []
+        size = max(1, self.config.max_batch)
+        for start in range(0, len(calls), size):
+            chunk = calls[start:start + size]
+            payload = [{"jsonrpc": "1.0", "id": next(self._ids), "method": method,
+                        "params": list(params)} for method, params in chunk]
+            replies = await self._post(self._path(wallet), payload, idempotent)
+            by_id = {reply.get("id"): reply for reply in replies}
+            for request in payload:
+                reply = by_id.get(request["id"])
+                if reply is None:
+                    error = RPCError(-32603, "missing response", request["method"])
+                elif reply.get("error"):
+                    error = RPCError(reply["error"].get("code", -32603),
+                                     reply["error"].get("message", ""), request["method"])
+                else:
+                    results.append(reply.get("result"))
+                    continue
+                if not return_errors:
+                    raise error
+                results.append(error)
+        return results
+
+    async def _post(self, path: str, payload: List[Dict[str, Any]],
+                    idempotent: bool = True) -> List[Dict[str, Any]]:
+        attempts = max(1, self.config.retry_attempts)
+        for attempt in range(attempts):
+            try:
+                response = await self._client.post(path, json=payload)
+                if response.status_code == 401:
+                    raise RPCError(-1, "unauthorized: check BITCOIN_RPC_USER/PASSWORD")
+                try:
+                    replies = response.json()
+                except ValueError:
+                    response.raise_for_status()
+                    raise RPCError(-32700, f"invalid response: {response.text[:200]}")
+                if isinstance(replies, dict):
+                    # Whole-request failures come back as a single object
+                    error = replies.get("error") or {}
+                    if error.get("code") == RPC_IN_WARMUP:
+                        raise NodeWarmingUpError(error.get("message", "node warming up"))
+                    raise RPCError(error.get("code", -32603), error.get("message", ""))
+                if any((reply.get("error") or {}).get("code") == RPC_IN_WARMUP
+                       for reply in replies):
+                    raise NodeWarmingUpError("node warming up")
+                return replies
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                if attempt == attempts - 1 or not (idempotent or isinstance(e, UNSENT_ERRORS)):
+                    raise
+                delay = self.config.retry_backoff * 2 ** attempt
+                logger.warning("Bitcoin RPC request failed (%s); retrying in %.1fs", e, delay)
+                await asyncio.sleep(delay)
+        raise AssertionError("unreachable")
+
+    async def verify(self) -> Dict[str, Any]:
+        """Chain and network info in one round trip (raises when the node is unusable)"""
+        chain, network = await self.batch([("getblockchaininfo", ()), ("getnetworkinfo", ())],
+                                          wallet="")
+        return {"chain": chain.get("chain"), "blocks": chain.get("blocks"),
+                "initialblockdownload": chain.get("initialblockdownload", False),
+                "version": network.get("version"), "subversion": network.get("subversion")}
+
+    @property
+    def is_closed(self) -> bool:
+        return self._client.is_closed
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def __aenter__(self) -> "BitcoinRPC":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+
+_rpc: Optional[BitcoinRPC] = None
+_rpc_lock = threading.Lock()
+
+
+def get_bitcoin_rpc() -> BitcoinRPC:
+    """Process-wide node client, so every caller shares one keep-alive connection"""
+    global _rpc
+    if _rpc is None or _rpc.is_closed:
+        with _rpc_lock:
+            if _rpc is None or _rpc.is_closed:
+                _rpc = BitcoinRPC.from_env()
+    return _rpc
+
+
+def configure_bitcoin_rpc(rpc: Optional[BitcoinRPC]) -> None:
+    """Replace the process-wide client (None rebuilds it from the environment)"""
+    global _rpc
+    with _rpc_lock:
+        _rpc = rpc
+
+
+async def aclose_bitcoin_rpc() -> None:
+    """Close the shared node client, if created (call on application shutdown)"""
+    global _rpc
+    with _rpc_lock:
+        rpc, _rpc = _rpc, None
+    if rpc is not None:
+        await rpc.aclose()
@@ -5,24 +5,30 @@ Run Bitcoin news workflow with API keys from 1Password
 
 import asyncio
 import os
-import subprocess
 from dotenv import load_dotenv
+from llm import GrokStrategy, LLMConfig, OpenAIStrategy
+from llm.secret_provider import (
+    SecretResolutionError,
+    get_secret_provider,
+    is_secret_reference
+)
 from workflows.bitcoin_news import BitcoinNewsWorkflow
 
 
-def extract_1password_secret(reference):
-    """Extract secret from 1Password using CLI"""
-    try:
-        result = subprocess.run(
-            ['op', 'read', reference],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        return result.stdout.strip()
-    except subprocess.CalledProcessError as e:
-        print(f"Error extracting from 1Password: {e}")
-        return None
+# Used when .env does not hold an op:// reference for the key
+DEFAULT_REFERENCES = {
+    "OPENAI_API_KEY": "op://S devops/gwa4opwgz4hsels43cb6mtjpcq/openai-dev-api-key",
+    "GROK_API_KEY": ("op://S devops/Stackr-Dev/Section_d4p7gl7tqctpf7t44tezv3a4ym/"
+                     "grok-dev-api-key"),
+}
+
+
+def secret_references():
+    """op:// reference per API key variable, preferring the one in .env"""
+    return {
+        name: os.getenv(name) if is_secret_reference(os.getenv(name)) else default
+        for name, default in DEFAULT_REFERENCES.items()
+    }
 
 
 async def main():
@@ -32,45 +38,28 @@ async def main():
     # Load .env file to get 1Password references
     load_dotenv()
 
-    # Extract OpenAI API key
-    openai_ref = os.getenv("OPENAI_API_KEY")
-    if not openai_ref:
-        print("Error: OPENAI_API_KEY not found in .env")
-        return
-
-    # Use the correct item ID for OpenAI
-    openai_key = extract_1password_secret(
-        "op://S devops/gwa4opwgz4hsels43cb6mtjpcq/openai-dev-api-key"
-    )
-    if not openai_key:
-        print("Error: Could not extract OpenAI API key from 1Password")
-        return
-
-    # Extract Grok API key
-    grok_ref = os.getenv("GROK_API_KEY")
-    if not grok_ref:
-        print("Error: GROK_API_KEY not found in .env")
-        return
-
-    # Use the correct item ID for Grok
-    grok_key = extract_1password_secret(
-        ("op://S devops/Stackr-Dev/Section_d4p7gl7tqctpf7t44tezv3a4ym/"
-         "grok-dev-api-key")
-    )
-    if not grok_key:
-        print("Error: Could not extract Grok API key from 1Password")
+    # Resolve every key with concurrent `op read` calls; the values stay in
+    # the provider's memory cache and are passed to the strategies directly
+    references = secret_references()
+    try:
+        values = await get_secret_provider().resolve_many(references.values())
+    except SecretResolutionError as e:
+        print(f"Error extracting from 1Password: {e}")
         return
-
-    # Set environment variables for the workflow
-    os.environ["OPENAI_API_KEY"] = openai_key
-    os.environ["GROK_API_KEY"] = grok_key
+    openai_key = values[references["OPENAI_API_KEY"]]
+    grok_key = values[references["GROK_API_KEY"]]
 
     print("✅ API keys extracted successfully!")
     print("🚀 Starting Bitcoin News Workflow...")
 
     try:
         # Create and run workflow
-        workflow = BitcoinNewsWorkflow()
+        workflow = BitcoinNewsWorkflow(
+            openai=OpenAIStrategy(LLMConfig(provider="openai", api_key=openai_key,
+                                            model="gpt-4o")),
+            grok=GrokStrategy(LLMConfig(provider="grok", api_key=grok_key,
+                                        model="grok-3-mini"))
+        )
         result = await workflow.run()
 
         # Print results
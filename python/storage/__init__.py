@@ -0,0 +1,26 @@
+"""
+Storage package
+File: python/storage/__init__.py
+Purpose: Re-exports the append-only transaction ledger and its pagination types
+Related components: ledger.py, main.py
+Tags: storage, ledger, sqlite, package
+"""
+
+# Import the ledger
+from .ledger import (
+    Ledger,
+    LedgerEntry,
+    LedgerPage,
+    decode_cursor,
+    encode_cursor
+)
+
+# Export all public components
+__all__ = [
+    # Ledger
+    "Ledger",
+    "LedgerEntry",
+    "LedgerPage",
+    "decode_cursor",
+    "encode_cursor"
+]
@@ -0,0 +1,361 @@
+"""
+Append-only transaction ledger
+File: python/storage/ledger.py
+Purpose: SQLite (WAL mode) ledger of purchases, withdrawals and settings changes with group-committed batched inserts, keyset-paginated queries and constant-memory CSV/JSON export generators
+Related components: main.py (/ledger endpoints), workflows/checkpoint.py (same WAL batching pattern), README.md (Export Logs)
+Tags: storage, ledger, sqlite, wal, pagination, export
+"""
+
+import asyncio
+import base64
+import csv
+import io
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+# Columns in storage and export order
+COLUMNS = ("id", "timestamp", "user_id", "kind", "strategy_id", "amount_btc",
+           "amount_fiat", "price", "txid", "details")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ledger (
+    id INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    user_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    strategy_id TEXT,
+    amount_btc REAL NOT NULL DEFAULT 0,
+    amount_fiat REAL NOT NULL DEFAULT 0,
+    price REAL,
+    txid TEXT,
+    details TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS idx_ledger_time ON ledger (timestamp, id);
+CREATE INDEX IF NOT EXISTS idx_ledger_user_time ON ledger (user_id, timestamp, id);
+CREATE INDEX IF NOT EXISTS idx_ledger_strategy_time ON ledger (strategy_id, timestamp, id);
+CREATE TRIGGER IF NOT EXISTS ledger_no_update BEFORE UPDATE ON ledger
+BEGIN SELECT RAISE(ABORT, 'ledger is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS ledger_no_delete BEFORE DELETE ON ledger
+BEGIN SELECT RAISE(ABORT, 'ledger is append-only'); END;
+"""
+
+
+class LedgerEntry(BaseModel):
+    """One ledger event (a buy, sell, withdrawal, fee or settings change)"""
+    # Assigned on append
+    id: Optional[int] = None
+    # Epoch seconds
+    timestamp: float = Field(default_factory=time.time)
+    user_id: str
+    kind: str
+    strategy_id: Optional[str] = None
+    amount_btc: float = 0.0
+    amount_fiat: float = 0.0
+    price: Optional[float] = None
+    txid: Optional[str] = None
+    details: Dict[str, Any] = Field(default_factory=dict)
+
+    def to_row(self) -> Tuple[Any, ...]:
+        return (self.id, self.timestamp, self.user_id, self.kind, self.strategy_id,
+                self.amount_btc, self.amount_fiat, self.price, self.txid,
+                json.dumps(self.details, separators=(",", ":"), default=str))
+
+    @classmethod
+    def from_row(cls, row: Tuple[Any, ...]) -> "LedgerEntry":
+        values = dict(zip(COLUMNS, row))
+        values["details"] = json.loads(values["details"] or "{}")
+        return cls(**values)
+
+
+class LedgerPage(BaseModel):
+    """One page of a keyset-paginated query"""
+    entries: List[LedgerEntry]
+    # Pass back as ``cursor`` for the next page; None on the last page
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(entry: LedgerEntry) -> str:
+    """Opaque cursor pointing just past ``entry``"""
+    raw = json.dumps([entry.timestamp, entry.id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, entry_id = json.loads(raw)
+        return float(timestamp), int(entry_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid ledger cursor: {cursor!r}") from e
+
+
+def _resolve(waiter: asyncio.Future, entry: LedgerEntry) -> None:
+    if not waiter.done():
+        waiter.set_result(entry)
+
+
+def _isoformat(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+class Ledger:
+    """Append-only SQLite ledger with group commit
+
+    ``append`` and ``extend`` commit before returning (``extend`` in one
+    transaction per ``batch_size`` entries). ``record`` is the async form
+    for many concurrent writers: entries wait at most ``flush_interval``
+    seconds (or until ``batch_size`` are pending) and are committed
+    together, and each call resolves once its entry is durable. Ids are
+    assigned by SQLite, so several processes can share one file. Reads
+    flush first. Rows can never be updated or deleted.
+
+    Queries page on the ``(timestamp, id)`` key rather than OFFSET, so
+    page N costs the same as page 1, and the export generators walk the
+    same keyset in ``chunk_size`` steps on their own connection: memory
+    stays constant and WAL lets appends continue during an export.
+    """
+
+    def __init__(self, path: str, batch_size: int = 256, flush_interval: float = 0.05):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending: List[Tuple[LedgerEntry, asyncio.Future]] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._lock = threading.RLock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = self._connect()
+        self._db.executescript(SCHEMA)
+        self._db.commit()
+
+    @classmethod
+    def from_env(cls) -> Optional["Ledger"]:
+        """Ledger at LEDGER_DB_PATH, or None when unset"""
+        path = os.getenv("LEDGER_DB_PATH")
+        if not path:
+            return None
+        return cls(path, batch_size=int(os.getenv("LEDGER_BATCH_SIZE", "256")),
+                   flush_interval=float(os.getenv("LEDGER_FLUSH_INTERVAL", "0.05")))
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    # -- writes -------------------------------------------------------------
+
+    def _insert(self, entries: List[LedgerEntry]) -> List[LedgerEntry]:
+        """Insert entries in one transaction and return them with their ids"""
+        sql = (f"INSERT INTO ledger ({', '.join(COLUMNS[1:])}) "
+               f"VALUES ({', '.join('?' * (len(COLUMNS) - 1))}) RETURNING id")
+        with self._lock, self._db:
+            return [entry.model_copy(update={
+                        "id": self._db.execute(sql, entry.to_row()[1:]).fetchone()[0]})
+                    for entry in entries]
+
+    def append(self, entry: LedgerEntry) -> LedgerEntry:
+        """Commit one entry and return it with its id"""
+        return self._insert([entry])[0]
+
+    def extend(self, entries: List[LedgerEntry]) -> List[LedgerEntry]:
+        """Commit many entries, one transaction per ``batch_size``"""
+        committed: List[LedgerEntry] = []
+        size = max(1, self.batch_size)
+        for start in range(0, len(entries), size):
+            committed += self._insert(entries[start:start + size])
+        return committed
+
+    async def record(self, entry: LedgerEntry) -> LedgerEntry:
+        """Queue an entry for the next group commit and return it once durable
+
+        The first record of a group schedules a flush ``flush_interval``
+        later; every record arriving before it joins the same transaction.
+        The commit runs on a worker thread, so the event loop never waits
+        on SQLite.
+        """
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        with self._lock:
+            self._loop = loop
+            self._pending.append((entry, waiter))
+            if len(self._pending) >= self.batch_size:
+                self._flush_in_background()
+            else:
+                self._schedule()
+        return await waiter
+
+    def _schedule(self) -> None:
+        if self._pending and self._flush_handle is None and self._loop is not None \
+                and not self._loop.is_closed():
+            self._flush_handle = self._loop.call_later(self.flush_interval,
+                                                       self._flush_in_background)
+
+    def _reschedule(self) -> None:
+        with self._lock:
+            self._schedule()
+
+    def _flush_in_background(self) -> None:
+        with self._lock:
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+                self._flush_handle = None
+            self._loop.run_in_executor(None, self._flush_logged)
+
+    def _flush_logged(self) -> None:
+        try:
+            self.flush()
+        except Exception as e:
+            # The entries stay queued; flush() re-armed the timer
+            logger.warning("Ledger group commit failed, retrying: %s", e)
+
+    def flush(self) -> int:
+        """Commit queued ``record`` entries in a single transaction; return how many
+
+        On failure the entries stay queued (and are retried after
+        ``flush_interval``), so a record is never dropped.
+        """
+        with self._lock:
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+                self._flush_handle = None
+            pending, self._pending = self._pending, []
+            if not pending:
+                return 0
+            try:
+                committed = self._insert([entry for entry, _ in pending])
+            except Exception:
+                self._pending = pending + self._pending
+                if self._loop is not None and not self._loop.is_closed():
+                    # May run on a worker thread: arm the timer on the loop
+                    self._loop.call_soon_threadsafe(self._reschedule)
+                raise
+        for (_, waiter), entry in zip(pending, committed):
+            waiter.get_loop().call_soon_threadsafe(_resolve, waiter, entry)
+        return len(committed)
+
+    def close(self) -> None:
+        """Flush and close the database"""
+        with self._lock:
+            self.flush()
+            self._db.close()
+
+    # -- reads --------------------------------------------------------------
+
+    @staticmethod
+    def _where(user_id: Optional[str] = None, strategy_id: Optional[str] = None,
+               kind: Optional[str] = None, start: Optional[float] = None,
+               end: Optional[float] = None,
+               after: Optional[Tuple[float, int]] = None) -> Tuple[str, List[Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        for column, value in (("user_id", user_id), ("strategy_id", strategy_id),
+                              ("kind", kind)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("timestamp < ?")
+            params.append(end)
+        if after is not None:
+            clauses.append("(timestamp, id) > (?, ?)")
+            params.extend(after)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def _page(self, db: sqlite3.Connection, limit: int,
+              after: Optional[Tuple[float, int]], **filters) -> List[LedgerEntry]:
+        where, params = self._where(after=after, **filters)
+        rows = db.execute(f"SELECT {', '.join(COLUMNS)} FROM ledger{where} "
+                          f"ORDER BY timestamp, id LIMIT ?", (*params, limit))
+        return [LedgerEntry.from_row(row) for row in rows]
+
+    def query(self, cursor: Optional[str] = None, limit: int = 100,
+              **filters) -> LedgerPage:
+        """Entries in (timestamp, id) order after ``cursor``
+
+        Filters: ``user_id``, ``strategy_id``, ``kind`` and the half-open
+        time range ``start`` <= timestamp < ``end``.
+        """
+        if limit < 1:
+            raise ValueError("limit must be positive")
+        after = decode_cursor(cursor) if cursor else None
+        self.flush()
+        with self._lock:
+            # One extra row tells whether another page follows
+            entries = self._page(self._db, limit + 1, after, **filters)
+        if len(entries) <= limit:
+            return LedgerPage(entries=entries)
+        entries = entries[:limit]
+        return LedgerPage(entries=entries, next_cursor=encode_cursor(entries[-1]))
+
+    def count(self, **filters) -> int:
+        self.flush()
+        where, params = self._where(**filters)
+        with self._lock:
+            return self._db.execute(f"SELECT COUNT(*) FROM ledger{where}", params).fetchone()[0]
+
+    def iter_entries(self, chunk_size: int = 1000, **filters) -> Iterator[LedgerEntry]:
+        """Every matching entry, read ``chunk_size`` rows at a time
+
+        Uses its own connection, so it may be consumed from another thread
+        (e.g. a streaming response) while appends continue.
+        """
+        self.flush()
+        db = self._connect()
+        try:
+            after: Optional[Tuple[float, int]] = None
+            while True:
+                entries = self._page(db, chunk_size, after, **filters)
+                yield from entries
+                if len(entries) < chunk_size:
+                    return
+                after = (entries[-1].timestamp, entries[-1].id)
+        finally:
+            db.close()
+
+    def iter_csv(self, chunk_size: int = 1000, **filters) -> Iterator[str]:
+        """CSV export, one text chunk per ``chunk_size`` rows (timestamps in ISO 8601 UTC)"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(COLUMNS)
+        rows = 0
+        for entry in self.iter_entries(chunk_size, **filters):
+            row = list(entry.to_row())
+            row[1] = _isoformat(entry.timestamp)
+            writer.writerow(row)
+            rows += 1
+            if rows % chunk_size == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    def iter_json(self, chunk_size: int = 1000, **filters) -> Iterator[str]:
+        """JSON array export streamed in chunks (timestamps in ISO 8601 UTC)"""
+        parts: List[str] = ["["]
+        first = True
+        for entry in self.iter_entries(chunk_size, **filters):
+            item = entry.model_dump()
+            item["timestamp"] = _isoformat(entry.timestamp)
+            parts.append(("" if first else ",") + json.dumps(item, default=str))
+            first = False
+            if len(parts) >= chunk_size:
+                yield "".join(parts)
+                parts = []
+        parts.append("]")
+        yield "".join(parts)
@@ -0,0 +1,103 @@
+"""
+Accumulation strategy package
+File: python/strategies/__init__.py
+Purpose: Re-exports the vectorized strategy engine, its registry and the strategy implementations
+Related components: engine.py, base.py, STRATEGIES.md
+Tags: strategies, dca, package
+"""
+
+# Import base classes and price history
+from .base import (
+    ACTIONS,
+    BUY,
+    GENESIS,
+    HOLD,
+    SELL,
+    FlatDCAStrategy,
+    PriceFeed,
+    PriceHistory,
+    PriceStrategy,
+    StrategyResult,
+    as_history,
+    days_since_genesis
+)
+
+# Import streaming indicators
+from .indicators import (
+    EWMA,
+    Indicator,
+    IndicatorSet,
+    RollingMean,
+    RollingVariance,
+    RunningRegression,
+    StreamingQuantile
+)
+
+# Import strategy implementations
+from .power_law import PowerLawChannelStrategy, PowerLawStrategy
+from .technical import MovingAverageDipStrategy, VolatilityAdjustedStrategy
+from .cycle import HalvingCycleStrategy
+from .ensemble import EnsembleStrategy
+
+# Import registry and evaluation entry points
+from .engine import (
+    BatchEvaluation,
+    StrategyFactory,
+    StreamingStrategy,
+    calculate_dca_amount,
+    evaluate_all,
+    evaluate_batch,
+    evaluate_strategy
+)
+
+# Import memory-mapped price storage
+from .store import OHLCV, PriceArchive, PriceStore, build_rollup
+
+# Export all public components
+__all__ = [
+    # Base classes
+    "ACTIONS",
+    "BUY",
+    "GENESIS",
+    "HOLD",
+    "SELL",
+    "FlatDCAStrategy",
+    "PriceFeed",
+    "PriceHistory",
+    "PriceStrategy",
+    "StrategyResult",
+    "as_history",
+    "days_since_genesis",
+
+    # Streaming indicators
+    "EWMA",
+    "Indicator",
+    "IndicatorSet",
+    "RollingMean",
+    "RollingVariance",
+    "RunningRegression",
+    "StreamingQuantile",
+
+    # Strategy implementations
+    "PowerLawStrategy",
+    "PowerLawChannelStrategy",
+    "MovingAverageDipStrategy",
+    "VolatilityAdjustedStrategy",
+    "HalvingCycleStrategy",
+    "EnsembleStrategy",
+
+    # Registry and evaluation
+    "BatchEvaluation",
+    "StrategyFactory",
+    "StreamingStrategy",
+    "calculate_dca_amount",
+    "evaluate_all",
+    "evaluate_batch",
+    "evaluate_strategy",
+
+    # Price storage
+    "OHLCV",
+    "PriceArchive",
+    "PriceStore",
+    "build_rollup"
+]
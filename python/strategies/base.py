@@ -0,0 +1,278 @@
+"""
+Base accumulation strategy classes and price history
+File: python/strategies/base.py
+Purpose: Defines StrategyResult, the NumPy-backed PriceHistory and the vectorized PriceStrategy interface
+Related components: engine.py, power_law.py, technical.py, cycle.py, ensemble.py, STRATEGIES.md
+Tags: strategies, dca, numpy, vectorized, base
+"""
+
+import heapq
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Literal, Sequence, Tuple, Union
+import numpy as np
+from pydantic import BaseModel
+from .indicators import IndicatorSet
+
+
+GENESIS = datetime(2009, 1, 3, tzinfo=timezone.utc)
+
+# Action codes used in the vectorized paths; ACTIONS maps them to names
+HOLD, BUY, SELL = 0, 1, 2
+ACTIONS = ("hold", "buy", "sell")
+
+
+def days_since_genesis(when: datetime) -> float:
+    """Days from the genesis block to ``when`` (naive datetimes are UTC)"""
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return (when - GENESIS).total_seconds() / 86400.0
+
+
+class PriceFeed(BaseModel):
+    """One historical price observation"""
+    timestamp: datetime
+    price: float
+
+
+class StrategyResult(BaseModel):
+    """Action and DCA multiplier chosen by a strategy"""
+    action: Literal["buy", "sell", "hold"]
+    multiplier: float
+    strategy_id: str
+    # True when the strategy lacked data and fell back to flat DCA
+    fallback: bool = False
+
+
+class PriceHistory:
+    """Historical prices as NumPy arrays with memoized derived values
+
+    ``prices`` and ``days`` (days since genesis) are sorted ascending.
+    Strategies cache what they derive from the history (moving averages,
+    fitted models, percentile bands) through ``derived``, so evaluating
+    many users or strategies against one history computes each only once.
+    Build the history once and reuse it; converting ``PriceFeed`` lists on
+    every call is the slow part.
+    """
+
+    def __init__(self, prices: Any, days: Any):
+        prices = np.asarray(prices, dtype=np.float64)
+        days = np.asarray(days, dtype=np.float64)
+        if prices.ndim != 1 or prices.shape != days.shape:
+            raise ValueError("prices and days must be 1-D arrays of equal length")
+        if days.size > 1 and np.any(np.diff(days) < 0):
+            order = np.argsort(days, kind="stable")
+            prices, days = prices[order], days[order]
+        self.prices = prices
+        self.days = days
+        self._derived: Dict[Any, Any] = {}
+
+    @classmethod
+    def from_feeds(cls, feeds: Iterable[PriceFeed]) -> "PriceHistory":
+        """History from PriceFeed objects (or dicts with timestamp and price)"""
+        feeds = [PriceFeed.model_validate(f) if isinstance(f, dict) else f for f in feeds]
+        return cls([f.price for f in feeds],
+                   [days_since_genesis(f.timestamp) for f in feeds])
+
+    @classmethod
+    def daily(cls, prices: Any, first_day: float) -> "PriceHistory":
+        """History of daily closes starting ``first_day`` days after genesis"""
+        prices = np.asarray(prices, dtype=np.float64)
+        return cls(prices, first_day + np.arange(prices.size, dtype=np.float64))
+
+    def __len__(self) -> int:
+        return int(self.prices.size)
+
+    def derived(self, key: Any, compute: Callable[[], Any]) -> Any:
+        """Value of ``compute()`` memoized under ``key``"""
+        try:
+            return self._derived[key]
+        except KeyError:
+            value = self._derived[key] = compute()
+            return value
+
+    @property
+    def log_prices(self) -> np.ndarray:
+        return self.derived("log_prices", lambda: np.log(self.prices))
+
+    @property
+    def log_returns(self) -> np.ndarray:
+        return self.derived("log_returns", lambda: np.diff(self.log_prices))
+
+
+HistoricalData = Union[PriceHistory, Sequence[PriceFeed], Sequence[Dict[str, Any]], None]
+
+
+def as_history(data: HistoricalData) -> PriceHistory:
+    """PriceHistory for any supported form of historical data"""
+    if isinstance(data, PriceHistory):
+        return data
+    if data is None:
+        return PriceHistory([], [])
+    return PriceHistory.from_feeds(data)
+
+
+class PriceStrategy:
+    """Base class for accumulation strategies
+
+    Subclasses implement ``signals``, vectorized over a batch of current
+    prices and days since genesis (one entry per user) against a shared
+    history, returning action codes and multipliers. Entries without
+    usable data fall back to flat DCA (buy, multiplier 1.0).
+    """
+
+    strategy_id = "base"
+    # Histories shorter than this fall back to flat DCA
+    min_history = 0
+
+    def __init__(self, min_multiplier: float = 0.5, max_multiplier: float = 3.0):
+        self.min_multiplier = min_multiplier
+        self.max_multiplier = max_multiplier
+
+    def signals(self, prices: np.ndarray, history: PriceHistory,
+                days: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Action codes and multipliers - to be implemented by subclasses"""
+        raise NotImplementedError
+
+    def clamp(self, multipliers: np.ndarray) -> np.ndarray:
+        return np.clip(multipliers, self.min_multiplier, self.max_multiplier)
+
+    def evaluate_many(self, prices: Any, history: PriceHistory, days: Any
+                      ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized evaluation returning (actions, multipliers, fallback mask)"""
+        return self._evaluate(prices, days, len(history),
+                              lambda p, d: self.signals(p, history, d))
+
+    def _evaluate(self, prices: Any, days: Any, observed: int,
+                  signals: Callable[[np.ndarray, np.ndarray], Tuple[np.ndarray, np.ndarray]]
+                  ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        prices = np.atleast_1d(np.asarray(prices, dtype=np.float64))
+        days = np.broadcast_to(np.asarray(days, dtype=np.float64), prices.shape)
+        fallback = ~((prices > 0) & (days > 0) & np.isfinite(prices))
+        if observed < self.min_history or fallback.all():
+            fallback = np.ones(prices.shape, dtype=bool)
+            actions = np.full(prices.shape, BUY, dtype=np.int8)
+            return actions, np.ones(prices.shape), fallback
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            actions, multipliers = signals(prices, days)
+        actions = np.where(fallback, BUY, actions).astype(np.int8)
+        multipliers = np.where(fallback, 1.0, multipliers)
+        return actions, multipliers, fallback
+
+    def series_signals(self, prices: np.ndarray, days: np.ndarray
+                       ) -> Tuple[np.ndarray, np.ndarray]:
+        """Walk-forward signals; subclasses override with a vectorized version
+
+        This reference implementation rebuilds the history for every entry.
+        """
+        actions = np.full(prices.shape, BUY, dtype=np.int8)
+        multipliers = np.ones(prices.shape)
+        for t in range(self.min_history, len(prices)):
+            history = PriceHistory(prices[:t], days[:t])
+            action, multiplier = self.signals(prices[t:t + 1], history, days[t:t + 1])
+            actions[t], multipliers[t] = action[0], multiplier[0]
+        return actions, multipliers
+
+    def evaluate_series(self, prices: Any, days: Any
+                        ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Walk-forward evaluation over a price series (for backtests)
+
+        Entry ``t`` uses ``prices[:t]`` as history and ``prices[t]`` as the
+        current price, so no entry sees the future. Returns the same
+        (actions, multipliers, fallback mask) as ``evaluate_many``.
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        days = np.asarray(days, dtype=np.float64)
+        fallback = ~((prices > 0) & (days > 0) & np.isfinite(prices))
+        fallback[:self.min_history] = True
+        if fallback.all():
+            return (np.full(prices.shape, BUY, dtype=np.int8), np.ones(prices.shape),
+                    fallback)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            actions, multipliers = self.series_signals(prices, days)
+        actions = np.where(fallback, BUY, actions).astype(np.int8)
+        multipliers = np.where(fallback, 1.0, multipliers)
+        return actions, multipliers, fallback
+
+    def indicators(self) -> Dict[str, Any]:
+        """Initial per-tick indicator state for ``stream_signals`` (none by default)"""
+        return {}
+
+    def observe(self, indicators: IndicatorSet, price: float, day: float) -> None:
+        """Fold a new close into the indicators; ``indicators.last`` is still the previous close"""
+
+    def update_indicators(self, indicators: IndicatorSet, price: float, day: float) -> None:
+        self.observe(indicators, price, day)
+        indicators.observed(price)
+
+    def stream_signals(self, prices: np.ndarray, days: np.ndarray,
+                       indicators: IndicatorSet) -> Tuple[np.ndarray, np.ndarray]:
+        """``signals`` computed from streamed indicators instead of the history"""
+        raise NotImplementedError(f"Strategy '{self.strategy_id}' has no streaming form")
+
+    def stream_evaluate(self, prices: Any, days: Any, indicators: IndicatorSet
+                        ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """``evaluate_many`` against indicator state, in O(1) per price"""
+        return self._evaluate(prices, days, indicators.count,
+                              lambda p, d: self.stream_signals(p, d, indicators))
+
+    def evaluate(self, current_price: float, history: PriceHistory,
+                 days: float) -> StrategyResult:
+        """Evaluate a single price"""
+        actions, multipliers, fallback = self.evaluate_many(current_price, history, days)
+        return StrategyResult(action=ACTIONS[actions[0]],
+                              multiplier=float(multipliers[0]),
+                              strategy_id=self.strategy_id,
+                              fallback=bool(fallback[0]))
+
+
+class FlatDCAStrategy(PriceStrategy):
+    """Plain DCA: always buy the base amount"""
+
+    strategy_id = "flat-dca"
+
+    def signals(self, prices: np.ndarray, history: PriceHistory,
+                days: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return np.full(prices.shape, BUY, dtype=np.int8), np.ones(prices.shape)
+
+    def series_signals(self, prices: np.ndarray, days: np.ndarray
+                       ) -> Tuple[np.ndarray, np.ndarray]:
+        return self.signals(prices, None, days)
+
+    def stream_signals(self, prices: np.ndarray, days: np.ndarray,
+                       indicators: IndicatorSet) -> Tuple[np.ndarray, np.ndarray]:
+        return self.signals(prices, None, days)
+
+
+def expanding_percentile(values: np.ndarray, q: float) -> np.ndarray:
+    """Percentile of ``values[:t]`` for every ``t`` (NaN entries skipped)
+
+    Matches ``np.percentile``'s linear interpolation. Two heaps hold the
+    lower and upper order statistics, so the whole series costs
+    O(n log n) instead of a sort per prefix. Empty prefixes give NaN.
+    """
+    out = np.full(len(values), np.nan)
+    fraction = q / 100.0
+    lower: List[float] = []  # max-heap (negated) of the smallest values
+    upper: List[float] = []  # min-heap of the rest
+    count = 0
+    for t, value in enumerate(values.tolist()):
+        if count:
+            position = fraction * (count - 1)
+            weight = position - int(position)
+            below = -lower[0]
+            out[t] = below if weight == 0 or not upper else below + (upper[0] - below) * weight
+        if value != value:
+            continue
+        if lower and value < -lower[0]:
+            heapq.heappush(lower, -value)
+        else:
+            heapq.heappush(upper, value)
+        count += 1
+        target = int(fraction * (count - 1)) + 1
+        while len(lower) > target:
+            heapq.heappush(upper, -heapq.heappop(lower))
+        while len(lower) < target:
+            heapq.heappush(lower, -heapq.heappop(upper))
+    return out
@@ -0,0 +1,213 @@
+"""
+Strategy registry and evaluation entry points
+File: python/strategies/engine.py
+Purpose: Registry of accumulation strategies plus evaluate_strategy, the vectorized batch mode, streaming evaluation and calculate_dca_amount
+Related components: base.py, indicators.py, power_law.py, technical.py, cycle.py, ensemble.py, PROJECT_ARCHITECTURE.md (Key Function Specs)
+Tags: strategies, registry, factory, batch, streaming, numpy
+"""
+
+import inspect
+from typing import Any, Dict, List, Optional, Sequence, Type, Union
+import numpy as np
+from .base import (
+    ACTIONS,
+    FlatDCAStrategy,
+    HistoricalData,
+    PriceStrategy,
+    StrategyResult,
+    as_history
+)
+from .power_law import PowerLawChannelStrategy, PowerLawStrategy
+from .technical import MovingAverageDipStrategy, VolatilityAdjustedStrategy
+from .cycle import HalvingCycleStrategy
+from .ensemble import EnsembleStrategy
+from .indicators import IndicatorSet
+
+
+class StrategyFactory:
+    """Factory and registry for accumulation strategies"""
+
+    _strategies: Dict[str, Type[PriceStrategy]] = {
+        "flat-dca": FlatDCAStrategy,
+        "power-law-95": PowerLawStrategy,
+        "power-law-channel": PowerLawChannelStrategy,
+        "technical-ma-dip": MovingAverageDipStrategy,
+        "volatility-dca": VolatilityAdjustedStrategy,
+        "halving-cycle": HalvingCycleStrategy,
+        "ensemble": EnsembleStrategy,
+    }
+    # Shared default-parameter instances; strategies hold no per-call state
+    _instances: Dict[str, PriceStrategy] = {}
+
+    @classmethod
+    def create(cls, strategy_id: str, **kwargs) -> PriceStrategy:
+        """Create a strategy instance for the specified id"""
+        if strategy_id not in cls._strategies:
+            available = ", ".join(cls._strategies.keys())
+            raise ValueError(f"Unknown strategy '{strategy_id}'. Available: {available}")
+        strategy = cls._strategies[strategy_id](**kwargs)
+        strategy.strategy_id = strategy_id
+        return strategy
+
+    @classmethod
+    def get(cls, strategy_id: str) -> PriceStrategy:
+        """Shared instance of a strategy with default parameters"""
+        if strategy_id not in cls._instances:
+            cls._instances[strategy_id] = cls.create(strategy_id)
+        return cls._instances[strategy_id]
+
+    @classmethod
+    def register(cls, strategy_id: str, strategy_class: Type[PriceStrategy]):
+        """Register a new strategy (replacing any existing one with that id)"""
+        cls._strategies[strategy_id] = strategy_class
+        cls._instances.pop(strategy_id, None)
+
+    @classmethod
+    def parameters(cls, strategy_id: str) -> List[str]:
+        """Constructor parameters a strategy accepts, including base-class ones"""
+        names: List[str] = []
+        for klass in cls._strategies[strategy_id].__mro__:
+            if "__init__" not in vars(klass) or klass is object:
+                continue
+            for parameter in inspect.signature(klass.__init__).parameters.values():
+                if (parameter.kind is parameter.POSITIONAL_OR_KEYWORD
+                        and parameter.name != "self" and parameter.name not in names):
+                    names.append(parameter.name)
+        return names
+
+    @classmethod
+    def list_strategies(cls) -> list:
+        """List all available strategy ids"""
+        return list(cls._strategies.keys())
+
+
+def evaluate_strategy(strategy_id: str, current_price: float,
+                      historical_data: HistoricalData,
+                      days_since_genesis: float) -> StrategyResult:
+    """Action and multiplier of one strategy for the current price
+
+    Missing or insufficient history falls back to flat DCA (``buy`` at
+    1.0, ``fallback=True``). Pass a PriceHistory to avoid converting
+    PriceFeed lists on every call.
+    """
+    return StrategyFactory.get(strategy_id).evaluate(
+        current_price, as_history(historical_data), days_since_genesis)
+
+
+class BatchEvaluation:
+    """Struct-of-arrays result of ``evaluate_batch``
+
+    Holds action codes, multipliers and fallback flags as NumPy arrays;
+    ``results()`` or indexing builds StrategyResult objects on demand.
+    """
+
+    def __init__(self, strategy_ids: np.ndarray, actions: np.ndarray,
+                 multipliers: np.ndarray, fallback: np.ndarray):
+        self.strategy_ids = strategy_ids
+        self.actions = actions
+        self.multipliers = multipliers
+        self.fallback = fallback
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    def __getitem__(self, index: int) -> StrategyResult:
+        return StrategyResult(action=ACTIONS[self.actions[index]],
+                              multiplier=float(self.multipliers[index]),
+                              strategy_id=str(self.strategy_ids[index]),
+                              fallback=bool(self.fallback[index]))
+
+    def results(self) -> List[StrategyResult]:
+        return [self[i] for i in range(len(self))]
+
+
+def evaluate_batch(strategy_ids: Sequence[str], current_prices: Any,
+                   historical_data: HistoricalData,
+                   days_since_genesis: Any) -> BatchEvaluation:
+    """Evaluate many (strategy, user) entries against one history in one pass
+
+    ``current_prices`` and ``days_since_genesis`` are scalars or one value
+    per entry. Entries are grouped by strategy and each strategy runs once,
+    vectorized over its group, so derived series are computed once per
+    history rather than once per user.
+    """
+    history = as_history(historical_data)
+    ids = np.asarray(strategy_ids, dtype=object)
+    count = len(ids)
+    prices = np.broadcast_to(np.asarray(current_prices, dtype=np.float64), (count,))
+    days = np.broadcast_to(np.asarray(days_since_genesis, dtype=np.float64), (count,))
+    strategies = {sid: StrategyFactory.get(sid) for sid in dict.fromkeys(strategy_ids)}
+
+    actions = np.empty(count, dtype=np.int8)
+    multipliers = np.empty(count, dtype=np.float64)
+    fallback = np.empty(count, dtype=bool)
+    for strategy_id, strategy in strategies.items():
+        group = np.flatnonzero(ids == strategy_id) if len(strategies) > 1 else slice(None)
+        (actions[group], multipliers[group],
+         fallback[group]) = strategy.evaluate_many(prices[group], history, days[group])
+    return BatchEvaluation(ids, actions, multipliers, fallback)
+
+
+def evaluate_all(current_price: float, historical_data: HistoricalData,
+                 days_since_genesis: float,
+                 strategy_ids: Optional[Sequence[str]] = None) -> Dict[str, StrategyResult]:
+    """Every registered strategy (or ``strategy_ids``) for one price"""
+    strategy_ids = list(strategy_ids or StrategyFactory.list_strategies())
+    batch = evaluate_batch(strategy_ids, current_price, historical_data, days_since_genesis)
+    return dict(zip(strategy_ids, batch.results()))
+
+
+class StreamingStrategy:
+    """A strategy evaluated from per-tick indicator state instead of the full history
+
+    ``update`` folds each new close into the strategy's indicators in
+    constant time and memory, and ``evaluate`` matches ``evaluate_strategy``
+    over the same closes (the power-law percentile band is a P² estimate).
+    ``snapshot`` is plain JSON, so the state can be stored in workflow
+    state or a checkpoint and ``from_snapshot`` resumes without replaying
+    the history.
+    """
+
+    def __init__(self, strategy_id: str, params: Optional[Dict[str, Any]] = None,
+                 indicators: Optional[IndicatorSet] = None):
+        self.strategy_id = strategy_id
+        self.params = dict(params or {})
+        self.strategy = (StrategyFactory.create(strategy_id, **self.params) if self.params
+                         else StrategyFactory.get(strategy_id))
+        self.indicators = indicators or IndicatorSet(self.strategy.indicators())
+
+    def update(self, price: float, days_since_genesis: float) -> None:
+        """Fold one new historical close into the indicators"""
+        self.strategy.update_indicators(self.indicators, float(price), float(days_since_genesis))
+
+    def extend(self, prices: Sequence[float], days: Sequence[float]) -> None:
+        for price, day in zip(np.asarray(prices, dtype=np.float64).tolist(),
+                              np.asarray(days, dtype=np.float64).tolist()):
+            self.strategy.update_indicators(self.indicators, price, day)
+
+    def evaluate(self, current_price: float, days_since_genesis: float) -> StrategyResult:
+        """Action and multiplier for the current price against the streamed history"""
+        actions, multipliers, fallback = self.strategy.stream_evaluate(
+            current_price, days_since_genesis, self.indicators)
+        return StrategyResult(action=ACTIONS[actions[0]],
+                              multiplier=float(multipliers[0]),
+                              strategy_id=self.strategy_id,
+                              fallback=bool(fallback[0]))
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"strategy_id": self.strategy_id, "params": self.params,
+                "indicators": self.indicators.snapshot()}
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Dict[str, Any]) -> "StreamingStrategy":
+        return cls(snapshot["strategy_id"], snapshot.get("params"),
+                   IndicatorSet.restore(snapshot["indicators"]))
+
+
+def calculate_dca_amount(base_amount: float, multiplier: Union[float, np.ndarray],
+                         min_multiplier: float = 0.1,
+                         max_multiplier: float = 10.0) -> Union[float, np.ndarray]:
+    """Base DCA amount scaled by a multiplier clamped to a safe range"""
+    clamped = np.clip(multiplier, min_multiplier, max_multiplier)
+    amount = base_amount * clamped
+    return float(amount) if np.ndim(amount) == 0 else amount
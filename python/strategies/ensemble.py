@@ -0,0 +1,96 @@
+"""
+Multi-model ensemble strategy
+File: python/strategies/ensemble.py
+Purpose: Buys when sub-strategies agree (strategy 8); the multiplier reflects consensus strength
+Related components: base.py, engine.py (registry, registered as "ensemble"), STRATEGIES.md
+Tags: strategies, ensemble, consensus, numpy
+"""
+
+from typing import Dict, Iterable, List, Sequence, Tuple, Union
+import numpy as np
+from .base import BUY, HOLD, SELL, PriceHistory, PriceStrategy
+from .indicators import IndicatorSet
+
+
+StrategySpec = Union[str, PriceStrategy]
+
+DEFAULT_MEMBERS = ("power-law-95", "power-law-channel", "technical-ma-dip", "halving-cycle")
+
+
+class EnsembleStrategy(PriceStrategy):
+    """Weighted vote of sub-strategies
+
+    Each member votes +1 (buy), -1 (sell) or 0 (hold). The ensemble buys
+    when the weighted consensus reaches ``threshold``, with the buying
+    members' mean multiplier scaled by the consensus, and sells at
+    ``-threshold``. Members may be given as strategy ids; they are created
+    through StrategyFactory on first use.
+    """
+
+    strategy_id = "ensemble"
+
+    def __init__(self, members: Sequence[StrategySpec] = DEFAULT_MEMBERS,
+                 weights: Sequence[float] = None, threshold: float = 0.5, **kwargs):
+        super().__init__(**kwargs)
+        self._specs: List[StrategySpec] = list(members)
+        self._created: Dict[int, PriceStrategy] = {}
+        self.weights = np.asarray(weights if weights is not None else [1.0] * len(members),
+                                  dtype=np.float64)
+        self.threshold = threshold
+
+    @property
+    def members(self) -> List[PriceStrategy]:
+        strategies = []
+        for index, spec in enumerate(self._specs):
+            if isinstance(spec, PriceStrategy):
+                strategies.append(spec)
+                continue
+            if index not in self._created:
+                from .engine import StrategyFactory
+                self._created[index] = StrategyFactory.get(spec)
+            strategies.append(self._created[index])
+        return strategies
+
+    @property
+    def min_history(self) -> int:
+        return max((member.min_history for member in self.members), default=0)
+
+    def signals(self, prices: np.ndarray, history: PriceHistory,
+                days: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return self._combine(member.evaluate_many(prices, history, days)
+                             for member in self.members)
+
+    def series_signals(self, prices: np.ndarray, days: np.ndarray
+                       ) -> Tuple[np.ndarray, np.ndarray]:
+        return self._combine(member.evaluate_series(prices, days)
+                             for member in self.members)
+
+    def indicators(self) -> Dict[str, IndicatorSet]:
+        return {str(i): IndicatorSet(member.indicators())
+                for i, member in enumerate(self.members)}
+
+    def observe(self, indicators: IndicatorSet, price: float, day: float) -> None:
+        for i, member in enumerate(self.members):
+            member.update_indicators(indicators[str(i)], price, day)
+
+    def stream_signals(self, prices: np.ndarray, days: np.ndarray,
+                       indicators: IndicatorSet) -> Tuple[np.ndarray, np.ndarray]:
+        return self._combine(member.stream_evaluate(prices, days, indicators[str(i)])
+                             for i, member in enumerate(self.members))
+
+    def _combine(self, evaluations: Iterable[Tuple[np.ndarray, np.ndarray, np.ndarray]]
+                 ) -> Tuple[np.ndarray, np.ndarray]:
+        """Consensus of the members' (actions, multipliers, fallback) outputs"""
+        votes = buy_weight = buy_multiplier = 0.0
+        for (actions, multipliers, _), weight in zip(evaluations, self.weights):
+            buying = actions == BUY
+            votes = votes + weight * (buying.astype(np.float64) - (actions == SELL))
+            buy_weight = buy_weight + weight * buying
+            buy_multiplier = buy_multiplier + weight * buying * multipliers
+
+        consensus = votes / self.weights.sum()
+        mean_multiplier = np.where(buy_weight > 0, buy_multiplier / buy_weight, 1.0)
+        actions = np.where(consensus >= self.threshold, BUY,
+                           np.where(consensus <= -self.threshold, SELL, HOLD))
+        multipliers = np.where(actions == BUY, self.clamp(consensus * mean_multiplier), 1.0)
+        return actions, multipliers
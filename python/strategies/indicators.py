@@ -0,0 +1,349 @@
+"""
+Streaming price indicators
+File: python/strategies/indicators.py
+Purpose: Per-tick O(1) rolling mean, windowed Welford variance, EWMA, P² quantile and running regression with JSON snapshots
+Related components: base.py (PriceStrategy.indicators), technical.py, power_law.py, ensemble.py, engine.py (StreamingStrategy)
+Tags: strategies, indicators, streaming, welford, quantile, snapshot
+"""
+
+import math
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type
+
+
+class Indicator:
+    """Base class for per-tick indicators
+
+    ``update`` folds in one observation in constant time; memory is
+    constant too (windowed indicators hold just their window).
+    ``snapshot`` returns plain JSON-serializable data and
+    ``Indicator.restore`` rebuilds an identical indicator from it.
+    """
+
+    kind = "indicator"
+    # Attributes captured by ``snapshot``
+    _fields: Tuple[str, ...] = ()
+    _kinds: Dict[str, Type["Indicator"]] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        Indicator._kinds[cls.kind] = cls
+
+    @property
+    def value(self) -> float:
+        raise NotImplementedError
+
+    def snapshot(self) -> Dict[str, Any]:
+        state: Dict[str, Any] = {"kind": self.kind}
+        for field in self._fields:
+            value = getattr(self, field)
+            state[field] = list(value) if isinstance(value, list) else value
+        return state
+
+    @classmethod
+    def restore(cls, snapshot: Dict[str, Any]) -> "Indicator":
+        """Indicator of the snapshot's kind in the snapshotted state"""
+        kind = Indicator._kinds.get(snapshot.get("kind"))
+        if kind is None:
+            raise ValueError(f"Unknown indicator kind '{snapshot.get('kind')}'")
+        indicator = kind.__new__(kind)
+        for field in kind._fields:
+            value = snapshot[field]
+            setattr(indicator, field, list(value) if isinstance(value, list) else value)
+        return indicator
+
+
+class RollingMean(Indicator):
+    """Mean of the last ``window`` values from a ring buffer and running sum
+
+    The sum is recomputed exactly each time the buffer wraps, so rounding
+    error cannot accumulate over long streams (amortized O(1)).
+    """
+
+    kind = "rolling_mean"
+    _fields = ("window", "buffer", "index", "total")
+
+    def __init__(self, window: int):
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.window = window
+        self.buffer: List[float] = []
+        self.index = 0
+        self.total = 0.0
+
+    @property
+    def count(self) -> int:
+        return len(self.buffer)
+
+    def update(self, value: float) -> float:
+        if len(self.buffer) < self.window:
+            self.buffer.append(value)
+            self.total += value
+        else:
+            self.total += value - self.buffer[self.index]
+            self.buffer[self.index] = value
+            self.index = (self.index + 1) % self.window
+            if self.index == 0:
+                self.total = math.fsum(self.buffer)
+        return self.value
+
+    @property
+    def value(self) -> float:
+        return self.total / len(self.buffer) if self.buffer else math.nan
+
+
+class RollingVariance(Indicator):
+    """Welford mean and variance over the last ``window`` values (all values if None)
+
+    Windowed updates add the new value and remove the evicted one in a
+    single step; the moments are re-derived from the buffer whenever it
+    wraps. Without a window nothing is buffered.
+    """
+
+    kind = "rolling_variance"
+    _fields = ("window", "ddof", "buffer", "index", "count", "mean", "m2")
+
+    def __init__(self, window: Optional[int] = None, ddof: int = 1):
+        if window is not None and window < 1:
+            raise ValueError("window must be at least 1")
+        self.window = window
+        self.ddof = ddof
+        self.buffer: List[float] = []
+        self.index = 0
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, value: float) -> float:
+        if self.window is None or self.count < self.window:
+            self.count += 1
+            delta = value - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (value - self.mean)
+            if self.window is not None:
+                self.buffer.append(value)
+        else:
+            evicted = self.buffer[self.index]
+            self.buffer[self.index] = value
+            self.index = (self.index + 1) % self.window
+            mean = self.mean + (value - evicted) / self.count
+            self.m2 += (value - evicted) * (value - mean + evicted - self.mean)
+            self.mean = mean
+            if self.index == 0:
+                self.mean = math.fsum(self.buffer) / self.count
+                self.m2 = math.fsum((v - self.mean) ** 2 for v in self.buffer)
+        self.m2 = max(self.m2, 0.0)
+        return self.value
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - self.ddof) if self.count > self.ddof else math.nan
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def value(self) -> float:
+        return self.variance
+
+
+class EWMA(Indicator):
+    """Exponentially weighted mean and variance (``alpha`` or ``span``)"""
+
+    kind = "ewma"
+    _fields = ("alpha", "count", "mean", "variance")
+
+    def __init__(self, span: Optional[float] = None, alpha: Optional[float] = None):
+        if alpha is None:
+            if span is None or span < 1:
+                raise ValueError("EWMA needs alpha or a span of at least 1")
+            alpha = 2.0 / (span + 1.0)
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        self.alpha = alpha
+        self.count = 0
+        self.mean = 0.0
+        self.variance = 0.0
+
+    def update(self, value: float) -> float:
+        if self.count == 0:
+            self.mean = value
+        else:
+            delta = value - self.mean
+            increment = self.alpha * delta
+            self.mean += increment
+            self.variance = (1.0 - self.alpha) * (self.variance + delta * increment)
+        self.count += 1
+        return self.mean
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def value(self) -> float:
+        return self.mean if self.count else math.nan
+
+
+class StreamingQuantile(Indicator):
+    """P² estimate of the ``q``-th percentile in five markers (Jain & Chlamtac)
+
+    Exact (``np.percentile``'s linear interpolation) for up to five values;
+    after that the middle marker tracks the quantile with piecewise
+    parabolic adjustments, in O(1) time and memory per value.
+    """
+
+    kind = "quantile"
+    _fields = ("q", "count", "heights", "positions", "desired")
+
+    def __init__(self, q: float = 95.0):
+        if not 0 <= q <= 100:
+            raise ValueError("q must be between 0 and 100")
+        self.q = q
+        p = q / 100.0
+        self.count = 0
+        self.heights: List[float] = []
+        self.positions = [1.0, 2.0, 3.0, 4.0, 5.0]
+        self.desired = [1.0, 1.0 + 2 * p, 1.0 + 4 * p, 3.0 + 2 * p, 5.0]
+
+    def update(self, value: float) -> float:
+        self.count += 1
+        heights, positions = self.heights, self.positions
+        if self.count <= 5:
+            heights.append(value)
+            heights.sort()
+            return self.value
+
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = next(i for i in range(4) if heights[i] <= value < heights[i + 1])
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+        p = self.q / 100.0
+        for i, increment in enumerate((0.0, p / 2, p, (1 + p) / 2, 1.0)):
+            self.desired[i] += increment
+
+        for i in (1, 2, 3):
+            offset = self.desired[i] - positions[i]
+            if ((offset >= 1 and positions[i + 1] - positions[i] > 1)
+                    or (offset <= -1 and positions[i - 1] - positions[i] < -1)):
+                step = 1.0 if offset > 0 else -1.0
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    j = i + int(step)
+                    height = heights[i] + step * (heights[j] - heights[i]) / (
+                        positions[j] - positions[i])
+                heights[i] = height
+                positions[i] += step
+        return self.value
+
+    def _parabolic(self, i: int, step: float) -> float:
+        h, n = self.heights, self.positions
+        return h[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (h[i] - h[i - 1]) / (n[i] - n[i - 1]))
+
+    @property
+    def value(self) -> float:
+        if self.count == 0:
+            return math.nan
+        if self.count > 5:
+            return self.heights[2]
+        position = self.q / 100.0 * (self.count - 1)
+        below = int(position)
+        above = min(below + 1, self.count - 1)
+        return self.heights[below] + (self.heights[above] - self.heights[below]) * (
+            position - below)
+
+
+class RunningRegression(Indicator):
+    """Ordinary least squares of y on x from running co-moments"""
+
+    kind = "regression"
+    _fields = ("count", "mean_x", "mean_y", "cxx", "cxy", "cyy")
+
+    def __init__(self):
+        self.count = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.cxx = 0.0
+        self.cxy = 0.0
+        self.cyy = 0.0
+
+    def update(self, x: float, y: float) -> float:
+        self.count += 1
+        dx = x - self.mean_x
+        dy = y - self.mean_y
+        self.mean_x += dx / self.count
+        self.mean_y += dy / self.count
+        self.cxx += dx * (x - self.mean_x)
+        self.cxy += dx * (y - self.mean_y)
+        self.cyy += dy * (y - self.mean_y)
+        return self.value
+
+    @property
+    def slope(self) -> float:
+        return self.cxy / self.cxx if self.cxx > 0 else math.nan
+
+    @property
+    def intercept(self) -> float:
+        return self.mean_y - self.slope * self.mean_x
+
+    @property
+    def residual_std(self) -> float:
+        """Population standard deviation of the residuals"""
+        if self.cxx <= 0:
+            return math.nan
+        return math.sqrt(max(self.cyy - self.slope * self.cxy, 0.0) / self.count)
+
+    @property
+    def value(self) -> float:
+        return self.slope
+
+
+class IndicatorSet:
+    """Named indicators (or nested sets) of one price stream
+
+    Also tracks how many closes have been observed and the last one, which
+    strategies use for the history-length check and return calculations.
+    """
+
+    def __init__(self, indicators: Optional[Dict[str, Any]] = None):
+        self.indicators: Dict[str, Any] = dict(indicators or {})
+        self.count = 0
+        self.last: Optional[float] = None
+
+    def __getitem__(self, name: str) -> Any:
+        return self.indicators[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.indicators)
+
+    def observed(self, price: float) -> None:
+        """Record that ``price`` has been folded into the indicators"""
+        self.count += 1
+        self.last = price
+
+    def values(self) -> Dict[str, Any]:
+        """Current value of every indicator (nested sets as nested dicts)"""
+        return {name: item.values() if isinstance(item, IndicatorSet) else item.value
+                for name, item in self.indicators.items()}
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"kind": "set", "count": self.count, "last": self.last,
+                "indicators": {name: item.snapshot() for name, item in self.indicators.items()}}
+
+    @classmethod
+    def restore(cls, snapshot: Dict[str, Any]) -> "IndicatorSet":
+        indicators = {
+            name: cls.restore(item) if item.get("kind") == "set" else Indicator.restore(item)
+            for name, item in snapshot["indicators"].items()}
+        restored = cls(indicators)
+        restored.count = snapshot["count"]
+        restored.last = snapshot["last"]
+        return restored
@@ -0,0 +1,166 @@
+"""
+Power-law accumulation strategies
+File: python/strategies/power_law.py
+Purpose: Power Law 95th Percentile (strategy 1) and the power-law regression channel oscillator (strategy 2)
+Related components: base.py, engine.py (registry), STRATEGIES.md, PROJECT_ARCHITECTURE.md
+Tags: strategies, power-law, regression, numpy
+"""
+
+import math
+from typing import Any, Dict, Tuple
+import numpy as np
+from .base import BUY, HOLD, SELL, PriceHistory, PriceStrategy, expanding_percentile
+from .indicators import Indicator, IndicatorSet, RunningRegression, StreamingQuantile
+
+
+class PowerLawStrategy(PriceStrategy):
+    """Buy below the power-law model price, sell above its 95th percentile band
+
+    ``model_price = a * days_since_genesis ** b``. The band is the given
+    percentile of historical price/model ratios among prices that traded
+    above the model. Buy multipliers grow with the discount to the model.
+    """
+
+    strategy_id = "power-law-95"
+    min_history = 30
+
+    def __init__(self, a: float = 1.0117e-17, b: float = 5.82,
+                 percentile: float = 95.0, **kwargs):
+        super().__init__(**kwargs)
+        self.a = a
+        self.b = b
+        self.percentile = percentile
+
+    def model_price(self, days: np.ndarray) -> np.ndarray:
+        return self.a * np.power(days, self.b)
+
+    def band_ratio(self, history: PriceHistory) -> float:
+        """Upper band as a multiple of the model price (inf if never above)"""
+        def compute() -> float:
+            valid = history.days > 0
+            ratios = history.prices[valid] / self.model_price(history.days[valid])
+            above = ratios[ratios > 1.0]
+            return float(np.percentile(above, self.percentile)) if above.size else math.inf
+        return history.derived(("power-law-band", self.a, self.b, self.percentile), compute)
+
+    def _decide(self, ratio: np.ndarray, band: Any) -> Tuple[np.ndarray, np.ndarray]:
+        actions = np.where(ratio < 1.0, BUY, np.where(ratio > band, SELL, HOLD))
+        multipliers = np.where(actions == BUY, self.clamp(1.0 / ratio),
+                               np.where(actions == SELL, self.clamp(ratio / band), 1.0))
+        return actions, multipliers
+
+    def signals(self, prices: np.ndarray, history: PriceHistory,
+                days: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return self._decide(prices / self.model_price(days), self.band_ratio(history))
+
+    def series_signals(self, prices: np.ndarray, days: np.ndarray
+                       ) -> Tuple[np.ndarray, np.ndarray]:
+        ratio = prices / self.model_price(days)
+        above = np.where((days > 0) & (ratio > 1.0), ratio, np.nan)
+        bands = expanding_percentile(above, self.percentile)
+        return self._decide(ratio, np.where(np.isnan(bands), math.inf, bands))
+
+    def indicators(self) -> Dict[str, Indicator]:
+        # P² estimate: streaming bands track the exact percentile closely, not exactly
+        return {"band": StreamingQuantile(self.percentile)}
+
+    def observe(self, indicators: IndicatorSet, price: float, day: float) -> None:
+        if day > 0:
+            ratio = price / float(self.model_price(day))
+            if ratio > 1.0:
+                indicators["band"].update(ratio)
+
+    def stream_signals(self, prices: np.ndarray, days: np.ndarray,
+                       indicators: IndicatorSet) -> Tuple[np.ndarray, np.ndarray]:
+        band = indicators["band"]
+        return self._decide(prices / self.model_price(days),
+                            band.value if band.count else math.inf)
+
+
+class PowerLawChannelStrategy(PriceStrategy):
+    """Log-log regression channel: buy near the lower band, sell near the upper
+
+    ``log(price)`` is fitted against ``log(days)`` over the history; bands
+    sit ``band_sigma`` residual deviations either side of the fit. The
+    position runs from -1 (lower band) to +1 (upper band).
+    """
+
+    strategy_id = "power-law-channel"
+    min_history = 30
+
+    def __init__(self, band_sigma: float = 2.0, buy_below: float = -0.5,
+                 sell_above: float = 0.75, **kwargs):
+        super().__init__(**kwargs)
+        self.band_sigma = band_sigma
+        self.buy_below = buy_below
+        self.sell_above = sell_above
+
+    def fit(self, history: PriceHistory) -> Tuple[float, float, float]:
+        """(slope, intercept, residual std) of the log-log fit"""
+        def compute() -> Tuple[float, float, float]:
+            valid = history.days > 0
+            log_days = np.log(history.days[valid])
+            log_prices = history.log_prices[valid]
+            slope, intercept = np.polyfit(log_days, log_prices, 1)
+            residuals = log_prices - (intercept + slope * log_days)
+            return float(slope), float(intercept), float(residuals.std())
+        return history.derived("power-law-fit", compute)
+
+    def signals(self, prices: np.ndarray, history: PriceHistory,
+                days: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        slope, intercept, sigma = self.fit(history)
+        if sigma == 0:
+            return np.full(prices.shape, HOLD, dtype=np.int8), np.ones(prices.shape)
+        center = intercept + slope * np.log(days)
+        return self._decide((np.log(prices) - center) / (self.band_sigma * sigma))
+
+    def series_signals(self, prices: np.ndarray, days: np.ndarray
+                       ) -> Tuple[np.ndarray, np.ndarray]:
+        # Expanding least-squares fit from cumulative sums, shifted to the
+        # first point to limit cancellation
+        valid = days > 0
+        log_days = np.log(np.where(valid, days, 1.0))
+        log_prices = np.log(prices)
+        first = int(np.argmax(valid))
+        x = np.where(valid, log_days - log_days[first], 0.0)
+        y = np.where(valid, log_prices - log_prices[first], 0.0)
+
+        def prefix(values: np.ndarray) -> np.ndarray:
+            return np.concatenate(([0.0], np.cumsum(values)[:-1]))
+
+        n = prefix(valid.astype(np.float64))
+        sx, sy = prefix(x), prefix(y)
+        sxx = prefix(x * x) - sx * sx / n
+        sxy = prefix(x * y) - sx * sy / n
+        syy = prefix(y * y) - sy * sy / n
+        slope = sxy / sxx
+        sigma = np.sqrt(np.maximum(syy - slope * sxy, 0.0) / n)
+        center = sy / n + slope * (log_days - log_days[first] - sx / n)
+        position = (log_prices - log_prices[first] - center) / (self.band_sigma * sigma)
+        actions, multipliers = self._decide(position)
+        flat = ~(sigma > 0)
+        return (np.where(flat, HOLD, actions), np.where(flat, 1.0, multipliers))
+
+    def indicators(self) -> Dict[str, Indicator]:
+        return {"fit": RunningRegression()}
+
+    def observe(self, indicators: IndicatorSet, price: float, day: float) -> None:
+        if day > 0:
+            indicators["fit"].update(math.log(day), math.log(price))
+
+    def stream_signals(self, prices: np.ndarray, days: np.ndarray,
+                       indicators: IndicatorSet) -> Tuple[np.ndarray, np.ndarray]:
+        fit = indicators["fit"]
+        sigma = fit.residual_std
+        if not sigma > 0:
+            return np.full(prices.shape, HOLD, dtype=np.int8), np.ones(prices.shape)
+        center = fit.intercept + fit.slope * np.log(days)
+        return self._decide((np.log(prices) - center) / (self.band_sigma * sigma))
+
+    def _decide(self, position: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        actions = np.where(position <= self.buy_below, BUY,
+                           np.where(position >= self.sell_above, SELL, HOLD))
+        multipliers = np.where(actions == BUY, self.clamp(1.0 - position),
+                               np.where(actions == SELL,
+                                        self.clamp(position / self.sell_above), 1.0))
+        return actions, multipliers
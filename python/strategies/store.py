@@ -0,0 +1,308 @@
+"""
+Memory-mapped price-history store
+File: python/strategies/store.py
+Purpose: Columnar timestamp/OHLCV files with O(1) appends, binary-search range and window views, and hourly/daily rollups
+Related components: base.py (PriceHistory), engine.py (evaluate_strategy), main.py (price-rollups job), backtest/data.py
+Tags: strategies, storage, mmap, numpy, ohlcv, rollup
+"""
+
+import json
+import os
+import threading
+from typing import Dict, Optional
+import numpy as np
+from .base import GENESIS, PriceHistory
+
+
+GENESIS_TIMESTAMP = GENESIS.timestamp()
+
+COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+FORMAT_VERSION = 1
+
+ROLLUP_PERIODS = {"1h": 3600, "1d": 86400}
+
+
+class OHLCV:
+    """A run of consecutive rows, one NumPy array per column"""
+
+    __slots__ = COLUMNS
+
+    def __init__(self, timestamp: np.ndarray, open: np.ndarray, high: np.ndarray,
+                 low: np.ndarray, close: np.ndarray, volume: np.ndarray):
+        self.timestamp = timestamp
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    def __len__(self) -> int:
+        return int(self.timestamp.size)
+
+    @property
+    def days(self) -> np.ndarray:
+        """Days since genesis of each row"""
+        return (self.timestamp - GENESIS_TIMESTAMP) / 86400.0
+
+    def history(self) -> PriceHistory:
+        """Closes as a PriceHistory (the closes are not copied)"""
+        return PriceHistory(self.close, self.days)
+
+
+class PriceStore:
+    """Timestamp and OHLCV columns of float64, each in its own memory-mapped file
+
+    Column files are preallocated and double in size when full, so
+    appends are amortized O(1). Rows must arrive in timestamp order, which
+    makes range and window lookups a binary search over the timestamp
+    column; they return views into the maps rather than copies. The row
+    count lives in a separate small map and is only advanced after the
+    row is written, so a crash mid-append loses at most that row.
+    """
+
+    def __init__(self, path: str, initial_capacity: int = 4096):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+        self._check_meta()
+
+        count_file = os.path.join(path, "count.i8")
+        if not os.path.exists(count_file):
+            with open(count_file, "wb") as f:
+                f.write(np.zeros(1, dtype=np.int64).tobytes())
+        self._count = np.memmap(count_file, dtype=np.int64, mode="r+", shape=(1,))
+
+        existing = [os.path.getsize(self._file(c)) // 8 for c in COLUMNS
+                    if os.path.exists(self._file(c))]
+        self._columns: Dict[str, np.memmap] = {}
+        self._map(max(max(existing) if existing else initial_capacity, len(self)))
+
+    def _check_meta(self) -> None:
+        meta_file = os.path.join(self.path, "meta.json")
+        meta = {"version": FORMAT_VERSION, "columns": list(COLUMNS), "dtype": "float64"}
+        if not os.path.exists(meta_file):
+            with open(meta_file, "w") as f:
+                json.dump(meta, f)
+            return
+        with open(meta_file) as f:
+            found = json.load(f)
+        if found != meta:
+            raise ValueError(f"{self.path} holds an incompatible price store: {found}")
+
+    def _file(self, column: str) -> str:
+        return os.path.join(self.path, f"{column}.f8")
+
+    def _map(self, capacity: int) -> None:
+        """(Re)map every column file at ``capacity`` rows, growing the files if needed"""
+        capacity = max(capacity, 1)
+        for column in COLUMNS:
+            filename = self._file(column)
+            with open(filename, "ab") as f:
+                if f.tell() != capacity * 8:
+                    f.truncate(capacity * 8)
+            self._columns[column] = np.memmap(filename, dtype=np.float64, mode="r+",
+                                              shape=(capacity,))
+        self.capacity = capacity
+
+    def _reserve(self, rows: int) -> None:
+        needed = len(self) + rows
+        if needed > self.capacity:
+            self.flush()
+            self._map(max(needed, self.capacity * 2))
+
+    def __len__(self) -> int:
+        return int(self._count[0])
+
+    def _view(self, start: int, stop: int) -> OHLCV:
+        return OHLCV(*(np.asarray(self._columns[c][start:stop]) for c in COLUMNS))
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Timestamp column of every row (a view)"""
+        return np.asarray(self._columns["timestamp"][:len(self)])
+
+    @property
+    def last_timestamp(self) -> Optional[float]:
+        count = len(self)
+        return float(self._columns["timestamp"][count - 1]) if count else None
+
+    def append(self, timestamp: float, open: float, high: float, low: float,
+               close: float, volume: float = 0.0) -> None:
+        """Append one row; ``timestamp`` must not precede the last row's"""
+        with self._lock:
+            count = len(self)
+            if count and timestamp < self._columns["timestamp"][count - 1]:
+                raise ValueError("Rows must be appended in ascending timestamp order")
+            self._reserve(1)
+            for column, value in zip(COLUMNS, (timestamp, open, high, low, close, volume)):
+                self._columns[column][count] = value
+            self._count[0] = count + 1
+
+    def append_tick(self, timestamp: float, price: float, volume: float = 0.0) -> None:
+        """Append a single trade or quote as a one-price row"""
+        self.append(timestamp, price, price, price, price, volume)
+
+    def extend(self, timestamp, open, high, low, close, volume=None) -> None:
+        """Append many rows at once from equal-length arrays"""
+        arrays = [np.asarray(a, dtype=np.float64).ravel()
+                  for a in (timestamp, open, high, low, close)]
+        rows = arrays[0].size
+        arrays.append(np.zeros(rows) if volume is None
+                      else np.asarray(volume, dtype=np.float64).ravel())
+        if any(a.size != rows for a in arrays):
+            raise ValueError("Columns must have equal lengths")
+        if rows == 0:
+            return
+        with self._lock:
+            count = len(self)
+            if np.any(np.diff(arrays[0]) < 0) or (
+                    count and arrays[0][0] < self._columns["timestamp"][count - 1]):
+                raise ValueError("Rows must be appended in ascending timestamp order")
+            self._reserve(rows)
+            for column, values in zip(COLUMNS, arrays):
+                self._columns[column][count:count + rows] = values
+            self._count[0] = count + rows
+
+    def range(self, start: Optional[float] = None, end: Optional[float] = None) -> OHLCV:
+        """Rows with ``start <= timestamp < end`` (either bound optional)"""
+        timestamps = self.timestamps
+        first = 0 if start is None else int(np.searchsorted(timestamps, start, "left"))
+        stop = timestamps.size if end is None else int(np.searchsorted(timestamps, end, "left"))
+        return self._view(first, max(first, stop))
+
+    def window(self, length: int, end: Optional[float] = None) -> OHLCV:
+        """The last ``length`` rows at or before ``end`` (default: the latest)"""
+        timestamps = self.timestamps
+        stop = timestamps.size if end is None else int(np.searchsorted(timestamps, end, "right"))
+        return self._view(max(0, stop - length), stop)
+
+    def history(self, start: Optional[float] = None,
+                end: Optional[float] = None) -> PriceHistory:
+        """Closes in ``[start, end)`` as a PriceHistory for the strategy engine"""
+        return self.range(start, end).history()
+
+    def truncate(self, rows: int) -> None:
+        """Drop rows from the end, keeping the first ``rows``"""
+        with self._lock:
+            self._count[0] = max(0, min(rows, len(self)))
+
+    def drop_before(self, timestamp: float) -> int:
+        """Delete rows older than ``timestamp``, moving the rest to the front
+
+        Views taken before the call no longer line up with the store.
+        Returns the number of rows dropped.
+        """
+        with self._lock:
+            count = len(self)
+            dropped = int(np.searchsorted(self.timestamps, timestamp, "left"))
+            if dropped:
+                kept = count - dropped
+                for column in self._columns.values():
+                    column[:kept] = column[dropped:count]
+                self._count[0] = kept
+            return dropped
+
+    def flush(self) -> None:
+        """Write dirty pages of every column (and the row count) to disk"""
+        for column in self._columns.values():
+            column.flush()
+        self._count.flush()
+
+    def compact(self) -> None:
+        """Shrink the column files to the rows in use"""
+        with self._lock:
+            self.flush()
+            self._map(len(self))
+
+
+def build_rollup(source: PriceStore, target: PriceStore, period: int,
+                 chunk_rows: int = 1_000_000) -> int:
+    """Downsample ``source`` into ``period``-second OHLCV bars appended to ``target``
+
+    Incremental: only rows from the target's last bar onward are read, and
+    that bar (which may have covered an unfinished period) is rebuilt.
+    Bars are timestamped at the start of their period. The source is read
+    in chunks cut at period boundaries, so memory stays bounded however
+    much raw data is pending. Returns the number of bars written.
+    """
+    resume = target.last_timestamp
+    if resume is not None:
+        target.truncate(len(target) - 1)
+    timestamps = source.timestamps
+    begin = 0 if resume is None else int(np.searchsorted(timestamps, resume, "left"))
+    written = 0
+    while begin < timestamps.size:
+        stop = min(begin + chunk_rows, timestamps.size)
+        if stop < timestamps.size:
+            # End the chunk where the period of row ``stop`` begins, or after
+            # it when a single period holds more than a chunk of rows
+            boundary = np.floor(timestamps[stop] / period) * period
+            aligned = int(np.searchsorted(timestamps, boundary, "left"))
+            stop = aligned if aligned > begin else int(
+                np.searchsorted(timestamps, boundary + period, "left"))
+        rows = source._view(begin, stop)
+        ids = np.floor_divide(rows.timestamp, period)
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(ids)) + 1))
+        ends = np.append(starts[1:], len(rows)) - 1
+        target.extend(ids[starts] * period,
+                      rows.open[starts],
+                      np.maximum.reduceat(rows.high, starts),
+                      np.minimum.reduceat(rows.low, starts),
+                      rows.close[ends],
+                      np.add.reduceat(rows.volume, starts))
+        written += starts.size
+        begin = stop
+    return written
+
+
+class PriceArchive:
+    """Raw ticks plus hourly and daily rollups, each a PriceStore under one directory"""
+
+    def __init__(self, path: str, periods: Optional[Dict[str, int]] = None):
+        self.path = path
+        self.periods = dict(periods or ROLLUP_PERIODS)
+        self.raw = PriceStore(os.path.join(path, "raw"))
+        self.rollups = {name: PriceStore(os.path.join(path, name)) for name in self.periods}
+
+    @classmethod
+    def from_env(cls) -> Optional["PriceArchive"]:
+        """Archive at PRICE_STORE_PATH, or None when unset"""
+        path = os.getenv("PRICE_STORE_PATH")
+        return cls(path) if path else None
+
+    def store(self, period: str = "raw") -> PriceStore:
+        """The raw store or the rollup for ``period`` (``1h``, ``1d``)"""
+        if period == "raw":
+            return self.raw
+        if period not in self.rollups:
+            raise ValueError(f"Unknown period '{period}'. Available: raw, {', '.join(self.rollups)}")
+        return self.rollups[period]
+
+    def append_tick(self, timestamp: float, price: float, volume: float = 0.0) -> None:
+        self.raw.append_tick(timestamp, price, volume)
+
+    def history(self, period: str = "1d", start: Optional[float] = None,
+                end: Optional[float] = None) -> PriceHistory:
+        return self.store(period).history(start, end)
+
+    def run_rollups(self) -> Dict[str, int]:
+        """Bring every rollup up to date with the raw store"""
+        return {name: build_rollup(self.raw, self.rollups[name], seconds)
+                for name, seconds in self.periods.items()}
+
+    def compact(self, keep_raw_seconds: Optional[float] = None) -> Dict[str, int]:
+        """Roll up, then drop raw rows older than ``keep_raw_seconds`` and flush
+
+        Raw rows are only dropped once rolled up; the bars they fed stay
+        in the rollups. Returns the bars written per period.
+        """
+        written = self.run_rollups()
+        latest = self.raw.last_timestamp
+        if keep_raw_seconds is not None and latest is not None:
+            cutoff = latest - keep_raw_seconds
+            # Keep everything from the start of the oldest open bar onward
+            cutoff = min([cutoff] + [np.floor(latest / s) * s for s in self.periods.values()])
+            self.raw.drop_before(cutoff)
+        for store in (self.raw, *self.rollups.values()):
+            store.flush()
+        return written
@@ -0,0 +1,142 @@
+"""
+Technical accumulation strategies
+File: python/strategies/technical.py
+Purpose: 50-day moving-average dip (strategy 5) and volatility-adjusted DCA (strategy 6)
+Related components: base.py, engine.py (registry), STRATEGIES.md
+Tags: strategies, technical, moving-average, volatility, numpy
+"""
+
+import math
+from typing import Dict, Tuple
+import numpy as np
+from .base import BUY, HOLD, PriceHistory, PriceStrategy
+from .indicators import Indicator, IndicatorSet, RollingMean, RollingVariance
+
+
+class MovingAverageDipStrategy(PriceStrategy):
+    """Buy when price falls ``dip`` below its moving average, more for deeper dips
+
+    The multiplier is the dip depth in units of ``dip``: 1.0 at the
+    threshold, 2.0 at twice the threshold, and so on up to the cap.
+    """
+
+    strategy_id = "technical-ma-dip"
+
+    def __init__(self, window: int = 50, dip: float = 0.05, **kwargs):
+        super().__init__(**kwargs)
+        self.window = window
+        self.dip = dip
+        self.min_history = window
+
+    def moving_average(self, history: PriceHistory) -> float:
+        return history.derived(("sma", self.window),
+                               lambda: float(history.prices[-self.window:].mean()))
+
+    def signals(self, prices: np.ndarray, history: PriceHistory,
+                days: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return self._decide(prices / self.moving_average(history) - 1.0)
+
+    def series_signals(self, prices: np.ndarray, days: np.ndarray
+                       ) -> Tuple[np.ndarray, np.ndarray]:
+        # Mean of the ``window`` closes before each entry, from a running sum
+        sums = np.concatenate(([0.0], np.cumsum(prices)))
+        averages = np.full(prices.shape, np.nan)
+        averages[self.window:] = (sums[self.window:-1] - sums[:-self.window - 1]) / self.window
+        return self._decide(prices / averages - 1.0)
+
+    def indicators(self) -> Dict[str, Indicator]:
+        return {"sma": RollingMean(self.window)}
+
+    def observe(self, indicators: IndicatorSet, price: float, day: float) -> None:
+        indicators["sma"].update(price)
+
+    def stream_signals(self, prices: np.ndarray, days: np.ndarray,
+                       indicators: IndicatorSet) -> Tuple[np.ndarray, np.ndarray]:
+        return self._decide(prices / indicators["sma"].value - 1.0)
+
+    def _decide(self, gap: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        buying = gap <= -self.dip
+        actions = np.where(buying, BUY, HOLD)
+        multipliers = np.where(buying, self.clamp(-gap / self.dip), 1.0)
+        return actions, multipliers
+
+
+class VolatilityAdjustedStrategy(PriceStrategy):
+    """DCA scaled by recent volatility relative to the history's baseline
+
+    Recent volatility is the standard deviation of the last ``window``
+    log returns, the newest being the move from the last close to the
+    current price. Histories are assumed evenly sampled (e.g. daily).
+    """
+
+    strategy_id = "volatility-dca"
+
+    def __init__(self, window: int = 30, **kwargs):
+        super().__init__(**kwargs)
+        self.window = window
+        self.min_history = window + 1
+
+    def _window_sums(self, history: PriceHistory) -> Tuple[float, float, float]:
+        """(sum, sum of squares, baseline std) of the historical returns"""
+        def compute() -> Tuple[float, float, float]:
+            returns = history.log_returns
+            recent = returns[len(returns) - (self.window - 1):]
+            return (float(recent.sum()), float(np.square(recent).sum()),
+                    float(returns.std(ddof=1)))
+        return history.derived(("volatility", self.window), compute)
+
+    def signals(self, prices: np.ndarray, history: PriceHistory,
+                days: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        total, squares, baseline = self._window_sums(history)
+        return self._scale(np.log(prices) - history.log_prices[-1], total, squares, baseline)
+
+    def _scale(self, latest: np.ndarray, total: float, squares: float,
+               baseline: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Signals from the latest return and the window's other returns"""
+        n = self.window
+        mean = (total + latest) / n
+        variance = np.maximum((squares + latest * latest - n * mean * mean) / (n - 1), 0.0)
+        actions = np.full(latest.shape, BUY, dtype=np.int8)
+        if baseline == 0:
+            return actions, np.ones(latest.shape)
+        return actions, self.clamp(np.sqrt(variance) / baseline)
+
+    def series_signals(self, prices: np.ndarray, days: np.ndarray
+                       ) -> Tuple[np.ndarray, np.ndarray]:
+        # returns[t] is the move into entry t; entry t's window ends with it
+        # and its baseline covers the returns before it
+        returns = np.concatenate(([np.nan], np.diff(np.log(prices))))
+        sums = np.concatenate(([0.0, 0.0], np.cumsum(returns[1:])))
+        squares = np.concatenate(([0.0, 0.0], np.cumsum(np.square(returns[1:]))))
+        n = self.window
+        recent_mean = np.full(prices.shape, np.nan)
+        recent_squares = np.full(prices.shape, np.nan)
+        recent_mean[n:] = (sums[n + 1:] - sums[1:-n]) / n
+        recent_squares[n:] = squares[n + 1:] - squares[1:-n]
+        variance = np.maximum((recent_squares - n * recent_mean ** 2) / (n - 1), 0.0)
+
+        count = np.arange(len(prices)) - 1.0  # returns strictly before entry t
+        past_sums, past_squares = sums[:-1], squares[:-1]
+        baseline = np.sqrt(np.maximum(
+            (past_squares - past_sums ** 2 / count) / (count - 1), 0.0))
+        actions = np.full(prices.shape, BUY, dtype=np.int8)
+        multipliers = np.where(baseline > 0, self.clamp(np.sqrt(variance) / baseline), 1.0)
+        return actions, multipliers
+
+    def indicators(self) -> Dict[str, Indicator]:
+        # The window's other ``window - 1`` returns and every return so far
+        return {"recent": RollingVariance(self.window - 1), "baseline": RollingVariance()}
+
+    def observe(self, indicators: IndicatorSet, price: float, day: float) -> None:
+        if indicators.last is not None:
+            change = math.log(price) - math.log(indicators.last)
+            indicators["recent"].update(change)
+            indicators["baseline"].update(change)
+
+    def stream_signals(self, prices: np.ndarray, days: np.ndarray,
+                       indicators: IndicatorSet) -> Tuple[np.ndarray, np.ndarray]:
+        recent = indicators["recent"]
+        total = recent.mean * recent.count
+        squares = recent.m2 + recent.count * recent.mean ** 2
+        return self._scale(np.log(prices) - math.log(indicators.last), total, squares,
+                           indicators["baseline"].std)
@@ -0,0 +1,150 @@
+"""
+Tests for the strategy backtester
+File: python/tests/test_backtest.py
+Purpose: Tests walk-forward signals against per-day evaluation, chunked data loading, run metrics and deterministic sweeps
+Related components: backtest.runner, backtest.data, backtest.__main__, strategies.base
+Tags: test, backtest, strategies, sweep
+"""
+
+import json
+import numpy as np
+import pytest
+from python.backtest import (
+    BacktestConfig,
+    PeriodAggregator,
+    PriceBars,
+    load_bars,
+    parameter_grid,
+    run_backtest,
+    run_sweep,
+    synthetic_bars
+)
+from python.backtest.__main__ import main
+from python.backtest.data import GENESIS_TIMESTAMP
+from python.strategies import PriceStrategy, StrategyFactory
+
+DAY = 86400
+
+
+def bars_of(prices, start_day: float = 5000.0) -> PriceBars:
+    timestamps = GENESIS_TIMESTAMP + (start_day + np.arange(len(prices))) * DAY
+    return PriceBars(timestamps, np.asarray(prices, dtype=np.float64))
+
+
+class TestWalkForward:
+    """Test vectorized series signals never look ahead"""
+
+    @pytest.mark.parametrize("strategy_id", StrategyFactory.list_strategies())
+    def test_matches_per_day_evaluation(self, strategy_id):
+        bars = synthetic_bars(260, start_day=5000, volatility=0.05, seed=4)
+        strategy = StrategyFactory.create(strategy_id)
+        actions, multipliers, fallback = strategy.evaluate_series(bars.closes, bars.days)
+        reference_actions, reference_multipliers = PriceStrategy.series_signals(
+            strategy, bars.closes, bars.days)
+
+        np.testing.assert_array_equal(actions, np.where(fallback, 1, reference_actions))
+        np.testing.assert_allclose(multipliers, np.where(fallback, 1.0, reference_multipliers),
+                                   rtol=1e-9)
+        assert fallback[:strategy.min_history].all()
+
+
+class TestData:
+    """Test chunked loading and period roll-ups"""
+
+    def test_chunking_does_not_change_bars(self):
+        rng = np.random.default_rng(2)
+        timestamps = 1_700_000_000 + np.arange(0, 3 * DAY, 60)
+        prices = 30000 + rng.normal(0, 50, timestamps.size).cumsum()
+
+        whole = PeriodAggregator("1d")
+        whole.feed(timestamps, prices)
+        chunked = PeriodAggregator("1d")
+        for start in range(0, timestamps.size, 997):
+            chunked.feed(timestamps[start:start + 997], prices[start:start + 997])
+
+        expected, actual = whole.bars(), chunked.bars()
+        np.testing.assert_array_equal(actual.timestamps, expected.timestamps)
+        np.testing.assert_array_equal(actual.closes, expected.closes)
+        assert len(actual) == 4  # three days from mid-day: four calendar days
+        last_of_day = np.flatnonzero(np.diff(timestamps // DAY))
+        np.testing.assert_array_equal(actual.closes[:-1], prices[last_of_day])
+
+    def test_out_of_order_rejected(self):
+        aggregator = PeriodAggregator("1h")
+        aggregator.feed([100.0, 200.0], [1.0, 2.0])
+        with pytest.raises(ValueError, match="ascending"):
+            aggregator.feed([150.0], [1.5])
+
+    def test_load_csv_in_chunks(self, tmp_path):
+        path = tmp_path / "prices.csv"
+        rows = ["Date,Open,Close"]
+        rows += [f"2024-01-{d:02d}T{h:02d}:00:00Z,0,{d * 100 + h}"
+                 for d in range(1, 6) for h in range(24)]
+        path.write_text("\n".join(rows) + "\n")
+
+        bars = load_bars(str(path), period="1d", chunk_rows=7)
+        assert bars.closes.tolist() == [d * 100 + 23 for d in range(1, 6)]
+        hourly = load_bars(str(path), period="1h", chunk_rows=50)
+        assert len(hourly) == 120
+
+    def test_millisecond_epochs(self, tmp_path):
+        path = tmp_path / "ms.csv"
+        path.write_text("timestamp,price\n1704067200000,42000\n1704153600000,43000\n")
+        bars = load_bars(str(path))
+        assert bars.timestamps.tolist() == [1704067200.0, 1704153600.0]
+
+
+class TestRunner:
+    """Test run metrics and sweeps"""
+
+    def test_metrics(self):
+        rising = run_backtest(BacktestConfig(strategy_id="flat-dca"), bars_of([1.0, 2.0]))
+        assert (rising.invested, rising.final_value) == (20.0, 30.0)
+        assert rising.roi == pytest.approx(0.5)
+        assert rising.sats == 15 * 100_000_000
+        assert rising.max_drawdown == 0.0
+
+        falling = run_backtest(BacktestConfig(strategy_id="flat-dca"), bars_of([2.0, 1.0]))
+        assert falling.roi == pytest.approx(-0.25)
+        assert falling.max_drawdown == pytest.approx(0.25)
+
+    def test_hold_signals_skip_buys(self):
+        prices = [100.0] * 60 + [99.0, 80.0]
+        result = run_backtest(BacktestConfig(strategy_id="technical-ma-dip",
+                                             params={"window": 50}), bars_of(prices))
+        # 50 fallback buys, 10 holds at the average, the 1% dip holds, the 20% dip buys 3x
+        assert result.buys == 51
+        assert result.invested == pytest.approx(500.0 + 30.0)
+
+    def test_parameter_grid(self):
+        configs = parameter_grid("technical-ma-dip", {"window": [20, 50], "dip": [0.05, 0.1]})
+        assert [c.params for c in configs] == [
+            {"window": 20, "dip": 0.05}, {"window": 20, "dip": 0.1},
+            {"window": 50, "dip": 0.05}, {"window": 50, "dip": 0.1}]
+        assert parameter_grid("flat-dca")[0].params == {}
+
+    def test_sweep_is_deterministic_across_workers(self):
+        bars = synthetic_bars(400, seed=7)
+        configs = (parameter_grid("power-law-95", {"b": [5.7, 5.82], "max_multiplier": [2, 3]})
+                   + parameter_grid("volatility-dca", {"window": [10, 30]}))
+        serial = run_sweep(configs, bars, workers=1)
+        pooled = run_sweep(configs, bars, workers=2, chunksize=1)
+
+        def stable(results):
+            return [r.model_dump(exclude={"runtime"}) for r in results]
+
+        assert stable(serial) == stable(pooled)
+        assert [r.params for r in pooled] == [c.params for c in configs]
+        assert all(r.runtime >= 0 for r in pooled)
+
+
+def test_cli(tmp_path, capsys):
+    output = tmp_path / "results.json"
+    assert main(["--synthetic", "300", "--strategies", "flat-dca,technical-ma-dip",
+                 "--grid", "window=20,50", "--workers", "1", "--output", str(output)]) == 0
+    report = json.loads(output.read_text())
+    assert report["metadata"]["bars"] == 300
+    # The window grid only applies to the strategy that accepts it
+    assert [r["strategy_id"] for r in report["results"]] == [
+        "flat-dca", "technical-ma-dip", "technical-ma-dip"]
+    assert "technical-ma-dip" in capsys.readouterr().out
@@ -0,0 +1,146 @@
+"""
+Tests for the benchmark harness and mock provider
+File: python/tests/test_bench.py
+Purpose: Tests the mock server's failure/streaming model, percentile maths and an end-to-end run
+Related components: bench.harness, bench.mock_server
+Tags: test, benchmark, mock
+"""
+
+import asyncio
+import json
+import random
+import pytest
+from fastapi.testclient import TestClient
+from python.bench import (
+    MockProviderServer,
+    MockServerConfig,
+    compare_reports,
+    create_app,
+    percentile,
+    run_benchmarks,
+    run_level
+)
+
+FAST = dict(latency_ms=0, tokens_per_second=1e6, completion_tokens=8)
+
+
+class TestMockServer:
+    """Test the fake chat-completions/responses endpoints"""
+
+    def test_chat_completion_with_usage(self):
+        """Test a non-streamed completion carries usage"""
+        client = TestClient(create_app(MockServerConfig(**FAST)))
+        body = client.post("/v1/chat/completions", json={
+            "model": "gpt-4o", "messages": [{"role": "user", "content": "hi"}]
+        }).json()
+        assert body["choices"][0]["message"]["content"].startswith("token0")
+        assert body["usage"]["completion_tokens"] > 0
+
+    def test_sentiment_prompt_returns_json(self):
+        """Test the workflow's sentiment prompt gets parseable JSON"""
+        client = TestClient(create_app(MockServerConfig(**FAST)))
+        body = client.post("/openai/v1/chat/completions", json={
+            "messages": [{"role": "user", "content": "x. Respond in JSON: {}"}]
+        }).json()
+        assert json.loads(body["choices"][0]["message"]["content"])["analysis"]
+
+    def test_streaming(self):
+        """Test SSE chunks end with usage and [DONE]"""
+        client = TestClient(create_app(MockServerConfig(**FAST)))
+        response = client.post("/openai/v1/chat/completions", json={
+            "messages": [{"role": "user", "content": "hi"}], "stream": True
+        })
+        frames = [line[6:] for line in response.text.splitlines()
+                  if line.startswith("data: ")]
+        assert frames[-1] == "[DONE]"
+        final = json.loads(frames[-2])
+        assert final["x_groq"]["usage"]["completion_tokens"] > 0
+        tokens = "".join(json.loads(f)["choices"][0]["delta"].get("content", "")
+                         for f in frames[:-1])
+        assert tokens.split() == [f"token{i}" for i in range(8)]
+
+    def test_responses_endpoint(self):
+        """Test the responses API shape used for web search"""
+        client = TestClient(create_app(MockServerConfig(**FAST)))
+        body = client.post("/v1/responses", json={"model": "gpt-4o", "input": "hi"}).json()
+        assert body["output"][0]["content"][0]["type"] == "output_text"
+        assert body["usage"]["input_tokens"] >= 1
+
+    def test_rate_limit_and_error_injection(self):
+        """Test 429s carry retry-after and are counted"""
+        client = TestClient(create_app(MockServerConfig(**FAST, rate_limit_rate=1.0)))
+        response = client.post("/v1/chat/completions", json={"messages": []})
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "0.05"
+
+        client.put("/config", json={**FAST, "error_rate": 1.0})
+        assert client.post("/v1/responses", json={}).status_code == 500
+        assert client.get("/stats").json() == {
+            "requests": 2, "streamed": 0, "errors": 1, "rate_limited": 1
+        }
+
+    def test_latency_distributions(self):
+        """Test sampled latencies follow the configured model"""
+        rng = random.Random(1)
+        assert MockServerConfig(latency_ms=80).sample_latency(rng) == 0.08
+        uniform = MockServerConfig(latency_ms=100, latency_distribution="uniform",
+                                   latency_spread=20)
+        assert all(0.08 <= uniform.sample_latency(rng) <= 0.12 for _ in range(100))
+        with pytest.raises(ValueError, match="Unknown latency distribution"):
+            MockServerConfig(latency_distribution="pareto").sample_latency(rng)
+
+
+class TestHarness:
+    """Test measurement and comparison"""
+
+    def test_percentile_interpolates(self):
+        """Test linear interpolation between ranks"""
+        values = [1.0, 2.0, 3.0, 4.0]
+        assert percentile(values, 0.5) == 2.5
+        assert percentile(values, 1.0) == 4.0
+        assert percentile([], 0.99) == 0.0
+
+    @pytest.mark.asyncio
+    async def test_run_level_counts_errors(self):
+        """Test failed calls are counted and excluded from latencies"""
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            number = calls
+            await asyncio.sleep(0.001)
+            if number % 4 == 0:
+                raise RuntimeError("boom")
+
+        result = await run_level("fake", call, concurrency=4, requests=20)
+        assert calls == 20
+        assert result.errors == 5
+        assert result.runs_per_sec > 0
+        assert result.p50 <= result.p95 <= result.p99
+        assert result.peak_rss_mb > 0
+
+    def test_compare_flags_regressions(self):
+        """Test p95 growth beyond the threshold is a regression"""
+        base = {"results": [{"scenario": "s", "concurrency": 1, "p95": 0.1,
+                             "runs_per_sec": 10.0}]}
+        slower = {"results": [{"scenario": "s", "concurrency": 1, "p95": 0.2,
+                               "runs_per_sec": 10.0}]}
+        assert compare_reports(base, slower)[0]["regression"]
+        assert not compare_reports(base, base)[0]["regression"]
+
+    @pytest.mark.asyncio
+    async def test_end_to_end_against_spawned_server(self):
+        """Test the real strategies and workflow run against the mock"""
+        with MockProviderServer(MockServerConfig(**FAST)) as server:
+            report = await run_benchmarks(server.base_url,
+                                          scenarios=["grok_query", "workflow"],
+                                          concurrency_levels=[1, 2], requests=4)
+            stats = server.stats()
+
+        assert [(r["scenario"], r["concurrency"]) for r in report["results"]] == [
+            ("grok_query", 1), ("grok_query", 2), ("workflow", 1), ("workflow", 2)]
+        assert all(r["errors"] == 0 for r in report["results"])
+        # 8 grok queries + 8 workflow runs x 3 calls
+        assert stats.requests == 32
+        json.dumps(report)
@@ -1,7 +1,12 @@
 import json
 import pytest
 from unittest.mock import patch, AsyncMock
-from python.workflows.bitcoin_news import BitcoinNewsWorkflow
+from python.workflows.bitcoin_news import (
+    BitcoinNewsWorkflow,
+    get_shared_workflow,
+    warm_up
+)
+from python.llm import LLMConfig, LLMStrategy
 
 
 @pytest.mark.asyncio
@@ -85,3 +90,98 @@ async def test_bitcoin_news_workflow_invalid_sentiment():
         with pytest.raises(ValueError, 
                           match="Invalid sentiment analysis format"):
             await workflow.run()
+
+
+@pytest.mark.asyncio
+async def test_bitcoin_news_workflow_stream_events():
+    """Test streaming yields node and token events before the final state"""
+
+    mock_sentiment = {"analysis": "neutral", "reasoning": "Sideways market."}
+
+    async def grok_stream(prompt, options=None):
+        for token in ["Bitcoin ", "is ", "flat."]:
+            yield token
+
+    async def openai_stream(prompt, options=None):
+        yield json.dumps(mock_sentiment)
+
+    workflow = BitcoinNewsWorkflow()
+
+    with (patch.object(workflow.openai, 'query_with_web_search',
+                      new_callable=AsyncMock) as mock_openai_web,
+          patch.object(workflow.openai, 'query_stream', side_effect=openai_stream),
+          patch.object(workflow.grok, 'query_stream', side_effect=grok_stream)):
+
+        mock_openai_web.return_value = "Bitcoin holds steady"
+
+        events = [event async for event in workflow.stream_events()]
+
+    kinds = [(e["event"], e["node"]) for e in events]
+    assert kinds[0] == ("node_start", "web_search")
+    assert ("node_end", "summarize") in kinds
+    assert kinds[-1] == ("done", None)
+
+    tokens = [e["data"] for e in events
+              if e["event"] == "token" and e["node"] == "summarize"]
+    assert tokens == ["Bitcoin ", "is ", "flat."]
+    # Tokens arrive before the summarize node finishes
+    assert (kinds.index(("token", "summarize"))
+            < kinds.index(("node_end", "summarize")))
+
+    final = events[-1]["data"]
+    assert final["summary"] == "Bitcoin is flat."
+    assert final["sentiment"] == mock_sentiment
+
+
+def test_workflows_reuse_process_wide_strategies():
+    """Test workflow instances share provider clients instead of rebuilding them"""
+    first = BitcoinNewsWorkflow()
+    second = BitcoinNewsWorkflow()
+    assert first.openai is second.openai
+    assert first.grok is second.grok
+
+
+def test_shared_workflow_in_fresh_interpreter():
+    """Test the first get_shared_workflow() call in a new process does not deadlock"""
+    import os
+    import subprocess
+    import sys
+    env = {**os.environ, "OPENAI_API_KEY": "x", "GROK_API_KEY": "x"}
+    code = ("from python.workflows.bitcoin_news import get_shared_workflow; "
+            "print(type(get_shared_workflow()).__name__)")
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    result = subprocess.run([sys.executable, "-c", code], cwd=root, env=env,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "BitcoinNewsWorkflow"
+
+
+def test_shared_workflow_built_once():
+    """Test the shared workflow and its compiled graph are process-wide"""
+    shared = warm_up()
+    assert get_shared_workflow() is shared
+    assert get_shared_workflow().graph is shared.graph
+
+
+@pytest.mark.asyncio
+async def test_injected_strategies_and_concurrent_runs():
+    """Test injected strategies serve concurrent runs on one instance"""
+    import asyncio
+
+    class EchoStrategy(LLMStrategy):
+        async def query(self, prompt, options=None):
+            if "sentiment" in prompt:
+                return json.dumps({"analysis": "neutral", "reasoning": "n/a"})
+            await asyncio.sleep(0.01)
+            return f"summary of {prompt}"
+
+        async def query_with_web_search(self, prompt, options=None):
+            return "Bitcoin headline"
+
+    fake = EchoStrategy(LLMConfig(provider="fake", api_key=""))
+    workflow = BitcoinNewsWorkflow(openai=fake, grok=fake)
+
+    results = await asyncio.gather(*[workflow.run() for _ in range(5)])
+
+    assert all(r["headline"] == "Bitcoin headline" for r in results)
+    assert all(r["sentiment"]["analysis"] == "neutral" for r in results)
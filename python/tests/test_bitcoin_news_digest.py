@@ -0,0 +1,156 @@
+"""
+Tests for the fan-out/fan-in news digest workflow
+File: python/tests/test_bitcoin_news_digest.py
+Purpose: Tests headline parsing, parallel branches, the concurrency cap and aggregation
+Related components: workflows.bitcoin_news_digest, workflows.state
+Tags: test, workflows, fan-out, sentiment
+"""
+
+import asyncio
+import json
+import time
+import pytest
+from langgraph.checkpoint.memory import MemorySaver
+from python.llm import LLMConfig, LLMStrategy
+from python.workflows.bitcoin_news_digest import (
+    BitcoinNewsDigestWorkflow,
+    aggregate_sentiment,
+    parse_headlines
+)
+
+
+class SlowStrategy(LLMStrategy):
+    """Strategy double with a fixed latency that tracks peak concurrency"""
+
+    def __init__(self, delay: float = 0.05, verdicts=None, headlines=""):
+        super().__init__(LLMConfig(provider="slow", api_key=""))
+        self.delay = delay
+        self.verdicts = verdicts or {}
+        self.headlines = headlines
+        self.active = 0
+        self.peak = 0
+
+    async def query(self, prompt, options=None):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        if prompt.startswith("Analyze"):
+            for headline, verdict in self.verdicts.items():
+                if headline in prompt:
+                    if verdict is None:
+                        return "not json"
+                    return json.dumps({"analysis": verdict, "reasoning": "r"})
+            return json.dumps({"analysis": "neutral", "reasoning": "r"})
+        # Summaries echo the headline so the sentiment prompt can be matched
+        return f"Summary of {prompt.split('headline: ')[-1]}"
+
+    async def query_with_web_search(self, prompt, options=None):
+        return self.headlines
+
+
+HEADLINES = "\n".join(f"{i}. Story {i}" for i in range(1, 9))
+
+
+def make_workflow(strategy, **kwargs) -> BitcoinNewsDigestWorkflow:
+    return BitcoinNewsDigestWorkflow(openai=strategy, grok=strategy,
+                                     checkpointer=MemorySaver(), **kwargs)
+
+
+class TestHelpers:
+    """Test headline parsing and aggregation"""
+
+    def test_parse_headlines_strips_markers(self):
+        """Test numbering, bullets, quotes and duplicates are removed"""
+        response = '1. "ETF inflows surge"\n- Miners sell\n\n2) ETF inflows surge\n* Fees fall'
+        assert parse_headlines(response, 10) == ["ETF inflows surge", "Miners sell",
+                                                 "Fees fall"]
+        assert parse_headlines(response, 2) == ["ETF inflows surge", "Miners sell"]
+
+    def test_aggregate_weights_by_rank(self):
+        """Test higher-ranked headlines dominate the score"""
+        result = aggregate_sentiment([
+            {"rank": 1, "sentiment": {"analysis": "bullish"}},
+            {"rank": 2, "sentiment": {"analysis": "bearish"}},
+            {"rank": 3, "error": "boom"}
+        ])
+        assert result["score"] == pytest.approx((1 - 0.5) / 1.5, abs=1e-4)
+        assert result["analysis"] == "bullish"
+        assert result["headlines"] == 2
+        assert result["failed"] == 1
+
+    def test_aggregate_requires_a_verdict(self):
+        """Test aggregation fails when no branch succeeded"""
+        with pytest.raises(ValueError, match="every headline failed"):
+            aggregate_sentiment([{"rank": 1, "error": "boom"}])
+
+
+class TestBitcoinNewsDigestWorkflow:
+    """Test the parallel graph"""
+
+    @pytest.mark.asyncio
+    async def test_runs_one_branch_per_headline(self):
+        """Test every headline is summarized and scored"""
+        strategy = SlowStrategy(delay=0, headlines=HEADLINES,
+                                verdicts={"Story 1": "bearish"})
+        result = await make_workflow(strategy, headlines=3).run()
+
+        assert result["headlines"] == ["Story 1", "Story 2", "Story 3"]
+        assert sorted(a["rank"] for a in result["analyses"]) == [1, 2, 3]
+        assert result["market_sentiment"]["analysis"] == "bearish"
+        assert result["end_time"] is not None
+
+    @pytest.mark.asyncio
+    async def test_wall_clock_close_to_single_headline(self):
+        """Test N headlines take about as long as one when uncapped"""
+        strategy = SlowStrategy(delay=0.05, headlines=HEADLINES)
+        started = time.perf_counter()
+        await make_workflow(strategy, headlines=8, max_concurrency=8).run()
+        elapsed = time.perf_counter() - started
+
+        # Sequentially this would be 8 headlines x 2 calls x 50ms = 0.8s
+        assert elapsed < 0.4
+        assert strategy.peak == 8
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap(self):
+        """Test no more than max_concurrency branches run at once"""
+        strategy = SlowStrategy(delay=0.01, headlines=HEADLINES)
+        result = await make_workflow(strategy, headlines=8, max_concurrency=2).run()
+        assert strategy.peak == 2
+
+        # Branches waiting behind the cap show up as queue wait
+        assert result["node_metrics"]["analyze_headline"]["queue_wait"] > 0.05
+
+    @pytest.mark.asyncio
+    async def test_failed_branch_does_not_fail_digest(self):
+        """Test a malformed verdict is recorded and excluded from the score"""
+        strategy = SlowStrategy(delay=0, headlines=HEADLINES,
+                                verdicts={"Story 1": None, "Story 2": "bullish"})
+        result = await make_workflow(strategy, headlines=2).run()
+
+        errors = [a for a in result["analyses"] if a.get("error")]
+        assert [a["rank"] for a in errors] == [1]
+        assert result["market_sentiment"] == {
+            "score": 1.0, "analysis": "bullish", "headlines": 1, "failed": 1
+        }
+
+    @pytest.mark.asyncio
+    async def test_no_headlines(self):
+        """Test an empty search result fails the run"""
+        with pytest.raises(ValueError, match="no headlines found"):
+            await make_workflow(SlowStrategy(delay=0, headlines="")).run()
+
+    @pytest.mark.asyncio
+    async def test_stream_events_per_branch(self):
+        """Test streaming reports each branch"""
+        strategy = SlowStrategy(delay=0, headlines=HEADLINES)
+        events = [e async for e in make_workflow(strategy, headlines=2).stream_events()]
+
+        started = {e["node"] for e in events if e["event"] == "node_start"}
+        assert {"web_search", "analyze_headline[1]", "analyze_headline[2]",
+                "aggregate"} <= started
+        assert events[-1]["event"] == "done"
+        assert events[-1]["data"]["market_sentiment"]["analysis"] == "neutral"
@@ -0,0 +1,262 @@
+"""
+Tests for the Bitcoin node client
+File: python/tests/test_bitcoin_node.py
+Purpose: Tests JSON-RPC batching, retries and auth, xpub normalization, incremental address tracking and xpub withdrawals against the mock node
+Related components: node.rpc, node.addresses, node.mock
+Tags: test, node, bitcoin, json-rpc, xpub
+"""
+
+import asyncio
+import httpx
+import pytest
+from python.node import (
+    AddressCache,
+    BitcoinRPC,
+    BitcoinRPCConfig,
+    MockBitcoind,
+    NoUnusedAddressError,
+    RPCError,
+    configure_bitcoin_rpc,
+    get_address_cache,
+    get_bitcoin_rpc,
+    normalize_xpub,
+    withdraw_to_xpub
+)
+from python.node.addresses import b58decode_check, b58encode_check
+
+# BIP84 test vector account key (m/84'/0'/0')
+ZPUB = ("zpub6rFR7y4Q2AijBEqTUquhVz398htDFrtymD9xYYfG1m4wAcvPhXNfE3EfH1r1ADqtf"
+        "SdVCToUG868RvUUkgDKf31mGDtKsAYz2oz2AGutZYs")
+VPUB = b58encode_check(bytes.fromhex("045f1cf6") + b58decode_check(ZPUB)[4:])
+
+
+def make_rpc(node: MockBitcoind, **kwargs) -> BitcoinRPC:
+    config = BitcoinRPCConfig(retry_backoff=0.0, **kwargs)
+    return BitcoinRPC(config, transport=node.transport())
+
+
+def make_cache(node: MockBitcoind, **kwargs) -> AddressCache:
+    kwargs.setdefault("gap_limit", 5)
+    kwargs.setdefault("lookahead", 5)
+    return AddressCache(make_rpc(node), VPUB, wallet="watch", **kwargs)
+
+
+class TestBitcoinRPC:
+    """Test batching, retries and errors"""
+
+    @pytest.mark.asyncio
+    async def test_batch_is_one_request(self):
+        node = MockBitcoind()
+        async with make_rpc(node) as rpc:
+            calls = [("getdescriptorinfo", (f"addr({i})",)) for i in range(50)]
+            results = await rpc.batch(calls)
+            assert node.requests == 1 and len(node.calls) == 50
+            assert [r["descriptor"].split("#")[0] for r in results] == [
+                f"addr({i})" for i in range(50)]
+
+    @pytest.mark.asyncio
+    async def test_batches_are_chunked(self):
+        node = MockBitcoind()
+        async with make_rpc(node, max_batch=20) as rpc:
+            await rpc.batch([("getblockchaininfo", ())] * 45)
+        assert node.requests == 3
+
+    @pytest.mark.asyncio
+    async def test_errors(self):
+        node = MockBitcoind()
+        async with make_rpc(node) as rpc:
+            results = await rpc.batch([("getnetworkinfo", ()), ("nosuchmethod", ())],
+                                      return_errors=True)
+            assert isinstance(results[1], RPCError) and results[1].code == -32601
+            with pytest.raises(RPCError, match="nosuchmethod"):
+                await rpc.call("nosuchmethod")
+        async with make_rpc(node, password="wrong") as rpc:
+            with pytest.raises(RPCError, match="unauthorized"):
+                await rpc.verify()
+
+    @pytest.mark.asyncio
+    async def test_retries_transport_errors(self):
+        node = MockBitcoind()
+        async with make_rpc(node, retry_attempts=3) as rpc:
+            node.fail_next(2)
+            assert (await rpc.verify())["chain"] == "test"
+            node.fail_next(3)
+            with pytest.raises(Exception):
+                await rpc.verify()
+
+    @pytest.mark.asyncio
+    async def test_payments_not_resent_after_read_timeout(self):
+        node = MockBitcoind()
+        async with make_rpc(node, retry_attempts=3) as rpc:
+            node.lose_replies(1)
+            with pytest.raises(httpx.ReadTimeout):
+                await rpc.call("sendtoaddress", "tb1qpaid", 0.01, idempotent=False)
+            assert len(node.transactions) == 1
+            # Never sent: safe to resend
+            node.fail_next(2)
+            await rpc.call("sendtoaddress", "tb1qpaid", 0.01, idempotent=False)
+            assert len(node.transactions) == 2
+
+
+class TestXpub:
+    """Test extended key normalization"""
+
+    def test_slip132_versions(self):
+        xpub = normalize_xpub(ZPUB, "mainnet")
+        assert xpub.startswith("xpub") and b58decode_check(xpub)[4:] == b58decode_check(ZPUB)[4:]
+        assert normalize_xpub(VPUB, "testnet").startswith("tpub")
+        assert normalize_xpub(xpub) == xpub
+
+    def test_rejects_bad_keys(self):
+        with pytest.raises(ValueError, match="mainnet"):
+            normalize_xpub(ZPUB, "testnet")
+        with pytest.raises(ValueError, match="checksum"):
+            normalize_xpub(ZPUB[:-1] + ("t" if ZPUB[-1] != "t" else "u"))
+        ypub = b58encode_check(bytes.fromhex("049d7cb2") + b58decode_check(ZPUB)[4:])
+        with pytest.raises(ValueError, match="BIP84"):
+            normalize_xpub(ypub)
+
+
+class TestAddressCache:
+    """Test derivation ahead of the gap limit and incremental tracking"""
+
+    @pytest.mark.asyncio
+    async def test_first_sync_derives_and_watches_in_one_batch(self):
+        node = MockBitcoind()
+        cache = make_cache(node)
+        assert await cache.sync() == []
+        # getdescriptorinfo, then derive + import + listsinceblock together
+        assert node.requests == 2
+        assert node.calls == ["getdescriptorinfo", "deriveaddresses",
+                              "importdescriptors", "listsinceblock"]
+        assert len(cache.addresses) == 10 and cache.watched_end == 9
+        assert cache.addresses[3] == MockBitcoind.address(cache.base_descriptor, 3)
+
+    @pytest.mark.asyncio
+    async def test_sync_is_incremental(self):
+        node = MockBitcoind()
+        cache = make_cache(node)
+        await cache.sync()
+        node.calls.clear()
+        requests = node.requests
+
+        # Nothing new: one call, nothing derived
+        assert await cache.sync() == []
+        assert node.calls == ["listsinceblock"] and node.requests == requests + 1
+
+        node.pay(cache.addresses[0])
+        node.pay(cache.addresses[7])
+        node.mine()
+        node.calls.clear()
+        assert await cache.sync() == [cache.addresses[0], cache.addresses[7]]
+        # The frontier moved to 7: extend to 7 + 1 + gap + lookahead
+        assert len(cache.addresses) == 18 and cache.watched_end == 17
+        assert node.calls == ["listsinceblock", "deriveaddresses", "importdescriptors"]
+
+        node.calls.clear()
+        assert await cache.sync() == []
+        assert node.calls == ["listsinceblock"]
+
+    @pytest.mark.asyncio
+    async def test_unwatched_addresses_are_not_seen(self):
+        node = MockBitcoind()
+        cache = make_cache(node)
+        await cache.sync()
+        node.pay(MockBitcoind.address(cache.base_descriptor, 50))
+        assert await cache.sync() == []
+
+    @pytest.mark.asyncio
+    async def test_select_respects_gap_limit(self):
+        node = MockBitcoind()
+        cache = make_cache(node)
+        await cache.sync()
+        picked = [cache.select_unused_address() for _ in range(5)]
+        assert picked == cache.addresses[:5]
+        with pytest.raises(NoUnusedAddressError):
+            cache.select_unused_address()
+        cache.release(picked[2])
+        assert cache.select_unused_address(reserve=False) == picked[2]
+
+        node.pay(picked[4])
+        await cache.sync()
+        assert cache.is_used(picked[4]) and cache.highest_used == 4
+        assert cache.select_unused_address() == cache.addresses[5]
+
+    @pytest.mark.asyncio
+    async def test_snapshot_restore(self):
+        node = MockBitcoind()
+        cache = make_cache(node)
+        await cache.sync()
+        node.pay(cache.addresses[1])
+        node.mine()
+        await cache.sync()
+
+        restored = make_cache(node)
+        restored.restore(cache.snapshot())
+        node.calls.clear()
+        assert await restored.sync() == []
+        assert node.calls == ["listsinceblock"]
+        assert restored.select_unused_address() == cache.addresses[2]
+
+
+class TestWithdrawToXpub:
+    """Test withdrawals to the next unused address"""
+
+    @pytest.mark.asyncio
+    async def test_withdrawals_never_reuse_addresses(self):
+        node = MockBitcoind()
+        cache = make_cache(node)
+        txids = [await withdraw_to_xpub(VPUB, 0.01, cache=cache) for _ in range(3)]
+        paid = [address for _, address, _, _ in node.transactions]
+        assert len(set(txids)) == 3 and paid == cache.addresses[:3]
+        assert cache.used == {0, 1, 2}
+
+    @pytest.mark.asyncio
+    async def test_failed_send_releases_address(self):
+        node = MockBitcoind()
+        cache = make_cache(node)
+        with pytest.raises(RPCError):
+            await withdraw_to_xpub(VPUB, 1e-12, cache=cache)
+        assert cache.reserved == set() and cache.used == set()
+        with pytest.raises(ValueError):
+            await withdraw_to_xpub(VPUB, 0, cache=cache)
+
+    @pytest.mark.asyncio
+    async def test_ambiguous_send_keeps_address_reserved(self):
+        node = MockBitcoind()
+        cache = make_cache(node)
+        node.lose_replies(1, method="sendtoaddress")
+        with pytest.raises(httpx.ReadTimeout):
+            await withdraw_to_xpub(VPUB, 0.01, cache=cache)
+        # Paid once, and the possibly-paid address is not handed out again
+        assert len(node.transactions) == 1 and cache.reserved == {0}
+        await withdraw_to_xpub(VPUB, 0.01, cache=cache)
+        assert node.transactions[-1][1] == cache.addresses[1]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_withdrawals(self):
+        node = MockBitcoind(latency=0.01)
+        cache = make_cache(node)
+        txids = await asyncio.gather(*(withdraw_to_xpub(VPUB, 0.01, cache=cache)
+                                       for _ in range(3)))
+        paid = [address for _, address, _, _ in node.transactions]
+        assert len(set(txids)) == 3 and sorted(paid) == sorted(cache.addresses[:3])
+        # Derivations never overlapped: the cache is the contiguous range
+        assert cache.addresses == [MockBitcoind.address(cache.base_descriptor, i)
+                                   for i in range(len(cache.addresses))]
+
+    @pytest.mark.asyncio
+    async def test_shared_client_and_cache(self, monkeypatch):
+        node = MockBitcoind()
+        monkeypatch.setenv("BITCOIN_WATCH_WALLET", "watch")
+        configure_bitcoin_rpc(make_rpc(node))
+        try:
+            rpc = get_bitcoin_rpc()
+            cache = get_address_cache(VPUB)
+            assert cache.rpc is rpc and get_address_cache(VPUB) is cache
+            await withdraw_to_xpub(VPUB, 0.01)
+            await withdraw_to_xpub(VPUB, 0.01)
+            assert get_bitcoin_rpc() is rpc and len(node.transactions) == 2
+        finally:
+            await get_bitcoin_rpc().aclose()
+            configure_bitcoin_rpc(None)
@@ -0,0 +1,203 @@
+"""
+Tests for the LLM response cache
+File: python/tests/test_cache.py
+Purpose: Tests LRU/TTL eviction, the SQLite tier and the caching strategy wrapper
+Related components: llm.cache, llm.base
+Tags: test, llm, cache
+"""
+
+import threading
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from python.llm import (
+    LLMConfig,
+    LLMStrategy,
+    CachedLLMStrategy,
+    LLMResponseCache,
+    make_cache_key
+)
+
+
+class FakeClock:
+    """Manually advanced clock for TTL tests"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_strategy(provider: str = "openai", model: str = "gpt-4o") -> LLMStrategy:
+    """Create a strategy double with mocked query methods"""
+    strategy = MagicMock(spec=LLMStrategy)
+    strategy.config = LLMConfig(provider=provider, api_key="key", model=model)
+    strategy.query = AsyncMock(return_value="answer")
+    strategy.query_with_web_search = AsyncMock(return_value="headline")
+    return strategy
+
+
+class TestCacheKey:
+    """Test cache key construction"""
+
+    def test_whitespace_normalized(self):
+        """Test prompts differing only in whitespace share a key"""
+        assert (make_cache_key("openai", "gpt-4o", "Summarize  this\n")
+                == make_cache_key("openai", "gpt-4o", "Summarize this"))
+
+    def test_key_includes_provider_model_and_options(self):
+        """Test every key component changes the key"""
+        base = make_cache_key("openai", "gpt-4o", "p", {"temperature": 0})
+        assert base != make_cache_key("grok", "gpt-4o", "p", {"temperature": 0})
+        assert base != make_cache_key("openai", "gpt-4o-mini", "p", {"temperature": 0})
+        assert base != make_cache_key("openai", "gpt-4o", "p", {"temperature": 1})
+        assert base != make_cache_key("openai", "gpt-4o", "p", {"temperature": 0},
+                                      kind="web_search")
+
+    def test_option_order_irrelevant(self):
+        """Test option dict ordering does not affect the key"""
+        assert (make_cache_key("openai", None, "p", {"a": 1, "b": 2})
+                == make_cache_key("openai", None, "p", {"b": 2, "a": 1}))
+
+
+class TestLLMResponseCache:
+    """Test the in-memory and SQLite tiers"""
+
+    def test_lru_eviction(self):
+        """Test least recently used entries are evicted first"""
+        cache = LLMResponseCache(max_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        assert cache.get("a") == "1"
+        cache.set("c", "3")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+        assert cache.get("c") == "3"
+        assert cache.stats.evictions == 1
+
+    def test_ttl_expiry(self):
+        """Test entries expire after their TTL"""
+        clock = FakeClock()
+        cache = LLMResponseCache(clock=clock)
+        cache.set("a", "1", ttl=10)
+        clock.now += 5
+        assert cache.get("a") == "1"
+        clock.now += 6
+        assert cache.get("a") is None
+        assert cache.stats.expirations == 1
+
+    def test_counters(self):
+        """Test hit and miss counters"""
+        cache = LLMResponseCache()
+        cache.get("missing")
+        cache.set("a", "1")
+        cache.get("a")
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+        assert cache.stats.hit_rate == 0.5
+
+    def test_sqlite_tier_survives_restart(self, tmp_path):
+        """Test entries persist across cache instances"""
+        db_path = str(tmp_path / "llm_cache.db")
+        first = LLMResponseCache(db_path=db_path)
+        first.set("a", "persisted")
+        first.close()
+
+        second = LLMResponseCache(db_path=db_path)
+        assert second.get("a") == "persisted"
+        assert second.stats.disk_hits == 1
+        second.close()
+
+    @pytest.mark.asyncio
+    async def test_async_disk_io_runs_off_the_loop(self, tmp_path):
+        """Test aget/aset reach SQLite from a worker thread"""
+        db_path = str(tmp_path / "llm_cache.db")
+        first = LLMResponseCache(db_path=db_path)
+        threads = []
+        set_disk = first._set_disk
+        first._set_disk = lambda *args: threads.append(threading.get_ident()) or set_disk(*args)
+        await first.aset("a", "persisted")
+        first.close()
+
+        second = LLMResponseCache(db_path=db_path)
+        get_disk = second._get_disk
+        second._get_disk = lambda *args: threads.append(threading.get_ident()) or get_disk(*args)
+        assert await second.aget("a") == "persisted"
+        # Promoted into memory: no second disk read
+        assert await second.aget("a") == "persisted"
+        assert len(threads) == 2 and threading.get_ident() not in threads
+        assert second.stats.disk_hits == 1
+        second.close()
+
+    def test_purge_expired(self, tmp_path):
+        """Test purging removes expired entries from both tiers"""
+        clock = FakeClock()
+        cache = LLMResponseCache(db_path=str(tmp_path / "c.db"), clock=clock)
+        cache.set("old", "1", ttl=1)
+        cache.set("new", "2", ttl=100)
+        clock.now += 10
+        assert cache.purge_expired() == 2
+        assert cache.get("new") == "2"
+        cache.close()
+
+
+class TestCachedLLMStrategy:
+    """Test the caching strategy wrapper"""
+
+    @pytest.mark.asyncio
+    async def test_repeated_query_hits_cache(self):
+        """Test identical queries only reach the provider once"""
+        inner = make_strategy()
+        strategy = CachedLLMStrategy(inner, LLMResponseCache())
+
+        assert await strategy.query("Summarize X") == "answer"
+        assert await strategy.query("Summarize  X") == "answer"
+        assert inner.query.call_count == 1
+        assert strategy.cache.stats.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_web_search_uses_short_ttl(self):
+        """Test web search results expire on the web-search TTL"""
+        clock = FakeClock()
+        cache = LLMResponseCache(default_ttl=3600, web_search_ttl=60, clock=clock)
+        inner = make_strategy()
+        strategy = CachedLLMStrategy(inner, cache)
+
+        await strategy.query_with_web_search("news")
+        await strategy.query("news")
+        clock.now += 120
+        await strategy.query_with_web_search("news")
+        await strategy.query("news")
+
+        assert inner.query_with_web_search.call_count == 2
+        assert inner.query.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_errors_not_cached(self):
+        """Test failed calls are retried rather than cached"""
+        inner = make_strategy()
+        inner.query.side_effect = [Exception("OpenAI API error"), "recovered"]
+        strategy = CachedLLMStrategy(inner, LLMResponseCache())
+
+        with pytest.raises(Exception, match="OpenAI API error"):
+            await strategy.query("p")
+        assert await strategy.query("p") == "recovered"
+
+    @pytest.mark.asyncio
+    async def test_stream_populates_cache(self):
+        """Test a streamed response is cached and replayed as one chunk"""
+        inner = make_strategy()
+
+        async def stream(prompt, options=None):
+            for token in ["a", "b", "c"]:
+                yield token
+
+        inner.query_stream = MagicMock(side_effect=stream)
+        strategy = CachedLLMStrategy(inner, LLMResponseCache())
+
+        assert [t async for t in strategy.query_stream("p")] == ["a", "b", "c"]
+        assert [t async for t in strategy.query_stream("p")] == ["abc"]
+        assert await strategy.query("p") == "abc"
+        assert inner.query_stream.call_count == 1
+        assert inner.query.call_count == 0
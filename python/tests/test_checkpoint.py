@@ -0,0 +1,180 @@
+"""
+Tests for the bounded workflow checkpointers
+File: python/tests/test_checkpoint.py
+Purpose: Tests thread retention, the SQLite saver and resuming interrupted runs
+Related components: workflows.checkpoint, workflows.bitcoin_news
+Tags: test, workflows, checkpoint
+"""
+
+import json
+import sqlite3
+import threading
+import pytest
+from unittest.mock import AsyncMock
+from python.llm import LLMConfig, LLMStrategy
+from python.workflows.bitcoin_news import BitcoinNewsWorkflow
+from python.workflows.checkpoint import (
+    BoundedMemorySaver,
+    RetentionPolicy,
+    SQLiteCheckpointSaver
+)
+
+
+class ScriptedStrategy(LLMStrategy):
+    """Strategy double returning canned answers and counting calls"""
+
+    def __init__(self):
+        super().__init__(LLMConfig(provider="scripted", api_key=""))
+        self.query = AsyncMock(return_value="A calm day for Bitcoin.")
+        self.query_with_web_search = AsyncMock(return_value="Bitcoin flat")
+
+
+def make_workflow(checkpointer) -> BitcoinNewsWorkflow:
+    return BitcoinNewsWorkflow(openai=ScriptedStrategy(), grok=ScriptedStrategy(),
+                               checkpointer=checkpointer)
+
+
+SENTIMENT = json.dumps({"analysis": "neutral", "reasoning": "Flat price."})
+
+
+class TestBoundedMemorySaver:
+    """Test in-memory retention"""
+
+    @pytest.mark.asyncio
+    async def test_max_threads_evicts_lru(self):
+        """Test memory stays bounded as runs accumulate"""
+        saver = BoundedMemorySaver(RetentionPolicy(max_threads=3, max_age_seconds=None))
+        workflow = make_workflow(saver)
+        workflow.openai.query.return_value = SENTIMENT
+
+        for _ in range(10):
+            await workflow.run()
+
+        assert saver.thread_count == 3
+        assert len(saver.storage) == 3
+        assert saver.evictions == 7
+
+    @pytest.mark.asyncio
+    async def test_max_age_evicts_idle_threads(self):
+        """Test threads idle past max_age are dropped on the next write"""
+        now = [0.0]
+        saver = BoundedMemorySaver(RetentionPolicy(max_threads=None, max_age_seconds=60),
+                                   clock=lambda: now[0])
+        workflow = make_workflow(saver)
+        workflow.openai.query.return_value = SENTIMENT
+
+        await workflow.run(thread_id="old")
+        now[0] += 120
+        await workflow.run(thread_id="new")
+
+        assert "old" not in saver.storage
+        assert "new" in saver.storage
+
+
+class TestSQLiteCheckpointSaver:
+    """Test the on-disk saver"""
+
+    @pytest.mark.asyncio
+    async def test_run_persists_and_reloads(self, tmp_path):
+        """Test checkpoints survive reopening the database"""
+        path = str(tmp_path / "checkpoints.db")
+        saver = SQLiteCheckpointSaver(path)
+        workflow = make_workflow(saver)
+        workflow.openai.query.return_value = SENTIMENT
+        await workflow.run(thread_id="t1")
+        saver.close()
+
+        reopened = SQLiteCheckpointSaver(path)
+        state = reopened.get_tuple({"configurable": {"thread_id": "t1"}})
+        assert state.checkpoint["channel_values"]["summary"] == "A calm day for Bitcoin."
+        assert len(list(reopened.list({"configurable": {"thread_id": "t1"}}))) > 1
+        reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_resume_skips_completed_nodes(self, tmp_path):
+        """Test an interrupted run resumes without repeating paid LLM calls"""
+        saver = SQLiteCheckpointSaver(str(tmp_path / "checkpoints.db"))
+        workflow = make_workflow(saver)
+        workflow.openai.query.return_value = "not json"
+
+        with pytest.raises(ValueError, match="Invalid sentiment analysis format"):
+            await workflow.run(thread_id="interrupted")
+
+        workflow.openai.query.return_value = SENTIMENT
+        result = await workflow.run(thread_id="interrupted")
+
+        assert result["sentiment"]["analysis"] == "neutral"
+        assert workflow.openai.query_with_web_search.call_count == 1
+        assert workflow.grok.query.call_count == 1
+        saver.close()
+
+    def test_writes_are_batched(self, tmp_path):
+        """Test writes stay buffered until the batch fills"""
+        saver = SQLiteCheckpointSaver(str(tmp_path / "c.db"), batch_size=3,
+                                      flush_interval=3600,
+                                      policy=RetentionPolicy(max_age_seconds=None))
+        saver._enqueue("INSERT INTO threads VALUES (?, ?)", ("a", 1.0))
+        saver._enqueue("INSERT INTO threads VALUES (?, ?)", ("b", 1.0))
+        count = saver._db.execute("SELECT COUNT(*) FROM threads").fetchone()[0]
+        assert count == 0
+        saver._enqueue("INSERT INTO threads VALUES (?, ?)", ("c", 1.0))
+        count = saver._db.execute("SELECT COUNT(*) FROM threads").fetchone()[0]
+        assert count == 3
+        saver.close()
+
+    def test_buffered_writes_flush_on_timer(self, tmp_path):
+        """Test a lone buffered write is committed without a later write"""
+        import time as _time
+        saver = SQLiteCheckpointSaver(str(tmp_path / "c.db"), batch_size=100,
+                                      flush_interval=0.05,
+                                      policy=RetentionPolicy(max_age_seconds=None))
+        saver._enqueue("INSERT INTO threads VALUES (?, ?)", ("a", 1.0))
+        _time.sleep(0.3)
+        other = sqlite3.connect(saver.path)
+        assert other.execute("SELECT COUNT(*) FROM threads").fetchone()[0] == 1
+        other.close()
+        saver.close()
+
+    @pytest.mark.asyncio
+    async def test_checkpoints_durable_after_each_step(self, tmp_path):
+        """Test a finished run leaves nothing buffered (crash-safe resume)"""
+        saver = SQLiteCheckpointSaver(str(tmp_path / "c.db"), flush_interval=3600)
+        workflow = make_workflow(saver)
+        workflow.openai.query.return_value = SENTIMENT
+        await workflow.run(thread_id="t1")
+        assert saver._pending == []
+        other = sqlite3.connect(saver.path)
+        assert other.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0] > 1
+        other.close()
+        saver.close()
+
+    @pytest.mark.asyncio
+    async def test_async_api_runs_off_the_loop(self, tmp_path):
+        """Test a run's checkpoint commits happen on worker threads"""
+        saver = SQLiteCheckpointSaver(str(tmp_path / "c.db"))
+        threads = []
+        put = saver.put
+        saver.put = lambda *args: threads.append(threading.get_ident()) or put(*args)
+        workflow = make_workflow(saver)
+        workflow.openai.query.return_value = SENTIMENT
+        await workflow.run(thread_id="t1")
+        assert threads and threading.get_ident() not in threads
+        saver.close()
+
+    @pytest.mark.asyncio
+    async def test_retention_limits_threads(self, tmp_path):
+        """Test old threads are deleted from disk"""
+        saver = SQLiteCheckpointSaver(
+            str(tmp_path / "c.db"),
+            policy=RetentionPolicy(max_threads=2, max_age_seconds=None)
+        )
+        workflow = make_workflow(saver)
+        workflow.openai.query.return_value = SENTIMENT
+        for i in range(5):
+            await workflow.run(thread_id=f"t{i}")
+        saver.flush()
+
+        threads = {row[0] for row in saver._db.execute(
+            "SELECT DISTINCT thread_id FROM checkpoints")}
+        assert threads == {"t3", "t4"}
+        saver.close()
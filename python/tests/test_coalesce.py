@@ -0,0 +1,115 @@
+"""
+Tests for single-flight LLM request coalescing
+File: python/tests/test_coalesce.py
+Purpose: Tests that concurrent identical requests share one upstream call
+Related components: llm.coalesce
+Tags: test, llm, coalescing
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from python.llm import (
+    LLMConfig,
+    LLMStrategy,
+    CoalescingLLMStrategy,
+    SingleFlight
+)
+
+
+def make_strategy(delay: float = 0.05) -> LLMStrategy:
+    """Create a strategy double whose calls take ``delay`` seconds"""
+    async def slow(prompt, options=None):
+        await asyncio.sleep(delay)
+        return f"result for {prompt}"
+
+    strategy = MagicMock(spec=LLMStrategy)
+    strategy.config = LLMConfig(provider="openai", api_key="key", model="gpt-4o")
+    strategy.query = AsyncMock(side_effect=slow)
+    strategy.query_with_web_search = AsyncMock(side_effect=slow)
+    return strategy
+
+
+class TestSingleFlight:
+    """Test the single-flight group"""
+
+    @pytest.mark.asyncio
+    async def test_identical_calls_share_result(self):
+        """Test N concurrent identical web searches make one upstream call"""
+        inner = make_strategy()
+        strategy = CoalescingLLMStrategy(inner, SingleFlight())
+
+        results = await asyncio.gather(
+            *[strategy.query_with_web_search("latest news") for _ in range(10)]
+        )
+
+        assert results == ["result for latest news"] * 10
+        assert inner.query_with_web_search.call_count == 1
+        assert strategy.stats.requests == 10
+        assert strategy.stats.deduplicated == 9
+
+    @pytest.mark.asyncio
+    async def test_errors_shared(self):
+        """Test every waiter receives the same upstream error"""
+        inner = make_strategy()
+
+        async def failing(prompt, options=None):
+            await asyncio.sleep(0.01)
+            raise Exception("OpenAI API error: boom")
+
+        inner.query_with_web_search.side_effect = failing
+        strategy = CoalescingLLMStrategy(inner, SingleFlight())
+
+        results = await asyncio.gather(
+            *[strategy.query_with_web_search("news") for _ in range(3)],
+            return_exceptions=True
+        )
+        assert all(str(r) == "OpenAI API error: boom" for r in results)
+        assert inner.query_with_web_search.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_not_coalesced(self):
+        """Test completed calls are not reused (that is the cache's job)"""
+        inner = make_strategy(delay=0)
+        strategy = CoalescingLLMStrategy(inner, SingleFlight())
+
+        await strategy.query_with_web_search("news")
+        await strategy.query_with_web_search("news")
+        assert inner.query_with_web_search.call_count == 2
+        assert strategy.group.inflight == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        """Test cancelling one waiter leaves the shared call running"""
+        inner = make_strategy(delay=0.05)
+        strategy = CoalescingLLMStrategy(inner, SingleFlight())
+
+        first = asyncio.ensure_future(strategy.query_with_web_search("news"))
+        second = asyncio.ensure_future(strategy.query_with_web_search("news"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert await second == "result for news"
+        assert first.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_plain_query_opt_in(self):
+        """Test plain queries are only coalesced when enabled"""
+        inner = make_strategy()
+        default = CoalescingLLMStrategy(inner, SingleFlight())
+        await asyncio.gather(default.query("p"), default.query("p"))
+        assert inner.query.call_count == 2
+
+        inner = make_strategy()
+        enabled = CoalescingLLMStrategy(inner, SingleFlight(), coalesce_query=True)
+        await asyncio.gather(enabled.query("p"), enabled.query("p"))
+        assert inner.query.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_different_prompts_not_coalesced(self):
+        """Test distinct prompts each make their own call"""
+        inner = make_strategy()
+        strategy = CoalescingLLMStrategy(inner, SingleFlight())
+        await asyncio.gather(strategy.query_with_web_search("a"),
+                             strategy.query_with_web_search("b"))
+        assert inner.query_with_web_search.call_count == 2
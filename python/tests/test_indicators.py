@@ -0,0 +1,145 @@
+"""
+Tests for streaming indicators
+File: python/tests/test_indicators.py
+Purpose: Tests per-tick indicators against NumPy references, snapshot round-trips and streaming strategy evaluation
+Related components: strategies.indicators, strategies.engine (StreamingStrategy), strategies.base
+Tags: test, strategies, indicators, streaming
+"""
+
+import json
+import numpy as np
+import pytest
+from python.strategies import (
+    EWMA,
+    Indicator,
+    IndicatorSet,
+    PriceHistory,
+    RollingMean,
+    RollingVariance,
+    RunningRegression,
+    StrategyFactory,
+    StreamingQuantile,
+    StreamingStrategy
+)
+from python.backtest import synthetic_bars
+
+
+def noise(size: int = 500, seed: int = 1) -> np.ndarray:
+    return np.random.default_rng(seed).normal(100.0, 15.0, size)
+
+
+class TestIndicators:
+    """Test indicators against full recomputation"""
+
+    def test_rolling_mean_and_variance(self):
+        values = noise()
+        mean, variance, expanding = RollingMean(20), RollingVariance(20), RollingVariance()
+        for t, value in enumerate(values, start=1):
+            mean.update(value)
+            variance.update(value)
+            expanding.update(value)
+            window = values[max(0, t - 20):t]
+            assert mean.value == pytest.approx(window.mean(), rel=1e-12)
+            if t > 1:
+                assert variance.value == pytest.approx(window.var(ddof=1), rel=1e-9)
+                assert expanding.std == pytest.approx(values[:t].std(ddof=1), rel=1e-9)
+        assert len(variance.buffer) == 20
+
+    def test_ewma(self):
+        values = noise(50)
+        ewma = EWMA(span=9)
+        for value in values:
+            ewma.update(value)
+        alpha = 0.2
+        weights = (1 - alpha) ** np.arange(49, -1, -1.0)
+        weights[0] /= alpha  # the first value seeds the mean with full weight
+        assert ewma.value == pytest.approx(np.average(values, weights=weights), rel=1e-12)
+        with pytest.raises(ValueError):
+            EWMA()
+
+    def test_quantile(self):
+        few = StreamingQuantile(95)
+        for value in [3.0, 1.0, 2.0]:
+            few.update(value)
+        assert few.value == pytest.approx(np.percentile([1.0, 2.0, 3.0], 95))
+
+        values = noise(20_000, seed=5)
+        estimate = StreamingQuantile(95)
+        for value in values:
+            estimate.update(value)
+        assert estimate.value == pytest.approx(np.percentile(values, 95), rel=0.01)
+        assert len(estimate.heights) == 5
+
+    def test_regression(self):
+        x = np.linspace(1.0, 9.0, 200)
+        y = 2.5 * x - 4.0 + noise(200) / 100
+        fit = RunningRegression()
+        for a, b in zip(x, y):
+            fit.update(a, b)
+        slope, intercept = np.polyfit(x, y, 1)
+        assert (fit.slope, fit.intercept) == (pytest.approx(slope), pytest.approx(intercept))
+        assert fit.residual_std == pytest.approx((y - (slope * x + intercept)).std())
+
+    def test_snapshot_round_trip(self):
+        values = noise(300)
+        indicators = IndicatorSet({"mean": RollingMean(7), "var": RollingVariance(7),
+                                   "ewma": EWMA(alpha=0.1), "p95": StreamingQuantile(95),
+                                   "nested": IndicatorSet({"all": RollingVariance()})})
+        for value in values[:150]:
+            for name in ("mean", "var", "ewma", "p95"):
+                indicators[name].update(value)
+            indicators["nested"]["all"].update(value)
+        resumed = IndicatorSet.restore(json.loads(json.dumps(indicators.snapshot())))
+        for value in values[150:]:
+            for target in (indicators, resumed):
+                for name in ("mean", "var", "ewma", "p95"):
+                    target[name].update(value)
+                target["nested"]["all"].update(value)
+        assert resumed.values() == indicators.values()
+
+    def test_unknown_kind(self):
+        with pytest.raises(ValueError, match="Unknown indicator"):
+            Indicator.restore({"kind": "nope"})
+
+
+class TestStreamingStrategy:
+    """Test streamed evaluation against history-based evaluation"""
+
+    @pytest.mark.parametrize("strategy_id,params", [
+        ("flat-dca", {}),
+        ("power-law-channel", {}),
+        ("technical-ma-dip", {"window": 20}),
+        ("volatility-dca", {"window": 10}),
+        ("halving-cycle", {}),
+        ("ensemble", {"members": ["power-law-channel", "technical-ma-dip", "halving-cycle"]}),
+    ])
+    def test_matches_history_evaluation(self, strategy_id, params):
+        bars = synthetic_bars(150, start_day=5000, volatility=0.05, seed=2)
+        prices, days = bars.closes, bars.days
+        reference = StrategyFactory.create(strategy_id, **params)
+        streaming = StreamingStrategy(strategy_id, params)
+        for t in range(len(prices)):
+            expected = reference.evaluate(prices[t], PriceHistory(prices[:t], days[:t]), days[t])
+            actual = streaming.evaluate(prices[t], days[t])
+            assert (actual.action, actual.fallback) == (expected.action, expected.fallback)
+            assert actual.multiplier == pytest.approx(expected.multiplier, rel=1e-9)
+            streaming.update(prices[t], days[t])
+
+    def test_power_law_band_is_estimated(self):
+        bars = synthetic_bars(600, start_day=5000, volatility=0.08, seed=3)
+        streaming = StreamingStrategy("power-law-95")
+        streaming.extend(bars.closes, bars.days)
+        history = PriceHistory(bars.closes, bars.days)
+        exact = StrategyFactory.get("power-law-95").band_ratio(history)
+        assert streaming.indicators["band"].value == pytest.approx(exact, rel=0.02)
+
+    def test_resume_from_snapshot(self):
+        bars = synthetic_bars(200, start_day=5000, seed=4)
+        live = StreamingStrategy("ensemble")
+        live.extend(bars.closes[:120], bars.days[:120])
+        resumed = StreamingStrategy.from_snapshot(json.loads(json.dumps(live.snapshot())))
+        for stream in (live, resumed):
+            stream.extend(bars.closes[120:], bars.days[120:])
+        assert resumed.evaluate(50_000.0, bars.days[-1] + 1) == live.evaluate(
+            50_000.0, bars.days[-1] + 1)
+        assert resumed.indicators.count == 200
@@ -0,0 +1,130 @@
+"""
+Tests for the workflow job queue
+File: python/tests/test_jobs.py
+Purpose: Tests the bounded worker pool, back-pressure and job retention
+Related components: workflows.jobs
+Tags: test, workflows, jobs, queue
+"""
+
+import asyncio
+import pytest
+from python.workflows.jobs import (
+    JobStatus,
+    QueueFullError,
+    WorkflowJobQueue
+)
+
+
+async def wait_for_status(queue, job_id, status, timeout=1.0):
+    """Poll until a job reaches ``status``"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while queue.get(job_id).status != status:
+        if loop.time() > deadline:
+            raise AssertionError(f"job never reached {status}")
+        await asyncio.sleep(0.005)
+    return queue.get(job_id)
+
+
+class TestWorkflowJobQueue:
+    """Test the job queue"""
+
+    @pytest.mark.asyncio
+    async def test_job_runs_and_stores_result(self):
+        """Test a submitted job runs and exposes its result"""
+        queue = WorkflowJobQueue(workers=1)
+
+        async def runner():
+            return {"headline": "Bitcoin up"}
+
+        queue.register("news", runner)
+        job = queue.submit("news")
+        assert job.status == JobStatus.QUEUED
+
+        done = await wait_for_status(queue, job.id, JobStatus.SUCCEEDED)
+        assert done.result == {"headline": "Bitcoin up"}
+        assert done.finished_at >= done.started_at
+        await queue.stop()
+
+    @pytest.mark.asyncio
+    async def test_failed_job_records_error(self):
+        """Test runner exceptions mark the job failed"""
+        queue = WorkflowJobQueue(workers=1)
+
+        async def runner():
+            raise ValueError("Cannot summarize: headline is missing")
+
+        queue.register("news", runner)
+        job = queue.submit("news")
+        done = await wait_for_status(queue, job.id, JobStatus.FAILED)
+        assert "headline is missing" in done.error
+        await queue.stop()
+
+    @pytest.mark.asyncio
+    async def test_worker_pool_bounds_concurrency(self):
+        """Test no more than ``workers`` jobs run at once"""
+        queue = WorkflowJobQueue(workers=2)
+        active = 0
+        peak = 0
+
+        async def runner():
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+            return {}
+
+        queue.register("news", runner)
+        jobs = [queue.submit("news") for _ in range(6)]
+        for job in jobs:
+            await wait_for_status(queue, job.id, JobStatus.SUCCEEDED)
+        assert peak == 2
+        await queue.stop()
+
+    @pytest.mark.asyncio
+    async def test_back_pressure_when_full(self):
+        """Test submit raises once the queue depth limit is reached"""
+        queue = WorkflowJobQueue(workers=1, max_queue=2)
+        release = asyncio.Event()
+
+        async def runner():
+            await release.wait()
+            return {}
+
+        queue.register("news", runner)
+        queue.submit("news")
+        await asyncio.sleep(0.01)  # first job is now running
+        queue.submit("news")
+        queue.submit("news")
+        with pytest.raises(QueueFullError):
+            queue.submit("news")
+
+        release.set()
+        await queue.stop()
+
+    @pytest.mark.asyncio
+    async def test_unknown_workflow(self):
+        """Test submitting an unregistered workflow fails"""
+        queue = WorkflowJobQueue()
+        with pytest.raises(ValueError, match="Unknown workflow"):
+            queue.submit("missing")
+
+    @pytest.mark.asyncio
+    async def test_finished_jobs_evicted(self):
+        """Test only ``max_retained`` jobs are kept for polling"""
+        queue = WorkflowJobQueue(workers=1, max_retained=2)
+
+        async def runner():
+            return {}
+
+        queue.register("news", runner)
+        first = queue.submit("news")
+        await wait_for_status(queue, first.id, JobStatus.SUCCEEDED)
+        second = queue.submit("news")
+        await wait_for_status(queue, second.id, JobStatus.SUCCEEDED)
+        queue.submit("news")
+
+        assert queue.get(first.id) is None
+        assert queue.get(second.id) is not None
+        await queue.stop()
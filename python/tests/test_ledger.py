@@ -0,0 +1,194 @@
+"""
+Tests for the transaction ledger
+File: python/tests/test_ledger.py
+Purpose: Tests group commit, append-only enforcement, keyset pagination and the streaming CSV/JSON export endpoints
+Related components: storage.ledger, main.py
+Tags: test, storage, ledger, sqlite, export
+"""
+
+import asyncio
+import csv
+import io
+import json
+import sqlite3
+import threading
+import pytest
+from fastapi.testclient import TestClient
+import python.main as main_module
+from python.storage import Ledger, LedgerEntry
+
+
+def entries(count: int, start: float = 1_700_000_000.0):
+    return [LedgerEntry(timestamp=start + i // 2, user_id=f"u{i % 3}", kind="buy",
+                        strategy_id="ma-dip" if i % 2 else "flat-dca",
+                        amount_btc=0.0001 * i, amount_fiat=10.0, price=100_000.0,
+                        details={"n": i})
+            for i in range(count)]
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    ledger = Ledger(str(tmp_path / "ledger.db"), batch_size=50, flush_interval=3600)
+    yield ledger
+    ledger.close()
+
+
+def committed(ledger: Ledger) -> int:
+    db = sqlite3.connect(ledger.path)
+    try:
+        return db.execute("SELECT COUNT(*) FROM ledger").fetchone()[0]
+    finally:
+        db.close()
+
+
+class TestWrites:
+    """Test batching and append-only storage"""
+
+    def test_appends_are_durable(self, ledger):
+        appended = ledger.extend(entries(120))
+        assert [e.id for e in appended[:3]] == [1, 2, 3]
+        assert committed(ledger) == 120
+        assert ledger.append(entries(1)[0]).id == 121 and committed(ledger) == 121
+
+    def test_writers_share_a_file(self, ledger):
+        other = Ledger(ledger.path)
+        ids = [ledger.append(e).id if i % 2 else other.append(e).id
+               for i, e in enumerate(entries(10))]
+        other.close()
+        assert sorted(ids) == list(range(1, 11)) and committed(ledger) == 10
+
+    def test_wal_mode_and_append_only(self, ledger):
+        ledger.extend(entries(3))
+        ledger.flush()
+        assert ledger._db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        with pytest.raises(sqlite3.IntegrityError, match="append-only"):
+            ledger._db.execute("UPDATE ledger SET amount_btc = 1")
+        with pytest.raises(sqlite3.IntegrityError, match="append-only"):
+            ledger._db.execute("DELETE FROM ledger")
+
+    def test_ids_continue_after_reopen(self, tmp_path):
+        path = str(tmp_path / "ledger.db")
+        first = Ledger(path)
+        first.extend(entries(5))
+        first.close()
+        second = Ledger(path)
+        assert second.append(entries(1)[0]).id == 6
+        second.close()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_records_share_a_commit(self, tmp_path):
+        ledger = Ledger(str(tmp_path / "ledger.db"), batch_size=1000, flush_interval=0.01)
+        commits = []
+        insert = ledger._insert
+        ledger._insert = lambda batch: commits.append(len(batch)) or insert(batch)
+        recorded = await asyncio.gather(*(ledger.record(e) for e in entries(40)))
+        assert sorted(e.id for e in recorded) == list(range(1, 41))
+        assert commits == [40] and committed(ledger) == 40
+        ledger.close()
+
+    @pytest.mark.asyncio
+    async def test_group_commits_run_off_the_loop(self, tmp_path):
+        ledger = Ledger(str(tmp_path / "ledger.db"), batch_size=10, flush_interval=0.01)
+        threads = []
+        insert = ledger._insert
+        ledger._insert = lambda batch: threads.append(threading.get_ident()) or insert(batch)
+        # A full batch and the timer both commit on a worker thread
+        recorded = await asyncio.gather(*(ledger.record(e) for e in entries(15)))
+        assert sorted(e.id for e in recorded) == list(range(1, 16))
+        assert len(threads) in (1, 2) and threading.get_ident() not in threads
+        ledger.close()
+
+    @pytest.mark.asyncio
+    async def test_record_commits_on_timer(self, tmp_path):
+        ledger = Ledger(str(tmp_path / "ledger.db"), flush_interval=0.01)
+        task = asyncio.ensure_future(ledger.record(entries(1)[0]))
+        await asyncio.sleep(0.1)
+        # Committed without any later write or read
+        assert task.done() and committed(ledger) == 1
+        ledger.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_commit_keeps_entries(self, tmp_path):
+        ledger = Ledger(str(tmp_path / "ledger.db"), flush_interval=0.01)
+        insert = ledger._insert
+        failures = [sqlite3.OperationalError("database is locked")]
+
+        def flaky(batch):
+            if failures:
+                raise failures.pop()
+            return insert(batch)
+
+        ledger._insert = flaky
+        recorded = await asyncio.wait_for(asyncio.gather(
+            *(ledger.record(e) for e in entries(5))), timeout=2)
+        assert [e.id for e in recorded] == [1, 2, 3, 4, 5] and committed(ledger) == 5
+        ledger.close()
+
+
+class TestQueries:
+    """Test keyset pagination and filters"""
+
+    def test_pages_cover_every_entry_once(self, ledger):
+        ledger.extend(entries(257))
+        seen, cursor = [], None
+        while True:
+            page = ledger.query(cursor=cursor, limit=50)
+            seen += [e.id for e in page.entries]
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+        assert seen == list(range(1, 258))
+
+    def test_filters(self, ledger):
+        ledger.extend(entries(60))
+        page = ledger.query(user_id="u1", strategy_id="ma-dip", limit=1000)
+        assert page.entries and all(e.user_id == "u1" and e.strategy_id == "ma-dip"
+                                    for e in page.entries)
+        start = 1_700_000_010.0
+        assert ledger.count(start=start, end=start + 5) == 10
+        assert {e.details["n"] for e in ledger.iter_entries(chunk_size=7, user_id="u2")} == {
+            i for i in range(60) if i % 3 == 2}
+
+    def test_indexes_are_used(self, ledger):
+        plan = " ".join(str(row) for row in ledger._db.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM ledger WHERE user_id = ? "
+            "AND (timestamp, id) > (?, ?) ORDER BY timestamp, id LIMIT 10", ("u1", 0, 0)))
+        assert "idx_ledger_user_time" in plan
+
+    def test_bad_cursor(self, ledger):
+        with pytest.raises(ValueError, match="cursor"):
+            ledger.query(cursor="not-a-cursor")
+
+
+class TestExportEndpoints:
+    """Test the /ledger endpoints"""
+
+    @pytest.fixture
+    def client(self, ledger, monkeypatch):
+        ledger.extend(entries(2500))
+        monkeypatch.setattr(main_module, "ledger", ledger)
+        return TestClient(main_module.app)
+
+    def test_csv_export(self, client):
+        response = client.get("/ledger/export.csv", params={"user_id": "u0"})
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) == 834 and rows[0]["timestamp"].startswith("2023-11-14T")
+        assert json.loads(rows[1]["details"]) == {"n": 3}
+
+    def test_json_export(self, client):
+        data = client.get("/ledger/export.json", params={"strategy_id": "ma-dip"}).json()
+        assert len(data) == 1250 and {e["strategy_id"] for e in data} == {"ma-dip"}
+        assert client.get("/ledger/export.xml").status_code == 404
+
+    def test_paged_endpoint(self, client):
+        first = client.get("/ledger", params={"limit": 1000}).json()
+        second = client.get("/ledger", params={"limit": 1000,
+                                               "cursor": first["next_cursor"]}).json()
+        assert first["entries"][-1]["id"] + 1 == second["entries"][0]["id"]
+        assert client.get("/ledger", params={"cursor": "bogus"}).status_code == 400
+
+    def test_unconfigured(self, monkeypatch):
+        monkeypatch.setattr(main_module, "ledger", None)
+        assert TestClient(main_module.app).get("/ledger").status_code == 503
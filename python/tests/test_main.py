@@ -16,6 +16,8 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Import the app with proper module path
 from python.main import app
+import python.main as main_module
+from unittest.mock import MagicMock
 
 client = TestClient(app)
 
@@ -68,4 +70,98 @@ def test_docs_endpoint():
     """Test that the docs endpoint is accessible."""
     response = client.get("/docs")
     assert response.status_code == 200
-    assert "text/html" in response.headers["content-type"] 
\ No newline at end of file
+    assert "text/html" in response.headers["content-type"]
+
+def test_bitcoin_news_stream_endpoint():
+    """Test the SSE endpoint streams workflow events."""
+    async def fake_events():
+        yield {"event": "node_start", "node": "web_search", "data": None}
+        yield {"event": "token", "node": "summarize", "data": "Hi"}
+        yield {"event": "done", "node": None, "data": {"summary": "Hi"}}
+
+    workflow = MagicMock()
+    workflow.stream_events = fake_events
+    original = main_module._news_workflow
+    main_module._news_workflow = workflow
+    try:
+        response = client.get("/workflows/bitcoin-news/stream")
+    finally:
+        main_module._news_workflow = original
+
+    assert response.status_code == 200
+    assert "text/event-stream" in response.headers["content-type"]
+    body = response.text
+    assert "event: node_start" in body
+    assert 'event: token\ndata: {"node": "summarize", "data": "Hi"}' in body
+    assert body.rstrip().endswith('data: {"node": null, "data": {"summary": "Hi"}}')
+
+def test_bitcoin_news_job_lifecycle():
+    """Test submitting a workflow job and polling it to completion."""
+    async def fake_run():
+        return {"headline": "Bitcoin steady", "summary": "Flat day."}
+
+    original = main_module.job_queue._runners["bitcoin-news"]
+    main_module.job_queue.register("bitcoin-news", fake_run)
+    try:
+        with TestClient(app) as lifespan_client:
+            response = lifespan_client.post("/workflows/bitcoin-news")
+            assert response.status_code == 202
+            job_id = response.json()["job_id"]
+            assert response.headers["location"].endswith(job_id)
+
+            for _ in range(100):
+                job = lifespan_client.get(f"/workflows/bitcoin-news/{job_id}").json()
+                if job["status"] == "succeeded":
+                    break
+            assert job["status"] == "succeeded"
+            assert job["result"]["headline"] == "Bitcoin steady"
+    finally:
+        main_module.job_queue.register("bitcoin-news", original)
+
+def test_bitcoin_news_job_not_found():
+    """Test polling an unknown job returns 404."""
+    response = client.get("/workflows/bitcoin-news/does-not-exist")
+    assert response.status_code == 404
+
+def test_bitcoin_news_job_queue_full():
+    """Test the API answers 429 when the job queue is saturated."""
+    from python.workflows.jobs import QueueFullError
+
+    def full(name):
+        raise QueueFullError("Workflow queue is full")
+
+    original = main_module.job_queue.submit
+    main_module.job_queue.submit = full
+    try:
+        response = client.post("/workflows/bitcoin-news")
+    finally:
+        main_module.job_queue.submit = original
+
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "5"
+
+def test_metrics_endpoint():
+    """Test /metrics serves the Prometheus text format."""
+    from python.llm.metrics import record_llm_call
+
+    record_llm_call("openai", "gpt-4o", "query", 0.2, 100, 50)
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE llm_request_duration_seconds histogram" in response.text
+    assert 'llm_tokens_total{provider="openai",model="gpt-4o",type="prompt"}' in response.text
+
+def test_scheduled_jobs_endpoint():
+    """Test the scheduler reports registered jobs and their state."""
+    async def fake_run():
+        return {}
+
+    main_module.scheduler.add_job("test-job", fake_run, "@daily")
+    try:
+        response = client.get("/scheduler/jobs")
+        assert response.status_code == 200
+        job = response.json()["test-job"]
+        assert job["runs"] == 0
+        assert job["next_run_at"] is not None
+    finally:
+        main_module.scheduler.remove_job("test-job")
@@ -0,0 +1,192 @@
+"""
+Tests for LLM and workflow instrumentation
+File: python/tests/test_metrics.py
+Purpose: Tests Prometheus rendering, usage collection and per-node metrics on the run state
+Related components: llm.metrics, llm.base, workflows.bitcoin_news
+Tags: test, llm, metrics, prometheus
+"""
+
+import json
+import time
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from langgraph.checkpoint.memory import MemorySaver
+from python.llm import (
+    CachedLLMStrategy,
+    LLMConfig,
+    LLMResponseCache,
+    LLMStrategy,
+    MetricsRegistry,
+    collect_usage,
+    estimate_cost,
+    get_registry
+)
+from python.llm.metrics import usage_tokens
+from python.workflows.bitcoin_news import BitcoinNewsWorkflow
+
+
+class MeteredStrategy(LLMStrategy):
+    """Strategy double that reports provider usage like the real strategies"""
+
+    def __init__(self, provider: str = "metered", model: str = "gpt-4o",
+                 answer: str = "ok", failures: int = 0):
+        super().__init__(LLMConfig(provider=provider, api_key="", model=model))
+        self.answer = answer
+        self.failures = failures
+
+    async def query(self, prompt, options=None):
+        started = time.perf_counter()
+        if self.failures:
+            self.failures -= 1
+            error = Exception("rate limited")
+            error.status_code = 429
+            error.response = MagicMock(headers={"retry-after": "0"})
+            self._record_call("query", started, prompt, error=True)
+            raise error
+        usage = SimpleNamespace(prompt_tokens=1000, completion_tokens=500)
+        self._record_call("query", started, prompt, usage, self.answer)
+        return self.answer
+
+    async def query_with_web_search(self, prompt, options=None):
+        return await self.query(prompt, options)
+
+
+class TestMetricsRegistry:
+    """Test the Prometheus text exposition"""
+
+    def test_counter_and_histogram_render(self):
+        """Test samples, cumulative buckets, sum and count"""
+        registry = MetricsRegistry()
+        registry.counter("calls_total", "Calls", ("provider",)).inc(provider="openai")
+        latency = registry.histogram("latency_seconds", "Latency", ("node",),
+                                     buckets=(0.1, 1.0))
+        latency.observe(0.05, node="summarize")
+        latency.observe(0.5, node="summarize")
+
+        text = registry.render()
+        assert "# TYPE calls_total counter" in text
+        assert 'calls_total{provider="openai"} 1.0' in text
+        assert 'latency_seconds_bucket{node="summarize",le="0.1"} 1.0' in text
+        assert 'latency_seconds_bucket{node="summarize",le="1.0"} 2.0' in text
+        assert 'latency_seconds_bucket{node="summarize",le="+Inf"} 2.0' in text
+        assert 'latency_seconds_count{node="summarize"} 2.0' in text
+
+    def test_label_values_escaped(self):
+        """Test quotes and newlines cannot break the format"""
+        registry = MetricsRegistry()
+        registry.counter("c", "C", ("model",)).inc(model='a"b\nc')
+        assert 'c{model="a\\"b\\nc"} 1.0' in registry.render()
+
+    def test_kind_conflict(self):
+        """Test a name cannot be reused for a different metric type"""
+        registry = MetricsRegistry()
+        registry.counter("x", "X")
+        with pytest.raises(ValueError, match="already registered"):
+            registry.histogram("x", "X")
+
+
+class TestUsageCollection:
+    """Test per-call accounting"""
+
+    def test_cost_from_price_table(self):
+        """Test cost uses per-million prompt/completion prices"""
+        assert estimate_cost("gpt-4o", 1_000_000, 0) == pytest.approx(2.50)
+        assert estimate_cost("unknown", 1000, 1000) == 0.0
+
+    def test_usage_tokens_fallback(self):
+        """Test responses-API usage and the length-based estimate"""
+        usage = SimpleNamespace(input_tokens=7, output_tokens=3)
+        assert usage_tokens(usage) == (7, 3)
+        assert usage_tokens(None, "x" * 40, "y" * 8) == (10, 2)
+
+    @pytest.mark.asyncio
+    async def test_calls_collected(self):
+        """Test tokens, cost and call counts accumulate in the collector"""
+        strategy = MeteredStrategy()
+        with collect_usage() as usage:
+            await strategy.query("a")
+            await strategy.query("b")
+
+        assert usage.llm_calls == 2
+        assert usage.prompt_tokens == 2000
+        assert usage.completion_tokens == 1000
+        assert usage.cost == pytest.approx(2 * estimate_cost("gpt-4o", 1000, 500))
+
+    @pytest.mark.asyncio
+    async def test_cache_hits_collected(self):
+        """Test cache hits are counted without tokens or cost"""
+        cached = CachedLLMStrategy(MeteredStrategy(provider="metered-cache"),
+                                   LLMResponseCache())
+        with collect_usage() as usage:
+            await cached.query("same")
+            await cached.query("same")
+
+        assert usage.llm_calls == 2
+        assert usage.cache_hits == 1
+        assert usage.prompt_tokens == 1000
+        requests = get_registry().counter("llm_requests_total", "")
+        assert requests.value(provider="metered-cache", model="gpt-4o",
+                              kind="query", status="cache_hit") == 1
+
+    @pytest.mark.asyncio
+    async def test_retries_and_queue_wait_collected(self):
+        """Test rate-limited retries are counted"""
+        strategy = MeteredStrategy(provider="metered-retry", failures=2)
+        with collect_usage() as usage:
+            assert await strategy.query_many(["p"]) == ["ok"]
+
+        assert usage.retries == 2
+        assert usage.llm_calls == 3
+        assert usage.queue_wait >= 0.0
+        retries = get_registry().counter("llm_retries_total", "")
+        assert retries.value(provider="metered-retry") == 2
+
+    def test_nested_collectors(self):
+        """Test inner totals roll up into the outer collector"""
+        with collect_usage() as outer:
+            with collect_usage() as inner:
+                inner.cost = 1.5
+        assert outer.cost == 1.5
+
+
+class TestNodeMetrics:
+    """Test workflow node instrumentation"""
+
+    @pytest.mark.asyncio
+    async def test_run_state_carries_node_metrics(self):
+        """Test every node records wall time, tokens and cost on the state"""
+        sentiment = json.dumps({"analysis": "bullish", "reasoning": "r"})
+        workflow = BitcoinNewsWorkflow(
+            openai=MeteredStrategy(provider="metered-openai", answer=sentiment),
+            grok=MeteredStrategy(provider="metered-grok", model="grok-3-mini"),
+            checkpointer=MemorySaver()
+        )
+        result = await workflow.run()
+
+        metrics = result["node_metrics"]
+        assert set(metrics) == {"web_search", "summarize", "sentiment"}
+        for stats in metrics.values():
+            assert stats["llm_calls"] == 1
+            assert stats["wall_time"] >= stats["llm_time"] >= 0
+            assert stats["prompt_tokens"] == 1000
+        assert metrics["summarize"]["cost"] == pytest.approx(
+            estimate_cost("grok-3-mini", 1000, 500))
+
+        durations = get_registry().histogram("workflow_node_duration_seconds", "")
+        assert durations.count(workflow="bitcoin_news", node="sentiment") >= 1
+
+    @pytest.mark.asyncio
+    async def test_failed_node_counted(self):
+        """Test a failing node is exported with status=error"""
+        workflow = BitcoinNewsWorkflow(
+            openai=MeteredStrategy(provider="metered-bad", answer="not json"),
+            grok=MeteredStrategy(provider="metered-bad"),
+            checkpointer=MemorySaver()
+        )
+        runs = get_registry().counter("workflow_node_runs_total", "")
+        before = runs.value(workflow="bitcoin_news", node="sentiment", status="error")
+        with pytest.raises(ValueError):
+            await workflow.run()
+        assert runs.value(workflow="bitcoin_news", node="sentiment",
+                          status="error") == before + 1
@@ -0,0 +1,130 @@
+"""
+Tests for task-aware model selection
+File: python/tests/test_model_selection.py
+Purpose: Tests tier preference, latency/cost budgets, learning from observed calls and provider wiring
+Related components: llm.model_selection, llm.base, llm.openai_strategy, llm.grok_strategy
+Tags: test, llm, model-selection
+"""
+
+import pytest
+from unittest.mock import patch, AsyncMock, MagicMock
+from python.llm import (
+    GrokStrategy,
+    ModelSelector,
+    ModelTier,
+    OpenAIStrategy,
+    TaskType,
+    configure_model_selector
+)
+
+
+@pytest.fixture
+def selector():
+    """Install a fresh process-wide selector for the test"""
+    selector = ModelSelector()
+    configure_model_selector(selector)
+    yield selector
+    configure_model_selector(None)
+
+
+def chat_response(content: str = "ok"):
+    response = MagicMock()
+    response.choices = [MagicMock()]
+    response.choices[0].message.content = content
+    response.usage = None
+    return response
+
+
+class TestModelSelector:
+    """Test the selection policy"""
+
+    @pytest.mark.parametrize("provider, task, expected", [
+        ("openai", TaskType.SEARCH, "gpt-4o"),
+        ("openai", TaskType.SUMMARIZE, "gpt-4o-mini"),
+        ("openai", TaskType.CLASSIFY, "gpt-4o-mini"),
+        ("grok", TaskType.SUMMARIZE, "grok-3-mini"),
+    ])
+    def test_default_policies(self, provider, task, expected):
+        assert ModelSelector().select(provider, task).model == expected
+
+    def test_tier_override(self):
+        chosen = ModelSelector().select("grok", "summarize", tier=ModelTier.PREMIUM)
+        assert chosen.model == "grok-3"
+        # No standard model: the cheaper neighbour wins the tie
+        assert ModelSelector().select("openai", "summarize", tier="standard").model == "gpt-4o-mini"
+
+    def test_search_needs_web_search(self):
+        """Test providers without web-search models get no selection"""
+        assert ModelSelector().select("grok", "search") is None
+
+    def test_cost_budget(self):
+        selector = ModelSelector()
+        prompt = "x" * 40000  # ~10k prompt tokens
+        assert selector.select("openai", "search", prompt).model == "gpt-4o"
+        assert selector.select("openai", "search", prompt, max_cost=0.01).model == "gpt-4o-mini"
+
+    def test_learns_observed_latency(self):
+        selector = ModelSelector(min_samples=3)
+        assert selector.select("grok", "classify", tier="premium").model == "grok-3"
+        for _ in range(3):
+            selector.observe("grok-3", 6.0)
+        # Observed latency now breaks classify's 3s budget
+        assert selector.select("grok", "classify", tier="premium").model == "grok-3-mini"
+
+    def test_avoids_failing_model_until_recovery(self):
+        selector = ModelSelector(recovery_after=0.0)
+        for _ in range(5):
+            selector.observe("gpt-4o", 1.0, error=True)
+        assert selector.select("openai", "search").model == "gpt-4o"
+
+        selector.recovery_after = 60.0
+        assert selector.select("openai", "search").model == "gpt-4o-mini"
+
+    def test_disabled(self):
+        assert ModelSelector(enabled=False).select("openai", "classify") is None
+
+    def test_from_env(self, monkeypatch):
+        monkeypatch.setenv("LLM_TASK_TIERS", "classify=premium, search=budget")
+        selector = ModelSelector.from_env()
+        assert selector.policies[TaskType.CLASSIFY].tier == ModelTier.PREMIUM
+        assert selector.policies[TaskType.SEARCH].tier == ModelTier.BUDGET
+        assert selector.policies[TaskType.SUMMARIZE].tier == ModelTier.BUDGET
+
+
+class TestStrategyWiring:
+    """Test strategies route task hints through the selector"""
+
+    @pytest.mark.asyncio
+    async def test_task_option_selects_model(self, selector):
+        strategy = OpenAIStrategy()
+        with patch.object(strategy.client.chat.completions, "create",
+                          new_callable=AsyncMock) as create:
+            create.return_value = chat_response()
+            await strategy.query("Is this bullish?", {"task": "classify"})
+            await strategy.query("Plain prompt")
+            await strategy.query("Pinned", {"task": "classify", "model": "gpt-4o"})
+
+        models = [c.kwargs["model"] for c in create.call_args_list]
+        assert models == ["gpt-4o-mini", "gpt-4o", "gpt-4o"]
+        # Selection hints are consumed, never sent to the API
+        assert all("task" not in c.kwargs for c in create.call_args_list)
+        assert selector.stats("gpt-4o-mini").sample_count == 1
+
+    @pytest.mark.asyncio
+    async def test_web_search_defaults_to_search_task(self, selector):
+        strategy = OpenAIStrategy()
+        with patch.object(strategy.client.responses, "create",
+                          new_callable=AsyncMock) as create:
+            create.return_value = MagicMock(output_text="Headline", usage=None)
+            await strategy.query_with_web_search("Latest news", {"tier": "budget"})
+        assert create.call_args.kwargs["model"] == "gpt-4o-mini"
+
+    @pytest.mark.asyncio
+    async def test_failures_are_observed(self, selector):
+        strategy = GrokStrategy()
+        with patch.object(strategy.client.chat.completions, "create",
+                          new_callable=AsyncMock) as create:
+            create.side_effect = ValueError("bad request")
+            with pytest.raises(Exception):
+                await strategy.query("Summarize", {"task": "summarize"})
+        assert selector.stats("grok-3-mini").failures == 1
@@ -0,0 +1,174 @@
+"""
+Tests for the shared price feed
+File: python/tests/test_price_feed.py
+Purpose: Tests median aggregation, staleness, single-flight polling, subscriber fan-out and the HTTP exchange adapters
+Related components: api.price_feed, api.adapters
+Tags: test, api, price-feed, exchanges
+"""
+
+import asyncio
+import httpx
+import pytest
+from python.api import (
+    CoinbaseAdapter,
+    ExchangeFactory,
+    KrakenAdapter,
+    PriceFeedService,
+    SimulatedExchange,
+    StalePriceError
+)
+
+
+class Clock:
+    def __init__(self, now: float = 1_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def exchanges(*prices: float, **kwargs):
+    return [SimulatedExchange(f"ex{i}", {"BTC-USD": p}, **kwargs) for i, p in enumerate(prices)]
+
+
+class TestAggregation:
+    """Test median and staleness handling"""
+
+    @pytest.mark.asyncio
+    async def test_median_of_exchanges(self):
+        feed = PriceFeedService(exchanges(100.0, 103.0, 250.0))
+        price = await feed.get_price("BTC-USD")
+        assert price.price == 103.0
+        assert price.quotes == {"ex0": 100.0, "ex1": 103.0, "ex2": 250.0}
+        assert price.stale == []
+
+    @pytest.mark.asyncio
+    async def test_stale_quotes_leave_the_median(self):
+        clock = Clock()
+        adapters = exchanges(100.0, 110.0)
+        feed = PriceFeedService(adapters, stale_after=30, clock=clock)
+        await feed.refresh("BTC-USD")
+
+        adapters[1].fail(ConnectionError("down"))
+        adapters[0].set_price("BTC-USD", 90.0)
+        clock.now += 20
+        # ex1's last quote is 20s old: still fresh
+        assert (await feed.refresh("BTC-USD")).price == 100.0
+        clock.now += 15
+        price = await feed.refresh("BTC-USD")
+        assert (price.price, price.stale) == (90.0, ["ex1"])
+
+        adapters[0].fail(ConnectionError("down"))
+        clock.now += 31
+        with pytest.raises(StalePriceError):
+            await feed.get_price("BTC-USD")
+
+    @pytest.mark.asyncio
+    async def test_min_sources(self):
+        adapters = exchanges(100.0, 110.0)
+        adapters[1].fail(ValueError("bad payload"))
+        feed = PriceFeedService(adapters, min_sources=2)
+        assert await feed.refresh("BTC-USD") is None
+
+    @pytest.mark.asyncio
+    async def test_slow_exchange_times_out(self):
+        adapters = exchanges(100.0) + [SimulatedExchange("slow", latency=1.0)]
+        feed = PriceFeedService(adapters, timeout=0.05)
+        price = await feed.get_price("BTC-USD")
+        assert (price.price, price.stale) == (100.0, ["slow"])
+
+
+class TestPolling:
+    """Test shared polling and fan-out"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_poll(self):
+        adapters = exchanges(100.0, 101.0, latency=0.02)
+        feed = PriceFeedService(adapters)
+        results = await asyncio.gather(*(feed.get_price("BTC-USD") for _ in range(50)))
+        assert {r.price for r in results} == {100.5}
+        assert [a.calls["BTC-USD"] for a in adapters] == [1, 1]
+        # Served from cache while fresh
+        await feed.get_price("BTC-USD")
+        assert adapters[0].calls["BTC-USD"] == 1
+
+    @pytest.mark.asyncio
+    async def test_one_poller_fans_out(self):
+        adapter = SimulatedExchange(prices={"BTC-USD": 100.0}, volatility=0.01)
+        feed = PriceFeedService([adapter], interval=0.01)
+        received = []
+        first = feed.subscribe("BTC-USD")
+        second = feed.subscribe("BTC-USD", callback=received.append)
+        assert feed.symbols == ["BTC-USD"]
+
+        ticks = [await first.get() for _ in range(3)]
+        assert len({t.price for t in ticks}) == 3
+        assert received and all(t.symbol == "BTC-USD" for t in received)
+        # One poller serves both subscribers (a poll may be in flight)
+        assert adapter.calls["BTC-USD"] - len(received) in (0, 1)
+
+        await first.close()
+        assert feed.symbols == ["BTC-USD"]
+        await second.close()
+        assert feed.symbols == []
+        await feed.aclose()
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_keeps_latest(self):
+        adapter = SimulatedExchange(prices={"BTC-USD": 100.0})
+        feed = PriceFeedService([adapter], interval=3600)
+        subscription = feed.subscribe("BTC-USD")
+        for price in (101.0, 102.0, 103.0):
+            adapter.set_price("BTC-USD", price)
+            await feed.refresh("BTC-USD")
+        assert (await subscription.get()).price == 103.0
+        await feed.aclose()
+
+    @pytest.mark.asyncio
+    async def test_slow_callback_does_not_block_refresh(self):
+        adapter = SimulatedExchange(prices={"BTC-USD": 100.0})
+        feed = PriceFeedService([adapter], interval=3600)
+        release = asyncio.Event()
+        received = []
+
+        async def slow(price):
+            await release.wait()
+            received.append(price.price)
+
+        feed.subscribe("BTC-USD", callback=slow)
+        queued = feed.subscribe("BTC-USD")
+        for price in (101.0, 102.0, 103.0):
+            adapter.set_price("BTC-USD", price)
+            await asyncio.wait_for(feed.refresh("BTC-USD"), timeout=1)
+        assert (await queued.get()).price == 103.0 and received == []
+
+        release.set()
+        await asyncio.sleep(0.01)
+        # The busy callback skips to the newest tick
+        assert received == [101.0, 103.0]
+        await feed.aclose()
+
+
+class TestAdapters:
+    """Test exchange adapters against canned responses"""
+
+    @pytest.mark.asyncio
+    async def test_http_adapters(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/v2/prices/BTC-USD/spot":
+                return httpx.Response(200, json={"data": {"amount": "97000.5"}})
+            assert request.url.params["pair"] == "XBTUSD"
+            return httpx.Response(200, json={"error": [],
+                                             "result": {"XXBTZUSD": {"c": ["97001.0", "1"]}}})
+
+        async with httpx.AsyncClient(base_url="https://exchange.test",
+                                     transport=httpx.MockTransport(handler)) as client:
+            assert await CoinbaseAdapter(client).fetch_price("BTC-USD") == 97000.5
+            assert await KrakenAdapter(client).fetch_price("BTC-USD") == 97001.0
+
+    def test_factory(self):
+        assert {"coinbase", "kraken", "bitstamp", "simulated"} <= set(
+            ExchangeFactory.list_exchanges())
+        assert isinstance(ExchangeFactory.create("simulated"), SimulatedExchange)
+        with pytest.raises(ValueError, match="Unknown exchange"):
+            ExchangeFactory.create("mtgox")
@@ -0,0 +1,124 @@
+"""
+Tests for the memory-mapped price store
+File: python/tests/test_price_store.py
+Purpose: Tests appends and growth, persistence, range/window views, incremental rollups and raw retention
+Related components: strategies.store, strategies.base (PriceHistory)
+Tags: test, strategies, storage, mmap, rollup
+"""
+
+import numpy as np
+import pytest
+from python.strategies import PriceArchive, PriceStore, build_rollup, evaluate_strategy
+
+HOUR = 3600
+DAY = 86400
+START = 1_700_006_400.0  # midnight UTC
+
+
+def minute_ticks(hours: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    timestamps = START + np.arange(0, hours * HOUR, 60, dtype=np.float64)
+    prices = 30000 + rng.normal(0, 20, timestamps.size).cumsum()
+    return timestamps, prices
+
+
+class TestPriceStore:
+    """Test appends, persistence and lookups"""
+
+    def test_append_grows_and_persists(self, tmp_path):
+        store = PriceStore(str(tmp_path / "s"), initial_capacity=2)
+        for i in range(5):
+            store.append(START + i, 10 + i, 11 + i, 9 + i, 10.5 + i, 1.0)
+        assert len(store) == 5 and store.capacity >= 5
+        store.flush()
+
+        reopened = PriceStore(str(tmp_path / "s"))
+        assert len(reopened) == 5
+        assert reopened.range().close.tolist() == [10.5 + i for i in range(5)]
+
+    def test_out_of_order_rejected(self, tmp_path):
+        store = PriceStore(str(tmp_path / "s"))
+        store.append_tick(START + 10, 1.0)
+        with pytest.raises(ValueError, match="ascending"):
+            store.append_tick(START, 2.0)
+        with pytest.raises(ValueError, match="ascending"):
+            store.extend([START + 20, START + 15], [1, 1], [1, 1], [1, 1], [1, 1])
+        assert len(store) == 1
+
+    def test_range_and_window_are_views(self, tmp_path):
+        store = PriceStore(str(tmp_path / "s"))
+        timestamps = START + np.arange(100.0)
+        store.extend(timestamps, timestamps, timestamps, timestamps, timestamps)
+
+        rows = store.range(START + 10, START + 20)
+        assert rows.timestamp.tolist() == (START + np.arange(10, 20)).tolist()
+        assert np.shares_memory(rows.close, store.range().close)
+        assert store.window(3).timestamp.tolist() == [START + 97, START + 98, START + 99]
+        assert store.window(3, end=START + 5.5).timestamp.tolist() == [
+            START + 3, START + 4, START + 5]
+        assert len(store.range(START + 500)) == 0
+
+    def test_history_feeds_strategies(self, tmp_path):
+        store = PriceStore(str(tmp_path / "s"))
+        closes = np.full(60, 100.0)
+        store.extend(START + np.arange(60) * DAY, closes, closes, closes, closes)
+        history = store.history()
+        assert len(history) == 60
+        result = evaluate_strategy("technical-ma-dip", 80.0, history, history.days[-1])
+        assert result.action == "buy" and not result.fallback
+
+    def test_incompatible_directory_rejected(self, tmp_path):
+        (tmp_path / "s").mkdir()
+        (tmp_path / "s" / "meta.json").write_text('{"version": 99}')
+        with pytest.raises(ValueError, match="incompatible"):
+            PriceStore(str(tmp_path / "s"))
+
+
+class TestRollups:
+    """Test downsampling into hourly and daily bars"""
+
+    def test_hourly_bars(self, tmp_path):
+        timestamps, prices = minute_ticks(3)
+        raw = PriceStore(str(tmp_path / "raw"))
+        raw.extend(timestamps, prices, prices, prices, prices, np.ones_like(prices))
+        hourly = PriceStore(str(tmp_path / "1h"))
+
+        assert build_rollup(raw, hourly, HOUR) == 3
+        bars = hourly.range()
+        assert bars.timestamp.tolist() == [START, START + HOUR, START + 2 * HOUR]
+        first = prices[:60]
+        assert (bars.open[0], bars.high[0], bars.low[0], bars.close[0], bars.volume[0]) == (
+            first[0], first.max(), first.min(), first[-1], 60.0)
+
+    def test_incremental_matches_full_rebuild(self, tmp_path):
+        timestamps, prices = minute_ticks(30, seed=3)
+        raw = PriceStore(str(tmp_path / "raw"))
+        incremental = PriceStore(str(tmp_path / "inc"))
+        # Resume mid-hour several times; small chunks exercise boundary cuts
+        for part in np.array_split(np.arange(timestamps.size), 7):
+            raw.extend(timestamps[part], prices[part], prices[part], prices[part], prices[part])
+            build_rollup(raw, incremental, HOUR, chunk_rows=45)
+
+        full = PriceStore(str(tmp_path / "full"))
+        build_rollup(raw, full, HOUR)
+        for column in ("timestamp", "open", "high", "low", "close", "volume"):
+            np.testing.assert_array_equal(getattr(incremental.range(), column),
+                                          getattr(full.range(), column))
+        assert len(full) == 30
+
+    def test_archive_compaction_keeps_rollups(self, tmp_path):
+        archive = PriceArchive(str(tmp_path / "archive"))
+        timestamps, prices = minute_ticks(50)
+        for ts, price in zip(timestamps, prices):
+            archive.append_tick(ts, price)
+
+        assert archive.compact(keep_raw_seconds=6 * HOUR) == {"1h": 50, "1d": 3}
+        assert archive.raw.range().timestamp[0] == timestamps[-1] - 6 * HOUR
+        daily = archive.store("1d").range()
+        assert daily.timestamp.tolist() == [START, START + DAY, START + 2 * DAY]
+        assert daily.close[-1] == prices[-1]
+
+        archive.append_tick(timestamps[-1] + 60, 1.0)
+        archive.compact()
+        assert archive.store("1h").range().low[-1] == 1.0
+        assert len(archive.history("1d")) == 3
@@ -0,0 +1,221 @@
+"""
+Tests for batched queries and provider rate limiting
+File: python/tests/test_rate_limit.py
+Purpose: Tests token buckets, 429 back-off and LLMStrategy.query_many
+Related components: llm.rate_limit, llm.base
+Tags: test, llm, rate-limit, batch
+"""
+
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+from python.llm import (
+    LLMConfig,
+    LLMStrategy,
+    LLMStrategyFactory,
+    ProviderRateLimiter,
+    TokenBucket,
+    configure_rate_limit,
+    get_rate_limiter,
+    estimate_tokens
+)
+from python.llm.rate_limit import rate_limit_retry_after
+from python.llm.resilience import RetryPolicy, call_with_resilience
+
+
+class RecordingStrategy(LLMStrategy):
+    """Strategy double that records concurrency and can fail on demand"""
+
+    def __init__(self, provider: str = "batch-test", delay: float = 0.01):
+        super().__init__(LLMConfig(provider=provider, api_key="key"))
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.calls = 0
+        self.failures = {}
+
+    async def query(self, prompt, options=None):
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            error = self.failures.pop(prompt, None)
+            if error is not None:
+                raise error
+            return prompt.upper()
+        finally:
+            self.active -= 1
+
+
+def make_429(retry_after: str = "0.01") -> Exception:
+    """Build a provider-style error wrapping an HTTP 429"""
+    sdk_error = Exception("rate limited")
+    sdk_error.status_code = 429
+    sdk_error.response = MagicMock(headers={"retry-after": retry_after})
+    try:
+        raise sdk_error
+    except Exception:
+        try:
+            raise Exception("OpenAI API error: rate limited")
+        except Exception as wrapped:
+            return wrapped
+
+
+class TestTokenBucket:
+    """Test the token bucket"""
+
+    def test_refill_over_time(self):
+        """Test tokens refill at the configured rate"""
+        now = [0.0]
+        bucket = TokenBucket(rate=2.0, capacity=4, clock=lambda: now[0])
+        bucket.consume(4)
+        assert bucket.wait_time(1) == 0.5
+        now[0] += 0.5
+        assert bucket.wait_time(1) == 0.0
+
+    def test_oversized_request_clamped(self):
+        """Test requests larger than capacity wait for a full bucket only"""
+        bucket = TokenBucket(rate=1.0, capacity=10)
+        assert bucket.wait_time(50) == 0.0
+
+
+class TestRateLimitRetryAfter:
+    """Test 429 detection on wrapped errors"""
+
+    def test_detects_wrapped_429(self):
+        """Test Retry-After is read from the wrapped SDK error"""
+        assert rate_limit_retry_after(make_429("3")) == 3.0
+
+    def test_other_errors_ignored(self):
+        """Test non-429 errors are not retried"""
+        assert rate_limit_retry_after(Exception("Grok API error: 500")) is None
+
+
+class TestProviderRateLimiter:
+    """Test the per-provider limiter"""
+
+    @pytest.mark.asyncio
+    async def test_requests_per_minute_enforced(self, monkeypatch):
+        """Test requests beyond the per-minute burst wait for refill"""
+        now = [0.0]
+        waits = []
+
+        async def sleep(seconds):
+            waits.append(seconds)
+            now[0] += seconds
+
+        monkeypatch.setattr(asyncio, "sleep", sleep)
+        limiter = ProviderRateLimiter(requests_per_minute=1200,  # 20/s
+                                      clock=lambda: now[0])
+        for _ in range(1200):
+            await limiter.acquire()
+        assert waits == []
+        await limiter.acquire()
+        await limiter.acquire()
+        assert waits == pytest.approx([0.05, 0.05])
+
+    @pytest.mark.asyncio
+    async def test_penalize_blocks_callers(self):
+        """Test a 429 pause delays the next acquire"""
+        limiter = ProviderRateLimiter()
+        limiter.penalize(0.05)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await limiter.acquire()
+        assert loop.time() - started >= 0.04
+
+    def test_shared_across_factory_instances(self):
+        """Test every strategy of a provider shares one limiter"""
+        first = LLMStrategyFactory.create("grok")
+        second = LLMStrategyFactory.create("grok")
+        assert first.rate_limiter is second.rate_limiter
+        assert first.rate_limiter is get_rate_limiter("grok")
+
+    def test_estimate_tokens_uses_max_tokens(self):
+        """Test the estimate includes the completion budget"""
+        assert estimate_tokens("x" * 400, {"max_tokens": 100}) == 200
+
+
+class TestQueryMany:
+    """Test the batch API"""
+
+    @pytest.mark.asyncio
+    async def test_results_in_order_with_bounded_concurrency(self):
+        """Test results keep input order and concurrency is capped"""
+        strategy = RecordingStrategy()
+        prompts = [f"p{i}" for i in range(20)]
+
+        results = await strategy.query_many(prompts, concurrency=4)
+
+        assert results == [p.upper() for p in prompts]
+        assert strategy.peak == 4
+
+    @pytest.mark.asyncio
+    async def test_as_completed_yields_indices(self):
+        """Test as-completed mode yields every index once"""
+        strategy = RecordingStrategy()
+        seen = {}
+        async for index, result in strategy.query_many_as_completed(
+                ["a", "b", "c"], concurrency=2):
+            seen[index] = result
+        assert seen == {0: "A", 1: "B", 2: "C"}
+
+    @pytest.mark.asyncio
+    async def test_retries_on_429(self):
+        """Test rate-limited prompts are retried after backing off"""
+        configure_rate_limit("retry-test")
+        strategy = RecordingStrategy(provider="retry-test")
+        strategy.failures["b"] = make_429("0.01")
+
+        results = await strategy.query_many(["a", "b"])
+
+        assert results == ["A", "B"]
+        assert strategy.calls == 3
+
+    @pytest.mark.asyncio
+    async def test_429_retried_by_one_layer(self):
+        """Test the resilience policy leaves 429s to the limiter under query_many"""
+        configure_rate_limit("single-layer-test")
+        upstream = []
+
+        class ResilientStrategy(LLMStrategy):
+            async def query(self, prompt, options=None):
+                async def send():
+                    upstream.append(prompt)
+                    raise make_429("0.01")
+                return await call_with_resilience(
+                    send, self.config.provider, "Test error",
+                    retry=RetryPolicy(max_attempts=3, base_delay=0.0, max_delay=0.0))
+
+        strategy = ResilientStrategy(LLMConfig(provider="single-layer-test", api_key="key"))
+        with pytest.raises(Exception):
+            await strategy.query_many(["a"], max_retries=2)
+        # 1 call + 2 limiter retries, not 3 x 3
+        assert len(upstream) == 3
+
+        # Outside query_many the policy still retries 429 itself
+        upstream.clear()
+        with pytest.raises(Exception):
+            await strategy.query("b")
+        assert len(upstream) == 3
+
+    @pytest.mark.asyncio
+    async def test_return_exceptions(self):
+        """Test failures can be returned in place of results"""
+        strategy = RecordingStrategy()
+        strategy.failures["b"] = ValueError("bad prompt")
+
+        results = await strategy.query_many(["a", "b"], return_exceptions=True)
+
+        assert results[0] == "A"
+        assert isinstance(results[1], ValueError)
+
+    @pytest.mark.asyncio
+    async def test_failure_propagates(self):
+        """Test the first failure is raised without return_exceptions"""
+        strategy = RecordingStrategy()
+        strategy.failures["b"] = ValueError("bad prompt")
+
+        with pytest.raises(ValueError, match="bad prompt"):
+            await strategy.query_many(["a", "b", "c"])
@@ -0,0 +1,398 @@
+"""
+Tests for deadlines, retries, circuit breakers and provider fallback
+File: python/tests/test_resilience.py
+Purpose: Tests call_with_resilience, CircuitBreaker, FallbackStrategy and workflow deadline propagation
+Related components: llm.resilience, llm.fallback, llm.openai_strategy, workflows.bitcoin_news
+Tags: test, llm, timeout, retry, circuit-breaker, deadline
+"""
+
+import asyncio
+import time
+import pytest
+from unittest.mock import AsyncMock, patch
+from langgraph.checkpoint.memory import MemorySaver
+from python.llm import (
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceededError,
+    FallbackStrategy,
+    LLMConfig,
+    LLMError,
+    LLMStrategy,
+    LLMStrategyFactory,
+    LLMTimeoutError,
+    OpenAIStrategy,
+    RetryPolicy,
+    configure_circuit_breaker,
+    current_deadline,
+    deadline_scope,
+    is_retryable
+)
+from python.llm.resilience import call_with_resilience
+from python.workflows.bitcoin_news import BitcoinNewsWorkflow
+
+NO_WAIT = RetryPolicy(max_attempts=3, base_delay=0.0, max_delay=0.0)
+
+
+class HTTPError(Exception):
+    """SDK-style error carrying an HTTP status"""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class FlakyCall:
+    """Awaitable factory failing with queued errors before succeeding"""
+
+    def __init__(self, *errors, delay: float = 0.0):
+        self.errors = list(errors)
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+class DeadlineProbe(LLMStrategy):
+    """Strategy double recording the deadline each call sees"""
+
+    def __init__(self, reply: str = "", delay: float = 0.0,
+                 error: Exception = None, provider: str = "probe"):
+        super().__init__(LLMConfig(provider=provider, api_key="", model="m"))
+        self.reply = reply
+        self.delay = delay
+        self.error = error
+        self.deadlines = []
+
+    async def query(self, prompt, options=None):
+        self.deadlines.append(current_deadline())
+
+        async def send():
+            await asyncio.sleep(self.delay)
+            if self.error is not None:
+                raise self.error
+            return self.reply
+        return await self._send(send, "Probe error")
+
+    async def query_with_web_search(self, prompt, options=None):
+        return await self.query(prompt, options)
+
+
+class TestRetryClassification:
+    """Test which failures are worth retrying"""
+
+    @pytest.mark.parametrize("error, retryable", [
+        (HTTPError(429), True),
+        (HTTPError(503), True),
+        (HTTPError(408), True),
+        (HTTPError(400), False),
+        (HTTPError(401), False),
+        (ConnectionResetError(), True),
+        (type("APITimeoutError", (Exception,), {})(), True),
+        (ValueError("bad prompt"), False),
+    ])
+    def test_is_retryable(self, error, retryable):
+        assert is_retryable(error) is retryable
+
+    def test_wrapped_cause(self):
+        """Test the status is found through re-wrapped exceptions"""
+        try:
+            try:
+                raise HTTPError(502)
+            except HTTPError as e:
+                raise RuntimeError("wrapped") from e
+        except RuntimeError as e:
+            assert is_retryable(e)
+
+    def test_backoff_is_jittered_and_capped(self):
+        policy = RetryPolicy(base_delay=1.0, max_delay=4.0)
+        delays = [policy.backoff(5) for _ in range(200)]
+        assert all(0 <= d <= 4.0 for d in delays)
+        assert len(set(delays)) > 1
+
+
+class TestCallWithResilience:
+    """Test timeouts, retries and deadlines around one request"""
+
+    @pytest.mark.asyncio
+    async def test_retries_retryable_errors(self):
+        call = FlakyCall(HTTPError(503), HTTPError(500))
+        result = await call_with_resilience(call, "retry-test", "Test error",
+                                            retry=NO_WAIT)
+        assert result == "ok"
+        assert call.calls == 3
+
+    @pytest.mark.asyncio
+    async def test_does_not_retry_client_errors(self):
+        call = FlakyCall(HTTPError(400))
+        with pytest.raises(LLMError, match="Test error: HTTP 400") as info:
+            await call_with_resilience(call, "client-error-test", "Test error",
+                                       retry=NO_WAIT)
+        assert call.calls == 1
+        assert not info.value.retryable
+        assert isinstance(info.value.__cause__, HTTPError)
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(self):
+        call = FlakyCall(*[HTTPError(503)] * 5)
+        with pytest.raises(LLMError, match="503"):
+            await call_with_resilience(call, "exhaust-test", "Test error",
+                                       retry=NO_WAIT)
+        assert call.calls == 3
+
+    @pytest.mark.asyncio
+    async def test_per_call_timeout(self):
+        call = FlakyCall(delay=1.0)
+        with pytest.raises(LLMTimeoutError, match="timed out"):
+            await call_with_resilience(call, "timeout-test", "Test error",
+                                       timeout=0.02,
+                                       retry=RetryPolicy(max_attempts=2,
+                                                         base_delay=0.0))
+        assert call.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_upstream_timeout_without_limit(self):
+        """Test an SDK timeout is reported when no per-call limit is set"""
+        call = FlakyCall(TimeoutError("read timed out"), TimeoutError())
+        with pytest.raises(LLMTimeoutError, match="request timed out$"):
+            await call_with_resilience(call, "no-limit-test", "Test error",
+                                       retry=RetryPolicy(max_attempts=2, base_delay=0.0))
+        assert call.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_deadline_bounds_timeout_and_retries(self):
+        """Test a short deadline wins over a long per-call timeout"""
+        call = FlakyCall(delay=1.0)
+        started = time.perf_counter()
+        with deadline_scope(0.05):
+            with pytest.raises(DeadlineExceededError):
+                await call_with_resilience(call, "deadline-test", "Test error",
+                                           timeout=30, retry=NO_WAIT)
+        assert time.perf_counter() - started < 0.5
+        assert call.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_deadline_skips_call(self):
+        call = FlakyCall()
+        with deadline_scope(0):
+            with pytest.raises(DeadlineExceededError):
+                await call_with_resilience(call, "expired-test", "Test error")
+        assert call.calls == 0
+
+    def test_nested_scopes_only_shorten(self):
+        with deadline_scope(10) as outer:
+            with deadline_scope(60) as inner:
+                assert inner is outer
+            with deadline_scope(1) as inner:
+                assert inner.at < outer.at
+        assert current_deadline() is None
+
+
+class TestCircuitBreaker:
+    """Test the per-provider breaker"""
+
+    def test_opens_and_half_opens(self):
+        now = [0.0]
+        breaker = CircuitBreaker("test", failure_threshold=2, recovery_time=10,
+                                 clock=lambda: now[0])
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == "open"
+        assert not breaker.allow()
+
+        now[0] = 10.0
+        assert breaker.allow()
+        # Only one probe at a time while half-open
+        assert not breaker.allow()
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+    def test_failed_probe_reopens(self):
+        now = [0.0]
+        breaker = CircuitBreaker("test", failure_threshold=1, recovery_time=5,
+                                 clock=lambda: now[0])
+        breaker.record_failure()
+        now[0] = 5.0
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == "open"
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_fast(self):
+        breaker = configure_circuit_breaker("breaker-test", failure_threshold=2,
+                                            recovery_time=60)
+        call = FlakyCall(*[HTTPError(503)] * 10)
+        with pytest.raises(LLMError):
+            await call_with_resilience(call, "breaker-test", "Test error",
+                                       retry=NO_WAIT)
+        assert breaker.state == "open"
+        assert call.calls == 2
+
+        with pytest.raises(CircuitOpenError):
+            await call_with_resilience(call, "breaker-test", "Test error",
+                                       retry=NO_WAIT)
+        assert call.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_probe_frees_the_slot(self):
+        breaker = CircuitBreaker("cancel-test", failure_threshold=1, recovery_time=0)
+        breaker.record_failure()
+        probe = asyncio.ensure_future(call_with_resilience(
+            FlakyCall(delay=1.0), "cancel-test", "Test error", breaker=breaker))
+        await asyncio.sleep(0.01)
+        probe.cancel()
+        await asyncio.gather(probe, return_exceptions=True)
+        assert breaker.state == "half_open"
+
+        with deadline_scope(0.01):
+            with pytest.raises(DeadlineExceededError):
+                await call_with_resilience(FlakyCall(delay=1.0), "cancel-test",
+                                           "Test error", breaker=breaker)
+        assert breaker.state == "half_open"
+        assert await call_with_resilience(FlakyCall(), "cancel-test", "Test error",
+                                          breaker=breaker) == "ok"
+        assert breaker.state == "closed"
+
+    @pytest.mark.asyncio
+    async def test_client_errors_do_not_trip(self):
+        breaker = configure_circuit_breaker("client-trip-test", failure_threshold=1)
+        for _ in range(3):
+            with pytest.raises(LLMError):
+                await call_with_resilience(FlakyCall(HTTPError(400)),
+                                           "client-trip-test", "Test error")
+        assert breaker.state == "closed"
+
+
+class TestProviderIntegration:
+    """Test the policy is applied to real strategy implementations"""
+
+    @pytest.mark.asyncio
+    async def test_openai_retries_server_errors(self):
+        configure_circuit_breaker("openai")
+        strategy = OpenAIStrategy()
+        strategy.retry_policy = NO_WAIT
+        reply = AsyncMock()
+        reply.choices = [AsyncMock()]
+        reply.choices[0].message.content = "recovered"
+        reply.usage = None
+        with patch.object(strategy.client.chat.completions, "create",
+                          new=AsyncMock(side_effect=[HTTPError(502), reply])) as create:
+            assert await strategy.query("p") == "recovered"
+        assert create.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_openai_error_is_classified(self):
+        configure_circuit_breaker("openai")
+        strategy = OpenAIStrategy()
+        with patch.object(strategy.client.chat.completions, "create",
+                          new=AsyncMock(side_effect=HTTPError(401))):
+            with pytest.raises(LLMError, match="OpenAI API error: HTTP 401") as info:
+                await strategy.query("p")
+        assert info.value.status_code == 401
+        assert info.value.provider == "openai"
+
+    def test_sdk_retries_disabled(self):
+        assert OpenAIStrategy().client.max_retries == 0
+
+
+class TestFallbackStrategy:
+    """Test failing over to another provider"""
+
+    @pytest.mark.asyncio
+    async def test_falls_back_on_open_circuit(self):
+        configure_circuit_breaker("down", failure_threshold=1, recovery_time=60)
+        primary = DeadlineProbe(error=HTTPError(503), provider="down")
+        primary.retry_policy = NO_WAIT
+        secondary = DeadlineProbe(reply="from fallback", provider="up")
+        strategy = FallbackStrategy(primary, [secondary])
+
+        assert await strategy.query("p") == "from fallback"
+        # The breaker is now open: the primary is skipped without a request
+        assert await strategy.query("p") == "from fallback"
+        assert len(primary.deadlines) == 2
+        assert len(secondary.deadlines) == 2
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_masked(self):
+        primary = DeadlineProbe(error=HTTPError(400), provider="bad-request")
+        secondary = DeadlineProbe(reply="unused", provider="up")
+        with pytest.raises(LLMError, match="400"):
+            await FallbackStrategy(primary, [secondary]).query("p")
+        assert secondary.deadlines == []
+
+    @pytest.mark.asyncio
+    async def test_web_search_only_falls_back_to_search_providers(self):
+        primary = DeadlineProbe(error=HTTPError(503), provider="search-down")
+        primary.retry_policy = NO_WAIT
+        primary.supports_web_search = True
+        plain = DeadlineProbe(reply="made-up headline", provider="no-search")
+        search = DeadlineProbe(reply="searched", provider="search-up")
+        search.supports_web_search = True
+
+        strategy = FallbackStrategy(primary, [plain, search])
+        assert await strategy.query_with_web_search("p") == "searched"
+        with pytest.raises(LLMError) as info:
+            await FallbackStrategy(primary, [plain]).query_with_web_search("p")
+        assert info.value.provider == "search-down" and plain.deadlines == []
+        # Plain queries may still use any provider
+        assert await FallbackStrategy(primary, [plain]).query("p") == "made-up headline"
+
+    def test_fallbacks_created_lazily_by_name(self):
+        with patch.object(LLMStrategyFactory, "create",
+                          wraps=LLMStrategyFactory.create) as create:
+            strategy = FallbackStrategy("openai", ["grok"])
+        assert [c.args[0] for c in create.call_args_list] == ["openai"]
+        assert strategy.config.provider == "openai"
+        assert "fallback" in LLMStrategyFactory.list_providers()
+
+
+class TestWorkflowDeadline:
+    """Test deadline propagation from BitcoinNewsWorkflow.run()"""
+
+    @pytest.mark.asyncio
+    async def test_nodes_see_run_deadline(self):
+        openai = DeadlineProbe('{"analysis": "neutral", "reasoning": "r"}')
+        grok = DeadlineProbe("summary")
+        workflow = BitcoinNewsWorkflow(openai=openai, grok=grok, fused=False,
+                                       checkpointer=MemorySaver())
+        await workflow.run(deadline=30)
+
+        seen = openai.deadlines + grok.deadlines
+        assert len(seen) == 3
+        assert all(d is not None and d is seen[0] for d in seen)
+        assert 0 < seen[0].remaining() <= 30
+
+    @pytest.mark.asyncio
+    async def test_slow_run_stops_at_deadline(self):
+        openai = DeadlineProbe("headline", delay=5.0, provider="slow")
+        workflow = BitcoinNewsWorkflow(openai=openai, grok=DeadlineProbe(),
+                                       fused=False, checkpointer=MemorySaver())
+        started = time.perf_counter()
+        with pytest.raises(DeadlineExceededError):
+            await workflow.run(deadline=0.1)
+        assert time.perf_counter() - started < 1.0
+
+    @pytest.mark.asyncio
+    async def test_env_default(self, monkeypatch):
+        monkeypatch.setenv("WORKFLOW_DEADLINE_SECONDS", "0")
+        openai = DeadlineProbe('{"analysis": "neutral", "reasoning": "r"}')
+        workflow = BitcoinNewsWorkflow(openai=openai, grok=DeadlineProbe("s"),
+                                       fused=False, checkpointer=MemorySaver())
+        await workflow.run()
+        assert openai.deadlines == [None, None]
+
+    @pytest.mark.asyncio
+    async def test_stream_events_deadline(self):
+        openai = DeadlineProbe('{"analysis": "neutral", "reasoning": "r"}')
+        workflow = BitcoinNewsWorkflow(openai=openai, grok=DeadlineProbe("s"),
+                                       fused=False, checkpointer=MemorySaver())
+        events = [e async for e in workflow.stream_events(deadline=30)]
+        assert events[-1]["event"] == "done"
+        assert all(d is not None for d in openai.deadlines)
@@ -0,0 +1,130 @@
+"""
+Tests for the latency-aware router strategy
+File: python/tests/test_router.py
+Purpose: Tests EWMA routing, hedging, failover and factory registration
+Related components: llm.router, llm.strategies
+Tags: test, llm, router, hedging
+"""
+
+import asyncio
+import pytest
+from python.llm import (
+    LLMConfig,
+    LLMStrategy,
+    LLMStrategyFactory,
+    RouterStrategy
+)
+
+
+class FakeBackend(LLMStrategy):
+    """Backend double with a fixed delay and optional failure"""
+
+    def __init__(self, name: str, delay: float = 0.0, fail: bool = False):
+        super().__init__(LLMConfig(provider=name, api_key="key", model="m"))
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = 0
+
+    async def query(self, prompt, options=None):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise Exception(f"{self.name} API error")
+        return f"{self.name}: {prompt}"
+
+    async def query_with_web_search(self, prompt, options=None):
+        return await self.query(prompt, options)
+
+
+class TestRouterStrategy:
+    """Test routing decisions"""
+
+    def test_registered_in_factory(self):
+        """Test the factory builds a router over OpenAI and Grok"""
+        router = LLMStrategyFactory.create("router")
+        assert isinstance(router, RouterStrategy)
+        assert [b.config.provider for b in router.backends] == ["openai", "grok"]
+
+    @pytest.mark.asyncio
+    async def test_routes_to_fastest_backend(self):
+        """Test calls go to the backend with the lowest EWMA latency"""
+        slow = FakeBackend("slow", delay=0.03)
+        fast = FakeBackend("fast", delay=0.0)
+        router = RouterStrategy([slow, fast], hedge=False)
+
+        # Explore both, then the fast backend should win every time
+        await router.query("a")
+        await router.query("b")
+        for _ in range(5):
+            assert (await router.query("p")).startswith("fast")
+        assert slow.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_hedges_slow_primary(self):
+        """Test a stalled primary is hedged and the loser cancelled"""
+        primary = FakeBackend("primary", delay=0.0)
+        backup = FakeBackend("backup", delay=0.0)
+        router = RouterStrategy([primary, backup], min_samples=3,
+                                min_hedge_delay=0.01)
+        for _ in range(3):
+            router.stats_for(primary).record_success(0.01)
+        router.stats_for(backup).record_success(0.02)
+
+        primary.delay = 1.0  # stall
+        result = await router.query("p")
+
+        assert result == "backup: p"
+        assert router.stats.hedges == 1
+        assert router.stats.hedge_wins == 1
+        await asyncio.sleep(0)  # let the cancelled loser unwind
+        assert primary.cancelled == 1
+
+    @pytest.mark.asyncio
+    async def test_fails_over_on_error(self):
+        """Test errors fall through to the next backend"""
+        broken = FakeBackend("broken", fail=True)
+        healthy = FakeBackend("healthy")
+        router = RouterStrategy([broken, healthy], hedge=False)
+
+        assert await router.query("p") == "healthy: p"
+        assert router.stats.failovers == 1
+        assert router.stats_for(broken).error_rate > 0
+
+    @pytest.mark.asyncio
+    async def test_all_backends_fail(self):
+        """Test the last error is raised when every backend fails"""
+        router = RouterStrategy([FakeBackend("a", fail=True),
+                                 FakeBackend("b", fail=True)], hedge=False)
+        with pytest.raises(Exception, match="API error"):
+            await router.query("p")
+
+    def test_unhealthy_backend_demoted_then_probed(self):
+        """Test a failing backend ranks last until its recovery window passes"""
+        now = [0.0]
+        flaky = FakeBackend("flaky")
+        steady = FakeBackend("steady")
+        router = RouterStrategy([flaky, steady], recovery_after=10,
+                                clock=lambda: now[0])
+        router.stats_for(steady).record_success(0.5)
+        for _ in range(5):
+            router.stats_for(flaky).record_failure()
+
+        assert router.rank(router.backends)[0] is steady
+        now[0] += 11
+        assert router.is_healthy(flaky)
+
+    @pytest.mark.asyncio
+    async def test_web_search_not_hedged(self):
+        """Test web search only uses the web-search backends"""
+        search = FakeBackend("search", delay=0.05)
+        other = FakeBackend("other")
+        router = RouterStrategy([search, other], default_hedge_delay=0.01)
+
+        assert await router.query_with_web_search("news") == "search: news"
+        assert other.calls == 0
@@ -0,0 +1,187 @@
+"""
+Tests for the in-process workflow scheduler
+File: python/tests/test_scheduler.py
+Purpose: Tests cron/interval parsing, jitter, overlap policies, the concurrency cap and persisted state
+Related components: workflows.scheduler, main.py
+Tags: test, workflows, scheduler, cron
+"""
+
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+import pytest
+from python.workflows.scheduler import (
+    CronSchedule,
+    IntervalSchedule,
+    OverlapPolicy,
+    SchedulerStateStore,
+    WorkflowScheduler,
+    parse_schedule
+)
+
+T0 = datetime(2026, 3, 2, 8, 7, 30, tzinfo=timezone.utc)  # a Monday
+
+
+class SlowRunner:
+    """Runner double tracking calls and peak concurrency"""
+
+    def __init__(self, duration: float = 0.0, tracker: "SlowRunner" = None):
+        self.duration = duration
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+        self.tracker = tracker or self
+
+    async def __call__(self):
+        self.calls += 1
+        self.tracker.active += 1
+        self.tracker.peak = max(self.tracker.peak, self.tracker.active)
+        try:
+            await asyncio.sleep(self.duration)
+        finally:
+            self.tracker.active -= 1
+
+
+class TestSchedules:
+    """Test schedule spec parsing"""
+
+    @pytest.mark.parametrize("expression, expected", [
+        ("*/15 * * * *", datetime(2026, 3, 2, 8, 15, tzinfo=timezone.utc)),
+        ("0 9 * * 1-5", datetime(2026, 3, 2, 9, 0, tzinfo=timezone.utc)),
+        ("30 6 * * 0", datetime(2026, 3, 8, 6, 30, tzinfo=timezone.utc)),
+        ("0 0 1 4 *", datetime(2026, 4, 1, 0, 0, tzinfo=timezone.utc)),
+        ("@daily", datetime(2026, 3, 3, 0, 0, tzinfo=timezone.utc)),
+        ("5,50 8 * * *", datetime(2026, 3, 2, 8, 50, tzinfo=timezone.utc)),
+    ])
+    def test_cron_next_after(self, expression, expected):
+        assert CronSchedule(expression).next_after(T0) == expected
+
+    def test_restricted_day_fields_match_either(self):
+        """Test day-of-month OR day-of-week, as in cron(8)"""
+        # 15th of the month or any Friday: Friday 6 March comes first
+        assert CronSchedule("0 0 15 * 5").next_after(T0).day == 6
+
+    @pytest.mark.parametrize("expression", [
+        "* * * *", "60 * * * *", "*/0 * * * *", "0 0 31 2 *",
+    ])
+    def test_invalid_cron(self, expression):
+        with pytest.raises(ValueError):
+            CronSchedule(expression).next_after(T0)
+
+    def test_interval(self):
+        schedule = parse_schedule("@every 15m")
+        assert isinstance(schedule, IntervalSchedule)
+        assert schedule.next_after(T0) == T0 + timedelta(minutes=15)
+        assert parse_schedule("@every 250ms").seconds == 0.25
+        with pytest.raises(ValueError):
+            parse_schedule("@every soon")
+
+
+class TestWorkflowScheduler:
+    """Test the scheduling loop"""
+
+    @pytest.mark.asyncio
+    async def test_runs_on_interval(self):
+        scheduler = WorkflowScheduler()
+        runner = SlowRunner()
+        scheduler.add_job("news", runner, "@every 20ms")
+        scheduler.start()
+        await asyncio.sleep(0.15)
+        await scheduler.stop()
+
+        state = scheduler.jobs()["news"]
+        assert runner.calls >= 3
+        assert state.runs == runner.calls
+        assert state.last_status == "succeeded"
+
+    @pytest.mark.asyncio
+    async def test_failures_recorded(self):
+        scheduler = WorkflowScheduler()
+
+        async def broken():
+            raise RuntimeError("provider down")
+
+        scheduler.add_job("news", broken, "@every 20ms")
+        scheduler.start()
+        await asyncio.sleep(0.07)
+        await scheduler.stop()
+        state = scheduler.jobs()["news"]
+        assert state.failures >= 1
+        assert state.last_error == "provider down"
+
+    @pytest.mark.asyncio
+    async def test_overlapping_run_skipped(self):
+        scheduler = WorkflowScheduler()
+        runner = SlowRunner(duration=0.12)
+        scheduler.add_job("news", runner, "@every 20ms")
+        scheduler.start()
+        await asyncio.sleep(0.2)
+        await scheduler.stop()
+
+        assert runner.peak == 1
+        assert scheduler.jobs()["news"].skipped >= 3
+
+    @pytest.mark.asyncio
+    async def test_overlapping_runs_coalesced(self):
+        """Test due slots during a run collapse into one back-to-back follow-up"""
+        scheduler = WorkflowScheduler()
+        runner = SlowRunner(duration=0.1)
+        scheduler.add_job("news", runner, "@every 20ms",
+                          overlap=OverlapPolicy.COALESCE)
+        scheduler.start()
+        await asyncio.sleep(0.25)
+        await scheduler.stop()
+
+        state = scheduler.jobs()["news"]
+        assert runner.peak == 1
+        assert runner.calls >= 2
+        # Several slots were due per run, yet each run is followed by one
+        assert state.coalesced > runner.calls
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap(self):
+        scheduler = WorkflowScheduler(max_concurrency=2)
+        tracker = SlowRunner()
+        runners = [SlowRunner(duration=0.05, tracker=tracker) for _ in range(4)]
+        for i, runner in enumerate(runners):
+            scheduler.add_job(f"job{i}", runner, "@every 10ms")
+        scheduler.start()
+        await asyncio.sleep(0.15)
+        await scheduler.stop()
+
+        assert tracker.peak == 2
+        assert all(r.calls >= 1 for r in runners)
+
+    def test_jitter_bounds(self):
+        now = T0
+        scheduler = WorkflowScheduler(clock=lambda: now, rng=random.Random(7))
+        job = scheduler.add_job("news", SlowRunner(), "*/15 * * * *", jitter=60)
+        slot = datetime(2026, 3, 2, 8, 15, tzinfo=timezone.utc)
+        assert job.slot == slot
+        assert slot < job.state.next_run_at <= slot + timedelta(seconds=60)
+
+    def test_restart_does_not_replay_missed_slots(self, tmp_path):
+        """Test persisted state resumes at the next slot after downtime"""
+        store = SchedulerStateStore(str(tmp_path / "scheduler.json"))
+        first = WorkflowScheduler(store=store, clock=lambda: T0)
+        job = first.add_job("news", SlowRunner(), "@hourly")
+        job.state.last_scheduled_at = datetime(2026, 3, 1, 0, 0, tzinfo=timezone.utc)
+        job.state.runs = 7
+        first._persist()
+
+        restarted = WorkflowScheduler(store=store, clock=lambda: T0)
+        resumed = restarted.add_job("news", SlowRunner(), "@hourly")
+        assert resumed.state.runs == 7
+        assert resumed.state.next_run_at == datetime(2026, 3, 2, 9, 0,
+                                                     tzinfo=timezone.utc)
+
+        catch_up = WorkflowScheduler(store=store, clock=lambda: T0)
+        once = catch_up.add_job("news", SlowRunner(), "@hourly", run_missed=True)
+        assert once.state.next_run_at == T0
+
+    def test_from_env(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("WORKFLOW_SCHEDULER_MAX_CONCURRENCY", "3")
+        monkeypatch.setenv("WORKFLOW_SCHEDULER_STATE", str(tmp_path / "s.json"))
+        scheduler = WorkflowScheduler.from_env()
+        assert scheduler.max_concurrency == 3
+        assert scheduler.store.path.endswith("s.json")
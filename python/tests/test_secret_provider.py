@@ -0,0 +1,140 @@
+"""
+Tests for the 1Password-backed secret provider
+File: python/tests/test_secret_provider.py
+Purpose: Tests concurrent op:// resolution, the TTL cache and strategy configuration, using the fake op binary in tests/bin
+Related components: llm.secret_provider, llm.openai_strategy, llm.grok_strategy
+Tags: test, llm, secrets, 1password
+"""
+
+import asyncio
+import json
+import os
+import time
+import pytest
+from python.llm import (
+    GrokStrategy,
+    OpenAIStrategy,
+    SecretProvider,
+    SecretResolutionError,
+    configure_secret_provider,
+    get_secret,
+    preload_secrets
+)
+
+FAKE_OP = os.path.join(os.path.dirname(__file__), "bin", "op")
+
+SECRETS = {
+    "op://Dev/openai/api-key": "sk-openai-test",
+    "op://Dev/grok/api-key": "gsk-grok-test",
+    "op://Dev/rpc/password": "rpc-pass",
+    "op://Dev/db/password": "db-pass",
+}
+
+
+@pytest.fixture
+def fake_op(tmp_path, monkeypatch):
+    """Point a SecretProvider at the fake op binary; returns (provider, log path)"""
+    secrets_file = tmp_path / "secrets.json"
+    secrets_file.write_text(json.dumps(SECRETS))
+    log = tmp_path / "op.log"
+    monkeypatch.setenv("FAKE_OP_SECRETS", str(secrets_file))
+    monkeypatch.setenv("FAKE_OP_LOG", str(log))
+    provider = SecretProvider(op_path=FAKE_OP)
+    configure_secret_provider(provider)
+    yield provider, log
+    configure_secret_provider(None)
+
+
+def op_calls(log) -> list:
+    return log.read_text().splitlines() if log.exists() else []
+
+
+class TestSecretProvider:
+    """Test op:// resolution"""
+
+    @pytest.mark.asyncio
+    async def test_resolves_concurrently(self, fake_op, monkeypatch):
+        """Test four slow op calls overlap instead of running back to back"""
+        provider, log = fake_op
+        monkeypatch.setenv("FAKE_OP_DELAY", "0.4")
+        started = time.perf_counter()
+        values = await provider.resolve_many(SECRETS)
+        elapsed = time.perf_counter() - started
+
+        assert values == SECRETS
+        assert sorted(op_calls(log)) == sorted(SECRETS)
+        assert elapsed < 1.2  # serial would take at least 1.6s
+
+    @pytest.mark.asyncio
+    async def test_cached_until_ttl(self, fake_op):
+        provider, log = fake_op
+        now = [0.0]
+        provider._clock = lambda: now[0]
+        provider.ttl = 60
+
+        ref = "op://Dev/openai/api-key"
+        assert await provider.resolve(ref) == "sk-openai-test"
+        assert provider.resolve_sync(ref) == "sk-openai-test"
+        assert len(op_calls(log)) == 1
+
+        now[0] = 61.0
+        await provider.resolve(ref)
+        assert len(op_calls(log)) == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_share_one_call(self, fake_op, monkeypatch):
+        provider, log = fake_op
+        monkeypatch.setenv("FAKE_OP_DELAY", "0.1")
+        ref = "op://Dev/grok/api-key"
+        results = await asyncio.gather(*(provider.resolve(ref) for _ in range(5)))
+        assert results == ["gsk-grok-test"] * 5
+        assert op_calls(log) == [ref]
+
+    @pytest.mark.asyncio
+    async def test_failures_name_the_reference(self, fake_op):
+        provider, _ = fake_op
+        with pytest.raises(SecretResolutionError, match="op://Dev/missing/key") as info:
+            await provider.resolve_many(["op://Dev/openai/api-key",
+                                         "op://Dev/missing/key"])
+        assert "sk-openai-test" not in str(info.value)
+        with pytest.raises(SecretResolutionError, match="isn't an item"):
+            provider.resolve_sync("op://Dev/missing/key")
+
+    @pytest.mark.asyncio
+    async def test_missing_binary(self):
+        provider = SecretProvider(op_path="/nonexistent/op")
+        with pytest.raises(SecretResolutionError, match="op://Dev/x/y"):
+            await provider.resolve("op://Dev/x/y")
+
+
+class TestStrategyConfiguration:
+    """Test API keys reach the strategies without touching os.environ"""
+
+    @pytest.mark.asyncio
+    async def test_preload_then_construct(self, fake_op, monkeypatch):
+        provider, log = fake_op
+        monkeypatch.setenv("OPENAI_API_KEY", "op://Dev/openai/api-key")
+        monkeypatch.setenv("GROK_API_KEY", "op://Dev/grok/api-key")
+
+        assert await preload_secrets() == {"OPENAI_API_KEY": "sk-openai-test",
+                                           "GROK_API_KEY": "gsk-grok-test"}
+        assert OpenAIStrategy().config.api_key == "sk-openai-test"
+        assert GrokStrategy().config.api_key == "gsk-grok-test"
+        # Construction was served from the cache; the environment keeps the reference
+        assert len(op_calls(log)) == 2
+        assert os.environ["OPENAI_API_KEY"] == "op://Dev/openai/api-key"
+
+    @pytest.mark.asyncio
+    async def test_plain_values_pass_through(self, fake_op, monkeypatch):
+        _, log = fake_op
+        monkeypatch.setenv("OPENAI_API_KEY", "sk-literal")
+        assert await preload_secrets(["OPENAI_API_KEY"]) == {}
+        assert get_secret("OPENAI_API_KEY") == "sk-literal"
+        assert op_calls(log) == []
+
+    def test_from_env(self, monkeypatch):
+        monkeypatch.setenv("SECRETS_OP_PATH", "/opt/op")
+        monkeypatch.setenv("SECRETS_CACHE_TTL", "30")
+        provider = SecretProvider.from_env()
+        assert provider.op_path == "/opt/op"
+        assert provider.ttl == 30
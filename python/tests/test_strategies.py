@@ -7,16 +7,31 @@ Tags: test, llm, strategy, factory
 """
 
 import pytest
-from unittest.mock import patch, AsyncMock
+from unittest.mock import patch, AsyncMock, MagicMock
 from python.llm import (
     LLMStrategyFactory,
     LLMStrategy,
     LLMConfig,
     OpenAIStrategy,
-    GrokStrategy
+    GrokStrategy,
+    HTTPPoolConfig,
+    configure_http_pool,
+    get_http_client,
+    aclose_http_clients
 )
 
 
+def make_stream(*tokens):
+    """Build an async iterator of streamed chat completion chunks"""
+    async def stream():
+        for token in tokens:
+            chunk = MagicMock()
+            chunk.choices = [MagicMock()]
+            chunk.choices[0].delta.content = token
+            yield chunk
+    return stream()
+
+
 class TestLLMStrategyFactory:
     """Test the LLM Strategy Factory"""
 
@@ -42,7 +57,9 @@ class TestLLMStrategyFactory:
         providers = LLMStrategyFactory.list_providers()
         assert "openai" in providers
         assert "grok" in providers
-        assert len(providers) == 2
+        assert "router" in providers
+        assert "fallback" in providers
+        assert len(providers) == 4
 
 
 class TestOpenAIStrategy:
@@ -53,7 +70,8 @@ class TestOpenAIStrategy:
         """Test successful OpenAI query"""
         strategy = OpenAIStrategy()
         
-        with patch.object(strategy.client.chat.completions, 'create') as mock_create:
+        with patch.object(strategy.client.chat.completions, 'create',
+                          new_callable=AsyncMock) as mock_create:
             mock_response = AsyncMock()
             mock_response.choices = [AsyncMock()]
             mock_response.choices[0].message.content = "Test response"
@@ -67,7 +85,8 @@ class TestOpenAIStrategy:
         """Test successful OpenAI query with web search"""
         strategy = OpenAIStrategy()
         
-        with patch.object(strategy.client.responses, 'create') as mock_create:
+        with patch.object(strategy.client.responses, 'create',
+                          new_callable=AsyncMock) as mock_create:
             mock_response = AsyncMock()
             mock_response.output_text = "Web search response"
             mock_create.return_value = mock_response
@@ -76,6 +95,20 @@ class TestOpenAIStrategy:
             assert result == "Web search response"
 
 
+    @pytest.mark.asyncio
+    async def test_query_stream(self):
+        """Test OpenAI streaming yields tokens in order"""
+        strategy = OpenAIStrategy()
+
+        with patch.object(strategy.client.chat.completions, 'create',
+                          new_callable=AsyncMock) as mock_create:
+            mock_create.return_value = make_stream("Hel", "lo", None)
+
+            tokens = [t async for t in strategy.query_stream("Test prompt")]
+            assert tokens == ["Hel", "lo"]
+            assert mock_create.call_args[1]["stream"] is True
+
+
 class TestGrokStrategy:
     """Test Grok Strategy Implementation"""
 
@@ -84,7 +117,8 @@ class TestGrokStrategy:
         """Test successful Grok query"""
         strategy = GrokStrategy()
         
-        with patch.object(strategy.client.chat.completions, 'create') as mock_create:
+        with patch.object(strategy.client.chat.completions, 'create',
+                          new_callable=AsyncMock) as mock_create:
             mock_response = AsyncMock()
             mock_response.choices = [AsyncMock()]
             mock_response.choices[0].message.content = "Grok response"
@@ -98,7 +132,8 @@ class TestGrokStrategy:
         """Test Grok query with custom options"""
         strategy = GrokStrategy()
         
-        with patch.object(strategy.client.chat.completions, 'create') as mock_create:
+        with patch.object(strategy.client.chat.completions, 'create',
+                          new_callable=AsyncMock) as mock_create:
             mock_response = AsyncMock()
             mock_response.choices = [AsyncMock()]
             mock_response.choices[0].message.content = "Grok response with options"
@@ -127,6 +162,103 @@ class TestGrokStrategy:
             mock_query.assert_called_once_with("Test prompt", None)
 
 
+    @pytest.mark.asyncio
+    async def test_query_stream_with_options(self):
+        """Test Grok streaming passes options and forces stream mode"""
+        strategy = GrokStrategy()
+
+        with patch.object(strategy.client.chat.completions, 'create',
+                          new_callable=AsyncMock) as mock_create:
+            mock_create.return_value = make_stream("Gro", "k")
+
+            tokens = [t async for t in strategy.query_stream(
+                "Test prompt", {"temperature": 0.1, "stream": False})]
+            assert "".join(tokens) == "Grok"
+            call_args = mock_create.call_args[1]
+            assert call_args["stream"] is True
+            assert call_args["temperature"] == 0.1
+
+    @pytest.mark.asyncio
+    async def test_query_stream_error_wrapped(self):
+        """Test streaming errors use the provider error format"""
+        strategy = GrokStrategy()
+
+        with patch.object(strategy.client.chat.completions, 'create',
+                          new_callable=AsyncMock) as mock_create:
+            mock_create.side_effect = RuntimeError("connection reset")
+
+            with pytest.raises(Exception, match="Grok API error"):
+                async for _ in strategy.query_stream("Test prompt"):
+                    pass
+
+
+class TestSharedHTTPPool:
+    """Test the process-wide provider connection pools"""
+
+    def test_strategies_share_provider_client(self):
+        """Test all instances of a provider reuse one HTTP client"""
+        first = OpenAIStrategy()
+        second = OpenAIStrategy()
+        assert first.client._client is second.client._client
+
+    def test_providers_get_separate_pools(self):
+        """Test OpenAI and Grok do not share a connection pool"""
+        assert OpenAIStrategy().client._client is not GrokStrategy().client._client
+
+    @pytest.mark.asyncio
+    async def test_configured_pool_limits(self):
+        """Test pool settings apply to the next client created"""
+        import openai
+        await aclose_http_clients()
+        configure_http_pool("openai", HTTPPoolConfig(max_connections=7,
+                                                     max_keepalive_connections=3))
+        try:
+            client = get_http_client("openai", openai)
+            pool = client._transport._pool
+            assert pool._max_connections == 7
+            assert pool._max_keepalive_connections == 3
+        finally:
+            configure_http_pool("openai", HTTPPoolConfig.from_env())
+            await aclose_http_clients()
+
+    @pytest.mark.asyncio
+    async def test_queries_overlap(self):
+        """Test concurrent queries do not block each other"""
+        import asyncio
+        strategy = GrokStrategy()
+
+        async def slow_create(**kwargs):
+            await asyncio.sleep(0.2)
+            response = AsyncMock()
+            response.choices = [AsyncMock()]
+            response.choices[0].message.content = "done"
+            return response
+
+        with patch.object(strategy.client.chat.completions, 'create',
+                          side_effect=slow_create):
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            results = await asyncio.gather(
+                *[strategy.query(f"prompt {i}") for i in range(5)]
+            )
+            assert results == ["done"] * 5
+            assert loop.time() - started < 0.5
+
+
+class TestBaseStrategyStream:
+    """Test the default streaming fallback"""
+
+    @pytest.mark.asyncio
+    async def test_default_stream_yields_full_response(self):
+        """Test strategies without streaming yield one chunk"""
+        class StaticStrategy(LLMStrategy):
+            async def query(self, prompt, options=None):
+                return "whole answer"
+
+        strategy = StaticStrategy(LLMConfig(provider="static", api_key=""))
+        assert [t async for t in strategy.query_stream("p")] == ["whole answer"]
+
+
 class TestLLMConfig:
     """Test LLM Configuration"""
 
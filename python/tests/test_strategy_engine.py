@@ -0,0 +1,167 @@
+"""
+Tests for the vectorized accumulation strategy engine
+File: python/tests/test_strategy_engine.py
+Purpose: Tests evaluate_strategy per strategy, data fallbacks, the registry and batch evaluation
+Related components: strategies.engine, strategies.base, strategies.power_law, strategies.technical, strategies.cycle, strategies.ensemble
+Tags: test, strategies, dca, numpy
+"""
+
+from datetime import datetime, timedelta, timezone
+import numpy as np
+import pytest
+from python.strategies import (
+    BUY,
+    HOLD,
+    SELL,
+    MovingAverageDipStrategy,
+    PowerLawStrategy,
+    PriceFeed,
+    PriceHistory,
+    PriceStrategy,
+    StrategyFactory,
+    calculate_dca_amount,
+    days_since_genesis,
+    evaluate_all,
+    evaluate_batch,
+    evaluate_strategy
+)
+
+TODAY = 6000.0
+
+
+def power_law_history(days: int = 400, noise: float = 0.1, seed: int = 1) -> PriceHistory:
+    """Daily closes scattered around the default power-law model"""
+    rng = np.random.default_rng(seed)
+    day = np.arange(TODAY - days, TODAY)
+    model = PowerLawStrategy().model_price(day)
+    return PriceHistory(model * np.exp(rng.normal(0.0, noise, days)), day)
+
+
+class TestStrategies:
+    """Test individual strategy decisions"""
+
+    def test_power_law_bands(self):
+        history = power_law_history()
+        strategy = PowerLawStrategy()
+        model = float(strategy.model_price(np.array([TODAY]))[0])
+        band = strategy.band_ratio(history)
+
+        below = evaluate_strategy("power-law-95", model * 0.5, history, TODAY)
+        assert below.action == "buy"
+        assert below.multiplier == pytest.approx(2.0)
+        assert evaluate_strategy("power-law-95", model * 0.2, history, TODAY).multiplier == 3.0
+        assert evaluate_strategy("power-law-95", model * 1.05, history, TODAY).action == "hold"
+        assert evaluate_strategy("power-law-95", model * band * 1.1, history, TODAY).action == "sell"
+
+    def test_ma_dip_scales_with_depth(self):
+        history = PriceHistory.daily([100.0] * 60, first_day=TODAY - 60)
+        assert evaluate_strategy("technical-ma-dip", 97.0, history, TODAY).action == "hold"
+        dip = evaluate_strategy("technical-ma-dip", 90.0, history, TODAY)
+        assert (dip.action, dip.multiplier) == ("buy", pytest.approx(2.0))
+
+    def test_volatility_scales_dca(self):
+        rng = np.random.default_rng(3)
+        calm_then_wild = np.concatenate([rng.normal(0, 0.01, 300), rng.normal(0, 0.06, 30)])
+        history = PriceHistory.daily(100 * np.exp(np.cumsum(calm_then_wild)), TODAY - 330)
+        result = evaluate_strategy("volatility-dca", history.prices[-1], history, TODAY)
+        assert result.action == "buy"
+        assert result.multiplier > 1.5
+
+        returns = np.diff(np.log(np.append(history.prices, history.prices[-1] * 1.02)))
+        expected = returns[-30:].std(ddof=1) / history.log_returns.std(ddof=1)
+        strategy = StrategyFactory.create("volatility-dca", max_multiplier=100.0)
+        assert strategy.evaluate(history.prices[-1] * 1.02, history, TODAY).multiplier == \
+            pytest.approx(expected)
+
+    def test_halving_cycle_weights_trough(self):
+        strategy = StrategyFactory.get("halving-cycle")
+        halving = days_since_genesis(datetime(2020, 5, 11, tzinfo=timezone.utc))
+        length = days_since_genesis(datetime(2024, 4, 20, tzinfo=timezone.utc)) - halving
+        trough = strategy.evaluate(1.0, PriceHistory([], []), halving + 0.65 * length)
+        near_peak = strategy.evaluate(1.0, PriceHistory([], []), halving + 0.15 * length)
+        assert trough.multiplier == pytest.approx(2.0)
+        assert near_peak.action == "hold"
+        # Beyond the last known halving the average cycle repeats
+        assert 0.0 <= strategy.phase(np.array([20000.0]))[0] < 1.0
+
+    def test_ensemble_needs_consensus(self):
+        history = power_law_history()
+        model = float(PowerLawStrategy().model_price(np.array([TODAY]))[0])
+        deep = evaluate_strategy("ensemble", model * 0.4, history, TODAY)
+        assert deep.action == "buy"
+        assert 0.5 <= deep.multiplier <= 3.0
+        assert evaluate_strategy("ensemble", model, history, TODAY).action == "hold"
+
+
+class TestFallbacks:
+    """Test flat-DCA fallback when data is missing"""
+
+    @pytest.mark.parametrize("strategy_id", ["power-law-95", "technical-ma-dip",
+                                             "volatility-dca", "ensemble"])
+    def test_no_history(self, strategy_id):
+        result = evaluate_strategy(strategy_id, 50000.0, None, TODAY)
+        assert (result.action, result.multiplier, result.fallback) == ("buy", 1.0, True)
+
+    def test_invalid_price(self):
+        result = evaluate_strategy("power-law-95", 0.0, power_law_history(), TODAY)
+        assert result.fallback
+
+    def test_price_feed_input(self):
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        feeds = [PriceFeed(timestamp=start + timedelta(days=i), price=100.0) for i in range(50)]
+        dicts = [{"timestamp": f.timestamp, "price": f.price} for f in feeds]
+        for data in (feeds, dicts):
+            result = evaluate_strategy("technical-ma-dip", 80.0, data, TODAY)
+            assert (result.action, result.fallback) == ("buy", False)
+
+
+class TestRegistryAndBatch:
+    """Test the registry and batch mode"""
+
+    def test_unknown_strategy(self):
+        with pytest.raises(ValueError, match="Unknown strategy"):
+            evaluate_strategy("moon", 1.0, None, TODAY)
+
+    def test_register(self):
+        class AlwaysSell(PriceStrategy):
+            def signals(self, prices, history, days):
+                return np.full(prices.shape, SELL), np.ones(prices.shape)
+
+        StrategyFactory.register("always-sell", AlwaysSell)
+        try:
+            assert "always-sell" in StrategyFactory.list_strategies()
+            result = evaluate_strategy("always-sell", 1.0, None, TODAY)
+            assert (result.action, result.strategy_id) == ("sell", "always-sell")
+        finally:
+            StrategyFactory._strategies.pop("always-sell")
+            StrategyFactory._instances.pop("always-sell", None)
+
+    def test_batch_matches_single_evaluation(self):
+        history = power_law_history(days=200)
+        rng = np.random.default_rng(9)
+        ids = rng.choice(StrategyFactory.list_strategies(), size=300)
+        prices = history.prices[-1] * rng.uniform(0.3, 3.0, size=300)
+
+        batch = evaluate_batch(ids, prices, history, TODAY)
+        assert len(batch) == 300
+        for i in range(0, 300, 7):
+            assert batch[i] == evaluate_strategy(ids[i], prices[i], history, TODAY)
+        assert set(np.unique(batch.actions)) <= {HOLD, BUY, SELL}
+
+    def test_evaluate_all(self):
+        results = evaluate_all(40000.0, power_law_history(), TODAY)
+        assert list(results) == StrategyFactory.list_strategies()
+        assert results["flat-dca"].multiplier == 1.0
+
+    def test_derived_values_computed_once(self):
+        history = PriceHistory.daily(np.linspace(100, 200, 60), TODAY - 60)
+        strategy = MovingAverageDipStrategy()
+        evaluate_batch(["technical-ma-dip"] * 1000, np.linspace(50, 250, 1000), history, TODAY)
+        assert list(history._derived) == [("sma", strategy.window)]
+
+
+def test_calculate_dca_amount():
+    assert calculate_dca_amount(100.0, 2.5) == 250.0
+    assert calculate_dca_amount(100.0, 50.0) == 1000.0
+    assert calculate_dca_amount(100.0, 0.0) == pytest.approx(10.0)
+    np.testing.assert_allclose(calculate_dca_amount(10.0, np.array([0.5, 20.0])), [5.0, 100.0])
@@ -0,0 +1,211 @@
+"""
+Tests for structured output and the fused analysis mode
+File: python/tests/test_structured.py
+Purpose: Tests the incremental JSON extractor, schema validation, query_json and the fused node
+Related components: llm.structured, llm.base, workflows.bitcoin_news, workflows.bitcoin_news_digest
+Tags: test, llm, json, structured-output
+"""
+
+import json
+import pytest
+from unittest.mock import AsyncMock
+from langgraph.checkpoint.memory import MemorySaver
+from python.llm import (
+    CachedLLMStrategy,
+    IncrementalJSONExtractor,
+    LLMConfig,
+    LLMResponseCache,
+    LLMStrategy,
+    OpenAIStrategy,
+    RouterStrategy,
+    extract_json,
+    validate_schema
+)
+from python.workflows.bitcoin_news import (
+    NEWS_ANALYSIS_SCHEMA,
+    BitcoinNewsWorkflow,
+    parse_sentiment
+)
+from python.workflows.bitcoin_news_digest import BitcoinNewsDigestWorkflow
+
+ANALYSIS = {"summary": "ETF inflows lift price.", "analysis": "bullish",
+            "reasoning": "Demand is rising."}
+
+
+class ScriptedStrategy(LLMStrategy):
+    """Strategy double replaying canned replies and recording options"""
+
+    def __init__(self, replies, schema_support: bool = False):
+        super().__init__(LLMConfig(provider="scripted", api_key="", model="m"))
+        self.supports_json_schema = schema_support
+        self.replies = list(replies)
+        self.options = []
+        self.query_with_web_search = AsyncMock(return_value="Bitcoin ETF inflows")
+
+    async def query(self, prompt, options=None):
+        self.options.append(options)
+        return self.replies.pop(0)
+
+
+class TestIncrementalJSONExtractor:
+    """Test tolerant extraction"""
+
+    @pytest.mark.parametrize("text", [
+        '```json\n{"a": 1}\n```',
+        'Sure! Here is the result: {"a": 1} Hope that helps.',
+        '{"a": 1}',
+    ])
+    def test_ignores_surrounding_text(self, text):
+        """Test fences and prose around the value are skipped"""
+        assert extract_json(text) == {"a": 1}
+
+    def test_braces_inside_strings(self):
+        """Test braces and escaped quotes in strings do not end the value"""
+        text = '{"reasoning": "price \\"broke\\" {resistance}", "n": [1, {"x": 2}]}'
+        assert extract_json(text)["reasoning"] == 'price "broke" {resistance}'
+
+    def test_skips_balanced_non_json(self):
+        """Test a {placeholder} before the real object is skipped"""
+        assert extract_json('Format {like this}: {"a": [1]}') == {"a": [1]}
+
+    def test_incremental_feed(self):
+        """Test the value completes on the closing token, not before"""
+        extractor = IncrementalJSONExtractor()
+        text = 'Answer: {"analysis": "bearish", "reasoning": "Outflows."} trailing'
+        closing = text.index("}")
+        for i, char in enumerate(text):
+            assert extractor.feed(char) == (i >= closing)
+        assert extractor.value == {"analysis": "bearish", "reasoning": "Outflows."}
+
+    def test_no_json(self):
+        """Test text without a complete value raises"""
+        with pytest.raises(ValueError, match="No JSON value"):
+            extract_json('{"truncated": ')
+
+
+class TestValidateSchema:
+    """Test the JSON Schema subset"""
+
+    def test_valid(self):
+        assert validate_schema(ANALYSIS, NEWS_ANALYSIS_SCHEMA) is ANALYSIS
+
+    @pytest.mark.parametrize("value, message", [
+        ({"summary": "s", "analysis": "moon", "reasoning": "r"}, "not one of"),
+        ({"summary": "s", "analysis": "bullish"}, "missing required property 'reasoning'"),
+        ({"summary": 3, "analysis": "bullish", "reasoning": "r"}, r"\$\.summary: expected string"),
+        ([], "expected object"),
+    ])
+    def test_invalid(self, value, message):
+        with pytest.raises(ValueError, match=message):
+            validate_schema(value, NEWS_ANALYSIS_SCHEMA)
+
+
+class TestQueryJson:
+    """Test structured queries on strategies"""
+
+    @pytest.mark.asyncio
+    async def test_schema_requested_when_supported(self):
+        """Test response_format is only sent to providers that enforce it"""
+        strict = ScriptedStrategy([json.dumps(ANALYSIS)], schema_support=True)
+        assert await strict.query_json("p", NEWS_ANALYSIS_SCHEMA, "news") == ANALYSIS
+        response_format = strict.options[0]["response_format"]
+        assert response_format["json_schema"]["name"] == "news"
+        assert response_format["json_schema"]["strict"] is True
+
+        loose = ScriptedStrategy(["```json\n" + json.dumps(ANALYSIS) + "\n```"])
+        assert await loose.query_json("p", NEWS_ANALYSIS_SCHEMA) == ANALYSIS
+        assert loose.options == [{}]
+
+    @pytest.mark.asyncio
+    async def test_malformed_reply_retried(self):
+        """Test one bad reply is re-requested instead of failing"""
+        strategy = ScriptedStrategy(["not json", json.dumps(ANALYSIS)])
+        assert await strategy.query_json("p", NEWS_ANALYSIS_SCHEMA) == ANALYSIS
+
+        strategy = ScriptedStrategy(["nope", "still nope"])
+        with pytest.raises(ValueError, match="No JSON value"):
+            await strategy.query_json("p", NEWS_ANALYSIS_SCHEMA)
+
+    @pytest.mark.asyncio
+    async def test_cache_stores_only_valid_replies(self):
+        """Test a cached structured reply is replayed without a call"""
+        inner = ScriptedStrategy(["bad", json.dumps(ANALYSIS)])
+        cached = CachedLLMStrategy(inner, LLMResponseCache())
+        assert await cached.query_json("p", NEWS_ANALYSIS_SCHEMA) == ANALYSIS
+        assert await cached.query_json("p", NEWS_ANALYSIS_SCHEMA) == ANALYSIS
+        assert len(inner.options) == 2
+
+    def test_schema_support_propagates(self):
+        """Test wrappers report the wrapped provider's capability"""
+        openai = OpenAIStrategy()
+        assert CachedLLMStrategy(openai, LLMResponseCache()).supports_json_schema
+        assert not RouterStrategy([openai, ScriptedStrategy([])]).supports_json_schema
+
+    def test_parse_sentiment_tolerates_prose(self):
+        """Test the classic sentiment node no longer needs bare JSON"""
+        reply = 'Here you go:\n{"analysis": "neutral", "reasoning": "Flat."}'
+        assert parse_sentiment(reply)["analysis"] == "neutral"
+
+
+class TestFusedWorkflow:
+    """Test the single-call summarize + sentiment mode"""
+
+    @pytest.mark.asyncio
+    async def test_one_call_per_headline(self):
+        """Test the fused graph skips the separate Grok summary call"""
+        openai = ScriptedStrategy([json.dumps(ANALYSIS)], schema_support=True)
+        grok = ScriptedStrategy([])
+        workflow = BitcoinNewsWorkflow(openai=openai, grok=grok, fused=True,
+                                       checkpointer=MemorySaver())
+        result = await workflow.run()
+
+        assert result["summary"] == ANALYSIS["summary"]
+        assert result["sentiment"] == {"analysis": "bullish",
+                                       "reasoning": "Demand is rising."}
+        assert len(openai.options) == 1
+        assert grok.options == []
+        assert set(result["node_metrics"]) == {"web_search", "analyze"}
+
+    @pytest.mark.asyncio
+    async def test_invalid_reply_fails_clearly(self):
+        """Test a reply that never matches the schema names the problem"""
+        openai = ScriptedStrategy(['{"summary": "s"}', '{"summary": "s"}'])
+        workflow = BitcoinNewsWorkflow(openai=openai, grok=ScriptedStrategy([]),
+                                       fused=True, checkpointer=MemorySaver())
+        with pytest.raises(ValueError, match="Invalid news analysis format"):
+            await workflow.run()
+
+    @pytest.mark.asyncio
+    async def test_streamed_fused_run(self):
+        """Test streamed tokens are parsed incrementally"""
+        openai = ScriptedStrategy([json.dumps(ANALYSIS)])
+        workflow = BitcoinNewsWorkflow(openai=openai, grok=ScriptedStrategy([]),
+                                       fused=True, checkpointer=MemorySaver())
+        events = [e async for e in workflow.stream_events()]
+
+        assert [e["node"] for e in events if e["event"] == "token"] == ["analyze"]
+        assert events[-1]["data"]["sentiment"]["analysis"] == "bullish"
+
+    @pytest.mark.asyncio
+    async def test_env_default(self, monkeypatch):
+        """Test WORKFLOW_FUSED_ANALYSIS switches the default graph"""
+        monkeypatch.setenv("WORKFLOW_FUSED_ANALYSIS", "true")
+        workflow = BitcoinNewsWorkflow(openai=ScriptedStrategy([]),
+                                       grok=ScriptedStrategy([]),
+                                       checkpointer=MemorySaver())
+        assert workflow.fused
+        assert "analyze" in workflow.graph.nodes
+
+    @pytest.mark.asyncio
+    async def test_fused_digest_branches(self):
+        """Test each digest branch makes a single structured call"""
+        openai = ScriptedStrategy([json.dumps(ANALYSIS)] * 3)
+        openai.query_with_web_search.return_value = "A\nB\nC"
+        workflow = BitcoinNewsDigestWorkflow(openai=openai, grok=ScriptedStrategy([]),
+                                             headlines=3, fused=True,
+                                             checkpointer=MemorySaver())
+        result = await workflow.run()
+
+        assert len(openai.options) == 3
+        assert result["market_sentiment"]["analysis"] == "bullish"
+        assert all(a["summary"] == ANALYSIS["summary"] for a in result["analyses"])
@@ -0,0 +1,155 @@
+"""
+Tests for the DCA trigger index and workflow
+File: python/tests/test_triggers.py
+Purpose: Tests threshold crossings, the schedule time wheel, trigger replacement and the check_triggers entry node of the DCA graph
+Related components: workflows.triggers, workflows.dca, workflows.state
+Tags: test, workflows, triggers, dca
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+import pytest
+from pydantic import ValidationError
+from python.workflows.dca import DCAWorkflow
+from python.workflows.triggers import (
+    ThresholdIndex,
+    TimeWheel,
+    Trigger,
+    TriggerIndex,
+    TriggerKind
+)
+
+T0 = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def price_trigger(trigger_id: str, kind: TriggerKind, threshold: float, **kwargs) -> Trigger:
+    return Trigger(trigger_id=trigger_id, user_id=kwargs.pop("user_id", "u1"), kind=kind,
+                   threshold=threshold, **kwargs)
+
+
+class TestThresholdIndex:
+    """Test crossing queries against a full scan"""
+
+    def test_matches_naive_scan(self):
+        rng = random.Random(3)
+        index = ThresholdIndex()
+        triggers = {}
+        for i in range(2000):
+            above = rng.random() < 0.5
+            threshold = rng.uniform(90, 110)
+            triggers[f"t{i}"] = (threshold, above)
+            index.add(f"t{i}", threshold, above)
+        for i in range(0, 2000, 3):
+            threshold, above = triggers.pop(f"t{i}")
+            index.remove(f"t{i}", threshold, above)
+
+        previous = 100.0
+        for _ in range(200):
+            current = previous + rng.uniform(-3, 3)
+            expected = {tid for tid, (threshold, above) in triggers.items()
+                        if (above and previous < threshold <= current)
+                        or (not above and current <= threshold < previous)}
+            assert set(index.crossed(previous, current)) == expected
+            previous = current
+        assert len(index) == len(triggers)
+
+
+class TestTimeWheel:
+    """Test due-time buckets"""
+
+    def test_pops_only_due_entries(self):
+        wheel = TimeWheel(resolution=10)
+        wheel.add("a", 105)
+        wheel.add("b", 108)
+        wheel.add("c", 250)
+        wheel.add("d", 101)
+        wheel.remove("d")
+        assert wheel.pop_due(100) == []
+        assert wheel.pop_due(106) == ["a"]
+        assert wheel.pop_due(1000) == ["b", "c"]
+        assert len(wheel) == 0
+
+
+class TestTriggerIndex:
+    """Test per-tick evaluation"""
+
+    def test_price_triggers_fire_on_crossing(self):
+        index = TriggerIndex()
+        index.add(price_trigger("dip", TriggerKind.PRICE_BELOW, 90_000))
+        index.add(price_trigger("rip", TriggerKind.PRICE_ABOVE, 110_000))
+
+        assert index.check_triggers(price=95_000, now=T0) == []  # sets the reference
+        fired = index.check_triggers(price=89_000, now=T0)
+        assert [(s.trigger_id, s.observed, s.threshold) for s in fired] == [
+            ("dip", 89_000, 90_000)]
+        assert index.check_triggers(price=85_000, now=T0) == []  # still below: no re-fire
+        assert [s.trigger_id for s in index.check_triggers(price=120_000, now=T0)] == ["rip"]
+
+    def test_balance_triggers_are_per_user(self):
+        index = TriggerIndex()
+        index.add(Trigger(trigger_id="sweep", user_id="alice",
+                          kind=TriggerKind.BALANCE_ABOVE, threshold=500))
+        index.check_triggers(balances={"alice": 100, "bob": 100}, now=T0)
+        assert index.check_triggers(balances={"bob": 900}, now=T0) == []
+        fired = index.check_triggers(balances={"alice": 600}, now=T0)
+        assert [(s.trigger_id, s.user_id) for s in fired] == [("sweep", "alice")]
+
+    def test_schedule_rearms(self):
+        index = TriggerIndex(resolution=60)
+        index.add(Trigger(trigger_id="hourly", user_id="u1", kind=TriggerKind.SCHEDULE,
+                          schedule="@every 1h"), now=T0)
+        assert index.check_triggers(now=T0 + timedelta(minutes=59)) == []
+        assert len(index.check_triggers(now=T0 + timedelta(hours=1))) == 1
+        # Missed slots fire once, then the next slot is an interval later
+        assert len(index.check_triggers(now=T0 + timedelta(hours=5))) == 1
+        assert index.check_triggers(now=T0 + timedelta(hours=5, minutes=30)) == []
+
+    def test_replace_and_remove(self):
+        index = TriggerIndex()
+        index.add(price_trigger("t", TriggerKind.PRICE_ABOVE, 100))
+        index.add(price_trigger("t", TriggerKind.PRICE_ABOVE, 200))
+        index.check_triggers(price=50, now=T0)
+        assert [s.threshold for s in index.check_triggers(price=250, now=T0)] == [200]
+        index.remove("t")
+        index.check_triggers(price=50, now=T0)
+        assert index.check_triggers(price=250, now=T0) == [] and len(index) == 0
+
+    def test_validation(self):
+        with pytest.raises(ValidationError):
+            Trigger(trigger_id="x", user_id="u", kind=TriggerKind.PRICE_ABOVE)
+        with pytest.raises(ValidationError):
+            Trigger(trigger_id="x", user_id="u", kind=TriggerKind.SCHEDULE,
+                    schedule="@every soon")
+
+
+class TestDCAWorkflow:
+    """Test the trigger entry node of the DCA graph"""
+
+    @pytest.mark.asyncio
+    async def test_only_fired_triggers_are_evaluated(self):
+        index = TriggerIndex()
+        for i in range(1000):
+            index.add(price_trigger(f"t{i}", TriggerKind.PRICE_BELOW, 50_000 + i * 10,
+                                    user_id=f"u{i}", base_amount=25.0))
+        workflow = DCAWorkflow(index)
+
+        idle = await workflow.run(price=70_000, now=T0)
+        assert idle.triggers == [] and idle.decisions == [] and idle.end_time is not None
+
+        result = await workflow.run(price=59_975, now=T0)
+        assert {t.trigger_id for t in result.triggers} == {"t998", "t999"}
+        # Flat DCA buys the base amount
+        assert [(d.action, d.amount) for d in result.decisions] == [
+            ("buy", 25.0), ("buy", 25.0)]
+
+    @pytest.mark.asyncio
+    async def test_schedule_tick_uses_last_price(self):
+        index = TriggerIndex()
+        index.add(Trigger(trigger_id="daily", user_id="u1", kind=TriggerKind.SCHEDULE,
+                          schedule="@daily", strategy_id="halving-cycle"), now=T0)
+        workflow = DCAWorkflow(index)
+        await workflow.run(price=80_000, now=T0)
+        result = await workflow.run(now=T0 + timedelta(days=1))
+        assert len(result.decisions) == 1
+        assert result.decisions[0].strategy_id == "halving-cycle"
+        assert not result.decisions[0].fallback
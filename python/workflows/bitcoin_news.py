@@ -1,18 +1,162 @@
-import json
+import os
+import time
 from datetime import datetime
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.config import get_stream_writer
+from langchain_core.runnables import RunnableConfig
 from .state import BitcoinNewsState
-from ..llm import OpenAIStrategy, GrokStrategy
+from .checkpoint import SQLiteCheckpointSaver, create_checkpointer
+from pydantic import BaseModel
+from ..llm import (
+    LLMStrategy,
+    OpenAIStrategy,
+    GrokStrategy,
+    CachedLLMStrategy,
+    CoalescingLLMStrategy,
+    LLMResponseCache
+)
+from ..llm.metrics import collect_usage, record_node
+from ..llm.resilience import (
+    bind_deadline,
+    check_deadline,
+    deadline_scope,
+    resolve_deadline
+)
+from ..llm.structured import IncrementalJSONExtractor, extract_json, validate_schema
+import threading
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
 from uuid import uuid4
 
 
+SENTIMENT_SCHEMA = {"type": "object", "required": ["analysis", "reasoning"]}
+
+# Structured output of the fused summarize + sentiment call
+NEWS_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {"type": "string"},
+        "analysis": {"type": "string", "enum": ["bullish", "bearish", "neutral"]},
+        "reasoning": {"type": "string"}
+    },
+    "required": ["summary", "analysis", "reasoning"],
+    "additionalProperties": False
+}
+
+# Task hints routing each node to a suitably sized model (see llm.model_selection)
+SUMMARIZE_TASK = {"task": "summarize"}
+CLASSIFY_TASK = {"task": "classify"}
+
+_default_strategies: Optional[Tuple[LLMStrategy, LLMStrategy]] = None
+_shared_workflow: Optional["BitcoinNewsWorkflow"] = None
+# Separate locks: building the workflow takes the strategies lock
+_strategies_lock = threading.Lock()
+_workflow_lock = threading.Lock()
+
+
+def sentiment_prompt(summary: str) -> str:
+    """Prompt asking for a bullish/bearish/neutral verdict as JSON"""
+    return (f'Analyze the sentiment of this Bitcoin news summary: '
+            f'"{summary}". Respond in JSON: '
+            f'{{ "analysis": "bullish" | "bearish" | "neutral", '
+            f'"reasoning": "string" }}')
+
+
+def parse_sentiment(response: str) -> Dict[str, Any]:
+    """Parse a sentiment JSON response, raising ValueError if malformed
+
+    Markdown fences and prose around the JSON object are tolerated.
+    """
+    try:
+        return extract_json(response, SENTIMENT_SCHEMA)
+    except ValueError:
+        raise ValueError("Invalid sentiment analysis format")
+
+
+def analysis_prompt(headline: str) -> str:
+    """Prompt for the fused summary + sentiment call"""
+    return (f'Summarize this Bitcoin news headline and analyze its sentiment: '
+            f'"{headline}". Respond in JSON: '
+            f'{{ "summary": "string", '
+            f'"analysis": "bullish" | "bearish" | "neutral", '
+            f'"reasoning": "string" }}')
+
+
+def fused_analysis_enabled() -> bool:
+    """Default for the fused mode, from WORKFLOW_FUSED_ANALYSIS"""
+    return os.getenv("WORKFLOW_FUSED_ANALYSIS", "false").lower() in ("1", "true", "yes")
+
+
+def default_deadline() -> Optional[float]:
+    """End-to-end run deadline from WORKFLOW_DEADLINE_SECONDS (0 disables)"""
+    seconds = float(os.getenv("WORKFLOW_DEADLINE_SECONDS", "120"))
+    return seconds if seconds > 0 else None
+
+
+def get_default_strategies() -> Tuple[LLMStrategy, LLMStrategy]:
+    """Return the process-wide (openai, grok) strategies, creating them once"""
+    global _default_strategies
+    if _default_strategies is None:
+        with _strategies_lock:
+            if _default_strategies is None:
+                # Concurrent runs issue the same web search; share one upstream call
+                _default_strategies = (CoalescingLLMStrategy(OpenAIStrategy()),
+                                       GrokStrategy())
+    return _default_strategies
+
+
+def get_shared_workflow() -> "BitcoinNewsWorkflow":
+    """Return the process-wide workflow (graph compiled once, safe to share)"""
+    global _shared_workflow
+    if _shared_workflow is None:
+        with _workflow_lock:
+            if _shared_workflow is None:
+                _shared_workflow = BitcoinNewsWorkflow()
+    return _shared_workflow
+
+
+def warm_up() -> "BitcoinNewsWorkflow":
+    """Build provider clients and compile the shared graph ahead of traffic"""
+    return get_shared_workflow()
+
+
+def shut_down() -> None:
+    """Flush the shared workflow's checkpoints (call on application shutdown)"""
+    if _shared_workflow is not None:
+        _shared_workflow.close()
+
+
 class BitcoinNewsWorkflow:
-    """Bitcoin news analysis workflow using LangGraph"""
+    """Bitcoin news analysis workflow using LangGraph
+
+    Instances hold no per-run state, so one instance (see
+    ``get_shared_workflow``) can serve any number of concurrent ``run()``
+    calls. Strategies can be injected for testing; by default every
+    instance reuses the process-wide provider clients.
+    """
 
-    def __init__(self):
-        self.openai = OpenAIStrategy()
-        self.grok = GrokStrategy()
+    # Label for the workflow_node_* metrics
+    workflow_name = "bitcoin_news"
+
+    def __init__(self, openai: Optional[LLMStrategy] = None,
+                 grok: Optional[LLMStrategy] = None,
+                 cache: Optional[LLMResponseCache] = None,
+                 checkpointer: Optional[BaseCheckpointSaver] = None,
+                 fused: Optional[bool] = None):
+        if openai is None or grok is None:
+            default_openai, default_grok = get_default_strategies()
+            openai = openai or default_openai
+            grok = grok or default_grok
+        self.openai = openai
+        self.grok = grok
+        if cache is not None:
+            # One cache shared by both providers; keys include the provider
+            self.openai = CachedLLMStrategy(self.openai, cache)
+            self.grok = CachedLLMStrategy(self.grok, cache)
+        # One structured call instead of separate summarize + sentiment calls
+        self.fused = fused_analysis_enabled() if fused is None else fused
+        # Bounded retention; SQLite-backed when WORKFLOW_CHECKPOINT_DB is set
+        self.checkpointer = checkpointer or create_checkpointer()
         self.graph = self._build_graph()
 
     def _build_graph(self) -> StateGraph:
@@ -20,77 +164,229 @@ class BitcoinNewsWorkflow:
         workflow = StateGraph(BitcoinNewsState)
 
         # Add nodes
-        workflow.add_node("web_search", self._web_search_node)
-        workflow.add_node("summarize", self._summarize_node)
-        workflow.add_node("sentiment", self._sentiment_node)
+        workflow.add_node("web_search",
+                          self._instrumented("web_search", self._web_search_node))
+        if self.fused:
+            workflow.add_node("analyze",
+                              self._instrumented("analyze", self._analyze_node))
+        else:
+            workflow.add_node("summarize",
+                              self._instrumented("summarize", self._summarize_node))
+            workflow.add_node("sentiment",
+                              self._instrumented("sentiment", self._sentiment_node))
 
         # Add edges
-        workflow.add_edge("web_search", "summarize")
-        workflow.add_edge("summarize", "sentiment")
-        workflow.add_edge("sentiment", END)
+        if self.fused:
+            workflow.add_edge("web_search", "analyze")
+            workflow.add_edge("analyze", END)
+        else:
+            workflow.add_edge("web_search", "summarize")
+            workflow.add_edge("summarize", "sentiment")
+            workflow.add_edge("sentiment", END)
 
         # Set entry point
         workflow.set_entry_point("web_search")
 
-        return workflow.compile(checkpointer=MemorySaver())
+        return workflow.compile(checkpointer=self.checkpointer)
+
+    def _instrumented(self, node: str,
+                      fn: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        """Wrap a node to record its wall time, queue wait and LLM usage
+
+        The totals are exported as workflow_node_* metrics and written to
+        the run state's ``node_metrics`` under the node name.
+        """
+        async def run(state: Any, config: Optional[RunnableConfig] = None) -> Any:
+            # Do not start work the run no longer has time for
+            check_deadline(f"Workflow node '{node}'")
+            started = time.perf_counter()
+            # Fan-out branches carry their dispatch time; the gap is time
+            # spent behind the concurrency cap before starting
+            dispatched_at = getattr(state, "dispatched_at", None)
+            scheduled_wait = (max(0.0, time.time() - dispatched_at)
+                              if dispatched_at is not None else 0.0)
+            error = False
+            with collect_usage() as usage:
+                try:
+                    result = await fn(state, config)
+                except Exception:
+                    error = True
+                    raise
+                finally:
+                    usage.wall_time = time.perf_counter() - started
+                    usage.queue_wait += scheduled_wait
+                    record_node(self.workflow_name, node, usage, error=error)
+
+            metrics = {node: usage.model_dump()}
+            if isinstance(result, BaseModel):
+                # Only this node's entry; the state reducer merges it in
+                result.node_metrics = metrics
+                return result
+            return {**result, "node_metrics": metrics}
+        return run
+
+    @staticmethod
+    def _streaming(config: Optional[RunnableConfig]) -> bool:
+        """Whether the run was started by stream_events()"""
+        return bool((config or {}).get("configurable", {}).get("stream_tokens"))
+
+    def _emit(self, config: Optional[RunnableConfig], event: str, node: str,
+              data: Any = None) -> None:
+        """Write a custom stream event when streaming"""
+        if self._streaming(config):
+            get_stream_writer()({"event": event, "node": node, "data": data})
+
+    async def _generate(self, strategy, prompt: str, node: str,
+                        config: Optional[RunnableConfig],
+                        options: Optional[Dict[str, Any]] = None) -> str:
+        """Query a strategy, streaming tokens out when the run is streamed"""
+        if not self._streaming(config):
+            return await strategy.query(prompt, options)
 
-    async def _web_search_node(self, 
-                              state: BitcoinNewsState) -> BitcoinNewsState:
+        chunks = []
+        async for token in strategy.query_stream(prompt, options):
+            chunks.append(token)
+            self._emit(config, "token", node, token)
+        return "".join(chunks)
+
+    async def _generate_json(self, strategy, prompt: str, schema: Dict[str, Any],
+                             name: str, node: str,
+                             config: Optional[RunnableConfig],
+                             options: Optional[Dict[str, Any]] = None) -> Any:
+        """Structured query; streamed runs emit tokens and parse incrementally"""
+        if not self._streaming(config):
+            return await strategy.query_json(prompt, schema, name=name, options=options)
+
+        extractor = IncrementalJSONExtractor()
+        async for token in strategy.query_stream(
+                prompt, strategy.structured_options(schema, name=name, options=options)):
+            self._emit(config, "token", node, token)
+            extractor.feed(token)
+        if not extractor.done:
+            raise ValueError("No JSON value found in response")
+        return validate_schema(extractor.value, schema)
+
+    async def _analyze(self, headline: str, node: str,
+                       config: Optional[RunnableConfig]) -> Tuple[str, Dict[str, Any]]:
+        """Summary and sentiment of a headline from one structured call"""
+        try:
+            result = await self._generate_json(self.openai, analysis_prompt(headline),
+                                               NEWS_ANALYSIS_SCHEMA, "news_analysis",
+                                               node, config, SUMMARIZE_TASK)
+        except ValueError as e:
+            raise ValueError(f"Invalid news analysis format: {e}")
+        return result["summary"], {"analysis": result["analysis"],
+                                   "reasoning": result["reasoning"]}
+
+    async def _web_search_node(self, state: BitcoinNewsState,
+                              config: Optional[RunnableConfig] = None
+                              ) -> BitcoinNewsState:
         """Web search node with real-time web search"""
+        self._emit(config, "node_start", "web_search")
         prompt = ("Find the latest Bitcoin news headline from today. "
                   "Return only the headline text.")
         state.headline = await self.openai.query_with_web_search(prompt)
         return state
 
-    async def _summarize_node(self, 
-                             state: BitcoinNewsState) -> BitcoinNewsState:
+    async def _summarize_node(self, state: BitcoinNewsState,
+                             config: Optional[RunnableConfig] = None
+                             ) -> BitcoinNewsState:
         """Summarize node"""
+        self._emit(config, "node_start", "summarize")
         if not state.headline:
             raise ValueError("Cannot summarize: headline is missing")
 
         prompt = f'Summarize this Bitcoin news headline: "{state.headline}"'
-        state.summary = await self.grok.query(prompt)
+        state.summary = await self._generate(self.grok, prompt, "summarize", config,
+                                            SUMMARIZE_TASK)
         return state
 
-    async def _sentiment_node(self, 
-                             state: BitcoinNewsState) -> BitcoinNewsState:
+    async def _sentiment_node(self, state: BitcoinNewsState,
+                             config: Optional[RunnableConfig] = None
+                             ) -> BitcoinNewsState:
         """Sentiment analysis node"""
+        self._emit(config, "node_start", "sentiment")
         if not state.summary:
             raise ValueError("Cannot analyze sentiment: summary is missing")
 
-        prompt = (f'Analyze the sentiment of this Bitcoin news summary: '
-                  f'"{state.summary}". Respond in JSON: '
-                  f'{{ "analysis": "bullish" | "bearish" | "neutral", '
-                  f'"reasoning": "string" }}')
-        response = await self.openai.query(prompt)
+        prompt = sentiment_prompt(state.summary)
+        response = await self._generate(self.openai, prompt, "sentiment", config,
+                                        CLASSIFY_TASK)
 
-        # Parse JSON response - handle markdown code blocks
-        try:
-            # Strip markdown code blocks if present
-            if response.startswith('```json'):
-                response = (response.replace('```json', '')
-                          .replace('```', '').strip())
-            elif response.startswith('```'):
-                response = response.replace('```', '').strip()
-
-            sentiment = json.loads(response)
-        except json.JSONDecodeError:
-            raise ValueError("Invalid sentiment analysis format")
-
-        if (not sentiment or "analysis" not in sentiment or
-                "reasoning" not in sentiment):
-            raise ValueError("Invalid sentiment analysis format")
-
-        state.sentiment = sentiment
+        state.sentiment = parse_sentiment(response)
         state.end_time = datetime.now()
         return state
 
-    async def run(self) -> BitcoinNewsState:
-        """Run the workflow with a unique thread_id for checkpointing"""
-        initial_state = BitcoinNewsState()
-        thread_id = str(uuid4())  # Generate a unique thread/session ID
-        # Pass thread_id in the config dict as required by LangGraph checkpointer
-        result = await self.graph.ainvoke(
-            initial_state, config={"configurable": {"thread_id": thread_id}}
+    def _initial_state(self) -> BitcoinNewsState:
+        """Input state for a fresh run"""
+        return BitcoinNewsState()
+
+    def _config(self, thread_id: str, **configurable: Any) -> RunnableConfig:
+        """Per-run LangGraph config"""
+        return {"configurable": {"thread_id": thread_id, **configurable}}
+
+    async def _analyze_node(self, state: BitcoinNewsState,
+                           config: Optional[RunnableConfig] = None
+                           ) -> BitcoinNewsState:
+        """Fused summarize + sentiment node (one structured-output call)"""
+        self._emit(config, "node_start", "analyze")
+        if not state.headline:
+            raise ValueError("Cannot analyze: headline is missing")
+
+        state.summary, state.sentiment = await self._analyze(
+            state.headline, "analyze", config)
+        state.end_time = datetime.now()
+        return state
+
+    async def run(self, thread_id: Optional[str] = None,
+                  deadline: Optional[float] = None) -> BitcoinNewsState:
+        """Run the workflow with a unique thread_id for checkpointing
+
+        Passing the thread_id of an interrupted run resumes it from its last
+        checkpoint, so completed nodes (and their LLM calls) are not repeated.
+        ``deadline`` (seconds, default WORKFLOW_DEADLINE_SECONDS) bounds the
+        whole run: every node and LLM call sees the remaining budget.
+        """
+        config = self._config(thread_id or str(uuid4()))
+        with deadline_scope(deadline if deadline is not None else default_deadline()):
+            if thread_id is not None:
+                snapshot = await self.graph.aget_state(config)
+                if snapshot.next:
+                    return await self.graph.ainvoke(None, config=config)
+            # Pass thread_id in the config dict as required by LangGraph checkpointer
+            return await self.graph.ainvoke(self._initial_state(), config=config)
+
+    def close(self) -> None:
+        """Flush buffered checkpoint writes"""
+        if isinstance(self.checkpointer, SQLiteCheckpointSaver):
+            self.checkpointer.flush()
+
+    async def stream_events(self, deadline: Optional[float] = None
+                            ) -> AsyncIterator[Dict[str, Any]]:
+        """Run the workflow, yielding node-level and token-level events
+
+        Events are dicts with ``event`` (node_start, token, node_end, done),
+        ``node`` and ``data``. The final ``done`` event carries the full
+        result state. ``deadline`` works as in ``run()``.
+        """
+        config = self._config(str(uuid4()), stream_tokens=True)
+        stream = self.graph.astream(
+            self._initial_state(), config=config, stream_mode=["custom", "updates"]
         )
-        return result
+        # Graph tasks inherit the deadline from the context that starts
+        # them, so it is bound around each step rather than across yields
+        bound = resolve_deadline(deadline if deadline is not None else default_deadline())
+        while True:
+            with bind_deadline(bound):
+                try:
+                    mode, chunk = await stream.__anext__()
+                except StopAsyncIteration:
+                    break
+            if mode == "custom":
+                yield chunk
+                continue
+            for node, update in chunk.items():
+                yield {"event": "node_end", "node": node, "data": update}
+
+        snapshot = await self.graph.aget_state(config)
+        yield {"event": "done", "node": None, "data": snapshot.values}
@@ -0,0 +1,191 @@
+"""
+Bitcoin News Digest Workflow
+File: python/workflows/bitcoin_news_digest.py
+Purpose: Fan-out/fan-in variant of the news graph that analyzes the top N headlines in parallel
+Related components: bitcoin_news.py, state.py, checkpoint.py
+Tags: workflows, langgraph, fan-out, sentiment, parallel
+"""
+
+import re
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from langgraph.graph import StateGraph, END
+from langgraph.types import Send
+from langchain_core.runnables import RunnableConfig
+from .bitcoin_news import (
+    CLASSIFY_TASK,
+    SUMMARIZE_TASK,
+    BitcoinNewsWorkflow,
+    parse_sentiment,
+    sentiment_prompt
+)
+from .state import BitcoinNewsDigestState, HeadlineTask
+
+
+# Score contributed by each sentiment label
+SENTIMENT_SCORES = {"bullish": 1.0, "neutral": 0.0, "bearish": -1.0}
+
+# |score| below this is reported as neutral
+NEUTRAL_BAND = 0.2
+
+_LIST_MARKER = re.compile(r'^\s*(?:[-*•]|\d+[.)])\s*')
+
+
+def parse_headlines(response: str, limit: int) -> List[str]:
+    """Split a one-headline-per-line response, dropping list markers and duplicates"""
+    headlines: List[str] = []
+    for line in response.splitlines():
+        headline = _LIST_MARKER.sub("", line).strip().strip('"').strip()
+        if headline and headline not in headlines:
+            headlines.append(headline)
+    return headlines[:limit]
+
+
+def aggregate_sentiment(analyses: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine per-headline verdicts into a rank-weighted score in [-1, 1]
+
+    Headline ``rank`` 1 is the most prominent story and gets weight 1,
+    rank 2 gets 1/2 and so on. Failed branches are excluded.
+    """
+    total = 0.0
+    weights = 0.0
+    for item in analyses:
+        sentiment = item.get("sentiment")
+        if not sentiment:
+            continue
+        weight = 1.0 / item["rank"]
+        total += weight * SENTIMENT_SCORES.get(
+            str(sentiment.get("analysis", "")).lower(), 0.0)
+        weights += weight
+
+    if not weights:
+        raise ValueError("Cannot aggregate sentiment: every headline failed")
+
+    score = total / weights
+    if score >= NEUTRAL_BAND:
+        analysis = "bullish"
+    elif score <= -NEUTRAL_BAND:
+        analysis = "bearish"
+    else:
+        analysis = "neutral"
+    return {
+        "score": round(score, 4),
+        "analysis": analysis,
+        "headlines": sum(1 for item in analyses if item.get("sentiment")),
+        "failed": sum(1 for item in analyses if item.get("error"))
+    }
+
+
+class BitcoinNewsDigestWorkflow(BitcoinNewsWorkflow):
+    """Analyze the top ``headlines`` stories in parallel branches
+
+    ``web_search`` fetches the headlines, one ``analyze_headline`` branch
+    per headline runs summarize + sentiment, and ``aggregate`` folds the
+    results into a weighted market-sentiment score. At most
+    ``max_concurrency`` branches run at once, so with a cap >= N the
+    wall-clock time stays close to a single-headline run.
+    """
+
+    workflow_name = "bitcoin_news_digest"
+
+    def __init__(self, headlines: int = 5, max_concurrency: int = 5, **kwargs):
+        if headlines < 1 or max_concurrency < 1:
+            raise ValueError("headlines and max_concurrency must be positive")
+        self.headlines = headlines
+        self.max_concurrency = max_concurrency
+        super().__init__(**kwargs)
+
+    def _build_graph(self) -> StateGraph:
+        """Build the fan-out/fan-in LangGraph workflow"""
+        workflow = StateGraph(BitcoinNewsDigestState)
+
+        # Add nodes
+        workflow.add_node("web_search",
+                          self._instrumented("web_search", self._web_search_node))
+        workflow.add_node("analyze_headline",
+                          self._instrumented("analyze_headline",
+                                             self._analyze_headline_node),
+                          input_schema=HeadlineTask)
+        workflow.add_node("aggregate",
+                          self._instrumented("aggregate", self._aggregate_node))
+
+        # Add edges: one branch per headline, joined at aggregate
+        workflow.add_conditional_edges("web_search", self._fan_out,
+                                       ["analyze_headline"])
+        workflow.add_edge("analyze_headline", "aggregate")
+        workflow.add_edge("aggregate", END)
+
+        # Set entry point
+        workflow.set_entry_point("web_search")
+
+        return workflow.compile(checkpointer=self.checkpointer)
+
+    def _initial_state(self) -> BitcoinNewsDigestState:
+        """Input state for a fresh run"""
+        return BitcoinNewsDigestState()
+
+    def _config(self, thread_id: str, **configurable: Any) -> RunnableConfig:
+        """Per-run LangGraph config, capping parallel branches"""
+        config = super()._config(thread_id, **configurable)
+        config["max_concurrency"] = self.max_concurrency
+        return config
+
+    @staticmethod
+    def _fan_out(state: BitcoinNewsDigestState) -> List[Send]:
+        """Dispatch one analyze_headline branch per headline"""
+        now = time.time()
+        return [Send("analyze_headline",
+                     HeadlineTask(rank=rank, headline=headline, dispatched_at=now))
+                for rank, headline in enumerate(state.headlines, start=1)]
+
+    async def _web_search_node(self, state: BitcoinNewsDigestState,
+                              config: Optional[RunnableConfig] = None
+                              ) -> Dict[str, Any]:
+        """Web search node returning the top headlines"""
+        self._emit(config, "node_start", "web_search")
+        prompt = (f"Find the top {self.headlines} Bitcoin news headlines from "
+                  f"today, most important first. Return only the headline "
+                  f"texts, one per line.")
+        response = await self.openai.query_with_web_search(prompt)
+        headlines = parse_headlines(response or "", self.headlines)
+        if not headlines:
+            raise ValueError("Cannot analyze news: no headlines found")
+        return {"headlines": headlines}
+
+    async def _analyze_headline_node(self, task: HeadlineTask,
+                                     config: Optional[RunnableConfig] = None
+                                     ) -> Dict[str, Any]:
+        """Summarize + sentiment for one headline (one call when fused)
+
+        Errors are recorded on the entry rather than raised so one bad
+        headline does not fail the whole digest.
+        """
+        node = f"analyze_headline[{task.rank}]"
+        self._emit(config, "node_start", node)
+        item: Dict[str, Any] = {"rank": task.rank, "headline": task.headline}
+        try:
+            if self.fused:
+                item["summary"], item["sentiment"] = await self._analyze(
+                    task.headline, node, config)
+            else:
+                prompt = f'Summarize this Bitcoin news headline: "{task.headline}"'
+                item["summary"] = await self._generate(self.grok, prompt, node, config,
+                                                       SUMMARIZE_TASK)
+                response = await self._generate(
+                    self.openai, sentiment_prompt(item["summary"]), node, config,
+                    CLASSIFY_TASK)
+                item["sentiment"] = parse_sentiment(response)
+        except Exception as e:
+            item["error"] = str(e)
+        return {"analyses": [item]}
+
+    async def _aggregate_node(self, state: BitcoinNewsDigestState,
+                             config: Optional[RunnableConfig] = None
+                             ) -> Dict[str, Any]:
+        """Fold the per-headline verdicts into one market-sentiment score"""
+        self._emit(config, "node_start", "aggregate")
+        return {
+            "market_sentiment": aggregate_sentiment(state.analyses),
+            "end_time": datetime.now()
+        }
@@ -0,0 +1,424 @@
+"""
+Bounded LangGraph checkpointers
+File: python/workflows/checkpoint.py
+Purpose: Checkpoint savers with thread retention (max threads, max age, LRU)
+    and an optional SQLite/WAL on-disk mode with batched writes
+Related components: bitcoin_news.py
+Tags: workflows, langgraph, checkpoint, retention, sqlite
+"""
+
+import asyncio
+import functools
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata
+)
+from langgraph.checkpoint.memory import MemorySaver
+from pydantic import BaseModel
+
+
+class RetentionPolicy(BaseModel):
+    """Limits on how many checkpoint threads are kept and for how long"""
+    max_threads: Optional[int] = 1000
+    max_age_seconds: Optional[float] = 24 * 3600
+
+    @classmethod
+    def from_env(cls) -> "RetentionPolicy":
+        """Build a policy from WORKFLOW_CHECKPOINT_* environment variables"""
+        max_threads = os.getenv("WORKFLOW_CHECKPOINT_MAX_THREADS", "1000")
+        max_age = os.getenv("WORKFLOW_CHECKPOINT_MAX_AGE", str(24 * 3600))
+        return cls(
+            max_threads=int(max_threads) if max_threads else None,
+            max_age_seconds=float(max_age) if max_age else None
+        )
+
+
+class BoundedMemorySaver(MemorySaver):
+    """In-memory checkpointer that evicts least recently used threads
+
+    A thread is "used" when a checkpoint is written or read for it. Beyond
+    ``max_threads`` the least recently used thread is dropped, and threads
+    idle for longer than ``max_age_seconds`` are dropped on the next write.
+    """
+
+    def __init__(self, policy: Optional[RetentionPolicy] = None,
+                 clock: Callable[[], float] = time.monotonic, **kwargs):
+        super().__init__(**kwargs)
+        self.policy = policy or RetentionPolicy()
+        self.evictions = 0
+        self._clock = clock
+        self._threads: "OrderedDict[str, float]" = OrderedDict()
+        self._retention_lock = threading.Lock()
+
+    @property
+    def thread_count(self) -> int:
+        """Number of threads currently retained"""
+        return len(self._threads)
+
+    def _touch(self, thread_id: str) -> None:
+        with self._retention_lock:
+            self._threads[thread_id] = self._clock()
+            self._threads.move_to_end(thread_id)
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        result = super().get_tuple(config)
+        if result is not None:
+            self._touch(config["configurable"]["thread_id"])
+        return result
+
+    def put(self, config: RunnableConfig, checkpoint: Checkpoint,
+            metadata: CheckpointMetadata,
+            new_versions: ChannelVersions) -> RunnableConfig:
+        result = super().put(config, checkpoint, metadata, new_versions)
+        thread_id = config["configurable"]["thread_id"]
+        self._touch(thread_id)
+        self._enforce_retention(keep=thread_id)
+        return result
+
+    def delete_thread(self, thread_id: str) -> None:
+        super().delete_thread(thread_id)
+        with self._retention_lock:
+            self._threads.pop(thread_id, None)
+
+    def _enforce_retention(self, keep: str) -> None:
+        """Evict threads over the count limit or past the age limit"""
+        expired: List[str] = []
+        with self._retention_lock:
+            now = self._clock()
+            excess = len(self._threads) - (self.policy.max_threads or len(self._threads))
+            for thread_id, touched in self._threads.items():
+                if thread_id == keep:
+                    continue
+                too_old = (self.policy.max_age_seconds is not None and
+                           now - touched > self.policy.max_age_seconds)
+                if excess > 0 or too_old:
+                    expired.append(thread_id)
+                    excess -= 1
+                elif excess <= 0:
+                    break  # remaining threads are newer
+        for thread_id in expired:
+            self.delete_thread(thread_id)
+            self.evictions += 1
+
+
+class SQLiteCheckpointSaver(BaseCheckpointSaver):
+    """SQLite (WAL mode) checkpointer with batched writes and retention
+
+    Writes are buffered and committed in one transaction when a super-step
+    ends (``put`` of its checkpoint), once ``batch_size`` operations are
+    pending, or at the latest ``flush_interval`` seconds after the oldest
+    buffered write (a background timer, so a crash between runs loses
+    nothing). Reads flush first so they always see the latest state.
+    Memory use is bounded by the batch buffer, not by run count. The async
+    API runs on one worker thread, off the event loop but in call order, so
+    a step's writes still commit with its checkpoint.
+    """
+
+    def __init__(self, path: str, policy: Optional[RetentionPolicy] = None,
+                 batch_size: int = 32, flush_interval: float = 1.0,
+                 clock: Callable[[], float] = time.time, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.policy = policy or RetentionPolicy()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.evictions = 0
+        self._clock = clock
+        self._pending: List[Tuple[str, tuple]] = []
+        self._pending_since: Optional[float] = None
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.RLock()
+        self._executor = ThreadPoolExecutor(max_workers=1,
+                                            thread_name_prefix="checkpoint")
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                thread_id TEXT NOT NULL,
+                checkpoint_ns TEXT NOT NULL DEFAULT '',
+                checkpoint_id TEXT NOT NULL,
+                parent_checkpoint_id TEXT,
+                type TEXT,
+                checkpoint BLOB,
+                metadata_type TEXT,
+                metadata BLOB,
+                PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+            );
+            CREATE TABLE IF NOT EXISTS writes (
+                thread_id TEXT NOT NULL,
+                checkpoint_ns TEXT NOT NULL DEFAULT '',
+                checkpoint_id TEXT NOT NULL,
+                task_id TEXT NOT NULL,
+                idx INTEGER NOT NULL,
+                channel TEXT NOT NULL,
+                type TEXT,
+                value BLOB,
+                task_path TEXT NOT NULL DEFAULT '',
+                PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+            );
+            CREATE TABLE IF NOT EXISTS threads (
+                thread_id TEXT PRIMARY KEY,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_threads_updated ON threads (updated_at);
+            """
+        )
+        self._db.commit()
+
+    # -- batching -----------------------------------------------------------
+
+    def _enqueue(self, sql: str, params: tuple) -> None:
+        with self._lock:
+            self._pending.append((sql, params))
+            if self._pending_since is None:
+                self._pending_since = self._clock()
+            if (len(self._pending) >= self.batch_size or
+                    self._clock() - self._pending_since >= self.flush_interval):
+                self.flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        """Commit buffered writes in a single transaction and apply retention"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, []
+            self._pending_since = None
+            with self._db:
+                for sql, params in pending:
+                    self._db.execute(sql, params)
+                self._enforce_retention()
+
+    def close(self) -> None:
+        """Flush and close the database"""
+        with self._lock:
+            self.flush()
+            self._db.close()
+        self._executor.shutdown(wait=False)
+
+    def _enforce_retention(self) -> None:
+        """Delete threads beyond the count limit or older than the age limit"""
+        expired: List[str] = []
+        if self.policy.max_age_seconds is not None:
+            cutoff = self._clock() - self.policy.max_age_seconds
+            expired += [row[0] for row in self._db.execute(
+                "SELECT thread_id FROM threads WHERE updated_at < ?", (cutoff,))]
+        if self.policy.max_threads is not None:
+            expired += [row[0] for row in self._db.execute(
+                "SELECT thread_id FROM threads ORDER BY updated_at DESC "
+                "LIMIT -1 OFFSET ?", (self.policy.max_threads,))]
+        for thread_id in set(expired):
+            self._delete_rows(thread_id)
+            self.evictions += 1
+
+    def _delete_rows(self, thread_id: str) -> None:
+        for table in ("checkpoints", "writes", "threads"):
+            self._db.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+
+    # -- BaseCheckpointSaver API --------------------------------------------
+
+    def put(self, config: RunnableConfig, checkpoint: Checkpoint,
+            metadata: CheckpointMetadata,
+            new_versions: ChannelVersions) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        type_, serialized = self.serde.dumps_typed(checkpoint)
+        metadata_type, serialized_metadata = self.serde.dumps_typed(
+            get_checkpoint_metadata(config, metadata))
+        self._enqueue(
+            "INSERT OR REPLACE INTO checkpoints (thread_id, checkpoint_ns, "
+            "checkpoint_id, parent_checkpoint_id, type, checkpoint, "
+            "metadata_type, metadata) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (thread_id, checkpoint_ns, checkpoint["id"],
+             config["configurable"].get("checkpoint_id"), type_, serialized,
+             metadata_type, serialized_metadata)
+        )
+        self._enqueue(
+            "INSERT OR REPLACE INTO threads (thread_id, updated_at) VALUES (?, ?)",
+            (thread_id, self._clock())
+        )
+        # A checkpoint closes a super-step: commit it with the step's writes
+        self.flush()
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]],
+                   task_id: str, task_path: str = "") -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        for idx, (channel, value) in enumerate(writes):
+            write_idx = WRITES_IDX_MAP.get(channel, idx)
+            # Special channels (errors, interrupts) overwrite; others are idempotent
+            verb = "INSERT OR REPLACE" if channel in WRITES_IDX_MAP else "INSERT OR IGNORE"
+            type_, serialized = self.serde.dumps_typed(value)
+            self._enqueue(
+                f"{verb} INTO writes (thread_id, checkpoint_ns, checkpoint_id, "
+                "task_id, idx, channel, type, value, task_path) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (thread_id, checkpoint_ns, checkpoint_id, task_id, write_idx,
+                 channel, type_, serialized, task_path)
+            )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config)
+        with self._lock:
+            self.flush()
+            if checkpoint_id:
+                row = self._db.execute(
+                    "SELECT checkpoint_id, parent_checkpoint_id, type, checkpoint, "
+                    "metadata_type, metadata FROM checkpoints WHERE thread_id = ? "
+                    "AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id)
+                ).fetchone()
+            else:
+                row = self._db.execute(
+                    "SELECT checkpoint_id, parent_checkpoint_id, type, checkpoint, "
+                    "metadata_type, metadata FROM checkpoints WHERE thread_id = ? "
+                    "AND checkpoint_ns = ? ORDER BY checkpoint_id DESC LIMIT 1",
+                    (thread_id, checkpoint_ns)
+                ).fetchone()
+            if row is None:
+                return None
+            return self._to_tuple(thread_id, checkpoint_ns, row)
+
+    def list(self, config: Optional[RunnableConfig], *,
+             filter: Optional[Dict[str, Any]] = None,
+             before: Optional[RunnableConfig] = None,
+             limit: Optional[int] = None) -> Iterator[CheckpointTuple]:
+        clauses, params = [], []
+        if config is not None:
+            clauses.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            checkpoint_ns = config["configurable"].get("checkpoint_ns")
+            if checkpoint_ns is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            if get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(get_checkpoint_id(config))
+        if before is not None and get_checkpoint_id(before):
+            clauses.append("checkpoint_id < ?")
+            params.append(get_checkpoint_id(before))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._lock:
+            self.flush()
+            rows = self._db.execute(
+                "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+                f"type, checkpoint, metadata_type, metadata FROM checkpoints {where} "
+                "ORDER BY checkpoint_id DESC", params
+            ).fetchall()
+            results = []
+            for row in rows:
+                item = self._to_tuple(row[0], row[1], row[2:])
+                if filter and not all(item.metadata.get(k) == v
+                                      for k, v in filter.items()):
+                    continue
+                results.append(item)
+                if limit is not None and len(results) >= limit:
+                    break
+        yield from results
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            self.flush()
+            with self._db:
+                self._delete_rows(thread_id)
+
+    def _to_tuple(self, thread_id: str, checkpoint_ns: str, row: tuple) -> CheckpointTuple:
+        """Deserialize a checkpoint row and attach its pending writes"""
+        checkpoint_id, parent_id, type_, blob, metadata_type, metadata = row
+        writes = self._db.execute(
+            "SELECT task_id, channel, type, value FROM writes WHERE thread_id = ? "
+            "AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id)
+        ).fetchall()
+        return CheckpointTuple(
+            config={"configurable": {"thread_id": thread_id,
+                                     "checkpoint_ns": checkpoint_ns,
+                                     "checkpoint_id": checkpoint_id}},
+            checkpoint=self.serde.loads_typed((type_, blob)),
+            metadata=self.serde.loads_typed((metadata_type, metadata)),
+            parent_config=({"configurable": {"thread_id": thread_id,
+                                             "checkpoint_ns": checkpoint_ns,
+                                             "checkpoint_id": parent_id}}
+                           if parent_id else None),
+            pending_writes=[(task_id, channel, self.serde.loads_typed((t, v)))
+                            for task_id, channel, t, v in writes]
+        )
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args))
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await self._run(self.get_tuple, config)
+
+    async def alist(self, config: Optional[RunnableConfig], *,
+                    filter: Optional[Dict[str, Any]] = None,
+                    before: Optional[RunnableConfig] = None,
+                    limit: Optional[int] = None) -> AsyncIterator[CheckpointTuple]:
+        items = await self._run(lambda: list(self.list(config, filter=filter,
+                                                       before=before, limit=limit)))
+        for item in items:
+            yield item
+
+    async def aput(self, config: RunnableConfig, checkpoint: Checkpoint,
+                   metadata: CheckpointMetadata,
+                   new_versions: ChannelVersions) -> RunnableConfig:
+        return await self._run(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config: RunnableConfig,
+                          writes: Sequence[Tuple[str, Any]], task_id: str,
+                          task_path: str = "") -> None:
+        await self._run(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await self._run(self.delete_thread, thread_id)
+
+
+def create_checkpointer() -> BaseCheckpointSaver:
+    """Build the workflow checkpointer from the environment
+
+    Uses SQLite when WORKFLOW_CHECKPOINT_DB is set, otherwise a bounded
+    in-memory saver. Both apply the same retention policy.
+    """
+    policy = RetentionPolicy.from_env()
+    db_path = os.getenv("WORKFLOW_CHECKPOINT_DB")
+    if db_path:
+        return SQLiteCheckpointSaver(db_path, policy=policy)
+    return BoundedMemorySaver(policy=policy)
@@ -0,0 +1,109 @@
+"""
+Trigger-driven DCA Workflow
+File: python/workflows/dca.py
+Purpose: LangGraph DCA graph whose entry node checks the trigger index, then evaluates strategies and sizes buys for the fired triggers only
+Related components: triggers.py (TriggerIndex), state.py (DCAState), strategies/engine.py (evaluate_batch, calculate_dca_amount)
+Tags: workflows, dca, triggers, langgraph, strategies
+"""
+
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+from langgraph.graph import StateGraph, END
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langchain_core.runnables import RunnableConfig
+from ..strategies import calculate_dca_amount, days_since_genesis, evaluate_batch
+from ..strategies.base import HistoricalData
+from .state import DCADecision, DCAState
+from .scheduler import utc_now
+from .triggers import TriggerIndex
+
+
+class DCAWorkflow:
+    """check_triggers -> evaluate_strategy -> calculate_dca_amount, once per tick
+
+    The entry node asks the TriggerIndex which triggers the tick fired,
+    so the cost of a run follows the number of fired triggers rather than
+    the number registered; a tick that fires nothing ends there. Fired
+    triggers are evaluated in one batch per strategy against the history
+    returned by ``history`` (flat DCA when there is none).
+    """
+
+    def __init__(self, index: Optional[TriggerIndex] = None,
+                 history: Optional[Callable[[], HistoricalData]] = None,
+                 checkpointer: Optional[BaseCheckpointSaver] = None):
+        self.index = index or TriggerIndex()
+        self.history = history or (lambda: None)
+        self.checkpointer = checkpointer
+        self.graph = self._build_graph()
+
+    def _build_graph(self) -> StateGraph:
+        """Build the LangGraph workflow"""
+        workflow = StateGraph(DCAState)
+
+        # Add nodes
+        workflow.add_node("check_triggers", self._check_triggers_node)
+        workflow.add_node("evaluate_strategy", self._evaluate_strategy_node)
+        workflow.add_node("calculate_dca_amount", self._calculate_dca_amount_node)
+
+        # Add edges
+        workflow.add_conditional_edges(
+            "check_triggers",
+            lambda state: "evaluate_strategy" if state.triggers else END,
+            ["evaluate_strategy", END]
+        )
+        workflow.add_edge("evaluate_strategy", "calculate_dca_amount")
+        workflow.add_edge("calculate_dca_amount", END)
+
+        # Set entry point
+        workflow.set_entry_point("check_triggers")
+
+        return workflow.compile(checkpointer=self.checkpointer)
+
+    async def _check_triggers_node(self, state: DCAState,
+                                   config: Optional[RunnableConfig] = None) -> DCAState:
+        """Collect the triggers fired by this tick's price, balances and time"""
+        state.triggers = self.index.check_triggers(state.price, state.balances,
+                                                   state.tick_time)
+        if not state.triggers:
+            state.end_time = datetime.now()
+        return state
+
+    async def _evaluate_strategy_node(self, state: DCAState,
+                                      config: Optional[RunnableConfig] = None) -> DCAState:
+        """Evaluate every fired trigger's strategy in one batch"""
+        # Schedule and balance ticks may carry no price; use the last one seen
+        price = state.price if state.price is not None else self.index.price
+        batch = evaluate_batch([t.strategy_id for t in state.triggers],
+                               price if price is not None else float("nan"),
+                               self.history(), days_since_genesis(state.tick_time))
+        state.decisions = [
+            DCADecision(trigger_id=trigger.trigger_id, user_id=trigger.user_id,
+                        strategy_id=result.strategy_id, action=result.action,
+                        multiplier=result.multiplier, fallback=result.fallback)
+            for trigger, result in zip(state.triggers, batch.results())
+        ]
+        return state
+
+    async def _calculate_dca_amount_node(self, state: DCAState,
+                                         config: Optional[RunnableConfig] = None) -> DCAState:
+        """Size each buy from the trigger's base amount and the strategy multiplier"""
+        base_amounts: Dict[str, float] = {t.trigger_id: t.base_amount for t in state.triggers}
+        for decision in state.decisions:
+            if decision.action == "buy":
+                decision.amount = calculate_dca_amount(base_amounts[decision.trigger_id],
+                                                       decision.multiplier)
+        state.end_time = datetime.now()
+        return state
+
+    async def run(self, price: Optional[float] = None,
+                  balances: Optional[Dict[str, float]] = None,
+                  now: Optional[datetime] = None,
+                  thread_id: str = "dca") -> DCAState:
+        """Run the graph for one tick and return its final state"""
+        tick_time = now or utc_now()
+        if tick_time.tzinfo is None:
+            tick_time = tick_time.replace(tzinfo=timezone.utc)
+        state = DCAState(price=price, balances=balances or {}, tick_time=tick_time)
+        config = {"configurable": {"thread_id": thread_id}}
+        result = await self.graph.ainvoke(state, config=config)
+        return DCAState.model_validate(result)
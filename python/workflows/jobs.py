@@ -0,0 +1,172 @@
+"""
+Workflow Job Queue
+File: python/workflows/jobs.py
+Purpose: Bounded asyncio worker pool that runs workflow jobs in the API process
+Related components: main.py (job endpoints), bitcoin_news.py
+Tags: workflows, jobs, queue, worker-pool, back-pressure
+"""
+
+import asyncio
+import os
+from collections import OrderedDict
+from datetime import datetime
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from uuid import uuid4
+from pydantic import BaseModel, Field
+from ..llm.metrics import get_registry
+
+
+class JobStatus(str, Enum):
+    """Lifecycle states of a workflow job"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class WorkflowJob(BaseModel):
+    """A queued or completed workflow run"""
+    id: str = Field(default_factory=lambda: str(uuid4()))
+    workflow: str
+    status: JobStatus = JobStatus.QUEUED
+    created_at: datetime = Field(default_factory=datetime.now)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue is at capacity"""
+
+
+WorkflowRunner = Callable[[], Awaitable[Any]]
+
+
+class WorkflowJobQueue:
+    """Runs registered workflows on a fixed number of asyncio workers
+
+    ``submit`` never blocks: when ``max_queue`` jobs are already waiting it
+    raises QueueFullError so the API can answer 429. Finished jobs are kept
+    for polling up to ``max_retained`` entries, oldest evicted first.
+    """
+
+    def __init__(self, workers: int = 4, max_queue: int = 100,
+                 max_retained: int = 1000):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.max_retained = max_retained
+        self._runners: Dict[str, WorkflowRunner] = {}
+        self._jobs: "OrderedDict[str, WorkflowJob]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @classmethod
+    def from_env(cls) -> "WorkflowJobQueue":
+        """Build a queue from WORKFLOW_* environment variables"""
+        return cls(
+            workers=int(os.getenv("WORKFLOW_WORKERS", "4")),
+            max_queue=int(os.getenv("WORKFLOW_QUEUE_SIZE", "100")),
+            max_retained=int(os.getenv("WORKFLOW_JOBS_RETAINED", "1000"))
+        )
+
+    def register(self, name: str, runner: WorkflowRunner) -> None:
+        """Register a coroutine factory that performs one workflow run"""
+        self._runners[name] = runner
+
+    @property
+    def running(self) -> bool:
+        """Whether worker tasks are active"""
+        return bool(self._tasks)
+
+    @property
+    def depth(self) -> int:
+        """Number of jobs waiting for a worker"""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def start(self) -> None:
+        """Start the worker tasks on the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self.running and self._loop is loop:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._tasks = [asyncio.create_task(self._worker(self._queue))
+                       for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Cancel workers; queued jobs that never started are marked failed"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._loop = None
+        for job in self._jobs.values():
+            if job.status in (JobStatus.QUEUED, JobStatus.RUNNING):
+                job.status = JobStatus.FAILED
+                job.error = "Job cancelled by shutdown"
+                job.finished_at = datetime.now()
+        self._queue = None
+
+    def submit(self, name: str) -> WorkflowJob:
+        """Enqueue a run of a registered workflow and return its job"""
+        if name not in self._runners:
+            raise ValueError(f"Unknown workflow '{name}'")
+        self.start()
+
+        job = WorkflowJob(workflow=name)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFullError(
+                f"Workflow queue is full ({self.max_queue} jobs waiting)"
+            )
+        self._jobs[job.id] = job
+        self._evict_finished()
+        return job
+
+    def get(self, job_id: str) -> Optional[WorkflowJob]:
+        """Return a job by id, or None if unknown or evicted"""
+        return self._jobs.get(job_id)
+
+    def _evict_finished(self) -> None:
+        """Drop the oldest finished jobs beyond the retention limit"""
+        excess = len(self._jobs) - self.max_retained
+        if excess <= 0:
+            return
+        for job_id in [jid for jid, job in self._jobs.items()
+                       if job.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+                       ][:excess]:
+            del self._jobs[job_id]
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        """Take jobs off the queue and run them until cancelled"""
+        while True:
+            job = await queue.get()
+            try:
+                await self._run(job)
+            finally:
+                queue.task_done()
+
+    async def _run(self, job: WorkflowJob) -> None:
+        """Run one job, recording its result or error"""
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.now()
+        get_registry().histogram(
+            "workflow_job_queue_wait_seconds",
+            "Time workflow jobs waited for a worker", ("workflow",)
+        ).observe((job.started_at - job.created_at).total_seconds(),
+                  workflow=job.workflow)
+        try:
+            result = await self._runners[job.workflow]()
+            if isinstance(result, BaseModel):
+                result = result.model_dump()
+            job.result = dict(result) if result is not None else None
+            job.status = JobStatus.SUCCEEDED
+        except Exception as e:
+            job.error = str(e)
+            job.status = JobStatus.FAILED
+        finally:
+            job.finished_at = datetime.now()
@@ -0,0 +1,355 @@
+"""
+In-process Workflow Scheduler
+File: python/workflows/scheduler.py
+Purpose: Long-lived asyncio scheduler running registered workflows on cron or interval specs, with jitter, overlap protection, a concurrency cap and persisted last-run state
+Related components: main.py (lifespan, /scheduler endpoints), jobs.py, bitcoin_news.py
+Tags: workflows, scheduler, cron, interval, jitter
+"""
+
+import asyncio
+import json
+import os
+import random
+import re
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+from pydantic import BaseModel
+from ..llm.metrics import get_registry
+
+
+WorkflowRunner = Callable[[], Awaitable[Any]]
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _parse_field(field: str, low: int, high: int) -> Set[int]:
+    """Values matched by one cron field (``*``, ``a-b``, ``*/n``, lists)"""
+    values: Set[int] = set()
+    for part in field.split(","):
+        part, _, step_text = part.partition("/")
+        step = int(step_text) if step_text else 1
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start, end = (int(x) for x in part.split("-", 1))
+        else:
+            start = int(part)
+            end = high if step_text else start
+        if step < 1 or start < low or end > high or start > end:
+            raise ValueError(f"Invalid cron field '{field}' (allowed {low}-{high})")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """Standard five-field cron expression, evaluated in UTC
+
+    ``minute hour day-of-month month day-of-week``; when both day fields
+    are restricted a day matching either one fires, as in cron(8).
+    """
+
+    ALIASES = {
+        "@hourly": "0 * * * *",
+        "@daily": "0 0 * * *",
+        "@weekly": "0 0 * * 0",
+        "@monthly": "0 0 1 * *",
+    }
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        fields = self.ALIASES.get(expression, expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression '{expression}' needs 5 fields")
+        self.minutes = _parse_field(fields[0], 0, 59)
+        self.hours = _parse_field(fields[1], 0, 23)
+        self.days = _parse_field(fields[2], 1, 31)
+        self.months = _parse_field(fields[3], 1, 12)
+        # 0 and 7 are both Sunday
+        self.weekdays = {d % 7 for d in _parse_field(fields[4], 0, 7)}
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def _day_matches(self, moment: datetime) -> bool:
+        in_month = moment.day in self.days
+        in_week = moment.isoweekday() % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return in_month and in_week
+        return in_month or in_week
+
+    def next_after(self, moment: datetime) -> datetime:
+        """First matching minute strictly after ``moment``"""
+        t = moment.astimezone(timezone.utc).replace(second=0, microsecond=0)
+        t += timedelta(minutes=1)
+        limit = t + timedelta(days=366 * 5)
+        while t < limit:
+            if t.month not in self.months:
+                t = (t.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(t):
+                t = t.replace(hour=0, minute=0) + timedelta(days=1)
+            elif t.hour not in self.hours:
+                t = t.replace(minute=0) + timedelta(hours=1)
+            elif t.minute not in self.minutes:
+                t += timedelta(minutes=1)
+            else:
+                return t
+        raise ValueError(f"Cron expression '{self.expression}' never fires")
+
+
+_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+class IntervalSchedule:
+    """Fixed period, e.g. ``@every 15m``"""
+
+    def __init__(self, seconds: float):
+        if seconds <= 0:
+            raise ValueError("Interval must be positive")
+        self.seconds = seconds
+
+    def next_after(self, moment: datetime) -> datetime:
+        return moment + timedelta(seconds=self.seconds)
+
+
+def parse_schedule(spec: str):
+    """Cron expression, cron alias (``@daily``) or ``@every <n><ms|s|m|h|d>``"""
+    spec = spec.strip()
+    if spec.startswith("@every"):
+        match = re.fullmatch(r"@every\s+(\d+(?:\.\d+)?)(ms|s|m|h|d)", spec)
+        if not match:
+            raise ValueError(f"Invalid interval '{spec}' (e.g. '@every 15m')")
+        return IntervalSchedule(float(match.group(1)) * _UNITS[match.group(2)])
+    return CronSchedule(spec)
+
+
+class OverlapPolicy(str, Enum):
+    """What to do when a job is due while its previous run is still going"""
+    SKIP = "skip"
+    # Remember one pending run and start it as soon as the current finishes
+    COALESCE = "coalesce"
+
+
+class JobState(BaseModel):
+    """Persisted and reported state of a scheduled job"""
+    last_scheduled_at: Optional[datetime] = None
+    last_started_at: Optional[datetime] = None
+    last_finished_at: Optional[datetime] = None
+    last_status: Optional[str] = None
+    last_error: Optional[str] = None
+    next_run_at: Optional[datetime] = None
+    runs: int = 0
+    failures: int = 0
+    skipped: int = 0
+    coalesced: int = 0
+
+
+class SchedulerStateStore:
+    """JSON file holding each job's JobState, replaced atomically on save"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> Dict[str, JobState]:
+        try:
+            with open(self.path) as f:
+                raw = json.load(f)
+        except FileNotFoundError:
+            return {}
+        return {name: JobState(**state) for name, state in raw.items()}
+
+    def save(self, states: Dict[str, JobState]) -> None:
+        temp = f"{self.path}.tmp"
+        with open(temp, "w") as f:
+            json.dump({name: state.model_dump(mode="json")
+                       for name, state in states.items()}, f, indent=2)
+        os.replace(temp, self.path)
+
+
+class ScheduledJob:
+    """A registered workflow and its schedule"""
+
+    def __init__(self, name: str, runner: WorkflowRunner, schedule: str,
+                 jitter: float = 0.0, overlap: OverlapPolicy = OverlapPolicy.SKIP,
+                 run_missed: bool = False):
+        self.name = name
+        self.runner = runner
+        self.spec = schedule
+        self.schedule = parse_schedule(schedule)
+        self.jitter = jitter
+        self.overlap = OverlapPolicy(overlap)
+        self.run_missed = run_missed
+        self.state = JobState()
+        # Unjittered slot the next run belongs to
+        self.slot: Optional[datetime] = None
+        self.running = False
+        self.pending = False
+
+
+class WorkflowScheduler:
+    """Runs registered workflows on cron/interval schedules in the event loop
+
+    Each firing is delayed by a random ``0..jitter`` seconds so replicas and
+    co-scheduled jobs do not hit providers at the same instant. A job that
+    is due while its previous run is still going is skipped or coalesced
+    into one follow-up run, and at most ``max_concurrency`` runs execute at
+    once. Last-run state is persisted (when a store is given) so a restart
+    resumes the schedule instead of replaying every missed slot.
+    """
+
+    def __init__(self, max_concurrency: int = 2,
+                 store: Optional[SchedulerStateStore] = None,
+                 clock: Callable[[], datetime] = utc_now,
+                 rng: Optional[random.Random] = None):
+        self.max_concurrency = max_concurrency
+        self.store = store
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._jobs: Dict[str, ScheduledJob] = {}
+        self._saved = store.load() if store is not None else {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._runs: Set[asyncio.Task] = set()
+
+    @classmethod
+    def from_env(cls) -> "WorkflowScheduler":
+        """Build a scheduler from WORKFLOW_SCHEDULER_* environment variables"""
+        path = os.getenv("WORKFLOW_SCHEDULER_STATE")
+        return cls(
+            max_concurrency=int(os.getenv("WORKFLOW_SCHEDULER_MAX_CONCURRENCY", "2")),
+            store=SchedulerStateStore(path) if path else None
+        )
+
+    def add_job(self, name: str, runner: WorkflowRunner, schedule: str,
+                jitter: float = 0.0, overlap: OverlapPolicy = OverlapPolicy.SKIP,
+                run_missed: bool = False) -> ScheduledJob:
+        """Register a workflow runner under a cron or ``@every`` spec
+
+        With ``run_missed`` a slot missed while the process was down runs
+        once on start; otherwise the schedule resumes at the next slot.
+        """
+        job = ScheduledJob(name, runner, schedule, jitter, overlap, run_missed)
+        if name in self._saved:
+            job.state = self._saved[name].model_copy()
+        self._jobs[name] = job
+        self._plan(job, self._clock(), initial=True)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job
+
+    def remove_job(self, name: str) -> None:
+        self._jobs.pop(name, None)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def jobs(self) -> Dict[str, JobState]:
+        """State of every registered job"""
+        return {name: job.state for name, job in self._jobs.items()}
+
+    def start(self) -> None:
+        """Start the scheduling loop on the running event loop"""
+        if self.running:
+            return
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """Stop scheduling and cancel runs in progress"""
+        tasks = [t for t in (self._task, *self._runs) if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._runs.clear()
+        for job in self._jobs.values():
+            job.running = job.pending = False
+        self._persist()
+
+    def _plan(self, job: ScheduledJob, now: datetime, initial: bool = False) -> None:
+        """Pick the next slot and its jittered run time"""
+        last = job.state.last_scheduled_at if initial else job.slot
+        if last is None:
+            slot = job.schedule.next_after(now)
+        else:
+            slot = job.schedule.next_after(last)
+            if slot <= now:
+                # Behind schedule (slow run or downtime): never replay the
+                # backlog; at most one immediate run when asked for
+                slot = now if initial and job.run_missed else job.schedule.next_after(now)
+        job.slot = slot
+        job.state.next_run_at = slot + timedelta(
+            seconds=self._rng.uniform(0, job.jitter) if job.jitter else 0.0)
+
+    async def _loop(self) -> None:
+        while True:
+            now = self._clock()
+            for job in list(self._jobs.values()):
+                if job.state.next_run_at is not None and job.state.next_run_at <= now:
+                    self._fire(job, now)
+            upcoming = [j.state.next_run_at for j in self._jobs.values()
+                        if j.state.next_run_at is not None]
+            delay = min(((t - now).total_seconds() for t in upcoming), default=60.0)
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), max(0.0, min(delay, 60.0)))
+            except asyncio.TimeoutError:
+                pass
+
+    def _fire(self, job: ScheduledJob, now: datetime) -> None:
+        """Handle a due job: run it, or skip/coalesce if still running"""
+        job.state.last_scheduled_at = job.slot
+        self._plan(job, now)
+        if job.running:
+            if job.overlap == OverlapPolicy.COALESCE:
+                job.pending = True
+                job.state.coalesced += 1
+                self._count(job, "coalesced")
+            else:
+                job.state.skipped += 1
+                self._count(job, "skipped")
+            self._persist()
+            return
+        self._launch(job)
+
+    def _launch(self, job: ScheduledJob) -> None:
+        job.running = True
+        task = asyncio.create_task(self._run(job))
+        self._runs.add(task)
+        task.add_done_callback(self._runs.discard)
+
+    async def _run(self, job: ScheduledJob) -> None:
+        """Run one firing under the concurrency cap and record the outcome"""
+        try:
+            async with self._semaphore:
+                job.state.last_started_at = self._clock()
+                job.state.runs += 1
+                self._persist()
+                try:
+                    await job.runner()
+                    job.state.last_status, job.state.last_error = "succeeded", None
+                except Exception as e:
+                    job.state.last_status, job.state.last_error = "failed", str(e)
+                    job.state.failures += 1
+                job.state.last_finished_at = self._clock()
+                self._count(job, job.state.last_status)
+                self._persist()
+        finally:
+            job.running = False
+        if job.pending and job.name in self._jobs:
+            job.pending = False
+            self._launch(job)
+
+    def _count(self, job: ScheduledJob, outcome: str) -> None:
+        get_registry().counter(
+            "workflow_scheduler_runs_total", "Scheduled workflow firings by outcome",
+            ("job", "outcome")).inc(job=job.name, outcome=outcome)
+
+    def _persist(self) -> None:
+        if self.store is not None:
+            self._saved.update(self.jobs())
+            self.store.save(self._saved)
@@ -1,6 +1,25 @@
+import operator
 from datetime import datetime
-from typing import Optional, Dict, Any
-from pydantic import BaseModel
+from typing import Annotated, Optional, Dict, Any, List
+from pydantic import BaseModel, Field
+from .triggers import TriggerState
+
+
+def merge_node_metrics(left: Optional[Dict[str, Dict[str, Any]]],
+                       right: Optional[Dict[str, Dict[str, Any]]]
+                       ) -> Dict[str, Dict[str, Any]]:
+    """Reducer summing per-node metrics (parallel branches share a node name)"""
+    merged = dict(left or {})
+    for node, stats in (right or {}).items():
+        if node in merged:
+            merged[node] = {key: merged[node].get(key, 0) + value
+                            for key, value in stats.items()}
+        else:
+            merged[node] = dict(stats)
+    return merged
+
+
+NodeMetrics = Annotated[Dict[str, Dict[str, Any]], merge_node_metrics]
 
 
 class BitcoinNewsState(BaseModel):
@@ -9,5 +28,56 @@ class BitcoinNewsState(BaseModel):
     headline: Optional[str] = None
     summary: Optional[str] = None
     sentiment: Optional[Dict[str, Any]] = None
-    start_time: datetime = datetime.now()
+    # Wall time, queue wait, tokens, cost, retries and cache hits per node
+    node_metrics: NodeMetrics = Field(default_factory=dict)
+    start_time: datetime = Field(default_factory=datetime.now)
+    end_time: Optional[datetime] = None
+
+
+class HeadlineTask(BaseModel):
+    """Input of one parallel headline branch"""
+
+    rank: int
+    headline: str
+    # Epoch seconds when the branch was scheduled, for queue-wait metrics
+    dispatched_at: Optional[float] = None
+
+
+class BitcoinNewsDigestState(BaseModel):
+    """State for the fan-out/fan-in Bitcoin news digest workflow"""
+
+    headlines: List[str] = Field(default_factory=list)
+    # Each branch appends one entry; the reducer merges parallel writes
+    analyses: Annotated[List[Dict[str, Any]], operator.add] = Field(
+        default_factory=list
+    )
+    market_sentiment: Optional[Dict[str, Any]] = None
+    node_metrics: NodeMetrics = Field(default_factory=dict)
+    start_time: datetime = Field(default_factory=datetime.now)
+    end_time: Optional[datetime] = None
+
+
+class DCADecision(BaseModel):
+    """Strategy verdict and buy amount for one fired trigger"""
+
+    trigger_id: str
+    user_id: str
+    strategy_id: str
+    action: str
+    multiplier: float
+    fallback: bool = False
+    # Fiat to spend; zero unless the action is a buy
+    amount: float = 0.0
+
+
+class DCAState(BaseModel):
+    """State for the trigger-driven DCA workflow (one run per tick)"""
+
+    price: Optional[float] = None
+    balances: Dict[str, float] = Field(default_factory=dict)
+    tick_time: Optional[datetime] = None
+    # Triggers fired by this tick
+    triggers: List[TriggerState] = Field(default_factory=list)
+    decisions: List[DCADecision] = Field(default_factory=list)
+    start_time: datetime = Field(default_factory=datetime.now)
     end_time: Optional[datetime] = None
@@ -0,0 +1,266 @@
+"""
+DCA Trigger Index
+File: python/workflows/triggers.py
+Purpose: Price, balance and schedule triggers indexed so each tick touches only the triggers that fire (sorted thresholds plus time-wheel buckets)
+Related components: dca.py (check_triggers entry node), scheduler.py (parse_schedule), PROJECT_ARCHITECTURE.md (check_triggers)
+Tags: workflows, triggers, index, bisect, time-wheel
+"""
+
+import heapq
+import math
+import threading
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Dict, List, Optional, Tuple
+from pydantic import BaseModel, model_validator
+from .scheduler import parse_schedule, utc_now
+
+
+class TriggerKind(str, Enum):
+    """Condition a DCA trigger waits for"""
+    PRICE_ABOVE = "price_above"
+    PRICE_BELOW = "price_below"
+    BALANCE_ABOVE = "balance_above"
+    BALANCE_BELOW = "balance_below"
+    SCHEDULE = "schedule"
+
+
+PRICE_KINDS = (TriggerKind.PRICE_ABOVE, TriggerKind.PRICE_BELOW)
+BALANCE_KINDS = (TriggerKind.BALANCE_ABOVE, TriggerKind.BALANCE_BELOW)
+ABOVE_KINDS = (TriggerKind.PRICE_ABOVE, TriggerKind.BALANCE_ABOVE)
+
+
+class Trigger(BaseModel):
+    """A user's DCA trigger and the strategy it runs when it fires"""
+    trigger_id: str
+    user_id: str
+    kind: TriggerKind
+    # Price or balance level for threshold kinds
+    threshold: Optional[float] = None
+    # Cron expression or ``@every <n><unit>`` for schedule triggers
+    schedule: Optional[str] = None
+    strategy_id: str = "flat-dca"
+    base_amount: float = 10.0
+
+    @model_validator(mode="after")
+    def _check_condition(self) -> "Trigger":
+        if self.kind is TriggerKind.SCHEDULE:
+            if not self.schedule:
+                raise ValueError("Schedule triggers need a schedule")
+            parse_schedule(self.schedule)
+        elif self.threshold is None or not math.isfinite(self.threshold):
+            raise ValueError(f"{self.kind.value} triggers need a finite threshold")
+        return self
+
+
+class TriggerState(BaseModel):
+    """A trigger that fired, with the value that crossed its threshold"""
+    trigger_id: str
+    user_id: str
+    kind: TriggerKind
+    strategy_id: str
+    base_amount: float
+    fired_at: datetime
+    # Price or balance observed on the tick (None for schedules)
+    observed: Optional[float] = None
+    threshold: Optional[float] = None
+
+
+class ThresholdIndex:
+    """Sorted above/below thresholds on one value stream
+
+    Triggers are edge-triggered: an above trigger fires when the value
+    moves from below its threshold to at or above it, a below trigger on
+    the opposite move. A change from ``previous`` to ``current`` selects
+    the crossed thresholds with two binary searches, so it costs
+    O(log n + k) for k fired triggers.
+    """
+
+    def __init__(self):
+        # (thresholds, trigger ids) kept in matching sorted order
+        self._above: Tuple[List[float], List[str]] = ([], [])
+        self._below: Tuple[List[float], List[str]] = ([], [])
+
+    def __len__(self) -> int:
+        return len(self._above[0]) + len(self._below[0])
+
+    def add(self, trigger_id: str, threshold: float, above: bool) -> None:
+        thresholds, ids = self._above if above else self._below
+        position = bisect_right(thresholds, threshold)
+        thresholds.insert(position, threshold)
+        ids.insert(position, trigger_id)
+
+    def remove(self, trigger_id: str, threshold: float, above: bool) -> None:
+        thresholds, ids = self._above if above else self._below
+        for position in range(bisect_left(thresholds, threshold),
+                              bisect_right(thresholds, threshold)):
+            if ids[position] == trigger_id:
+                del thresholds[position], ids[position]
+                return
+
+    def crossed(self, previous: Optional[float], current: float) -> List[str]:
+        """Ids of triggers whose threshold lies between ``previous`` and ``current``"""
+        if previous is None or current == previous:
+            return []
+        if current > previous:
+            thresholds, ids = self._above
+            return ids[bisect_right(thresholds, previous):bisect_right(thresholds, current)]
+        thresholds, ids = self._below
+        return ids[bisect_left(thresholds, current):bisect_left(thresholds, previous)]
+
+
+class TimeWheel:
+    """Due times bucketed by ``resolution`` seconds, with a heap of occupied buckets
+
+    Advancing the clock pops only buckets that have come due, so a tick
+    costs O(log b + k) however many schedules are registered and however
+    long the wheel sat idle.
+    """
+
+    def __init__(self, resolution: float = 1.0):
+        self.resolution = resolution
+        self._buckets: Dict[int, Dict[str, float]] = {}
+        self._slots: List[int] = []
+        self._bucket_of: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._bucket_of)
+
+    def add(self, trigger_id: str, due: float) -> None:
+        self.remove(trigger_id)
+        slot = math.floor(due / self.resolution)
+        if slot not in self._buckets:
+            self._buckets[slot] = {}
+            heapq.heappush(self._slots, slot)
+        self._buckets[slot][trigger_id] = due
+        self._bucket_of[trigger_id] = slot
+
+    def remove(self, trigger_id: str) -> None:
+        slot = self._bucket_of.pop(trigger_id, None)
+        if slot is not None:
+            bucket = self._buckets[slot]
+            del bucket[trigger_id]
+            if not bucket:
+                # The heap entry is dropped lazily when it reaches the top
+                del self._buckets[slot]
+
+    def pop_due(self, now: float) -> List[str]:
+        """Remove and return every entry due at or before ``now``"""
+        current = math.floor(now / self.resolution)
+        due: List[str] = []
+        while self._slots and self._slots[0] <= current:
+            slot = self._slots[0]
+            bucket = self._buckets.get(slot)
+            if bucket is not None:
+                ready = [tid for tid, when in bucket.items() if when <= now]
+                for trigger_id in ready:
+                    del bucket[trigger_id]
+                    del self._bucket_of[trigger_id]
+                due.extend(ready)
+                if bucket:
+                    # Only the current bucket can hold entries not yet due
+                    break
+                del self._buckets[slot]
+            heapq.heappop(self._slots)
+        return due
+
+
+class TriggerIndex:
+    """All users' triggers, indexed for per-tick evaluation
+
+    Price triggers sit in one ThresholdIndex, balance triggers in one per
+    user and schedules in a TimeWheel, so ``check_triggers`` touches only
+    the triggers that fire instead of scanning every trigger. Price and
+    balance triggers fire on crossings: the first value seen only sets
+    the reference. A schedule trigger fires once when due (missed slots
+    are not replayed) and is re-armed for its next slot.
+    """
+
+    def __init__(self, resolution: float = 1.0):
+        self._triggers: Dict[str, Trigger] = {}
+        self._prices = ThresholdIndex()
+        self._balances: Dict[str, ThresholdIndex] = {}
+        self._wheel = TimeWheel(resolution)
+        self._schedules: Dict[str, object] = {}
+        self.price: Optional[float] = None
+        self.balances: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._triggers)
+
+    def __contains__(self, trigger_id: str) -> bool:
+        return trigger_id in self._triggers
+
+    def add(self, trigger: Trigger, now: Optional[datetime] = None) -> None:
+        """Register (or replace) a trigger"""
+        with self._lock:
+            self._discard(trigger.trigger_id)
+            self._triggers[trigger.trigger_id] = trigger
+            above = trigger.kind in ABOVE_KINDS
+            if trigger.kind in PRICE_KINDS:
+                self._prices.add(trigger.trigger_id, trigger.threshold, above)
+            elif trigger.kind in BALANCE_KINDS:
+                self._balances.setdefault(trigger.user_id, ThresholdIndex()).add(
+                    trigger.trigger_id, trigger.threshold, above)
+            else:
+                schedule = parse_schedule(trigger.schedule)
+                self._schedules[trigger.trigger_id] = schedule
+                due = schedule.next_after(now or utc_now())
+                self._wheel.add(trigger.trigger_id, due.timestamp())
+
+    def remove(self, trigger_id: str) -> None:
+        with self._lock:
+            self._discard(trigger_id)
+
+    def _discard(self, trigger_id: str) -> None:
+        trigger = self._triggers.pop(trigger_id, None)
+        if trigger is None:
+            return
+        above = trigger.kind in ABOVE_KINDS
+        if trigger.kind in PRICE_KINDS:
+            self._prices.remove(trigger_id, trigger.threshold, above)
+        elif trigger.kind in BALANCE_KINDS:
+            index = self._balances[trigger.user_id]
+            index.remove(trigger_id, trigger.threshold, above)
+            if not len(index):
+                del self._balances[trigger.user_id]
+        else:
+            self._schedules.pop(trigger_id, None)
+            self._wheel.remove(trigger_id)
+
+    def check_triggers(self, price: Optional[float] = None,
+                       balances: Optional[Dict[str, float]] = None,
+                       now: Optional[datetime] = None) -> List[TriggerState]:
+        """Triggers fired by this tick: a new price, users' new balances and the clock"""
+        now = now or utc_now()
+        if now.tzinfo is None:
+            now = now.replace(tzinfo=timezone.utc)
+        fired: List[TriggerState] = []
+        with self._lock:
+            if price is not None:
+                for trigger_id in self._prices.crossed(self.price, price):
+                    fired.append(self._fired(trigger_id, now, price))
+                self.price = price
+
+            for user_id, balance in (balances or {}).items():
+                index = self._balances.get(user_id)
+                if index is not None:
+                    for trigger_id in index.crossed(self.balances.get(user_id), balance):
+                        fired.append(self._fired(trigger_id, now, balance))
+                self.balances[user_id] = balance
+
+            for trigger_id in self._wheel.pop_due(now.timestamp()):
+                fired.append(self._fired(trigger_id, now))
+                self._wheel.add(trigger_id,
+                                self._schedules[trigger_id].next_after(now).timestamp())
+        return fired
+
+    def _fired(self, trigger_id: str, now: datetime,
+               observed: Optional[float] = None) -> TriggerState:
+        trigger = self._triggers[trigger_id]
+        return TriggerState(trigger_id=trigger_id, user_id=trigger.user_id,
+                            kind=trigger.kind, strategy_id=trigger.strategy_id,
+                            base_amount=trigger.base_amount, fired_at=now,
+                            observed=observed, threshold=trigger.threshold)